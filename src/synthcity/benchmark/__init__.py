@@ -1,11 +1,10 @@
 # stdlib
 import hashlib
 import json
-import platform
 import random
 from copy import copy
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 # third party
 import numpy as np
@@ -15,14 +14,15 @@ from pydantic import validate_arguments
 
 # synthcity absolute
 import synthcity.logger as log
+from synthcity.benchmark.executor import BenchmarkBackend, get_backend
 from synthcity.benchmark.utils import augment_data, get_json_serializable_kwargs
 from synthcity.metrics import Metrics
 from synthcity.metrics.scores import ScoreEvaluator
 from synthcity.plugins import Plugins
 from synthcity.plugins.core.constraints import Constraints
 from synthcity.plugins.core.dataloader import DataLoader
+from synthcity.utils.artifacts import MISSING, ArtifactStore
 from synthcity.utils.reproducibility import clear_cache, enable_reproducible_results
-from synthcity.utils.serialization import load_from_file, save_to_file
 
 
 def print_score(mean: pd.Series, std: pd.Series) -> pd.Series:
@@ -43,6 +43,215 @@ def print_score(mean: pd.Series, std: pd.Series) -> pd.Series:
     return mean_str + " ± " + stddev_str
 
 
+def _evaluate_experiment(
+    testcase: str,
+    plugin: str,
+    kwargs: dict,
+    repeat: int,
+    experiment_key: list,
+    X: DataLoader,
+    X_test: Optional[DataLoader],
+    metrics: Optional[Dict],
+    synthetic_size: Optional[int],
+    synthetic_constraints: Optional[Constraints],
+    synthetic_cache: bool,
+    synthetic_reuse_if_exists: bool,
+    augmented_reuse_if_exists: bool,
+    task_type: str,
+    workspace: Path,
+    augmentation_rule: str,
+    strict_augmentation: bool,
+    ad_hoc_augment_vals: Optional[Dict],
+    augmentation_hash: str,
+    use_metric_cache: bool,
+    n_eval_folds: int,
+    cache_max_size: Optional[int],
+    plugin_cats: List[str],
+    generate_kwargs: Dict[str, Any],
+) -> Optional[pd.DataFrame]:
+    """Run one (testcase, repeat) job of `Benchmarks.evaluate`: fit, generate, augment and evaluate.
+
+    Every intermediary result goes through the artifact store of the workspace, and so does the evaluation itself, so a job which completed before a crash is not recomputed when the benchmark is resumed.
+
+    Returns:
+        The output of `Metrics.evaluate`, or None if the plugin failed.
+    """
+    enable_reproducible_results(repeat)
+
+    clear_cache()
+
+    store = ArtifactStore(workspace, max_size=cache_max_size)
+    reuse_evaluation = synthetic_reuse_if_exists and use_metric_cache
+
+    X_syn_cache_key = store.key(*experiment_key, kind="synthetic")
+    X_ref_syn_cache_key = store.key(*experiment_key, kind="synthetic_reference")
+    generator_key = store.key(*experiment_key, kind="generator")
+    X_augment_cache_key = store.key(
+        *experiment_key, augmentation_hash, kind="augmentation"
+    )
+    augment_generator_key = store.key(
+        *experiment_key, augmentation_hash, kind="augmentation_generator"
+    )
+    evaluation_key = store.key(
+        *experiment_key,
+        augmentation_hash,
+        metrics,
+        task_type,
+        n_eval_folds,
+        X_test.hash() if X_test is not None else None,
+        synthetic_size,
+        synthetic_constraints.rules if synthetic_constraints is not None else None,
+        generate_kwargs,
+        kind="evaluation",
+    )
+
+    log.info(
+        f"[testcase] {testcase} Experiment repeat: {repeat} task type: {task_type} Train df hash = {experiment_key[0]}"
+    )
+
+    # a single lookup per artifact: a concurrent job may evict it between an `exists` and a `get`
+    if reuse_evaluation:
+        evaluation = store.get(evaluation_key, MISSING)
+        if evaluation is not MISSING:
+            log.info(f"[{plugin}][take {repeat}] reusing the cached evaluation")
+            return evaluation
+
+    # The artifacts are keyed by the synthcity and python versions, caches from other versions are never loaded.
+    generator = (
+        store.get(generator_key, MISSING) if synthetic_reuse_if_exists else MISSING
+    )
+    if generator is MISSING:
+        generator = Plugins(categories=plugin_cats).get(
+            plugin,
+            **kwargs,
+        )
+
+        generator.fit(X.train())
+
+        if synthetic_cache:
+            store.put(generator_key, generator, kind="generator")
+
+    X_syn = (
+        store.get(X_syn_cache_key, MISSING) if synthetic_reuse_if_exists else MISSING
+    )
+    if X_syn is MISSING:
+        try:
+            X_syn = generator.generate(
+                count=synthetic_size,
+                constraints=synthetic_constraints,
+                **generate_kwargs,
+            )
+            if len(X_syn) == 0:
+                raise RuntimeError("Plugin failed to generate data")
+        except BaseException as e:
+            log.critical(f"[{plugin}][take {repeat}] failed: {e}")
+            return None
+
+        if synthetic_cache:
+            store.put(X_syn_cache_key, X_syn, kind="synthetic")
+
+    # X_ref_syn is the reference synthetic data used for DomiasMIA metrics
+    X_ref_syn = (
+        store.get(X_ref_syn_cache_key, MISSING)
+        if synthetic_reuse_if_exists
+        else MISSING
+    )
+    if X_ref_syn is MISSING:
+        try:
+            X_ref_syn = generator.generate(
+                count=synthetic_size,
+                constraints=synthetic_constraints,
+                **generate_kwargs,
+            )
+            if len(X_syn) == 0:
+                raise RuntimeError("Plugin failed to generate data")
+        except BaseException as e:
+            log.critical(f"[{plugin}][take {repeat}] failed: {e}")
+            return None
+
+        if synthetic_cache:
+            store.put(X_ref_syn_cache_key, X_ref_syn, kind="synthetic_reference")
+
+    # Augmentation
+    if metrics and any(
+        "augmentation" in metric for metric in [x for v in metrics.values() for x in v]
+    ):
+        augment_generator = (
+            store.get(augment_generator_key, MISSING)
+            if augmented_reuse_if_exists
+            else MISSING
+        )
+        if augment_generator is MISSING:
+            augment_generator = Plugins(categories=plugin_cats).get(
+                plugin,
+                **kwargs,
+            )
+            try:
+                if not X.get_fairness_column():
+                    raise ValueError(
+                        "To use the augmentation metrics, `fairness_column` must be set to a string representing the name of a column in the DataLoader."
+                    )
+                augment_generator.fit(
+                    X.train(),
+                    cond=X.train()[X.get_fairness_column()],
+                )
+            except BaseException as e:
+                log.critical(
+                    f"[{plugin}][take {repeat}] failed to fit augmentation generator: {e}"
+                )
+                return None
+            if synthetic_cache:
+                store.put(
+                    augment_generator_key,
+                    augment_generator,
+                    kind="augmentation_generator",
+                )
+
+        X_augmented = (
+            store.get(X_augment_cache_key, MISSING)
+            if augmented_reuse_if_exists
+            else MISSING
+        )
+        if X_augmented is MISSING:
+            try:
+                X_augmented = augment_data(
+                    X.train(),
+                    augment_generator,
+                    rule=augmentation_rule,
+                    strict=strict_augmentation,
+                    ad_hoc_augment_vals=ad_hoc_augment_vals,
+                    **generate_kwargs,
+                )
+                if len(X_augmented) == 0:
+                    raise RuntimeError("Plugin failed to generate data")
+            except BaseException as e:
+                log.critical(
+                    f"[{plugin}][take {repeat}] failed to generate augmentation data: {e}"
+                )
+                return None
+            if synthetic_cache:
+                store.put(X_augment_cache_key, X_augmented, kind="augmentation")
+    else:
+        X_augmented = None
+    evaluation = Metrics.evaluate(
+        X_test if X_test is not None else X.test(),
+        X_syn,
+        X.train(),
+        X_ref_syn,
+        X_augmented,
+        metrics=metrics,
+        task_type=task_type,
+        workspace=workspace,
+        use_cache=use_metric_cache,
+        n_folds=n_eval_folds,
+    )
+
+    if synthetic_cache:
+        store.put(evaluation_key, evaluation, kind="evaluation")
+
+    return evaluation
+
+
 class Benchmarks:
     @staticmethod
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -64,6 +273,9 @@ class Benchmarks:
         ad_hoc_augment_vals: Optional[Dict] = None,
         use_metric_cache: bool = True,
         n_eval_folds: int = 5,
+        cache_max_size: Optional[int] = None,
+        n_jobs: int = 1,
+        backend: Union[str, BenchmarkBackend] = "sequential",
         **generate_kwargs: Any,
     ) -> pd.DataFrame:
         """Benchmark the performance of several algorithms.
@@ -111,14 +323,20 @@ class Benchmarks:
                 If the current metric has been previously run and is cached, it will be reused for the experiments. Defaults to True.
             n_eval_folds: int
                 the KFolds used by MetricEvaluators in the benchmarks. Defaults to 5.
+            cache_max_size: Optional[int]
+                Size limit, in bytes, of the artifact cache in the workspace. The least recently used artifacts are evicted when exceeded. Defaults to None, unbounded.
+            n_jobs: int
+                Number of concurrent (testcase, repeat) jobs for the "process" backend. -1 uses all the CPUs. Defaults to 1.
+            backend: Union[str, BenchmarkBackend]
+                The executor of the jobs: "sequential", "process", or a BenchmarkBackend instance, e.g. a ProcessPoolBackend with CPU and memory budgets. Every job caches its evaluation in the workspace, so an interrupted benchmark resumes from the completed jobs. Defaults to "sequential".
             plugin_kwargs:
                 Optional kwargs for each algorithm. Example {"adsgan": {"n_iter": 10}},
         """
-        out = {}
-
         experiment_name = X.hash()
 
         workspace.mkdir(parents=True, exist_ok=True)
+        # create the index before the workers share it
+        ArtifactStore(workspace, max_size=cache_max_size)
 
         plugin_cats = ["generic", "privacy", "domain_adaptation"]
         if X.type() == "images":
@@ -128,13 +346,45 @@ class Benchmarks:
         elif task_type == "time_series" or task_type == "time_series_survival":
             plugin_cats.append("time_series")
 
+        augmentation_arguments = {
+            "augmentation_rule": augmentation_rule,
+            "strict_augmentation": strict_augmentation,
+            "ad_hoc_augment_vals": ad_hoc_augment_vals,
+        }
+        augmentation_arguments_hash_raw = json.dumps(
+            copy(augmentation_arguments), sort_keys=True
+        ).encode()
+        augmentation_hash_object = hashlib.sha256(augmentation_arguments_hash_raw)
+        augmentation_hash = augmentation_hash_object.hexdigest()
+
+        shared = dict(
+            X=X,
+            X_test=X_test,
+            metrics=metrics,
+            synthetic_size=synthetic_size,
+            synthetic_constraints=synthetic_constraints,
+            synthetic_cache=synthetic_cache,
+            synthetic_reuse_if_exists=synthetic_reuse_if_exists,
+            augmented_reuse_if_exists=augmented_reuse_if_exists,
+            task_type=task_type,
+            workspace=workspace,
+            augmentation_rule=augmentation_rule,
+            strict_augmentation=strict_augmentation,
+            ad_hoc_augment_vals=ad_hoc_augment_vals,
+            augmentation_hash=augmentation_hash,
+            use_metric_cache=use_metric_cache,
+            n_eval_folds=n_eval_folds,
+            cache_max_size=cache_max_size,
+            plugin_cats=plugin_cats,
+            generate_kwargs=generate_kwargs,
+        )
+
+        jobs: List[Dict[str, Any]] = []
         for testcase, plugin, kwargs in tests:
             log.info(f"Testcase : {testcase}")
             if not isinstance(kwargs, dict):
                 raise ValueError(f"'kwargs' must be a dict for {testcase}:{plugin}")
 
-            scores = ScoreEvaluator()
-
             kwargs_hash = ""
             if len(kwargs) > 0:
                 serializable_kwargs = get_json_serializable_kwargs(kwargs)
@@ -144,185 +394,53 @@ class Benchmarks:
                 hash_object = hashlib.sha256(kwargs_hash_raw)
                 kwargs_hash = hash_object.hexdigest()
 
-            augmentation_arguments = {
-                "augmentation_rule": augmentation_rule,
-                "strict_augmentation": strict_augmentation,
-                "ad_hoc_augment_vals": ad_hoc_augment_vals,
-            }
-            augmentation_arguments_hash_raw = json.dumps(
-                copy(augmentation_arguments), sort_keys=True
-            ).encode()
-            augmentation_hash_object = hashlib.sha256(augmentation_arguments_hash_raw)
-            augmentation_hash = augmentation_hash_object.hexdigest()
-
             repeats_list = list(range(repeats))
             random.shuffle(repeats_list)
 
             for repeat in repeats_list:
-                enable_reproducible_results(repeat)
-
-                kwargs["workspace"] = workspace
-                kwargs["random_state"] = repeat
-
-                clear_cache()
-
-                X_syn_cache_file = (
-                    workspace
-                    / f"{experiment_name}_{testcase}_{plugin}_{kwargs_hash}_{platform.python_version()}_{repeat}.bkp"
-                )
-                X_ref_syn_cache_file = (
-                    workspace
-                    / f"{experiment_name}_{testcase}_{plugin}_{kwargs_hash}_{platform.python_version()}_{repeat}_reference.bkp"
-                )
-                generator_file = (
-                    workspace
-                    / f"{experiment_name}_{testcase}_{plugin}_{kwargs_hash}_{platform.python_version()}_generator_{repeat}.bkp"
-                )
-                X_augment_cache_file = (
-                    workspace
-                    / f"{experiment_name}_{testcase}_{plugin}_augmentation_{augmentation_hash}_{kwargs_hash}_{platform.python_version()}_{repeat}.bkp"
-                )
-                augment_generator_file = (
-                    workspace
-                    / f"{experiment_name}_{testcase}_{plugin}_augmentation_{augmentation_hash}_{kwargs_hash}_{platform.python_version()}_generator_{repeat}.bkp"
-                )
-
-                log.info(
-                    f"[testcase] Experiment repeat: {repeat} task type: {task_type} Train df hash = {experiment_name}"
-                )
-
-                # TODO: caches should be from the same version of Synthcity. Different APIs will crash.
-                if generator_file.exists() and synthetic_reuse_if_exists:
-                    generator = load_from_file(generator_file)
-                else:
-                    generator = Plugins(categories=plugin_cats).get(
-                        plugin,
-                        **kwargs,
+                jobs.append(
+                    dict(
+                        testcase=testcase,
+                        plugin=plugin,
+                        kwargs=dict(kwargs, workspace=workspace, random_state=repeat),
+                        repeat=repeat,
+                        experiment_key=[
+                            experiment_name,
+                            testcase,
+                            plugin,
+                            kwargs_hash,
+                            repeat,
+                        ],
+                        **shared,
                     )
+                )
 
-                    generator.fit(X.train())
-
-                    if synthetic_cache:
-                        save_to_file(generator_file, generator)
+        evaluations = get_backend(backend, n_jobs).run(_evaluate_experiment, jobs)
 
-                if X_syn_cache_file.exists() and synthetic_reuse_if_exists:
-                    X_syn = load_from_file(X_syn_cache_file)
-                else:
-                    try:
-                        X_syn = generator.generate(
-                            count=synthetic_size,
-                            constraints=synthetic_constraints,
-                            **generate_kwargs,
-                        )
-                        if len(X_syn) == 0:
-                            raise RuntimeError("Plugin failed to generate data")
-                    except BaseException as e:
-                        log.critical(f"[{plugin}][take {repeat}] failed: {e}")
-                        continue
-
-                    if synthetic_cache:
-                        save_to_file(X_syn_cache_file, X_syn)
-
-                # X_ref_syn is the reference synthetic data used for DomiasMIA metrics
-                if X_ref_syn_cache_file.exists() and synthetic_reuse_if_exists:
-                    X_ref_syn = load_from_file(X_ref_syn_cache_file)
-                else:
-                    try:
-                        X_ref_syn = generator.generate(
-                            count=synthetic_size,
-                            constraints=synthetic_constraints,
-                            **generate_kwargs,
-                        )
-                        if len(X_syn) == 0:
-                            raise RuntimeError("Plugin failed to generate data")
-                    except BaseException as e:
-                        log.critical(f"[{plugin}][take {repeat}] failed: {e}")
-                        continue
-
-                    if synthetic_cache:
-                        save_to_file(X_ref_syn_cache_file, X_ref_syn)
-
-                # Augmentation
-                if metrics and any(
-                    "augmentation" in metric
-                    for metric in [x for v in metrics.values() for x in v]
-                ):
-                    if augment_generator_file.exists() and augmented_reuse_if_exists:
-                        augment_generator = load_from_file(augment_generator_file)
-                    else:
-                        augment_generator = Plugins(categories=plugin_cats).get(
-                            plugin,
-                            **kwargs,
-                        )
-                        try:
-                            if not X.get_fairness_column():
-                                raise ValueError(
-                                    "To use the augmentation metrics, `fairness_column` must be set to a string representing the name of a column in the DataLoader."
-                                )
-                            augment_generator.fit(
-                                X.train(),
-                                cond=X.train()[X.get_fairness_column()],
-                            )
-                        except BaseException as e:
-                            log.critical(
-                                f"[{plugin}][take {repeat}] failed to fit augmentation generator: {e}"
-                            )
-                            continue
-                        if synthetic_cache:
-                            save_to_file(augment_generator_file, augment_generator)
-
-                    if X_augment_cache_file.exists() and augmented_reuse_if_exists:
-                        X_augmented = load_from_file(X_augment_cache_file)
-                    else:
-                        try:
-                            X_augmented = augment_data(
-                                X.train(),
-                                augment_generator,
-                                rule=augmentation_rule,
-                                strict=strict_augmentation,
-                                ad_hoc_augment_vals=ad_hoc_augment_vals,
-                                **generate_kwargs,
-                            )
-                            if len(X_augmented) == 0:
-                                raise RuntimeError("Plugin failed to generate data")
-                        except BaseException as e:
-                            log.critical(
-                                f"[{plugin}][take {repeat}] failed to generate augmentation data: {e}"
-                            )
-                            continue
-                        if synthetic_cache:
-                            save_to_file(X_augment_cache_file, X_augmented)
-                else:
-                    X_augmented = None
-                evaluation = Metrics.evaluate(
-                    X_test if X_test is not None else X.test(),
-                    X_syn,
-                    X.train(),
-                    X_ref_syn,
-                    X_augmented,
-                    metrics=metrics,
-                    task_type=task_type,
-                    workspace=workspace,
-                    use_cache=use_metric_cache,
-                    n_folds=n_eval_folds,
+        # the results are merged in the order of the tests, regardless of the scheduling order
+        out = {}
+        for job, evaluation in zip(jobs, evaluations):
+            testcase = job["testcase"]
+            if testcase not in out:
+                out[testcase] = ScoreEvaluator()
+            if evaluation is None:
+                continue
+
+            mean_score = evaluation["mean"].to_dict()
+            errors = evaluation["errors"].to_dict()
+            duration = evaluation["durations"].to_dict()
+            direction = evaluation["direction"].to_dict()
+
+            for key in mean_score:
+                out[testcase].add(
+                    key,
+                    mean_score[key],
+                    errors[key],
+                    duration[key],
+                    direction[key],
                 )
 
-                mean_score = evaluation["mean"].to_dict()
-                errors = evaluation["errors"].to_dict()
-                duration = evaluation["durations"].to_dict()
-                direction = evaluation["direction"].to_dict()
-
-                for key in mean_score:
-                    scores.add(
-                        key,
-                        mean_score[key],
-                        errors[key],
-                        duration[key],
-                        direction[key],
-                    )
-            out[testcase] = scores.to_dataframe()
-
-        return out
+        return {testcase: scores.to_dataframe() for testcase, scores in out.items()}
 
     @staticmethod
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -0,0 +1,160 @@
+# stdlib
+import multiprocessing
+from abc import ABCMeta, abstractmethod
+from concurrent.futures import Executor, Future, as_completed
+from typing import Any, Callable, Dict, List, Optional, Union
+
+# synthcity absolute
+import synthcity.logger as log
+from synthcity.utils.parallel import process_pool
+
+SUPPORTED_BACKENDS = ["sequential", "process"]
+
+
+class BenchmarkBackend(metaclass=ABCMeta):
+    """
+    .. inheritance-diagram:: synthcity.benchmark.executor.BenchmarkBackend
+        :parts: 1
+
+    Base class for the executors of the benchmark jobs. Each (testcase, repeat) of `Benchmarks.evaluate` is an independent job.
+
+    Each derived class must implement the following methods:
+        run() - run the jobs and return their results, in the order of the jobs.
+
+    The jobs exchange their intermediary results through the artifact store of the workspace, so the workers of a distributed backend must share the workspace folder.
+    """
+
+    @abstractmethod
+    def run(self, fn: Callable, jobs: List[Dict[str, Any]]) -> List[Any]:
+        """Run `fn(**job)` for each job.
+
+        Returns:
+            The results, in the order of the jobs. The first failing job raises its exception.
+        """
+        ...
+
+
+class ExecutorBackend(BenchmarkBackend):
+    """
+    .. inheritance-diagram:: synthcity.benchmark.executor.ExecutorBackend
+        :parts: 1
+
+    Base class for the backends submitting the jobs to a `concurrent.futures.Executor`.
+
+    Each derived class must implement the following methods:
+        executor() - return the Executor running the jobs, e.g. a process pool or the executor of a cluster client.
+    """
+
+    @abstractmethod
+    def executor(self) -> Executor:
+        ...
+
+    def run(self, fn: Callable, jobs: List[Dict[str, Any]]) -> List[Any]:
+        """Run `fn(**job)` for each job on the executor.
+
+        Returns:
+            The results, in the order of the jobs. The first failing job cancels the pending ones and raises its exception.
+        """
+        results: List[Any] = [None] * len(jobs)
+        if len(jobs) == 0:
+            return results
+
+        executor = self.executor()
+        try:
+            futures: Dict[Future, int] = {
+                executor.submit(fn, **job): idx for idx, job in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+
+        executor.shutdown(wait=True)
+        return results
+
+
+class SequentialBackend(BenchmarkBackend):
+    """Runs the jobs one after the other, in the current process."""
+
+    def run(self, fn: Callable, jobs: List[Dict[str, Any]]) -> List[Any]:
+        return [fn(**job) for job in jobs]
+
+
+class ProcessPoolBackend(ExecutorBackend):
+    """Runs the jobs in a local pool of processes, within CPU and memory budgets.
+
+    Args:
+        n_jobs: int
+            Maximum number of concurrent jobs. -1 allows as many jobs as the CPU budget permits. Default: -1.
+        cpus_per_job: int
+            Number of threads each job may use, for torch and the BLAS/OpenMP pools. Default: 1.
+        cpu_budget: Optional[int]
+            Total number of CPUs for the benchmark. Default: None, all the CPUs of the machine.
+        memory_per_job: Optional[int]
+            Expected peak memory of a job, in bytes. Required by `memory_budget`.
+        memory_budget: Optional[int]
+            Total memory for the benchmark, in bytes. The number of concurrent jobs is capped to memory_budget // memory_per_job. Default: None, no memory cap.
+    """
+
+    def __init__(
+        self,
+        n_jobs: int = -1,
+        cpus_per_job: int = 1,
+        cpu_budget: Optional[int] = None,
+        memory_per_job: Optional[int] = None,
+        memory_budget: Optional[int] = None,
+    ) -> None:
+        if cpus_per_job <= 0:
+            raise ValueError(f"Invalid cpus_per_job {cpus_per_job}")
+        if cpu_budget is not None and cpu_budget < cpus_per_job:
+            raise ValueError(
+                f"cpu_budget {cpu_budget} is lower than cpus_per_job {cpus_per_job}"
+            )
+        if memory_budget is not None:
+            if memory_per_job is None or memory_per_job <= 0:
+                raise ValueError("memory_budget requires a valid memory_per_job")
+            if memory_budget < memory_per_job:
+                raise ValueError(
+                    f"memory_budget {memory_budget} is lower than memory_per_job {memory_per_job}"
+                )
+
+        self.n_jobs = n_jobs
+        self.cpus_per_job = cpus_per_job
+        self.cpu_budget = cpu_budget
+        self.memory_per_job = memory_per_job
+        self.memory_budget = memory_budget
+
+    def n_workers(self) -> int:
+        cpu_budget = (
+            self.cpu_budget
+            if self.cpu_budget is not None
+            else multiprocessing.cpu_count()
+        )
+        n_workers = max(1, cpu_budget // self.cpus_per_job)
+        if self.n_jobs > 0:
+            n_workers = min(n_workers, self.n_jobs)
+        if self.memory_budget is not None and self.memory_per_job is not None:
+            n_workers = min(n_workers, self.memory_budget // self.memory_per_job)
+
+        return max(1, n_workers)
+
+    def executor(self) -> Executor:
+        n_workers = self.n_workers()
+        log.info(f"[benchmark] {n_workers} workers, {self.cpus_per_job} CPUs per job")
+        # each job gets its share of the CPUs, instead of every worker using all of them
+        return process_pool(n_workers, n_threads=self.cpus_per_job)
+
+
+def get_backend(
+    backend: Union[str, BenchmarkBackend], n_jobs: int = 1
+) -> BenchmarkBackend:
+    """Get a benchmark backend from a name or an instance."""
+    if isinstance(backend, BenchmarkBackend):
+        return backend
+    if backend == "sequential":
+        return SequentialBackend()
+    if backend == "process":
+        return ProcessPoolBackend(n_jobs=n_jobs)
+
+    raise ValueError(f"Invalid backend {backend}. Supported: {SUPPORTED_BACKENDS}")
@@ -1,2 +1,4 @@
 # synthcity relative
+from .context import EvaluationContext  # noqa: F401
 from .metric import MetricEvaluator  # noqa: F401
+from .neighbors import NeighborIndex  # noqa: F401
@@ -0,0 +1,288 @@
+# stdlib
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# third party
+import numpy as np
+import pandas as pd
+
+# synthcity absolute
+from synthcity.metrics.core.neighbors import NeighborIndex
+from synthcity.plugins.core.dataloader import DataLoader, fit_column_encoder
+
+
+def array_digest(X: np.ndarray) -> str:
+    """Content hash of an array, used as a cache key."""
+    X = np.ascontiguousarray(X)
+    digest = hashlib.sha256(f"{X.dtype}{X.shape}".encode())
+    digest.update(X.view(np.uint8).reshape(-1) if X.size else b"")
+    return digest.hexdigest()
+
+
+class EvaluationContext:
+    """Shared state for evaluating synthetic datasets against the same real data.
+
+    The real-side work is done once and reused by every metric and every call of `Metrics.evaluate` using the context:
+        - the label encoders and the encoded real datasets. The encoders only depend on the unique values of the columns, so they are refitted, and the real datasets re-encoded, only if a synthetic dataset brings new values.
+        - the dense matrices of the datasets, the nearest neighbours indexes and queries, the OneClass embeddings and the quasi-identifier groups of the privacy metrics, memoized by content hash. A single kNN index is built per (matrix, metric), whatever the number of neighbours the metrics need.
+
+    The memoized values are read-only and evicted in least recently used order. When the context is sent to a worker process, only its configuration is copied, and the worker starts with an empty cache.
+
+    Args:
+        X_gt: DataLoader
+            Reference real data.
+        X_train: Optional[DataLoader]
+            The data used to train the generators (used for domias metrics only).
+        X_ref_syn: Optional[DataLoader]
+            Reference synthetic data (used for domias metrics only).
+        max_entries: int
+            Maximum number of memoized values. Default: 64.
+        knn_backend: str
+            The backend of the kNN indexes, "exact" or "approximate". See NeighborIndex. Default: "exact".
+        knn_batch_size: int
+            Number of query rows per batch of the kNN queries, to bound their peak memory. Default: 4096.
+        qi_grouping: str
+            How the k-anonymity, l-diversity, k-map and delta-presence metrics group the records on the quasi-identifiers: "kmeans", "minibatch" or "exact". See PrivacyEvaluator. Default: "kmeans".
+
+    Example:
+        >>> context = EvaluationContext(X_gt)
+        >>> for X_syn in candidates:
+        >>>     Metrics.evaluate(X_gt, X_syn, context=context)
+    """
+
+    def __init__(
+        self,
+        X_gt: DataLoader,
+        X_train: Optional[DataLoader] = None,
+        X_ref_syn: Optional[DataLoader] = None,
+        max_entries: int = 64,
+        knn_backend: str = "exact",
+        knn_batch_size: int = 4096,
+        qi_grouping: str = "kmeans",
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError(f"Invalid max_entries {max_entries}")
+        if knn_batch_size <= 0:
+            raise ValueError(f"Invalid knn_batch_size {knn_batch_size}")
+
+        self.X_gt = X_gt
+        self.X_train = X_train
+        self.X_ref_syn = X_ref_syn
+        self.max_entries = max_entries
+        self.knn_backend = knn_backend
+        self.knn_batch_size = knn_batch_size
+        self.qi_grouping = qi_grouping
+
+        self._reset()
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._cache: OrderedDict = OrderedDict()
+        self._uniques: Optional[Dict[Any, pd.Series]] = None
+        self._encoded: Optional[Tuple[Tuple, Dict[str, DataLoader]]] = None
+
+    def __getstate__(self) -> dict:
+        return {
+            "X_gt": None,
+            "X_train": None,
+            "X_ref_syn": None,
+            "max_entries": self.max_entries,
+            "knn_backend": self.knn_backend,
+            "knn_batch_size": self.knn_batch_size,
+            "qi_grouping": self.qi_grouping,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._reset()
+
+    def _real(self) -> Dict[str, DataLoader]:
+        if self.X_gt is None:
+            raise RuntimeError("The real data is not available in a worker context")
+
+        real = {"X_gt": self.X_gt}
+        if self.X_train is not None:
+            real["X_train"] = self.X_train
+        if self.X_ref_syn is not None:
+            real["X_ref_syn"] = self.X_ref_syn
+        return real
+
+    def matches(
+        self,
+        X_gt: DataLoader,
+        X_train: Optional[DataLoader] = None,
+        X_ref_syn: Optional[DataLoader] = None,
+    ) -> bool:
+        """Test if the context was created for these real datasets."""
+        for lhs, rhs in [
+            (self.X_gt, X_gt),
+            (self.X_train, X_train),
+            (self.X_ref_syn, X_ref_syn),
+        ]:
+            if lhs is None or rhs is None:
+                if lhs is not rhs:
+                    return False
+                continue
+            if lhs is not rhs and lhs.hash() != rhs.hash():
+                return False
+        return True
+
+    def memo(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return the memoized value of `key`, computing it with `fn` if missing."""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        value = fn()
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        return value
+
+    def array(self, X: DataLoader, dtype: Any = None) -> np.ndarray:
+        """The dense 2D matrix of a dataset, as returned by `X.numpy()`, optionally cast to `dtype`."""
+
+        def _array() -> np.ndarray:
+            arr = np.asarray(X.numpy()).reshape(len(X), -1)
+            if dtype is not None:
+                arr = arr.astype(dtype)
+            return arr
+
+        return self.memo(("array", X.hash(), str(dtype)), _array)
+
+    def neighbors(self, X: np.ndarray, metric: str = "euclidean") -> NeighborIndex:
+        """The kNN index of the rows of `X`."""
+        key = ("neighbors", array_digest(X), metric, self.knn_backend)
+        return self.memo(
+            key,
+            lambda: NeighborIndex(
+                X,
+                metric=metric,
+                backend=self.knn_backend,
+                batch_size=self.knn_batch_size,
+                n_jobs=-1,
+            ),
+        )
+
+    def kneighbors(
+        self, X: np.ndarray, Q: np.ndarray, n_neighbors: int, metric: str = "euclidean"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Memoized kNN query of the rows of `Q` against the index of `X`.
+
+        Returns:
+            The read-only distances and indices, as returned by `NeighborIndex.kneighbors`.
+        """
+
+        def _query() -> Tuple[np.ndarray, np.ndarray]:
+            dist, idx = self.neighbors(X, metric=metric).kneighbors(Q, n_neighbors)
+            dist.setflags(write=False)
+            idx.setflags(write=False)
+            return dist, idx
+
+        key = (
+            "kneighbors",
+            array_digest(X),
+            array_digest(Q),
+            n_neighbors,
+            metric,
+            self.knn_backend,
+        )
+        return self.memo(key, _query)
+
+    @staticmethod
+    def _uniques_of(X: DataLoader) -> Dict[Any, pd.Series]:
+        df = X.dataframe()
+        return {col: pd.Series(df[col].unique()) for col in df.columns}
+
+    def _encoders(self, others: list) -> Tuple[Tuple, Dict[str, Any]]:
+        if self.X_gt.type() == "images":
+            return (), {}
+
+        if self._uniques is None:
+            self._uniques = {}
+            for loader in self._real().values():
+                for col, values in self._uniques_of(loader).items():
+                    if col in self._uniques:
+                        values = pd.concat([self._uniques[col], values])
+                    self._uniques[col] = values
+
+        uniques = dict(self._uniques)
+        for loader in others:
+            for col, values in self._uniques_of(loader).items():
+                if col in uniques:
+                    values = pd.concat([uniques[col], values], ignore_index=True)
+                uniques[col] = values
+
+        signature = []
+        encoders = {}
+        for col, values in uniques.items():
+            encoder = fit_column_encoder(values)
+            if encoder is None:
+                continue
+            encoders[col] = encoder
+            classes = getattr(encoder, "classes_", None)
+            signature.append(
+                (
+                    col,
+                    type(encoder).__name__,
+                    None if classes is None else tuple(classes.tolist()),
+                )
+            )
+
+        return tuple(signature), encoders
+
+    def encode(
+        self, X_syn: DataLoader, X_augmented: Optional[DataLoader] = None
+    ) -> Tuple[
+        DataLoader,
+        DataLoader,
+        Optional[DataLoader],
+        Optional[DataLoader],
+        Optional[DataLoader],
+    ]:
+        """Encode the real and synthetic datasets with shared label encoders.
+
+        The encoders are the ones `DataLoader.encode` would fit on the concatenation of all the datasets, so each category is mapped to the same code in every dataset.
+
+        Returns:
+            The encoded X_gt, X_syn, X_train, X_ref_syn and X_augmented.
+        """
+        others = [X_syn] + ([X_augmented] if X_augmented is not None else [])
+        signature, encoders = self._encoders(others)
+
+        with self._lock:
+            cached = self._encoded
+        if cached is not None and cached[0] == signature:
+            real = cached[1]
+        else:
+            real = {
+                name: loader.encode(encoders)[0]
+                for name, loader in self._real().items()
+            }
+            with self._lock:
+                self._encoded = (signature, real)
+
+        X_syn, _ = X_syn.encode(encoders)
+        if X_augmented is not None:
+            X_augmented, _ = X_augmented.encode(encoders)
+
+        return (
+            real["X_gt"],
+            X_syn,
+            real.get("X_train"),
+            real.get("X_ref_syn"),
+            X_augmented,
+        )
+
+    def sample(self, X: DataLoader, count: int) -> DataLoader:
+        """Memoized `X.sample(count)`, for the real datasets."""
+        return self.memo(("sample", X.hash(), count), lambda: X.sample(count))
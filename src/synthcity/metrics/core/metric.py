@@ -1,8 +1,7 @@
 # stdlib
-import platform
 from abc import ABCMeta, abstractmethod
 from pathlib import Path
-from typing import Callable, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 # third party
 import numpy as np
@@ -11,10 +10,13 @@ import torch
 from pydantic import validate_arguments
 
 # synthcity absolute
+from synthcity.metrics.core.context import EvaluationContext, array_digest
+from synthcity.metrics.core.neighbors import NeighborIndex
 from synthcity.metrics.representations.OneClass import OneClassLayer
 from synthcity.plugins.core.dataloader import DataLoader
+from synthcity.utils.artifacts import MISSING, ArtifactStore, artifact_key
 from synthcity.utils.constants import DEVICE
-from synthcity.utils.serialization import dataframe_hash, load_from_file, save_to_file
+from synthcity.utils.serialization import dataframe_hash
 
 
 class MetricEvaluator(metaclass=ABCMeta):
@@ -40,7 +42,9 @@ class MetricEvaluator(metaclass=ABCMeta):
         workspace: Path
             The directory to save intermediate models or results. Default: Path("workspace").
         use_cache: bool
-            Whether to use cache. If True, it will try to load saved results in workspace directory where possible.
+            Whether to use cache. If True, it will try to load saved results in workspace directory where possible, and save the new ones. If False, the workspace cache is neither read nor written.
+        context: Optional[EvaluationContext]
+            Shared evaluation state, used to memoize the real-side work (dense matrices, nearest neighbours, OneClass embeddings) across metrics. Default: None.
     """
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -54,6 +58,7 @@ class MetricEvaluator(metaclass=ABCMeta):
         workspace: Path = Path("workspace"),
         use_cache: bool = True,
         default_metric: Optional[str] = None,
+        context: Optional[EvaluationContext] = None,
     ) -> None:
         self._reduction = reduction
         self._n_histogram_bins = n_histogram_bins
@@ -66,8 +71,10 @@ class MetricEvaluator(metaclass=ABCMeta):
         if default_metric is None:
             default_metric = reduction
         self._default_metric = default_metric
+        self._context = context
 
         workspace.mkdir(parents=True, exist_ok=True)
+        self._store: Optional[ArtifactStore] = None
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     @abstractmethod
@@ -98,6 +105,11 @@ class MetricEvaluator(metaclass=ABCMeta):
     def fqdn(cls) -> str:
         return f"{cls.type()}.{cls.name()}"
 
+    @staticmethod
+    def cost() -> float:
+        """Relative cost hint of the metric, used by the scheduler to start the slowest metrics first."""
+        return 1.0
+
     def reduction(self) -> Callable:
         if self._reduction == "mean":
             return np.mean
@@ -109,14 +121,20 @@ class MetricEvaluator(metaclass=ABCMeta):
             raise ValueError(f"Unknown reduction {self._reduction}")
 
     def _get_oneclass_model(self, X_gt: np.ndarray) -> OneClassLayer:
+        if self._context is not None:
+            return self._context.memo(
+                ("oneclass", array_digest(X_gt)),
+                lambda: self._fit_oneclass_model(X_gt),
+            )
+        return self._fit_oneclass_model(X_gt)
+
+    def _fit_oneclass_model(self, X_gt: np.ndarray) -> OneClassLayer:
         X_hash = dataframe_hash(pd.DataFrame(X_gt))
 
-        cache_file = (
-            self._workspace
-            / f"sc_metric_cache_model_oneclass_{X_hash}_{platform.python_version()}.bkp"
-        )
-        if cache_file.exists() and self._use_cache:
-            return load_from_file(cache_file)
+        cache_key = artifact_key("oneclass", X_hash, kind="model")
+        cached = self._cache_get(cache_key)
+        if cached is not MISSING:
+            return cached
 
         model = OneClassLayer(
             input_dim=X_gt.shape[1],
@@ -125,13 +143,75 @@ class MetricEvaluator(metaclass=ABCMeta):
         )
         model.fit(X_gt)
 
-        save_to_file(cache_file, model)
+        self._cache_put(cache_key, model, kind="model")
 
         return model.to(DEVICE)
 
     def _oneclass_predict(self, model: OneClassLayer, X: np.ndarray) -> np.ndarray:
         with torch.no_grad():
-            return model(torch.from_numpy(X).float().to(DEVICE)).cpu().detach().numpy()
-
-    def use_cache(self, path: Path) -> bool:
-        return path.exists() and self._use_cache
+            return (
+                model(torch.tensor(X, dtype=torch.float32).to(DEVICE))
+                .cpu()
+                .detach()
+                .numpy()
+            )
+
+    def _numpy(self, X: DataLoader) -> np.ndarray:
+        """The dense 2D matrix of a dataset. With a context, the matrix is memoized and read-only."""
+        if self._context is not None:
+            return self._context.array(X)
+        return X.numpy().reshape(len(X), -1)
+
+    def _kneighbors(
+        self, X: np.ndarray, Q: np.ndarray, n_neighbors: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Euclidean distances and indices of the `n_neighbors` nearest rows of `X` for each row of `Q`.
+
+        With a context, the index of `X` is shared by all the metrics, and the query is memoized.
+        """
+        if self._context is not None:
+            return self._context.kneighbors(X, Q, n_neighbors)
+        return NeighborIndex(X).kneighbors(Q, n_neighbors)
+
+    def _oneclass_embeddings(
+        self, X_gt: np.ndarray, X_syn: np.ndarray
+    ) -> Tuple[OneClassLayer, np.ndarray, np.ndarray]:
+        """Fit the OneClass model on `X_gt`, and embed both datasets.
+
+        With a context, the model and the embedding of the real data are memoized.
+        """
+        model = self._get_oneclass_model(X_gt)
+        if self._context is None:
+            X_gt_emb = self._oneclass_predict(model, X_gt)
+        else:
+            X_gt_emb = self._context.memo(
+                ("oneclass_embedding", array_digest(X_gt)),
+                lambda: self._oneclass_predict(model, X_gt),
+            ).copy()
+
+        return model, X_gt_emb, self._oneclass_predict(model, X_syn)
+
+    @property
+    def _artifacts(self) -> ArtifactStore:
+        # the store, and its SQLite index, are only created by the first cache access
+        if self._store is None:
+            self._store = ArtifactStore(self._workspace)
+        return self._store
+
+    def _cache_key(self, *parts: Any) -> str:
+        return artifact_key(self.fqdn(), *parts, kind="metric")
+
+    def _cache_get(self, key: str) -> Any:
+        """The cached result of `key`, or MISSING if the cache is disabled or has no such result."""
+        if not self._use_cache:
+            return MISSING
+        return self._artifacts.get(key, MISSING)
+
+    def _cache_put(self, key: str, obj: Any, kind: str = "metric") -> None:
+        if self._use_cache:
+            self._artifacts.put(key, obj, kind=kind)
+
+    def use_cache(self, key: Union[str, Path]) -> bool:
+        if isinstance(key, Path):
+            return key.exists() and self._use_cache
+        return self._use_cache and self._artifacts.exists(key)
@@ -0,0 +1,103 @@
+# stdlib
+from typing import Optional, Tuple
+
+# third party
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+
+try:
+    # third party
+    import pynndescent
+except ImportError:
+    pynndescent = None
+
+SUPPORTED_BACKENDS = ["exact", "approximate"]
+
+
+class NeighborIndex:
+    """k-nearest neighbours index over the rows of a matrix, shared by the metrics through the EvaluationContext.
+
+    The index does not depend on the number of neighbours, so a single index per (matrix, metric) serves every query. The queries are run in batches of rows, which bounds the peak memory of the distance computations.
+
+    Args:
+        X: np.ndarray
+            The indexed rows.
+        metric: str
+            The distance metric. Default: "euclidean".
+        backend: str
+            "exact" for the sklearn NearestNeighbors (ball tree, kd tree or brute force, picked by `algorithm`), or "approximate" for a pynndescent graph, which must be installed. Default: "exact".
+        algorithm: str
+            The algorithm of the exact backend. Default: "auto".
+        batch_size: int
+            Number of query rows per batch. Default: 4096.
+        n_jobs: Optional[int]
+            Number of threads for the queries. Default: None, a single thread.
+        random_state: int
+            Seed of the approximate backend. Default: 0.
+    """
+
+    def __init__(
+        self,
+        X: np.ndarray,
+        metric: str = "euclidean",
+        backend: str = "exact",
+        algorithm: str = "auto",
+        batch_size: int = 4096,
+        n_jobs: Optional[int] = None,
+        random_state: int = 0,
+    ) -> None:
+        if backend not in SUPPORTED_BACKENDS:
+            raise ValueError(
+                f"Invalid backend {backend}. Supported: {SUPPORTED_BACKENDS}"
+            )
+        if batch_size <= 0:
+            raise ValueError(f"Invalid batch_size {batch_size}")
+        if len(X) == 0:
+            raise ValueError("Cannot index an empty matrix")
+
+        self.metric = metric
+        self.backend = backend
+        self.batch_size = batch_size
+        self.n_samples = len(X)
+
+        if backend == "approximate":
+            if pynndescent is None:
+                raise RuntimeError(
+                    "The approximate kNN backend requires pynndescent: pip install pynndescent"
+                )
+            self._index = pynndescent.NNDescent(
+                X, metric=metric, random_state=random_state, n_jobs=n_jobs
+            )
+            self._index.prepare()
+        else:
+            self._index = NearestNeighbors(
+                metric=metric, algorithm=algorithm, n_jobs=n_jobs
+            ).fit(X)
+
+    def kneighbors(
+        self, Q: np.ndarray, n_neighbors: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """The `n_neighbors` nearest indexed rows of each row of `Q`, closest first.
+
+        Querying the indexed matrix itself returns each row as its own first neighbour.
+
+        Returns:
+            The distances and the indices, both of shape (len(Q), n_neighbors).
+        """
+        if n_neighbors <= 0 or n_neighbors > self.n_samples:
+            raise ValueError(
+                f"Invalid n_neighbors {n_neighbors} for {self.n_samples} indexed rows"
+            )
+
+        dist = np.empty((len(Q), n_neighbors), dtype=np.float64)
+        idx = np.empty((len(Q), n_neighbors), dtype=np.int64)
+        for start in range(0, len(Q), self.batch_size):
+            batch = Q[start : start + self.batch_size]
+            if self.backend == "approximate":
+                batch_idx, batch_dist = self._index.query(batch, k=n_neighbors)
+            else:
+                batch_dist, batch_idx = self._index.kneighbors(batch, n_neighbors)
+            dist[start : start + len(batch)] = batch_dist
+            idx[start : start + len(batch)] = batch_idx
+
+        return dist, idx
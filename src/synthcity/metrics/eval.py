@@ -14,6 +14,7 @@ from synthcity.plugins.core.dataloader import (
 )
 
 # synthcity relative
+from .core import EvaluationContext
 from .eval_detection import (
     SyntheticDetectionGMM,
     SyntheticDetectionLinear,
@@ -120,6 +121,10 @@ class Metrics:
         workspace: Path = Path("workspace"),
         use_cache: bool = True,
         n_folds: int = 5,
+        n_jobs: int = 1,
+        backend: str = "sequential",
+        timeout: Optional[float] = None,
+        context: Optional[EvaluationContext] = None,
     ) -> pd.DataFrame:
         """Core evaluation logic for the metrics
 
@@ -155,6 +160,16 @@ class Metrics:
             The folder for caching intermediary results.
         use_cache: bool
             If the a metric has been previously run and is cached, it will be reused for the experiments. Defaults to True.
+        n_folds: int
+            The number of folds used by the metrics with cross validation. Defaults to 5.
+        n_jobs: int
+            The number of metrics evaluated in parallel. -1 uses all the available devices/cores. Defaults to 1.
+        backend: str
+            The scheduler backend: "sequential", "thread" or "process". Defaults to "sequential".
+        timeout: Optional[float]
+            Per-metric timeout in seconds. Metrics exceeding it are reported as failed. Defaults to None.
+        context: Optional[EvaluationContext]
+            Shared state for evaluating several synthetic datasets against the same real data: the encoding and the real-side computations are reused across calls. It must be created for the same X_gt, X_train and X_ref_syn. Defaults to None, a new context per call.
         """
         workspace.mkdir(parents=True, exist_ok=True)
 
@@ -203,32 +218,25 @@ class Metrics:
 
         """
         We need to encode the categorical data in the real and synthetic data.
-        To ensure each category in the two datasets are mapped to the same one hot vector, we merge all avalable datasets for computing the encoder.
+        To ensure each category in the two datasets are mapped to the same one hot vector, the encoders are computed on all the available datasets.
         """
-        all_df = pd.concat([X_gt.dataframe(), X_syn.dataframe()])
-        if X_train:
-            all_df = pd.concat([all_df, X_train.dataframe()])
-        if X_ref_syn:
-            all_df = pd.concat([all_df, X_ref_syn.dataframe()])
-        if X_augmented:
-            all_df = pd.concat([all_df, X_augmented.dataframe()])
-        X_enc = create_from_info(all_df, X_gt.info())
-        _, encoders = X_enc.encode()
-
-        # now we encode the data
-        X_gt, _ = X_gt.encode(encoders)
-        X_syn, _ = X_syn.encode(encoders)
+        if context is None:
+            context = EvaluationContext(X_gt, X_train=X_train, X_ref_syn=X_ref_syn)
+        elif not context.matches(X_gt, X_train=X_train, X_ref_syn=X_ref_syn):
+            raise ValueError(
+                "The evaluation context was created for different real datasets"
+            )
 
-        if X_train:
-            X_train, _ = X_train.encode(encoders)
-        if X_ref_syn:
-            X_ref_syn, _ = X_ref_syn.encode(encoders)
-        if X_augmented:
-            X_augmented, _ = X_augmented.encode(encoders)
+        X_gt, X_syn, X_train, X_ref_syn, X_augmented = context.encode(
+            X_syn, X_augmented
+        )
 
-        scores = ScoreEvaluator()
+        scores = ScoreEvaluator(n_jobs=n_jobs, backend=backend, timeout=timeout)
 
+        # the subsamples are shared by all the metrics, so the scheduler can send them once per worker
         eval_cnt = min(len(X_gt), len(X_syn))
+        X_gt_eval = context.sample(X_gt, eval_cnt)
+        X_syn_eval = X_syn.sample(eval_cnt)
         for metric in standard_metrics:
             if metric.type() not in metrics:
                 continue
@@ -244,6 +252,7 @@ class Metrics:
                         workspace=workspace,
                         use_cache=use_cache,
                         n_folds=n_folds,
+                        context=context,
                     ),
                     X_gt,
                     X_augmented,
@@ -258,6 +267,7 @@ class Metrics:
                         workspace=workspace,
                         use_cache=use_cache,
                         n_folds=n_folds,
+                        context=context,
                     ),
                     X_gt,
                     X_syn,
@@ -275,9 +285,10 @@ class Metrics:
                         workspace=workspace,
                         use_cache=use_cache,
                         n_folds=n_folds,
+                        context=context,
                     ),
-                    X_gt.sample(eval_cnt),
-                    X_syn.sample(eval_cnt),
+                    X_gt_eval,
+                    X_syn_eval,
                 )
 
         scores.compute()
@@ -1,5 +1,4 @@
 # stdlib
-import platform
 from typing import Any, Dict
 
 # third party
@@ -13,7 +12,7 @@ from xgboost import XGBClassifier, XGBRegressor
 from synthcity.metrics.core import MetricEvaluator
 from synthcity.plugins.core.dataloader import DataLoader
 from synthcity.plugins.core.models.mlp import MLP
-from synthcity.utils.serialization import load_from_file, save_to_file
+from synthcity.utils.artifacts import MISSING
 
 
 class AttackEvaluator(MetricEvaluator):
@@ -46,12 +45,10 @@ class AttackEvaluator(MetricEvaluator):
         X_gt: DataLoader,
         X_syn: DataLoader,
     ) -> Dict:
-        cache_file = (
-            self._workspace
-            / f"sc_metric_cache_{self.type()}_{self.name()}_{X_gt.hash()}_{X_syn.hash()}_{self._reduction}_{platform.python_version()}.bkp"
-        )
-        if self.use_cache(cache_file):
-            return load_from_file(cache_file)
+        cache_key = self._cache_key(X_gt.hash(), X_syn.hash(), self._reduction)
+        cached = self._cache_get(cache_key)
+        if cached is not MISSING:
+            return cached
 
         if len(X_gt.sensitive_features) == 0:
             return {}
@@ -95,7 +92,7 @@ class AttackEvaluator(MetricEvaluator):
 
         results = {self._reduction: self.reduction()(output)}
 
-        save_to_file(cache_file, results)
+        self._cache_put(cache_key, results)
 
         return results
 
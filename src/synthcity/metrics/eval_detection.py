@@ -1,5 +1,4 @@
 # stdlib
-import platform
 from typing import Any, Dict
 
 # third party
@@ -19,8 +18,8 @@ from synthcity.plugins.core.dataloader import DataLoader
 from synthcity.plugins.core.dataset import NumpyDataset
 from synthcity.plugins.core.models.convnet import suggest_image_classifier_arch
 from synthcity.plugins.core.models.mlp import MLP
+from synthcity.utils.artifacts import MISSING
 from synthcity.utils.reproducibility import clear_cache
-from synthcity.utils.serialization import load_from_file, save_to_file
 
 
 class DetectionEvaluator(MetricEvaluator):
@@ -69,18 +68,15 @@ class DetectionEvaluator(MetricEvaluator):
         X_syn: DataLoader,
         **model_args: Any,
     ) -> Dict:
-        cache_file = (
-            self._workspace
-            / f"sc_metric_cache_{self.type()}_{self.name()}_{X_gt.hash()}_{X_syn.hash()}_{self._reduction}_{platform.python_version()}.bkp"
-        )
-        if self.use_cache(cache_file):
-            results = load_from_file(cache_file)
+        cache_key = self._cache_key(X_gt.hash(), X_syn.hash(), self._reduction)
+        results = self._cache_get(cache_key)
+        if results is not MISSING:
             log.info(
                 f" Synthetic-real data discrimination using {self.name()}. AUCROC : {results}"
             )
             return results
 
-        arr_gt = X_gt.numpy().reshape(len(X_gt), -1)
+        arr_gt = self._numpy(X_gt)
         labels_gt = np.asarray([0] * len(X_gt))
 
         arr_syn = X_syn.numpy().reshape(len(X_syn), -1)
@@ -114,7 +110,7 @@ class DetectionEvaluator(MetricEvaluator):
             f" Synthetic-real data discrimination using {self.name()}. AUCROC : {results}"
         )
 
-        save_to_file(cache_file, results)
+        self._cache_put(cache_key, results)
 
         return results
 
@@ -149,6 +145,10 @@ class SyntheticDetectionXGB(DetectionEvaluator):
     def name() -> str:
         return "detection_xgb"
 
+    @staticmethod
+    def cost() -> float:
+        return 20.0
+
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def evaluate(self, X_gt: DataLoader, X_syn: DataLoader) -> Dict:
         # TODO: investigate why XGBoost always has high AUCROC for the detection
@@ -187,16 +187,17 @@ class SyntheticDetectionMLP(DetectionEvaluator):
     def name() -> str:
         return "detection_mlp"
 
+    @staticmethod
+    def cost() -> float:
+        return 50.0
+
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def _evaluate_image_detection(self, X_gt: DataLoader, X_syn: DataLoader) -> Dict:
         clear_cache()
 
-        cache_file = (
-            self._workspace
-            / f"sc_metric_cache_{self.type()}_{self.name()}_{X_gt.hash()}_{X_syn.hash()}_{self._reduction}_{platform.python_version()}.bkp"
-        )
-        if self.use_cache(cache_file):
-            results = load_from_file(cache_file)
+        cache_key = self._cache_key(X_gt.hash(), X_syn.hash(), self._reduction)
+        results = self._cache_get(cache_key)
+        if results is not MISSING:
             log.info(
                 f" Synthetic-real data discrimination using {self.name()}. AUCROC : {results}"
             )
@@ -239,7 +240,7 @@ class SyntheticDetectionMLP(DetectionEvaluator):
             f" Synthetic-real data discrimination using {self.name()}. AUCROC : {results}"
         )
 
-        save_to_file(cache_file, results)
+        self._cache_put(cache_key, results)
         return results
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
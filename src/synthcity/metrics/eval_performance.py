@@ -1,7 +1,7 @@
 # stdlib
 import copy
-import platform
-from typing import Any, Dict, List, Tuple
+import multiprocessing
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # third party
 import numpy as np
@@ -42,7 +42,130 @@ from synthcity.plugins.core.models.time_series_survival.ts_surv_xgb import (
     XGBTimeSeriesSurvival,
 )
 from synthcity.plugins.core.models.ts_model import TimeSeriesModel
-from synthcity.utils.serialization import load_from_file, save_to_file
+from synthcity.utils.artifacts import MISSING
+from synthcity.utils.parallel import process_pool, resolve_n_jobs
+
+
+def _rng_state() -> Tuple:
+    state: Tuple = (np.random.get_state(), torch.random.get_rng_state())
+    if torch.cuda.is_available():
+        state += (torch.cuda.get_rng_state_all(),)
+    return state
+
+
+def _set_rng_state(state: Tuple) -> None:
+    np.random.set_state(state[0])
+    torch.random.set_rng_state(state[1])
+    if len(state) > 2:
+        torch.cuda.set_rng_state_all(state[2])
+
+
+def _fit_classifier(
+    model: Any, model_args: Dict, X_train: np.ndarray, y_train: np.ndarray
+) -> Optional[Tuple[Any, LabelEncoder, Tuple]]:
+    """Train a classifier on the encoded labels. None if the training fails.
+
+    The random state after the training is kept with the model: the predictions of some models are stochastic (e.g. the MLP dropout), and each scoring restores it, so a model scored on several test sets predicts as if it was just trained.
+    """
+    # the labels kept in the test sets are the labels of the training set
+    encoder = LabelEncoder().fit(list(y_train))
+    enc_y_train = encoder.transform(y_train)
+
+    model_args = dict(model_args)
+    if "n_units_out" in model_args:
+        model_args["n_units_out"] = len(np.unique(y_train))
+    try:
+        estimator = model(**model_args).fit(X_train, enc_y_train)
+    except BaseException as e:
+        log.error(f"classifier evaluation failed {e}.")
+        return None
+
+    return estimator, encoder, _rng_state()
+
+
+def _score_classifier(
+    trained: Optional[Tuple[Any, LabelEncoder, Tuple]],
+    y_train: np.ndarray,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+) -> float:
+    """AUCROC of a classifier trained by `_fit_classifier`, on the test samples with a label seen in training."""
+    X_test_df = pd.DataFrame(X_test)
+    y_test_df = pd.Series(y_test, index=X_test_df.index)
+    for v in np.unique(list(y_train) + list(y_test)):
+        if v not in list(y_train):
+            X_test_df = X_test_df[y_test_df != v]
+            y_test_df = y_test_df[y_test_df != v]
+
+    X_test = np.asarray(X_test_df)
+    y_test = np.asarray(y_test_df)
+
+    if len(y_test) == 0 or trained is None:
+        return 0
+
+    estimator, encoder, state = trained
+    _set_rng_state(state)
+    try:
+        enc_y_test = encoder.transform(y_test)
+        y_pred = estimator.predict_proba(X_test)
+        score, _ = evaluate_auc(enc_y_test, y_pred)
+    except BaseException as e:
+        log.error(f"classifier evaluation failed {e}.")
+        score = 0
+
+    return score
+
+
+def _fit_regressor(
+    model: Any, model_args: Dict, X_train: np.ndarray, y_train: np.ndarray
+) -> Optional[Tuple[Any, Tuple]]:
+    """Train a regressor. None if the training fails. See `_fit_classifier` for the random state."""
+    try:
+        estimator = model(**model_args).fit(np.asarray(X_train), np.asarray(y_train))
+    except BaseException as e:
+        log.error(f"regression evaluation failed {e}")
+        return None
+
+    return estimator, _rng_state()
+
+
+def _score_regressor(
+    trained: Optional[Tuple[Any, Tuple]], X_test: np.ndarray, y_test: np.ndarray
+) -> float:
+    """R2 score of a regressor trained by `_fit_regressor`."""
+    if trained is None:
+        return -1
+
+    estimator, state = trained
+    _set_rng_state(state)
+    try:
+        y_pred = estimator.predict(np.asarray(X_test))
+        score = r2_score(np.asarray(y_test), y_pred)
+    except BaseException as e:
+        log.error(f"regression evaluation failed {e}")
+        score = -1
+
+    return score
+
+
+def _standard_fold_job(
+    task_type: str,
+    model: Any,
+    model_args: Dict,
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+) -> float:
+    if task_type == "classification":
+        if len(y_test) == 0:
+            return 0
+        trained = _fit_classifier(model, model_args, X_train, y_train)
+        return _score_classifier(trained, y_train, X_test, y_test)
+
+    return _score_regressor(
+        _fit_regressor(model, model_args, X_train, y_train), X_test, y_test
+    )
 
 
 class PerformanceEvaluator(MetricEvaluator):
@@ -53,10 +176,29 @@ class PerformanceEvaluator(MetricEvaluator):
     Evaluating synthetic data based on downstream performance.
 
     This implements the train-on-synthetic test-on-real methodology for evaluation.
+
+    The model trained on the synthetic data is trained once, and scored on every real test set.
+
+    Args:
+        n_jobs: int
+            Number of processes training the models of the real data folds, with their threads bounded to share the CPUs. -1 uses all the CPUs. Default: 1.
     """
 
-    def __init__(self, **kwargs: Any) -> None:
+    def __init__(self, n_jobs: int = 1, **kwargs: Any) -> None:
         super().__init__(**kwargs)
+        self._n_jobs = resolve_n_jobs(n_jobs)
+
+    def _map_folds(self, fn: Callable, *iterables: Any) -> List:
+        """Map `fn` over the folds, in parallel if `n_jobs` > 1."""
+        jobs = list(zip(*iterables))
+        n_jobs = min(self._n_jobs, len(jobs))
+        if n_jobs <= 1:
+            return [fn(*job) for job in jobs]
+
+        # bound the threads of the models trained in parallel
+        n_threads = max(1, multiprocessing.cpu_count() // n_jobs)
+        with process_pool(n_jobs, n_threads=n_threads) as executor:
+            return list(executor.map(fn, *zip(*jobs)))
 
     @staticmethod
     def type() -> str:
@@ -86,36 +228,9 @@ class PerformanceEvaluator(MetricEvaluator):
             1 means perfect predictions.
             0 means only incorrect predictions.
         """
-        labels = list(y_train) + list(y_test)
-
-        X_test_df = pd.DataFrame(X_test)
-        y_test_df = pd.Series(y_test, index=X_test_df.index)
-        for v in np.unique(labels):
-            if v not in list(y_train):
-                X_test_df = X_test_df[y_test_df != v]
-                y_test_df = y_test_df[y_test_df != v]
-
-        X_test = np.asarray(X_test_df)
-        y_test = np.asarray(y_test_df)
-        labels = list(y_train) + list(y_test)
-
-        if len(y_test) == 0:
-            return 0
-
-        encoder = LabelEncoder().fit(labels)
-        enc_y_train = encoder.transform(y_train)
-        if "n_units_out" in model_args:
-            model_args["n_units_out"] = len(np.unique(y_train))
-        try:
-            enc_y_test = encoder.transform(y_test)
-            estimator = model(**model_args).fit(X_train, enc_y_train)
-            y_pred = estimator.predict_proba(X_test)
-            score, _ = evaluate_auc(enc_y_test, y_pred)
-        except BaseException as e:
-            log.error(f"classifier evaluation failed {e}.")
-            score = 0
-
-        return score
+        return _standard_fold_job(
+            "classification", model, model_args, X_train, y_train, X_test, y_test
+        )
 
     def _evaluate_performance_regression(
         self,
@@ -133,22 +248,9 @@ class PerformanceEvaluator(MetricEvaluator):
             0 means perfect predictions.
             The lower the negative value, the bigger the error in the predictions.
         """
-
-        X_train = np.asarray(X_train)
-        X_test = np.asarray(X_test)
-        y_train = np.asarray(y_train)
-        y_test = np.asarray(y_test)
-
-        try:
-            estimator = model(**model_args).fit(X_train, y_train)
-            y_pred = estimator.predict(X_test)
-
-            score = r2_score(y_test, y_pred)
-        except BaseException as e:
-            log.error(f"regression evaluation failed {e}")
-            score = -1
-
-        return score
+        return _standard_fold_job(
+            "regression", model, model_args, X_train, y_train, X_test, y_test
+        )
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def _evaluate_standard_performance(
@@ -166,52 +268,67 @@ class PerformanceEvaluator(MetricEvaluator):
         if X_gt.type() == "images":
             raise ValueError("Standard evaluation not supported for images")
 
-        cache_file = (
-            self._workspace
-            / f"sc_metric_cache_{self.type()}_{self.name()}_{X_gt.hash()}_{X_syn.hash()}_{self._reduction}_{platform.python_version()}_{platform.python_version()}.bkp"
-        )
-        if self.use_cache(cache_file):
-            return load_from_file(cache_file)
+        cache_key = self._cache_key(X_gt.hash(), X_syn.hash(), self._reduction)
+        cached = self._cache_get(cache_key)
+        if cached is not MISSING:
+            return cached
 
         id_X_gt, id_y_gt = X_gt.train().unpack()
         ood_X_gt, ood_y_gt = X_gt.test().unpack()
         iter_X_syn, iter_y_syn = X_syn.unpack()
 
         if self._task_type == "classification":
-            eval_cbk = self._evaluate_performance_classification
             skf = StratifiedKFold(
                 n_splits=self._n_folds, shuffle=True, random_state=self._random_state
             )
         elif self._task_type == "regression":
-            eval_cbk = self._evaluate_performance_regression
             skf = KFold(
                 n_splits=self._n_folds, shuffle=True, random_state=self._random_state
             )
 
-        real_scores = []
+        folds = []
+        for train_idx, test_idx in skf.split(id_X_gt, id_y_gt):
+            folds.append(
+                (
+                    np.asarray(id_X_gt.loc[train_idx]),
+                    np.asarray(id_y_gt.loc[train_idx]),
+                    np.asarray(id_X_gt.loc[test_idx]),
+                    np.asarray(id_y_gt.loc[test_idx]),
+                )
+            )
+        keys = self.standard_performance_output_keys()
+
+        # the synthetic data model is the same for every fold: trained once, scored on each test set
+        syn_model: Optional[Tuple]
+        if self._task_type == "classification":
+            syn_model = _fit_classifier(model, model_args, iter_X_syn, iter_y_syn)
+
+            def syn_score(X_test: Any, y_test: Any) -> float:
+                return _score_classifier(syn_model, iter_y_syn, X_test, y_test)
+
+        else:
+            syn_model = _fit_regressor(model, model_args, iter_X_syn, iter_y_syn)
+
+            def syn_score(X_test: Any, y_test: Any) -> float:
+                return _score_regressor(syn_model, X_test, y_test)
+
         syn_scores_id = []
+        if "syn_id" in keys:
+            syn_scores_id = [syn_score(fold[2], fold[3]) for fold in folds]
         syn_scores_ood = []
+        if "syn_ood" in keys or "aug_ood" in keys:
+            syn_scores_ood = [syn_score(ood_X_gt, ood_y_gt)] * len(folds)
 
-        for train_idx, test_idx in skf.split(id_X_gt, id_y_gt):
-            train_data = np.asarray(id_X_gt.loc[train_idx])
-            test_data = np.asarray(id_X_gt.loc[test_idx])
-            train_labels = np.asarray(id_y_gt.loc[train_idx])
-            test_labels = np.asarray(id_y_gt.loc[test_idx])
-
-            real_score = eval_cbk(
-                model, model_args, train_data, train_labels, test_data, test_labels
-            )
-            synth_score_id = eval_cbk(
-                model, model_args, iter_X_syn, iter_y_syn, test_data, test_labels
-            )
-            synth_score_ood = eval_cbk(
-                model, model_args, iter_X_syn, iter_y_syn, ood_X_gt, ood_y_gt
+        real_scores = []
+        if "gt" in keys:
+            real_scores = self._map_folds(
+                _standard_fold_job,
+                [self._task_type] * len(folds),
+                [model] * len(folds),
+                [model_args] * len(folds),
+                *zip(*folds),
             )
 
-            real_scores.append(real_score)
-            syn_scores_id.append(synth_score_id)
-            syn_scores_ood.append(synth_score_ood)
-
         results = {}
         for key in self.standard_performance_output_keys():
             if key == "gt":
@@ -223,7 +340,7 @@ class PerformanceEvaluator(MetricEvaluator):
             elif key == "aug_ood":
                 results.update({key: float(self.reduction()(syn_scores_ood))})
 
-        save_to_file(cache_file, results)
+        self._cache_put(cache_key, results)
 
         return results
 
@@ -248,12 +365,10 @@ class PerformanceEvaluator(MetricEvaluator):
                 f"Invalid data types. gt = {X_gt.type()} syn = {X_syn.type()}"
             )
 
-        cache_file = (
-            self._workspace
-            / f"sc_metric_cache_{self.type()}_{self.name()}_{X_gt.hash()}_{X_syn.hash()}_{self._reduction}_{platform.python_version()}_{platform.python_version()}.bkp"
-        )
-        if self.use_cache(cache_file):
-            return load_from_file(cache_file)
+        cache_key = self._cache_key(X_gt.hash(), X_syn.hash(), self._reduction)
+        cached = self._cache_get(cache_key)
+        if cached is not MISSING:
+            return cached
 
         info = X_gt.info()
         time_horizons = info["time_horizons"]
@@ -333,7 +448,7 @@ class PerformanceEvaluator(MetricEvaluator):
             "syn_ood.brier_score": float(score_syn_ood["brier_score"][0]),
         }
 
-        save_to_file(cache_file, results)
+        self._cache_put(cache_key, results)
 
         return results
 
@@ -358,12 +473,10 @@ class PerformanceEvaluator(MetricEvaluator):
                 f"Invalid data type gt = {X_gt.type()} syn = {X_syn.type()}"
             )
 
-        cache_file = (
-            self._workspace
-            / f"sc_metric_cache_{self.type()}_{self.name()}_{X_gt.hash()}_{X_syn.hash()}_{self._reduction}_{platform.python_version()}_{platform.python_version()}.bkp"
-        )
-        if self.use_cache(cache_file):
-            return load_from_file(cache_file)
+        cache_key = self._cache_key(X_gt.hash(), X_syn.hash(), self._reduction)
+        cached = self._cache_get(cache_key)
+        if cached is not MISSING:
+            return cached
 
         (
             id_static_gt,
@@ -389,20 +502,35 @@ class PerformanceEvaluator(MetricEvaluator):
         syn_scores_id = []
         syn_scores_ood = []
 
-        def ts_eval_cbk(
+        def ts_fit(
             static_train: np.ndarray,
             temporal_train: np.ndarray,
             observation_times_train: np.ndarray,
             outcome_train: np.ndarray,
+        ) -> Optional[Tuple[Any, Tuple]]:
+            try:
+                estimator = model(**model_args).fit(
+                    static_train, temporal_train, observation_times_train, outcome_train
+                )
+            except BaseException as e:
+                log.error(f"regression evaluation failed {e}")
+                return None
+
+            return estimator, _rng_state()
+
+        def ts_score(
+            trained: Optional[Tuple[Any, Tuple]],
             static_test: np.ndarray,
             temporal_test: np.ndarray,
             observation_times_test: np.ndarray,
             outcome_test: np.ndarray,
         ) -> float:
+            if trained is None:
+                return -1
+
+            estimator, state = trained
+            _set_rng_state(state)
             try:
-                estimator = model(**model_args).fit(
-                    static_train, temporal_train, observation_times_train, outcome_train
-                )
                 preds = estimator.predict(
                     static_test, temporal_test, observation_times_test
                 )
@@ -414,48 +542,32 @@ class PerformanceEvaluator(MetricEvaluator):
 
             return score
 
+        # the synthetic data model is the same for every fold: trained once, scored on each test set
+        syn_model = ts_fit(static_syn, temporal_syn, observation_times_syn, outcome_syn)
+        synth_score_ood = ts_score(
+            syn_model,
+            ood_static_gt,
+            ood_temporal_gt,
+            ood_observation_times_gt,
+            ood_outcome_gt,
+        )
+
         for train_idx, test_idx in skf.split(id_static_gt):
-            static_train_data = id_static_gt[train_idx]
-            temporal_train_data = id_temporal_gt[train_idx]
-            observation_times_train_data = id_observation_times_gt[train_idx]
-            outcome_train_data = id_outcome_gt[train_idx]
-            static_test_data = id_static_gt[test_idx]
-            temporal_test_data = id_temporal_gt[test_idx]
-            observation_times_test_data = id_observation_times_gt[test_idx]
-            outcome_test_data = id_outcome_gt[test_idx]
-            real_score = ts_eval_cbk(
-                static_train_data,
-                temporal_train_data,
-                observation_times_train_data,
-                outcome_train_data,
-                static_test_data,
-                temporal_test_data,
-                observation_times_test_data,
-                outcome_test_data,
+            test_data = (
+                id_static_gt[test_idx],
+                id_temporal_gt[test_idx],
+                id_observation_times_gt[test_idx],
+                id_outcome_gt[test_idx],
             )
-            synth_score_id = ts_eval_cbk(
-                static_syn,
-                temporal_syn,
-                observation_times_syn,
-                outcome_syn,
-                static_test_data,
-                temporal_test_data,
-                observation_times_test_data,
-                outcome_test_data,
-            )
-            synth_score_ood = ts_eval_cbk(
-                static_syn,
-                temporal_syn,
-                observation_times_syn,
-                outcome_syn,
-                ood_static_gt,
-                ood_temporal_gt,
-                ood_observation_times_gt,
-                ood_outcome_gt,
+            real_model = ts_fit(
+                id_static_gt[train_idx],
+                id_temporal_gt[train_idx],
+                id_observation_times_gt[train_idx],
+                id_outcome_gt[train_idx],
             )
 
-            real_scores.append(real_score)
-            syn_scores_id.append(synth_score_id)
+            real_scores.append(ts_score(real_model, *test_data))
+            syn_scores_id.append(ts_score(syn_model, *test_data))
             syn_scores_ood.append(synth_score_ood)
 
         results = {
@@ -464,7 +576,7 @@ class PerformanceEvaluator(MetricEvaluator):
             "syn_ood": float(self.reduction()(syn_scores_ood)),
         }
 
-        save_to_file(cache_file, results)
+        self._cache_put(cache_key, results)
 
         return results
 
@@ -489,12 +601,10 @@ class PerformanceEvaluator(MetricEvaluator):
                 f"Invalid data type gt = {X_gt.type()} syn = {X_syn.type()}"
             )
 
-        cache_file = (
-            self._workspace
-            / f"sc_metric_cache_{self.type()}_{self.name()}_{X_gt.hash()}_{X_syn.hash()}_{self._reduction}_{platform.python_version()}_{platform.python_version()}.bkp"
-        )
-        if self.use_cache(cache_file):
-            return load_from_file(cache_file)
+        cache_key = self._cache_key(X_gt.hash(), X_syn.hash(), self._reduction)
+        cached = self._cache_get(cache_key)
+        if cached is not MISSING:
+            return cached
 
         info = X_gt.info()
         time_horizons = info["time_horizons"]
@@ -609,7 +719,7 @@ class PerformanceEvaluator(MetricEvaluator):
             "syn_ood.c_index": float(score_syn_ood["c_index"][0]),
             "syn_ood.brier_score": float(score_syn_ood["brier_score"][0]),
         }
-        save_to_file(cache_file, results)
+        self._cache_put(cache_key, results)
 
         return results
 
@@ -650,6 +760,10 @@ class PerformanceEvaluatorXGB(PerformanceEvaluator):
     def name() -> str:
         return "xgb"
 
+    @staticmethod
+    def cost() -> float:
+        return 20.0
+
     @staticmethod
     def standard_performance_output_keys() -> List:
         return ["gt", "syn_id", "syn_ood"]
@@ -783,6 +897,10 @@ class PerformanceEvaluatorMLP(PerformanceEvaluator):
     def name() -> str:
         return "mlp"
 
+    @staticmethod
+    def cost() -> float:
+        return 50.0
+
     @staticmethod
     def standard_performance_output_keys() -> List:
         return ["gt", "syn_id", "syn_ood"]
@@ -817,12 +935,10 @@ class PerformanceEvaluatorMLP(PerformanceEvaluator):
         X_gt: DataLoader,
         X_syn: DataLoader,
     ) -> Dict:
-        cache_file = (
-            self._workspace
-            / f"sc_metric_cache_{self.type()}_{self.name()}_{X_gt.hash()}_{X_syn.hash()}_{self._reduction}_{platform.python_version()}_{platform.python_version()}.bkp"
-        )
-        if self.use_cache(cache_file):
-            return load_from_file(cache_file)
+        cache_key = self._cache_key(X_gt.hash(), X_syn.hash(), self._reduction)
+        cached = self._cache_get(cache_key)
+        if cached is not MISSING:
+            return cached
 
         id_gt = X_gt.train().unpack()
         id_X_gt, id_y_gt = id_gt.numpy()
@@ -869,7 +985,7 @@ class PerformanceEvaluatorMLP(PerformanceEvaluator):
             "syn_ood": float(self.reduction()(syn_scores_ood)),
         }
 
-        save_to_file(cache_file, results)
+        self._cache_put(cache_key, results)
 
         return results
 
@@ -1012,12 +1128,9 @@ class FeatureImportanceRankDistance(MetricEvaluator):
         X_gt: DataLoader,
         X_syn: DataLoader,
     ) -> Dict:
-        cache_file = (
-            self._workspace
-            / f"sc_metric_cache_{self.type()}_{self.name()}_{X_gt.hash()}_{X_syn.hash()}_{platform.python_version()}.bkp"
-        )
-        if self.use_cache(cache_file):
-            results = load_from_file(cache_file)
+        cache_key = self._cache_key(X_gt.hash(), X_syn.hash())
+        results = self._cache_get(cache_key)
+        if results is not MISSING:
             log.info(
                 f" Feature Importance rank distance df hash = {X_gt.train().hash()} ood hash = {X_gt.test().hash()}. score = {results}"
             )
@@ -1139,7 +1252,7 @@ class FeatureImportanceRankDistance(MetricEvaluator):
         else:
             raise RuntimeError(f"Unuspported task type {self._task_type}")
 
-        save_to_file(cache_file, results)
+        self._cache_put(cache_key, results)
 
         log.info(
             f" Feature Importance rank distance df hash = {X_gt.train().hash()} ood hash = {X_gt.test().hash()}. score = {results}"
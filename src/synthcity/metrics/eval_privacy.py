@@ -1,8 +1,6 @@
 # stdlib
-import platform
 from abc import abstractmethod
-from collections import Counter
-from typing import Any, Dict, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 # third party
 import numpy as np
@@ -11,28 +9,144 @@ import torch
 from pydantic import validate_arguments
 from scipy import stats
 from scipy.stats import entropy
-from sklearn.cluster import KMeans
-from sklearn.neighbors import NearestNeighbors
+from sklearn.cluster import KMeans, MiniBatchKMeans
 
 # synthcity absolute
 import synthcity.logger as log
 from synthcity.metrics import _utils
 from synthcity.plugins.core.dataloader import DataLoader
+from synthcity.utils.artifacts import MISSING
 from synthcity.utils.constants import DEVICE
-from synthcity.utils.serialization import load_from_file, save_to_file
 
 # synthcity relative
 from .core import MetricEvaluator
 
+SUPPORTED_GROUPINGS = ["kmeans", "minibatch", "exact"]
+
+# the cluster counts of the KMeans groupings
+N_CLUSTERS = [2, 5, 10, 15]
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    # the numeric columns are hashed as floats, so equal values get equal hashes across datasets
+    df = df.astype(
+        {col: float for col in df.columns if pd.api.types.is_numeric_dtype(df[col])}
+    )
+    return pd.util.hash_pandas_object(df, index=False).values
+
+
+def _distinct_per_group(
+    groups: np.ndarray, values: np.ndarray, n_groups: int
+) -> np.ndarray:
+    # the number of distinct values in each group
+    _, values = np.unique(values, return_inverse=True)
+    pairs = np.unique(groups.astype(np.int64) * (values.max() + 1) + values.reshape(-1))
+    return np.bincount(pairs // (values.max() + 1), minlength=n_groups)
+
 
 class PrivacyEvaluator(MetricEvaluator):
     """
     .. inheritance-diagram:: synthcity.metrics.eval_privacy.PrivacyEvaluator
         :parts: 1
+
+    The k-anonymity, l-diversity, k-map and delta-presence metrics group the records on their quasi-identifiers, the non-sensitive features. The grouping is:
+        - "kmeans": KMeans clusterings with 2, 5, 10 and 15 clusters.
+        - "minibatch": the same clusterings, approximated with MiniBatchKMeans, for large datasets.
+        - "exact": the equivalence classes of the quasi-identifier tuples, found by hashing the rows in a single pass.
+
+    With an EvaluationContext, the groups of a dataset are computed once and reused by all these metrics.
+
+    Args:
+        grouping: Optional[str]
+            The grouping of the records. Default: None, the qi_grouping of the context, or "kmeans" without a context.
     """
 
-    def __init__(self, **kwargs: Any) -> None:
+    def __init__(self, grouping: Optional[str] = None, **kwargs: Any) -> None:
         super().__init__(**kwargs)
+        if grouping is None:
+            grouping = (
+                self._context.qi_grouping if self._context is not None else "kmeans"
+            )
+        if grouping not in SUPPORTED_GROUPINGS:
+            raise ValueError(
+                f"Invalid grouping {grouping}. Supported: {SUPPORTED_GROUPINGS}"
+            )
+        self._grouping = grouping
+
+    def _memo(self, key: tuple, fn: Any) -> Any:
+        if self._context is not None:
+            return self._context.memo(key, fn)
+        return fn()
+
+    def _qi_clusters(
+        self, X: DataLoader, features: List[str]
+    ) -> List[Tuple[Any, np.ndarray]]:
+        """The clusterings of the records of `X` on `features`, for each cluster count small enough for the dataset.
+
+        Returns:
+            The fitted clustering models, and the cluster of each record.
+        """
+
+        def _fit() -> List[Tuple[Any, np.ndarray]]:
+            data = X[features]
+            clusterings = []
+            for n_clusters in N_CLUSTERS:
+                if len(X) / n_clusters < 10:
+                    continue
+                if self._grouping == "minibatch":
+                    model = MiniBatchKMeans(
+                        n_clusters=n_clusters,
+                        init="k-means++",
+                        random_state=0,
+                        batch_size=4096,
+                        n_init=3,
+                    ).fit(data)
+                else:
+                    model = KMeans(
+                        n_clusters=n_clusters, init="k-means++", random_state=0
+                    ).fit(data)
+                clusterings.append((model, np.asarray(model.labels_)))
+            return clusterings
+
+        key = ("qi_clusters", X.hash(), tuple(features), self._grouping)
+        return self._memo(key, _fit)
+
+    def _qi_classes(self, X: DataLoader, features: List[str]) -> np.ndarray:
+        """The hash of the quasi-identifier tuple of each record of `X`."""
+        key = ("qi_classes", X.hash(), tuple(features))
+        return self._memo(key, lambda: _row_hashes(X.dataframe()[features]))
+
+    def _group_matches(
+        self, X_gt: DataLoader, X_syn: DataLoader, features: List[str]
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """The number of real and synthetic records in each group of the real data, for each grouping.
+
+        The synthetic records are assigned to the groups of the real data: to the nearest cluster, or to the equivalence class of the same quasi-identifiers.
+        """
+        if self._grouping == "exact":
+            gt_classes, gt_counts = np.unique(
+                self._qi_classes(X_gt, features), return_counts=True
+            )
+            syn_classes = self._qi_classes(X_syn, features)
+            idx = np.searchsorted(gt_classes, syn_classes).clip(0, len(gt_classes) - 1)
+            matched = gt_classes[idx] == syn_classes
+            syn_counts = np.bincount(idx[matched], minlength=len(gt_classes))
+            return [(gt_counts, syn_counts)]
+
+        matches = []
+        for model, labels in self._qi_clusters(X_gt, features):
+            n_clusters = model.n_clusters
+            syn_labels = model.predict(X_syn[features])
+            matches.append(
+                (
+                    np.bincount(labels, minlength=n_clusters),
+                    np.bincount(syn_labels, minlength=n_clusters),
+                )
+            )
+        return matches
+
+    def _cache_key(self, *parts: Any) -> str:
+        return super()._cache_key(*parts, self._grouping)
 
     @staticmethod
     def type() -> str:
@@ -48,14 +162,12 @@ class PrivacyEvaluator(MetricEvaluator):
     def evaluate(
         self, X_gt: DataLoader, X_syn: DataLoader, *args: Any, **kwargs: Any
     ) -> Dict:
-        cache_file = (
-            self._workspace
-            / f"sc_metric_cache_{self.type()}_{self.name()}_{X_gt.hash()}_{X_syn.hash()}_{self._reduction}_{platform.python_version()}.bkp"
-        )
-        if self.use_cache(cache_file):
-            return load_from_file(cache_file)
+        cache_key = self._cache_key(X_gt.hash(), X_syn.hash(), self._reduction)
+        cached = self._cache_get(cache_key)
+        if cached is not MISSING:
+            return cached
         results = self._evaluate(X_gt, X_syn, *args, **kwargs)
-        save_to_file(cache_file, results)
+        self._cache_put(cache_key, results)
         return results
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -92,14 +204,12 @@ class kAnonymization(PrivacyEvaluator):
         features = _utils.get_features(X, X.sensitive_features)
 
         values = [999]
-        for n_clusters in [2, 5, 10, 15]:
-            if len(X) / n_clusters < 10:
-                continue
-            cluster = KMeans(
-                n_clusters=n_clusters, init="k-means++", random_state=0
-            ).fit(X[features])
-            counts: dict = Counter(cluster.labels_)
-            values.append(np.min(list(counts.values())))
+        if self._grouping == "exact":
+            _, counts = np.unique(self._qi_classes(X, features), return_counts=True)
+            values.append(np.min(counts))
+        else:
+            for _, labels in self._qi_clusters(X, features):
+                values.append(np.min(np.unique(labels, return_counts=True)[1]))
 
         return int(np.min(values))
 
@@ -139,20 +249,25 @@ class lDiversityDistinct(PrivacyEvaluator):
 
     def evaluate_data(self, X: DataLoader) -> int:
         features = _utils.get_features(X, X.sensitive_features)
+        sensitive = [col for col in X.sensitive_features if col in X.columns]
+        if len(sensitive) > 0:
+            sensitive_values = _row_hashes(X.dataframe()[sensitive])
+        else:
+            # without sensitive features, every record is distinct
+            sensitive_values = np.arange(len(X))
+
+        if self._grouping == "exact":
+            _, classes = np.unique(self._qi_classes(X, features), return_inverse=True)
+            groupings = [(classes.reshape(-1), int(classes.max()) + 1)]
+        else:
+            groupings = [
+                (labels, model.n_clusters)
+                for model, labels in self._qi_clusters(X, features)
+            ]
 
         values = [999]
-        for n_clusters in [2, 5, 10, 15]:
-            if len(X) / n_clusters < 10:
-                continue
-            model = KMeans(n_clusters=n_clusters, init="k-means++", random_state=0).fit(
-                X[features]
-            )
-            clusters = model.predict(X.dataframe()[features])
-            clusters_df = pd.Series(clusters, index=X.dataframe().index)
-            for cluster in range(n_clusters):
-                partition = X.dataframe()[clusters_df == cluster]
-                uniq_values = partition[X.sensitive_features].drop_duplicates()
-                values.append(len(uniq_values))
+        for groups, n_groups in groupings:
+            values.extend(_distinct_per_group(groups, sensitive_values, n_groups))
 
         return int(np.min(values))
 
@@ -196,15 +311,11 @@ class kMap(PrivacyEvaluator):
         features = _utils.get_features(X_gt, X_gt.sensitive_features)
 
         values = []
-        for n_clusters in [2, 5, 10, 15]:
-            if len(X_gt) / n_clusters < 10:
-                continue
-            model = KMeans(n_clusters=n_clusters, init="k-means++", random_state=0).fit(
-                X_gt[features]
-            )
-            clusters = model.predict(X_syn[features])
-            counts: dict = Counter(clusters)
-            values.append(np.min(list(counts.values())))
+        for _, syn_counts in self._group_matches(X_gt, X_syn, features):
+            # the groups without synthetic records are not counted
+            syn_counts = syn_counts[syn_counts > 0]
+            if len(syn_counts) > 0:
+                values.append(np.min(syn_counts))
 
         if len(values) == 0:
             return {"score": 0}
@@ -241,25 +352,12 @@ class DeltaPresence(PrivacyEvaluator):
         features = _utils.get_features(X_gt, X_gt.sensitive_features)
 
         values = []
-        for n_clusters in [2, 5, 10, 15]:
-            if len(X_gt) / n_clusters < 10:
-                continue
-            model = KMeans(n_clusters=n_clusters, init="k-means++", random_state=0).fit(
-                X_gt[features]
-            )
-            clusters = model.predict(X_syn[features])
-            synth_counts: dict = Counter(clusters)
-            gt_counts: dict = Counter(model.labels_)
+        for gt_counts, synth_counts in self._group_matches(X_gt, X_syn, features):
+            matched = (gt_counts > 0) & (synth_counts > 0)
+            values.extend(gt_counts[matched] / (synth_counts[matched] + 1e-8))
 
-            for key in gt_counts:
-                if key not in synth_counts:
-                    continue
-                gt_cnt = gt_counts[key]
-                synth_cnt = synth_counts[key]
-
-                delta = gt_cnt / (synth_cnt + 1e-8)
-
-                values.append(delta)
+        if len(values) == 0:
+            return {"score": 0}
 
         return {"score": float(np.max(values))}
 
@@ -289,6 +387,10 @@ class IdentifiabilityScore(PrivacyEvaluator):
     def name() -> str:
         return "identifiability_score"
 
+    @staticmethod
+    def cost() -> float:
+        return 5.0
+
     @staticmethod
     def direction() -> str:
         return "minimize"
@@ -326,9 +428,7 @@ class IdentifiabilityScore(PrivacyEvaluator):
 
         if emb == "OC":
             emb = f"_{emb}"
-            oneclass_model = self._get_oneclass_model(X_gt_)
-            X_gt_ = self._oneclass_predict(oneclass_model, X_gt_)
-            X_syn_ = self._oneclass_predict(oneclass_model, X_syn_)
+            _, X_gt_, X_syn_ = self._oneclass_embeddings(X_gt_, X_syn_)
         else:
             if emb != "":
                 raise RuntimeError(f" Invalid emb {emb}")
@@ -363,12 +463,10 @@ class IdentifiabilityScore(PrivacyEvaluator):
             X_syn_hat[:, i] = X_syn_[:, i] * 1.0 / (W[i] + eps)
 
         # r_i computation
-        nbrs = NearestNeighbors(n_neighbors=2).fit(X_hat)
-        distance, _ = nbrs.kneighbors(X_hat)
+        distance, _ = self._kneighbors(X_hat, X_hat, 2)
 
         # hat{r_i} computation
-        nbrs_hat = NearestNeighbors(n_neighbors=1).fit(X_syn_hat)
-        distance_hat, _ = nbrs_hat.kneighbors(X_hat)
+        distance_hat, _ = self._kneighbors(X_syn_hat, X_hat, 1)
 
         # See which one is bigger
         R_Diff = distance_hat[:, 0] - distance[:, 1]
@@ -544,6 +642,10 @@ class DomiasMIAKDE(DomiasMIA):
     def name() -> str:
         return "DomiasMIA_KDE"
 
+    @staticmethod
+    def cost() -> float:
+        return 5.0
+
     def evaluate_p_R(
         self,
         synth_set: Union[DataLoader, Any],
@@ -577,6 +679,10 @@ class DomiasMIABNAF(DomiasMIA):
     def name() -> str:
         return "DomiasMIA_BNAF"
 
+    @staticmethod
+    def cost() -> float:
+        return 100.0
+
     def evaluate_p_R(
         self,
         synth_set: Union[DataLoader, Any],
@@ -5,11 +5,10 @@ from typing import Any, Dict
 import numpy as np
 import pandas as pd
 from pydantic import validate_arguments
-from sklearn.neighbors import NearestNeighbors
 
 # synthcity absolute
 import synthcity.logger as log
-from synthcity.metrics.core import MetricEvaluator
+from synthcity.metrics.core import MetricEvaluator, NeighborIndex
 from synthcity.plugins.core.dataloader import DataLoader
 
 
@@ -25,17 +24,27 @@ class BasicMetricEvaluator(MetricEvaluator):
     @staticmethod
     def _helper_nearest_neighbor(X_gt: DataLoader, X_syn: DataLoader) -> np.ndarray:
         try:
-            estimator = NearestNeighbors(n_neighbors=5).fit(
-                X_syn.numpy().reshape(len(X_syn), -1)
-            )
-            dist, _ = estimator.kneighbors(
-                X_gt.numpy().reshape(len(X_gt), -1), 1, return_distance=True
+            dist, _ = NeighborIndex(X_syn.numpy().reshape(len(X_syn), -1)).kneighbors(
+                X_gt.numpy().reshape(len(X_gt), -1), 1
             )
             return dist.squeeze()
         except BaseException:
             log.error("NearestNeighbors failed")
             return np.asarray([999])
 
+    def _nearest_neighbor_distances(
+        self, X_gt: DataLoader, X_syn: DataLoader
+    ) -> np.ndarray:
+        """Distances from the real rows to their closest synthetic neighbor, shared by the sanity metrics through the context."""
+        if self._context is None:
+            return self._helper_nearest_neighbor(X_gt, X_syn)
+        try:
+            dist, _ = self._kneighbors(self._numpy(X_syn), self._numpy(X_gt), 1)
+            return dist.squeeze()
+        except BaseException:
+            log.error("NearestNeighbors failed")
+            return np.asarray([999])
+
     @staticmethod
     def type() -> str:
         return "sanity"
@@ -165,7 +174,7 @@ class NearestSyntheticNeighborDistance(BasicMetricEvaluator):
         if len(X_gt.columns) != len(X_syn.columns):
             raise ValueError(f"Incompatible dataframe {X_gt.shape} and {X_syn.shape}")
 
-        dist = BasicMetricEvaluator._helper_nearest_neighbor(X_gt, X_syn)
+        dist = self._nearest_neighbor_distances(X_gt, X_syn)
 
         dist = (dist - np.min(dist)) / (np.max(dist) - np.min(dist) + 1e-8)
         return {self._reduction: float(self.reduction()(dist))}
@@ -199,7 +208,7 @@ class CloseValuesProbability(BasicMetricEvaluator):
         if len(X_gt.columns) != len(X_syn.columns):
             raise ValueError(f"Incompatible dataframe {X_gt.shape} and {X_syn.shape}")
 
-        dist = BasicMetricEvaluator._helper_nearest_neighbor(X_gt, X_syn)
+        dist = self._nearest_neighbor_distances(X_gt, X_syn)
         dist = (dist - np.min(dist)) / (np.max(dist) - np.min(dist) + 1e-8)
 
         threshold = 0.2
@@ -235,7 +244,7 @@ class DistantValuesProbability(BasicMetricEvaluator):
         if len(X_gt.columns) != len(X_syn.columns):
             raise ValueError(f"Incompatible dataframe {X_gt.shape} and {X_syn.shape}")
 
-        dist = BasicMetricEvaluator._helper_nearest_neighbor(X_gt, X_syn)
+        dist = self._nearest_neighbor_distances(X_gt, X_syn)
         dist = (dist - np.min(dist)) / (np.max(dist) - np.min(dist) + 1e-8)
 
         threshold = 0.8
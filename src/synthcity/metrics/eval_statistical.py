@@ -1,7 +1,6 @@
 # stdlib
-import platform
 from abc import abstractmethod
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # third party
 import numpy as np
@@ -14,7 +13,6 @@ from scipy.spatial.distance import jensenshannon
 from scipy.special import kl_div
 from scipy.stats import chisquare, ks_2samp
 from sklearn import metrics
-from sklearn.neighbors import NearestNeighbors
 from sklearn.preprocessing import MinMaxScaler
 
 # synthcity absolute
@@ -25,8 +23,52 @@ from synthcity.plugins.core.dataloader import DataLoader
 from synthcity.plugins.core.models.survival_analysis.metrics import (
     nonparametric_distance,
 )
+from synthcity.utils.artifacts import MISSING
 from synthcity.utils.reproducibility import clear_cache
-from synthcity.utils.serialization import load_from_file, save_to_file
+
+# Row count above which the "auto" estimators switch from the full pairwise matrices to the blocked computation.
+MAX_EXACT_ROWS = 4096
+
+
+def _centered_float32(X: np.ndarray, Y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Cast two samples to float32 for the tiles, after centering them in float64 to limit the cancellation errors of the squared distances."""
+    X = np.asarray(X, dtype=np.float64)
+    Y = np.asarray(Y, dtype=np.float64)
+    center = (X.sum(axis=0) + Y.sum(axis=0)) / (len(X) + len(Y))
+    return (X - center).astype(np.float32), (Y - center).astype(np.float32)
+
+
+def _sq_distances(
+    A: np.ndarray, B: np.ndarray, A_sq: np.ndarray, B_sq: np.ndarray
+) -> np.ndarray:
+    """Squared euclidean distances between the rows of two float32 tiles, given their squared norms."""
+    dist = A_sq[:, None] + B_sq[None, :] - 2 * (A @ B.T)
+    return np.maximum(dist, 0, out=dist)
+
+
+def _blocked_kernel_mean(
+    A: np.ndarray, B: Optional[np.ndarray], kernel: Callable, block_size: int
+) -> float:
+    """Mean of the kernel matrix between the rows of A and B, computed by float32 tiles of block_size rows and accumulated in float64.
+
+    If B is None, the kernel matrix of A with itself is symmetric, and only its upper tiles are computed.
+    """
+    symmetric = B is None
+    if B is None:
+        B = A
+
+    A_sq = np.einsum("ij,ij->i", A, A)
+    B_sq = A_sq if symmetric else np.einsum("ij,ij->i", B, B)
+
+    total = 0.0
+    for i in range(0, len(A), block_size):
+        a, a_sq = A[i : i + block_size], A_sq[i : i + block_size]
+        for j in range(i if symmetric else 0, len(B), block_size):
+            b, b_sq = B[j : j + block_size], B_sq[j : j + block_size]
+            tile_sum = float(kernel(a, b, a_sq, b_sq).sum(dtype=np.float64))
+            total += 2 * tile_sum if symmetric and j != i else tile_sum
+
+    return total / (len(A) * len(B))
 
 
 class StatisticalEvaluator(MetricEvaluator):
@@ -47,18 +89,22 @@ class StatisticalEvaluator(MetricEvaluator):
     def _evaluate(self, X_gt: DataLoader, X_syn: DataLoader) -> Dict:
         ...
 
+    def _cache_params(self) -> List[Any]:
+        """Parameters of the metric which change its result, besides the reduction."""
+        return []
+
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def evaluate(self, X_gt: DataLoader, X_syn: DataLoader) -> Dict:
-        cache_file = (
-            self._workspace
-            / f"sc_metric_cache_{self.type()}_{self.name()}_{X_gt.hash()}_{X_syn.hash()}_{self._reduction}_{platform.python_version()}.bkp"
+        cache_key = self._cache_key(
+            X_gt.hash(), X_syn.hash(), self._reduction, *self._cache_params()
         )
-        if self.use_cache(cache_file):
-            return load_from_file(cache_file)
+        cached = self._cache_get(cache_key)
+        if cached is not MISSING:
+            return cached
 
         clear_cache()
         results = self._evaluate(X_gt, X_syn)
-        save_to_file(cache_file, results)
+        self._cache_put(cache_key, results)
         return results
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -197,32 +243,178 @@ class MaximumMeanDiscrepancy(StatisticalEvaluator):
 
     Args:
         kernel: "rbf", "linear" or "polynomial"
+        estimator: str
+            How the kernel means are computed. See `estimator_for` for the estimator used on a pair of samples:
+                - "exact": the full pairwise kernel matrices.
+                - "blocked": the same estimate, computed by float32 tiles of `block_size` rows and accumulated in float64, in bounded memory.
+                - "linear_time": the linear-time unbiased estimator over disjoint pairs of samples, in O(n).
+                - "rff": random Fourier features approximation of the rbf kernel, in O(n * n_features).
+                - "auto": "exact" up to MAX_EXACT_ROWS rows per side, "blocked" above.
+            The linear kernel is always computed exactly from the feature means. Default: "auto".
+        block_size: int
+            Rows per tile of the blocked estimator. Default: 4096.
+        n_features: int
+            Number of random Fourier features. Default: 2048.
 
     Score:
         0: The distributions are the same.
         1: The distributions are totally different.
     """
 
+    estimators = ["auto", "exact", "blocked", "linear_time", "rff"]
+
+    # kernel parameters: k(x,y) = exp(-rbf_gamma * ||x-y||^2) and k(x,y) = (poly_gamma <x, y> + poly_coef0)^poly_degree
+    rbf_gamma = 1.0
+    poly_degree = 2
+    poly_gamma = 1
+    poly_coef0 = 0
+
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
-    def __init__(self, kernel: str = "rbf", **kwargs: Any) -> None:
+    def __init__(
+        self,
+        kernel: str = "rbf",
+        estimator: str = "auto",
+        block_size: int = 4096,
+        n_features: int = 2048,
+        **kwargs: Any,
+    ) -> None:
         super().__init__(default_metric="joint", **kwargs)
 
+        if estimator not in self.estimators:
+            raise ValueError(
+                f"Invalid estimator {estimator}. Supported: {self.estimators}"
+            )
+        if estimator == "rff" and kernel != "rbf":
+            raise ValueError("The rff estimator only supports the rbf kernel")
+        if block_size <= 0:
+            raise ValueError(f"Invalid block_size {block_size}")
+
         self.kernel = kernel
+        self.estimator = estimator
+        self.block_size = block_size
+        self.n_features = n_features
 
     @staticmethod
     def name() -> str:
         return "max_mean_discrepancy"
 
+    @staticmethod
+    def cost() -> float:
+        return 5.0
+
     @staticmethod
     def direction() -> str:
         return "minimize"
 
+    def _cache_params(self) -> List[Any]:
+        return [self.kernel, self.estimator, self.n_features]
+
+    def estimator_for(self, n_gt: int, n_syn: int) -> str:
+        """The estimator used for samples of `n_gt` and `n_syn` rows, with "auto" resolved."""
+        if self.kernel == "linear":
+            return "exact"
+        if self.estimator != "auto":
+            return self.estimator
+        return "exact" if max(n_gt, n_syn) <= MAX_EXACT_ROWS else "blocked"
+
+    def _kernel(self) -> Callable:
+        """The kernel of a float32 tile, given the squared norms of its rows."""
+        if self.kernel == "rbf":
+
+            def _rbf(
+                A: np.ndarray, B: np.ndarray, A_sq: np.ndarray, B_sq: np.ndarray
+            ) -> np.ndarray:
+                dist = _sq_distances(A, B, A_sq, B_sq)
+                return np.exp(-self.rbf_gamma * dist, out=dist)
+
+            return _rbf
+
+        def _polynomial(
+            A: np.ndarray, B: np.ndarray, A_sq: np.ndarray, B_sq: np.ndarray
+        ) -> np.ndarray:
+            return (self.poly_gamma * (A @ B.T) + self.poly_coef0) ** self.poly_degree
+
+        return _polynomial
+
+    def _paired_kernel(self, A: np.ndarray, B: np.ndarray) -> np.ndarray:
+        """The kernel between the matching rows of A and B."""
+        if self.kernel == "rbf":
+            diff = A - B
+            return np.exp(-self.rbf_gamma * np.einsum("ij,ij->i", diff, diff))
+
+        return (
+            self.poly_gamma * np.einsum("ij,ij->i", A, B) + self.poly_coef0
+        ) ** self.poly_degree
+
+    def _samples_float32(
+        self, X: np.ndarray, Y: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if self.kernel == "rbf":
+            return _centered_float32(X, Y)
+        # the polynomial kernel is not shift invariant, so it is computed on the raw samples
+        return X.astype(np.float32), Y.astype(np.float32)
+
+    def _blocked(self, X: np.ndarray, Y: np.ndarray) -> float:
+        X, Y = self._samples_float32(X, Y)
+
+        kernel = self._kernel()
+        XX = _blocked_kernel_mean(X, None, kernel, self.block_size)
+        YY = _blocked_kernel_mean(Y, None, kernel, self.block_size)
+        XY = _blocked_kernel_mean(X, Y, kernel, self.block_size)
+
+        return XX + YY - 2 * XY
+
+    def _linear_time(self, X: np.ndarray, Y: np.ndarray) -> float:
+        n_pairs = min(len(X), len(Y)) // 2
+        if n_pairs == 0:
+            raise ValueError("The linear_time estimator requires two samples per side")
+
+        rng = np.random.default_rng(self._random_state)
+        X = X[rng.permutation(len(X))[: 2 * n_pairs]]
+        Y = Y[rng.permutation(len(Y))[: 2 * n_pairs]]
+        # the pairs are O(n), so they are computed in float64
+        X, Y = X.astype(np.float64), Y.astype(np.float64)
+
+        x1, x2 = X[0::2], X[1::2]
+        y1, y2 = Y[0::2], Y[1::2]
+        h = (
+            self._paired_kernel(x1, x2)
+            + self._paired_kernel(y1, y2)
+            - self._paired_kernel(x1, y2)
+            - self._paired_kernel(x2, y1)
+        )
+
+        return float(h.mean(dtype=np.float64))
+
+    def _rff(self, X: np.ndarray, Y: np.ndarray) -> float:
+        X, Y = _centered_float32(X, Y)
+
+        # k(x, y) = exp(-gamma ||x - y||^2) = E[2 cos(w x + b) cos(w y + b)], w ~ N(0, 2 gamma I), b ~ U(0, 2 pi)
+        rng = np.random.default_rng(self._random_state)
+        W = rng.normal(
+            scale=np.sqrt(2 * self.rbf_gamma), size=(X.shape[1], self.n_features)
+        )
+        W = W.astype(np.float32)
+        b = rng.uniform(0, 2 * np.pi, size=self.n_features).astype(np.float32)
+
+        def _mean_embedding(A: np.ndarray) -> np.ndarray:
+            total = np.zeros(self.n_features, dtype=np.float64)
+            for start in range(0, len(A), self.block_size):
+                features = np.cos(A[start : start + self.block_size] @ W + b)
+                total += features.sum(axis=0, dtype=np.float64)
+            return total * np.sqrt(2.0 / self.n_features) / len(A)
+
+        delta = _mean_embedding(X) - _mean_embedding(Y)
+        return float(delta.dot(delta))
+
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def _evaluate(
         self,
         X_gt: DataLoader,
         X_syn: DataLoader,
     ) -> Dict:
+        estimator = self.estimator_for(len(X_gt), len(X_syn))
+        log.debug(f"{self.name()} estimator: {estimator}")
         if self.kernel == "linear":
             """
             MMD using linear kernel (i.e., k(x,y) = <x,y>)
@@ -231,58 +423,37 @@ class MaximumMeanDiscrepancy(StatisticalEvaluator):
             delta = delta_df.values
 
             score = delta.dot(delta.T)
-        elif self.kernel == "rbf":
-            """
-            MMD using rbf (gaussian) kernel (i.e., k(x,y) = exp(-gamma * ||x-y||^2 / 2))
-            """
-            gamma = 1.0
-            XX = metrics.pairwise.rbf_kernel(
-                X_gt.numpy().reshape(len(X_gt), -1),
-                X_gt.numpy().reshape(len(X_gt), -1),
-                gamma,
-            )
-            YY = metrics.pairwise.rbf_kernel(
-                X_syn.numpy().reshape(len(X_syn), -1),
-                X_syn.numpy().reshape(len(X_syn), -1),
-                gamma,
-            )
-            XY = metrics.pairwise.rbf_kernel(
-                X_gt.numpy().reshape(len(X_gt), -1),
-                X_syn.numpy().reshape(len(X_syn), -1),
-                gamma,
-            )
-            score = XX.mean() + YY.mean() - 2 * XY.mean()
-        elif self.kernel == "polynomial":
-            """
-            MMD using polynomial kernel (i.e., k(x,y) = (gamma <X, Y> + coef0)^degree)
-            """
-            degree = 2
-            gamma = 1
-            coef0 = 0
-            XX = metrics.pairwise.polynomial_kernel(
-                X_gt.numpy().reshape(len(X_gt), -1),
-                X_gt.numpy().reshape(len(X_gt), -1),
-                degree,
-                gamma,
-                coef0,
-            )
-            YY = metrics.pairwise.polynomial_kernel(
-                X_syn.numpy().reshape(len(X_syn), -1),
-                X_syn.numpy().reshape(len(X_syn), -1),
-                degree,
-                gamma,
-                coef0,
-            )
-            XY = metrics.pairwise.polynomial_kernel(
-                X_gt.numpy().reshape(len(X_gt), -1),
-                X_syn.numpy().reshape(len(X_syn), -1),
-                degree,
-                gamma,
-                coef0,
-            )
-            score = XX.mean() + YY.mean() - 2 * XY.mean()
-        else:
+        elif self.kernel not in ["rbf", "polynomial"]:
             raise ValueError(f"Unsupported kernel {self.kernel}")
+        else:
+            X = X_gt.numpy().reshape(len(X_gt), -1)
+            Y = X_syn.numpy().reshape(len(X_syn), -1)
+            if estimator == "blocked":
+                score = self._blocked(X, Y)
+            elif estimator == "linear_time":
+                score = self._linear_time(X, Y)
+            elif estimator == "rff":
+                score = self._rff(X, Y)
+            elif self.kernel == "rbf":
+                """
+                MMD using rbf (gaussian) kernel (i.e., k(x,y) = exp(-gamma * ||x-y||^2 / 2))
+                """
+                gamma = self.rbf_gamma
+                XX = metrics.pairwise.rbf_kernel(X, X, gamma)
+                YY = metrics.pairwise.rbf_kernel(Y, Y, gamma)
+                XY = metrics.pairwise.rbf_kernel(X, Y, gamma)
+                score = XX.mean() + YY.mean() - 2 * XY.mean()
+            else:
+                """
+                MMD using polynomial kernel (i.e., k(x,y) = (gamma <X, Y> + coef0)^degree)
+                """
+                degree = self.poly_degree
+                gamma = self.poly_gamma
+                coef0 = self.poly_coef0
+                XX = metrics.pairwise.polynomial_kernel(X, X, degree, gamma, coef0)
+                YY = metrics.pairwise.polynomial_kernel(Y, Y, degree, gamma, coef0)
+                XY = metrics.pairwise.polynomial_kernel(X, Y, degree, gamma, coef0)
+                score = XX.mean() + YY.mean() - 2 * XY.mean()
 
         return {"joint": float(score)}
 
@@ -408,17 +579,55 @@ class PRDCScore(StatisticalEvaluator):
 
     Args:
         nearest_k: int.
+        estimator: str
+            How the real-synthetic distances are computed. See `estimator_for` for the estimator used on a pair of samples:
+                - "exact": the full pairwise distance matrix.
+                - "blocked": float32 tiles of `block_size` rows, reduced on the fly, in bounded memory.
+                - "auto": "exact" up to MAX_EXACT_ROWS rows per side, "blocked" above.
+            Default: "auto".
+        block_size: int
+            Rows per tile of the blocked estimator. Default: 4096.
     """
 
-    def __init__(self, nearest_k: int = 5, **kwargs: Any) -> None:
+    estimators = ["auto", "exact", "blocked"]
+
+    def __init__(
+        self,
+        nearest_k: int = 5,
+        estimator: str = "auto",
+        block_size: int = 4096,
+        **kwargs: Any,
+    ) -> None:
         super().__init__(default_metric="precision", **kwargs)
 
+        if estimator not in self.estimators:
+            raise ValueError(
+                f"Invalid estimator {estimator}. Supported: {self.estimators}"
+            )
+        if block_size <= 0:
+            raise ValueError(f"Invalid block_size {block_size}")
+
         self.nearest_k = nearest_k
+        self.estimator = estimator
+        self.block_size = block_size
 
     @staticmethod
     def name() -> str:
         return "prdc"
 
+    def _cache_params(self) -> List[Any]:
+        return [self.nearest_k, self.estimator]
+
+    def estimator_for(self, n_gt: int, n_syn: int) -> str:
+        """The estimator used for samples of `n_gt` and `n_syn` rows, with "auto" resolved."""
+        if self.estimator != "auto":
+            return self.estimator
+        return "exact" if max(n_gt, n_syn) <= MAX_EXACT_ROWS else "blocked"
+
+    @staticmethod
+    def cost() -> float:
+        return 5.0
+
     @staticmethod
     def direction() -> str:
         return "maximize"
@@ -478,9 +687,9 @@ class PRDCScore(StatisticalEvaluator):
         Returns:
             Distances to kth nearest neighbours.
         """
-        distances = self._compute_pairwise_distance(input_features)
-        radii = self._get_kth_value(distances, k=nearest_k + 1, axis=-1)
-        return radii
+        # the closest neighbour of each row is itself
+        distances, _ = self._kneighbors(input_features, input_features, nearest_k + 1)
+        return distances[:, nearest_k]
 
     def _compute_prdc(
         self, real_features: np.ndarray, fake_features: np.ndarray
@@ -500,6 +709,17 @@ class PRDCScore(StatisticalEvaluator):
         fake_nearest_neighbour_distances = self._compute_nearest_neighbour_distances(
             fake_features, self.nearest_k
         )
+
+        estimator = self.estimator_for(len(real_features), len(fake_features))
+        log.debug(f"{self.name()} estimator: {estimator}")
+        if estimator == "blocked":
+            return self._compute_prdc_blocked(
+                real_features,
+                fake_features,
+                real_nearest_neighbour_distances,
+                fake_nearest_neighbour_distances,
+            )
+
         distance_real_fake = self._compute_pairwise_distance(
             real_features, fake_features
         )
@@ -532,7 +752,66 @@ class PRDCScore(StatisticalEvaluator):
         ).mean()
 
         return dict(
-            precision=precision, recall=recall, density=density, coverage=coverage
+            precision=precision,
+            recall=recall,
+            density=density,
+            coverage=coverage,
+        )
+
+    def _compute_prdc_blocked(
+        self,
+        real_features: np.ndarray,
+        fake_features: np.ndarray,
+        real_radii: np.ndarray,
+        fake_radii: np.ndarray,
+    ) -> Dict:
+        """
+        Computes precision, recall, density, and coverage by float32 tiles of the real-synthetic distances, reduced on the fly.
+        Args:
+            real_features: numpy.ndarray([N, feature_dim])
+            fake_features: numpy.ndarray([M, feature_dim])
+            real_radii: numpy.ndarray([N]), distances of the real samples to their kth neighbour.
+            fake_radii: numpy.ndarray([M]), distances of the fake samples to their kth neighbour.
+        Returns:
+            dict of precision, recall, density, and coverage.
+        """
+        real, fake = _centered_float32(real_features, fake_features)
+        real_sq = np.einsum("ij,ij->i", real, real)
+        fake_sq = np.einsum("ij,ij->i", fake, fake)
+
+        fake_in_real = np.zeros(len(fake), dtype=bool)
+        fake_density = np.zeros(len(fake), dtype=np.int64)
+        real_in_fake = np.zeros(len(real), dtype=bool)
+        real_to_fake = np.full(len(real), np.inf)
+
+        bs = self.block_size
+        for i in range(0, len(real), bs):
+            radii = real_radii[i : i + bs, None]
+            for j in range(0, len(fake), bs):
+                dist = np.sqrt(
+                    _sq_distances(
+                        real[i : i + bs],
+                        fake[j : j + bs],
+                        real_sq[i : i + bs],
+                        fake_sq[j : j + bs],
+                    )
+                )
+
+                in_real = dist < radii
+                fake_in_real[j : j + bs] |= in_real.any(axis=0)
+                fake_density[j : j + bs] += in_real.sum(axis=0)
+                real_in_fake[i : i + bs] |= (dist < fake_radii[None, j : j + bs]).any(
+                    axis=1
+                )
+                real_to_fake[i : i + bs] = np.minimum(
+                    real_to_fake[i : i + bs], dist.min(axis=1)
+                )
+
+        return dict(
+            precision=fake_in_real.mean(),
+            recall=real_in_fake.mean(),
+            density=(1.0 / float(self.nearest_k)) * fake_density.mean(),
+            coverage=(real_to_fake < real_radii).mean(),
         )
 
 
@@ -561,6 +840,10 @@ class AlphaPrecision(StatisticalEvaluator):
     def name() -> str:
         return "alpha_precision"
 
+    @staticmethod
+    def cost() -> float:
+        return 10.0
+
     @staticmethod
     def direction() -> str:
         return "maximize"
@@ -590,11 +873,8 @@ class AlphaPrecision(StatisticalEvaluator):
 
         synth_to_center = np.sqrt(np.sum((X_syn - emb_center) ** 2, axis=1))
 
-        nbrs_real = NearestNeighbors(n_neighbors=2, n_jobs=-1, p=2).fit(X)
-        real_to_real, _ = nbrs_real.kneighbors(X)
-
-        nbrs_synth = NearestNeighbors(n_neighbors=1, n_jobs=-1, p=2).fit(X_syn)
-        real_to_synth, real_to_synth_args = nbrs_synth.kneighbors(X)
+        real_to_real, _ = self._kneighbors(X, X, 2)
+        real_to_synth, real_to_synth_args = self._kneighbors(X_syn, X, 1)
 
         # Let us find closest real point to any real point, excluding itself (therefore 1 instead of 0)
         real_to_real = real_to_real[:, 1].squeeze()
@@ -712,14 +992,12 @@ class AlphaPrecision(StatisticalEvaluator):
     ) -> Dict:
         results = {}
 
-        X_ = X.numpy().reshape(len(X), -1)
-        X_syn_ = X_syn.numpy().reshape(len(X_syn), -1)
+        X_ = self._numpy(X)
+        X_syn_ = self._numpy(X_syn)
 
         # OneClass representation
         emb = "_OC"
-        oneclass_model = self._get_oneclass_model(X_)
-        X_ = self._oneclass_predict(oneclass_model, X_)
-        X_syn_ = self._oneclass_predict(oneclass_model, X_syn_)
+        oneclass_model, X_, X_syn_ = self._oneclass_embeddings(X_, X_syn_)
         emb_center = oneclass_model.c.detach().cpu().numpy()
 
         (
@@ -1,25 +1,40 @@
 # stdlib
 import multiprocessing
 import time
-from typing import Any, Dict, Tuple
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Dict, List, Optional, Tuple
 
 # third party
 import numpy as np
 import pandas as pd
 import torch
-from joblib import Parallel, delayed
 from scipy.stats import iqr
 
 # synthcity absolute
 import synthcity.logger as log
+from synthcity.utils.parallel import process_pool, worker_state
 
 # synthcity relative
 from .core.metric import MetricEvaluator
 
-n_jobs = torch.cuda.device_count()
-if n_jobs == 0:
-    n_jobs = multiprocessing.cpu_count()
-dispatcher = Parallel(n_jobs=1)
+
+def _default_n_jobs() -> int:
+    n_jobs = torch.cuda.device_count()
+    if n_jobs == 0:
+        n_jobs = multiprocessing.cpu_count()
+    return n_jobs
+
+
+n_jobs = _default_n_jobs()
+
+SUPPORTED_BACKENDS = ["sequential", "thread", "process"]
 
 
 def _safe_evaluate(
@@ -47,11 +62,76 @@ def _safe_evaluate(
     return evaluator.fqdn(), result, failed, duration, evaluator.direction()
 
 
+class _SharedInput:
+    """Reference to an input shared by all the tasks of a process pool, in the state of the workers."""
+
+    def __init__(self, key: int) -> None:
+        self.key = key
+
+
+def _resolve_shared_input(arg: Any) -> Any:
+    if isinstance(arg, _SharedInput):
+        return worker_state(arg.key)
+    return arg
+
+
+def _safe_evaluate_shared(
+    evaluator: MetricEvaluator,
+    args: tuple,
+    kwargs: dict,
+) -> Tuple[str, Dict, bool, float, str]:
+    args = tuple(_resolve_shared_input(arg) for arg in args)
+    kwargs = {key: _resolve_shared_input(val) for key, val in kwargs.items()}
+
+    return _safe_evaluate(evaluator, *args, **kwargs)
+
+
+def _is_shareable(arg: Any) -> bool:
+    return not isinstance(arg, (str, int, float, bool, type(None)))
+
+
 class ScoreEvaluator:
-    def __init__(self) -> None:
+    """Collects and aggregates the scores of the metric evaluators.
+
+    Evaluators are scheduled with `queue` and executed by `compute`.
+
+    Args:
+        n_jobs: int
+            Number of workers used by `compute`. -1 uses all the available devices/cores. Default: 1.
+        backend: str
+            The execution backend: "sequential", "thread" or "process". The "thread" backend shares the inputs with the workers for free, the "process" backend sends each distinct input once per worker. Default: "sequential".
+        timeout: Optional[float]
+            Per-metric timeout, in seconds, counted from the start of the metric. Metrics running longer are reported as failed, and the pool of workers is replaced, so the next metrics start right away. With the "process" backend, the workers are terminated, and the other metrics they were running are started again. Threads cannot be interrupted, so a timed out "thread" task keeps running in the background; use the "process" backend for hard timeouts. Default: None.
+        costs: Optional[Dict[str, float]]
+            Overrides for the relative cost hints of the evaluators, keyed by their fqdn. The most expensive metrics are started first. Default: None, use `MetricEvaluator.cost()`.
+        poll_interval: float
+            How often, in seconds, the running metrics are checked against the timeout. Default: 0.5.
+    """
+
+    def __init__(
+        self,
+        n_jobs: int = 1,
+        backend: str = "sequential",
+        timeout: Optional[float] = None,
+        costs: Optional[Dict[str, float]] = None,
+        poll_interval: float = 0.5,
+    ) -> None:
+        if backend not in SUPPORTED_BACKENDS:
+            raise ValueError(
+                f"Invalid backend {backend}. Supported: {SUPPORTED_BACKENDS}"
+            )
+        if timeout is not None and timeout <= 0:
+            raise ValueError(f"Invalid timeout {timeout}")
+
         self.scores: dict = {}
         self.pending_tasks: list = []
 
+        self.n_jobs = n_jobs if n_jobs > 0 else _default_n_jobs()
+        self.backend = backend
+        self.timeout = timeout
+        self.costs = costs if costs is not None else {}
+        self.poll_interval = poll_interval
+
     def add(
         self, key: str, result: float, failed: int, duration: float, direction: str
     ) -> None:
@@ -80,16 +160,126 @@ class ScoreEvaluator:
     ) -> None:
         self.pending_tasks.append((evaluator, args, kwargs))
 
+    def cost(self, evaluator: MetricEvaluator) -> float:
+        return self.costs.get(evaluator.fqdn(), evaluator.cost())
+
     def compute(self) -> None:
-        results = dispatcher(
-            delayed(_safe_evaluate)(evaluator, *args, **kwargs)
-            for (evaluator, args, kwargs) in self.pending_tasks
-        )
+        tasks = self.pending_tasks
         self.pending_tasks = []
 
+        if self.backend == "sequential" and self.timeout is None:
+            results = [
+                _safe_evaluate(evaluator, *args, **kwargs)
+                for (evaluator, args, kwargs) in tasks
+            ]
+        else:
+            results = self._compute_parallel(tasks)
+
+        # the results are merged in the queue order, regardless of the scheduling order
         for key, result, failed, duration, direction in results:
             self.add_multiple(key, result, failed, duration, direction)
 
+    def _compute_parallel(self, tasks: list) -> List[Tuple]:
+        n_workers = 1 if self.backend == "sequential" else self.n_jobs
+        n_workers = max(1, min(n_workers, len(tasks)))
+
+        shared: Dict[int, Any] = {}
+        jobs = []
+        for evaluator, args, kwargs in tasks:
+            if self.backend == "process":
+                args = tuple(self._share(arg, shared) for arg in args)
+                kwargs = {key: self._share(val, shared) for key, val in kwargs.items()}
+            jobs.append((evaluator, args, kwargs))
+
+        # the most expensive metrics are started first, to reduce the tail latency
+        queued = sorted(range(len(tasks)), key=lambda idx: -self.cost(tasks[idx][0]))
+
+        results: List[Optional[Tuple]] = [None] * len(tasks)
+        running: Dict[Future, Tuple[int, float]] = {}
+        executor = self._executor(n_workers, shared)
+
+        try:
+            while len(queued) > 0 or len(running) > 0:
+                # at most one task per worker is submitted, so the timeout of a task starts when it runs
+                while len(queued) > 0 and len(running) < n_workers:
+                    idx = queued.pop(0)
+                    future = executor.submit(_safe_evaluate_shared, *jobs[idx])
+                    running[future] = (idx, time.time())
+
+                done, _ = wait(
+                    running.keys(),
+                    timeout=self.poll_interval if self.timeout is not None else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    idx, _ = running.pop(future)
+                    try:
+                        results[idx] = future.result()
+                    except BaseException as e:
+                        results[idx] = self._failed(tasks[idx][0], str(e), 0)
+
+                if self.timeout is None:
+                    continue
+
+                now = time.time()
+                expired = [
+                    future
+                    for future, (_, start) in running.items()
+                    if not future.done() and now - start > self.timeout
+                ]
+                if len(expired) == 0:
+                    continue
+
+                for future in expired:
+                    idx, start = running.pop(future)
+                    results[idx] = self._failed(
+                        tasks[idx][0],
+                        f"timeout after {self.timeout} s",
+                        now - start,
+                    )
+
+                # the workers of the timed out tasks are stuck, the next tasks go to a new pool
+                self._shutdown(executor, kill=True)
+                if self.backend == "process":
+                    # the other running tasks were killed with the pool, they are started again
+                    queued = [idx for idx, _ in running.values()] + queued
+                    running = {}
+                executor = self._executor(n_workers, shared)
+        except BaseException:
+            self._shutdown(executor, kill=True)
+            raise
+
+        self._shutdown(executor, kill=False)
+
+        return [result for result in results if result is not None]
+
+    def _executor(self, n_workers: int, shared: Dict[int, Any]) -> Executor:
+        if self.backend == "process":
+            return process_pool(n_workers, state=shared)
+        return ThreadPoolExecutor(max_workers=n_workers)
+
+    @staticmethod
+    def _shutdown(executor: Executor, kill: bool) -> None:
+        """Shut the pool down. With `kill`, the worker processes are terminated, and the worker threads are left behind."""
+        if kill and isinstance(executor, ProcessPoolExecutor):
+            for process in list(getattr(executor, "_processes", {}).values()):
+                process.terminate()
+        executor.shutdown(wait=not kill, cancel_futures=True)
+
+    @staticmethod
+    def _share(arg: Any, shared: Dict[int, Any]) -> Any:
+        if not _is_shareable(arg):
+            return arg
+        shared[id(arg)] = arg
+        return _SharedInput(id(arg))
+
+    @staticmethod
+    def _failed(
+        evaluator: MetricEvaluator, err: str, duration: float
+    ) -> Tuple[str, Dict, bool, float, str]:
+        log.error(f" >> Evaluator {evaluator.fqdn()} failed: {err}")
+        return evaluator.fqdn(), {}, True, float(duration), evaluator.direction()
+
     def to_dataframe(self) -> pd.DataFrame:
         output_metrics = [
             "min",
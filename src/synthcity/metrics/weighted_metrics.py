@@ -1,6 +1,6 @@
 # stdlib
 from pathlib import Path
-from typing import Any, List, Tuple, Union
+from typing import Any, List, Optional, Tuple, Union
 
 # third party
 import numpy as np
@@ -8,6 +8,7 @@ import pandas as pd
 from pydantic import validate_arguments
 
 # synthcity absolute
+from synthcity.metrics.core.context import EvaluationContext
 from synthcity.plugins.core.dataloader import (
     DataLoader,
     GenericDataLoader,
@@ -26,6 +27,7 @@ class WeightedMetrics:
         task_type: str = "classification",
         random_state: int = 0,
         workspace: Path = Path("workspace"),
+        context: Optional[EvaluationContext] = None,
     ) -> None:
         if len(metrics) != len(weights):
             raise ValueError("Metrics and weights should have the same length")
@@ -44,10 +46,13 @@ class WeightedMetrics:
                 f"Invalid task type {task_type}. Supported: {supported_tasks}"
             )
 
+        self._metric_names = metrics
+        self._metric_weights = weights
         self.weights = weights / (np.sum(weights) + 1e-8)
         self.workspace = workspace
         self.task_type = task_type
         self.random_state = random_state
+        self.context = context
         self.metrics = []
 
         directions = []
@@ -62,6 +67,7 @@ class WeightedMetrics:
                     task_type=task_type,
                     random_state=random_state,
                     workspace=workspace,
+                    context=context,
                 )
             if runner is None:
                 raise ValueError(f"Unknown metric {mtype} - {mname}")
@@ -101,11 +107,24 @@ class WeightedMetrics:
         eval_cnt = min(len(X_gt), len(X_syn))
 
         for weight, metric in zip(self.weights, self.metrics):
-            score += weight * metric.evaluate_default(
-                X_gt.sample(eval_cnt), X_syn.sample(eval_cnt)
-            )
+            if self.context is not None:
+                X_gt_eval = self.context.sample(X_gt, eval_cnt)
+            else:
+                X_gt_eval = X_gt.sample(eval_cnt)
+            score += weight * metric.evaluate_default(X_gt_eval, X_syn.sample(eval_cnt))
 
         return score
 
+    def with_context(self, context: EvaluationContext) -> "WeightedMetrics":
+        """The same metrics, memoizing their real-side work in `context`."""
+        return WeightedMetrics(
+            metrics=self._metric_names,
+            weights=self._metric_weights,
+            task_type=self.task_type,
+            random_state=self.random_state,
+            workspace=self.workspace,
+            context=context,
+        )
+
     def direction(self) -> str:
         return self._direction
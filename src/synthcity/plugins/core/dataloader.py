@@ -19,10 +19,35 @@ from synthcity.plugins.core.constraints import Constraints
 from synthcity.plugins.core.dataset import FlexibleDataset, TensorDataset
 from synthcity.plugins.core.models.feature_encoder import DatetimeEncoder
 from synthcity.plugins.core.models.syn_seq.syn_seq_encoder import Syn_SeqEncoder
-from synthcity.utils.compression import compress_dataset, decompress_dataset
+from synthcity.utils.compression import (
+    CompressionCache,
+    compress_dataset,
+    decompress_dataset,
+)
 from synthcity.utils.serialization import dataframe_hash
 
 
+def fit_column_encoder(column: pd.Series) -> Optional[Any]:
+    """Fit the encoder used by `DataLoader.encode` for a column.
+
+    The choice of encoder and its fitted state only depend on the unique values of the column.
+
+    Returns:
+        A LabelEncoder for the categorical columns, a DatetimeEncoder for the dates, None for the columns kept as is.
+    """
+    kind = column.infer_objects().dtype.kind
+    n_unique = len(column.unique())
+
+    if kind == "i" and column.min() == 0 and column.max() == n_unique - 1:
+        return None
+
+    if kind in ["O", "b"] or n_unique < 15:
+        return LabelEncoder().fit(column)
+    elif kind in ["M"]:
+        return DatetimeEncoder().fit(column)
+    return None
+
+
 class DataLoader(metaclass=ABCMeta):
     """
     .. inheritance-diagram:: synthcity.plugins.core.dataloader.DataLoader
@@ -92,6 +117,22 @@ class DataLoader(metaclass=ABCMeta):
         self.data_type = data_type
         self.train_size = train_size
 
+    @property
+    def data(self) -> Any:
+        return self._data
+
+    @data.setter
+    def data(self, data: Any) -> None:
+        self._data = data
+        self._hash: Optional[str] = None
+
+    def __setstate__(self, state: dict) -> None:
+        # loaders pickled before the hash memoization
+        if "data" in state:
+            state["_data"] = state.pop("data")
+        state.setdefault("_hash", None)
+        self.__dict__.update(state)
+
     def raw(self) -> Any:
         return self.data
 
@@ -174,7 +215,16 @@ class DataLoader(metaclass=ABCMeta):
         ...
 
     def hash(self) -> str:
-        return dataframe_hash(self.dataframe())
+        """Content hash of the dataset, used for caching.
+
+        The hash is memoized. It is invalidated when the data is replaced or updated through the loader (`__setitem__`, `fillna`), but not by in-place edits of the underlying frames.
+        """
+        if self._hash is None:
+            self._hash = dataframe_hash(self.dataframe())
+        return self._hash
+
+    def _invalidate_hash(self) -> None:
+        self._hash = None
 
     def __repr__(self, *args: Any, **kwargs: Any) -> str:
         return self.dataframe().__repr__(*args, **kwargs)
@@ -195,11 +245,26 @@ class DataLoader(metaclass=ABCMeta):
 
     def compress(
         self,
+        n_jobs: int = 1,
+        screen_threshold: Optional[float] = None,
+        cache: Optional[CompressionCache] = None,
     ) -> Tuple["DataLoader", Dict]:
+        """Compress the dataset with `compress_dataset`, except the protected features.
+
+        Args:
+            n_jobs: int
+                Number of processes of the redundancy scan. Default: 1.
+            screen_threshold: Optional[float]
+                Correlation screen of the redundancy scan. Default: None.
+            cache: Optional[CompressionCache]
+                Cache of the redundancy scores. Default: None.
+        """
         to_compress = self.data.copy().drop(
             columns=self.compression_protected_features()
         )
-        compressed, context = compress_dataset(to_compress)
+        compressed, context = compress_dataset(
+            to_compress, n_jobs=n_jobs, screen_threshold=screen_threshold, cache=cache
+        )
         for protected_col in self.compression_protected_features():
             compressed[protected_col] = self.data[protected_col]
 
@@ -224,24 +289,11 @@ class DataLoader(metaclass=ABCMeta):
             encoders = {}
 
             for col in encoded.columns:
-                if (
-                    encoded[col].infer_objects().dtype.kind == "i"
-                    and encoded[col].min() == 0
-                    and encoded[col].max() == len(encoded[col].unique()) - 1
-                ):
+                encoder = fit_column_encoder(encoded[col])
+                if encoder is None:
                     continue
-
-                if (
-                    encoded[col].infer_objects().dtype.kind in ["O", "b"]
-                    or len(encoded[col].unique()) < 15
-                ):
-                    encoder = LabelEncoder().fit(encoded[col])
-                    encoded[col] = encoder.transform(encoded[col])
-                    encoders[col] = encoder
-                elif encoded[col].infer_objects().dtype.kind in ["M"]:
-                    encoder = DatetimeEncoder().fit(encoded[col])
-                    encoded[col] = encoder.transform(encoded[col]).values
-                    encoders[col] = encoder
+                encoded[col] = np.asarray(encoder.transform(encoded[col]))
+                encoders[col] = encoder
         return self.from_info(encoded, self.info()), encoders
 
     def decode(
@@ -439,6 +491,7 @@ class GenericDataLoader(DataLoader):
 
     def __setitem__(self, feature: str, val: Any) -> None:
         self.data[feature] = val
+        self._invalidate_hash()
 
     def _train_test_split(self) -> Tuple:
         stratify = None
@@ -660,6 +713,7 @@ class SurvivalAnalysisDataLoader(DataLoader):
 
     def __setitem__(self, feature: str, val: Any) -> None:
         self.data[feature] = val
+        self._invalidate_hash()
 
     def train(self) -> "DataLoader":
         stratify = self.data[self.target_column]
@@ -690,6 +744,343 @@ class SurvivalAnalysisDataLoader(DataLoader):
         return True
 
 
+def _ragged_take(
+    offsets: np.ndarray, subjects: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """The rows and the offsets of a selection of subjects of a ragged array."""
+    lengths = (offsets[1:] - offsets[:-1])[subjects]
+    new_offsets = np.zeros(len(subjects) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_offsets[1:])
+
+    rows = np.arange(new_offsets[-1]) + np.repeat(
+        offsets[:-1][subjects] - new_offsets[:-1], lengths
+    )
+    return rows, new_offsets
+
+
+def _flatten(items: List) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack a list of sequences into a flat array and the offsets of each sequence."""
+    offsets = np.zeros(len(items) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in items], out=offsets[1:])
+    if offsets[-1] == 0:
+        return np.zeros(0), offsets
+    return np.concatenate([np.asarray(item) for item in items if len(item)]), offsets
+
+
+def _common_dtype(dtypes: list) -> Any:
+    """The type of a feature stacked from DataFrames of the given types: the numpy promotion of the numeric types, object otherwise."""
+    if not len(dtypes):
+        return np.dtype(np.float64)
+    if all(isinstance(dtype, np.dtype) and dtype.kind in "iufb" for dtype in dtypes):
+        return np.result_type(*dtypes)
+    if all(dtype == dtypes[0] for dtype in dtypes):
+        return dtypes[0]
+    return np.dtype(object)
+
+
+def _nan_dtype(dtype: Any) -> Any:
+    """The type pandas gives to a feature of type `dtype` with NaNs."""
+    if dtype.kind in "iu":
+        return np.dtype(np.float64)
+    if dtype.kind == "b":
+        return np.dtype(object)
+    return dtype
+
+
+def _inferred_frame(values: np.ndarray, columns: list) -> pd.DataFrame:
+    """The frame pandas builds from the rows of `values` as lists of Python scalars."""
+    if values.dtype.kind == "f":
+        values = values.astype(np.float64, copy=False)
+    elif values.dtype.kind in "iu":
+        values = values.astype(np.int64, copy=False)
+
+    df = pd.DataFrame(values, columns=columns)
+    if values.dtype == object:
+        df = df.infer_objects()
+    return df
+
+
+class TemporalArrays:
+    """Array-backed ragged temporal data.
+
+    The observations of all the subjects are stacked in a single `values` array, and the observations of subject `i` are its rows `offsets[i]:offsets[i + 1]`. The row labels of the observations are stacked in `index`, with the same offsets, and the observation times are stacked in `times`, with their own `time_offsets`, as their lengths may differ from the number of observations.
+
+    Args:
+        values: np.ndarray
+            The stacked observations, of shape (n_rows, n_features).
+        offsets: np.ndarray
+            The offsets of the observations of each subject, of shape (n_subjects + 1,).
+        features: list
+            The names of the features.
+        index: np.ndarray
+            The stacked row labels of the observations.
+        times: np.ndarray
+            The stacked observation times.
+        time_offsets: np.ndarray
+            The offsets of the observation times of each subject, of shape (n_subjects + 1,).
+        dtypes: Optional[list]
+            The type of each feature in the DataFrames of the subjects, as `values` holds all the features in a single type. Default: None, the type of `values`.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        offsets: np.ndarray,
+        features: list,
+        index: np.ndarray,
+        times: np.ndarray,
+        time_offsets: np.ndarray,
+        dtypes: Optional[list] = None,
+    ) -> None:
+        if len(offsets) != len(time_offsets):
+            raise ValueError("Temporal data and observation times mismatch")
+        if values.shape != (offsets[-1], len(features)) or len(index) != len(values):
+            raise ValueError(
+                f"Invalid temporal values of shape {values.shape} for {offsets[-1]} rows and {len(features)} features"
+            )
+        if dtypes is not None and len(dtypes) != len(features):
+            raise ValueError("Temporal features and types mismatch")
+
+        self.values = values
+        self.offsets = offsets
+        self.features = list(features)
+        self.index = index
+        self.times = times
+        self.time_offsets = time_offsets
+        self.dtypes = dtypes
+
+    @staticmethod
+    def from_frames(
+        temporal_data: List[pd.DataFrame],
+        observation_times: List,
+        features: Optional[list] = None,
+    ) -> "TemporalArrays":
+        """Stack the temporal DataFrames of the subjects.
+
+        Args:
+            temporal_data: List[pd.DataFrame]
+                The temporal data of each subject.
+            observation_times: List
+                The observation times of each subject.
+            features: Optional[list]
+                The features to stack, in order. The features missing from a DataFrame are filled with NaNs. Default: all the features, sorted.
+        """
+        if len(temporal_data) != len(observation_times):
+            raise ValueError("Temporal data and observation times mismatch")
+        if features is None:
+            features = TimeSeriesDataLoader.unique_temporal_features(temporal_data)
+
+        blocks = []
+        dtypes: List[list] = [[] for _ in features]
+        for item in temporal_data:
+            if list(item.columns) != features:
+                item = item.reindex(columns=features)
+            blocks.append(item.to_numpy())
+            for feature_dtypes, dtype in zip(dtypes, item.dtypes):
+                feature_dtypes.append(dtype)
+
+        offsets = np.zeros(len(temporal_data) + 1, dtype=np.int64)
+        np.cumsum([len(block) for block in blocks], out=offsets[1:])
+        if len(blocks):
+            values = np.concatenate(blocks)
+            index = np.concatenate([item.index.to_numpy() for item in temporal_data])
+        else:
+            values = np.zeros((0, len(features)))
+            index = np.zeros(0, dtype=np.int64)
+
+        times, time_offsets = _flatten(observation_times)
+
+        return TemporalArrays(
+            values,
+            offsets,
+            features,
+            index,
+            times,
+            time_offsets,
+            dtypes=[_common_dtype(feature_dtypes) for feature_dtypes in dtypes],
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self.offsets[1:] - self.offsets[:-1]
+
+    @property
+    def window_len(self) -> int:
+        return int(self.lengths.max()) if len(self) else 0
+
+    def take(self, subjects: np.ndarray) -> "TemporalArrays":
+        """The data of a selection of subjects, in the order of `subjects`."""
+        rows, offsets = _ragged_take(self.offsets, subjects)
+        time_rows, time_offsets = _ragged_take(self.time_offsets, subjects)
+        return TemporalArrays(
+            self.values[rows],
+            offsets,
+            self.features,
+            self.index[rows],
+            self.times[time_rows],
+            time_offsets,
+            dtypes=self.dtypes,
+        )
+
+    def _frame_dtypes(self) -> Dict[Any, Any]:
+        """The types to restore in the DataFrames, for the features whose type is not the type of `values`."""
+        if self.dtypes is None:
+            return {}
+
+        missing = None
+        dtypes = {}
+        for idx, (feature, dtype) in enumerate(zip(self.features, self.dtypes)):
+            if dtype == self.values.dtype:
+                continue
+            if dtype.kind in "iub":
+                if missing is None:
+                    missing = pd.isna(self.values).any(axis=0)
+                if missing[idx]:
+                    # the padding or the missing values are NaNs
+                    dtype = _nan_dtype(dtype)
+            if dtype != self.values.dtype:
+                dtypes[feature] = dtype
+        return dtypes
+
+    def frames(self) -> List[pd.DataFrame]:
+        """The temporal DataFrame of each subject, with the type of each feature restored.
+
+        The DataFrames are views of `values` if all the features have the type of `values`.
+        """
+        columns = pd.Index(self.features)
+        dtypes = self._frame_dtypes()
+
+        # the consecutive integer labels are cheaper as ranges
+        ranges = np.zeros(len(self), dtype=bool)
+        if self.index.dtype.kind in "iu":
+            steps = np.diff(self.index) == 1
+            broken = np.concatenate([[0], np.cumsum(~steps)])
+            ranges = broken[self.offsets[1:] - 1] == broken[self.offsets[:-1]]
+            ranges &= self.lengths > 0
+
+        frames = []
+        for start, end, is_range in zip(self.offsets[:-1], self.offsets[1:], ranges):
+            if is_range:
+                first = self.index[start]
+                index = pd.RangeIndex(first, first + end - start)
+            else:
+                index = pd.Index(self.index[start:end])
+            frame = pd.DataFrame(
+                self.values[start:end], index=index, columns=columns, copy=False
+            )
+            if dtypes:
+                frame = frame.astype(dtypes)
+            frames.append(frame)
+        return frames
+
+    def observation_times(self) -> List[list]:
+        """The observation times of each subject."""
+        return [
+            self.times[start:end].tolist()
+            for start, end in zip(self.time_offsets[:-1], self.time_offsets[1:])
+        ]
+
+    def tensor(self, fill: Any = np.nan) -> Tuple[np.ndarray, np.ndarray]:
+        """The padded 3D tensor of the observations, of shape (n_subjects, window_len, n_features).
+
+        If all the subjects have the same number of observations, the tensor is a view of `values`.
+
+        Returns:
+            The tensor, and the boolean mask of the observed steps, of shape (n_subjects, window_len).
+        """
+        n_subjects, window_len = len(self), self.window_len
+        steps = np.arange(window_len)
+        observed = steps[None, :] < self.lengths[:, None]
+        if observed.all():
+            tensor = self.values.reshape(n_subjects, window_len, len(self.features))
+            return tensor, observed
+
+        dtype = np.result_type(self.values.dtype, np.asarray(fill).dtype)
+        tensor = np.full(
+            (n_subjects, window_len, len(self.features)), fill, dtype=dtype
+        )
+        tensor[observed] = self.values
+        return tensor, observed
+
+    def pad(self, fill: Any = np.nan) -> "TemporalArrays":
+        """Pad the observations and the observation times of every subject to `window_len` steps.
+
+        The padded rows are labelled after the last label of each subject, and the observation times longer than `window_len` are kept as is.
+        """
+        n_subjects, window_len = len(self), self.window_len
+        tensor, observed = self.tensor(fill=fill)
+        values = tensor.reshape(n_subjects * window_len, len(self.features))
+
+        # the labels of the padding follow the last label of each subject
+        index = np.empty(n_subjects * window_len, dtype=self.index.dtype)
+        index[observed.reshape(-1)] = self.index
+        padding = ~observed
+        if padding.any():
+            start = np.zeros(n_subjects, dtype=self.index.dtype)
+            nonempty = self.lengths > 0
+            if nonempty.any():
+                start[nonempty] = (
+                    np.maximum.reduceat(self.index, self.offsets[:-1][nonempty]) + 1
+                )
+            steps = np.arange(window_len)[None, :] - self.lengths[:, None]
+            index[padding.reshape(-1)] = (start[:, None] + steps)[padding]
+
+        time_lengths = self.time_offsets[1:] - self.time_offsets[:-1]
+        time_offsets = np.zeros(n_subjects + 1, dtype=np.int64)
+        np.cumsum(np.maximum(time_lengths, window_len), out=time_offsets[1:])
+        times = np.full(
+            time_offsets[-1], np.nan, dtype=np.result_type(self.times.dtype, np.float64)
+        )
+        shift = np.repeat(time_offsets[:-1] - self.time_offsets[:-1], time_lengths)
+        times[np.arange(len(self.times)) + shift] = self.times
+
+        return TemporalArrays(
+            values,
+            np.arange(n_subjects + 1, dtype=np.int64) * window_len,
+            self.features,
+            index,
+            times,
+            time_offsets,
+            dtypes=self.dtypes,
+        )
+
+    def mask(self, fill: Any = 0) -> "TemporalArrays":
+        """Fill the missing values with `fill`, and add a `masked_<feature>` indicator for each feature, 1 if the value is observed.
+
+        If no value is missing, the data is returned as is. Otherwise, the missing observation times are filled too.
+        """
+        missing = pd.isna(self.values)
+        if not missing.any():
+            return self
+
+        values = np.where(missing, fill, self.values)
+        values = np.concatenate([values, (~missing).astype(values.dtype)], axis=1)
+        features = self.features + [f"masked_{feat}" for feat in self.features]
+        times = np.where(pd.isna(self.times), fill, self.times)
+
+        dtypes = None
+        if self.dtypes is not None:
+            # the filled features keep the type they had with the NaNs
+            dtypes = [
+                _nan_dtype(dtype) if has_missing else dtype
+                for dtype, has_missing in zip(self.dtypes, missing.any(axis=0))
+            ]
+            dtypes += [np.dtype(int)] * len(self.features)
+
+        return TemporalArrays(
+            values,
+            self.offsets,
+            features,
+            self.index,
+            times,
+            self.time_offsets,
+            dtypes=dtypes,
+        )
+
+
 class TimeSeriesDataLoader(DataLoader):
     """
     .. inheritance-diagram:: synthcity.plugins.core.dataloader.TimeSeriesDataLoader
@@ -931,16 +1322,15 @@ class TimeSeriesDataLoader(DataLoader):
             )
 
         if as_numpy:
-            longest_observation_seq = max([len(seq) for seq in temporal_data])
-            padded_temporal_data = np.zeros(
-                (len(temporal_data), longest_observation_seq, 5)
+            arrays = TemporalArrays.from_frames(
+                temporal_data,
+                observation_times,
+                features=list(temporal_data[0].columns),
             )
-            mask = np.ones((len(temporal_data), longest_observation_seq, 5), dtype=bool)
-            for i, arr in enumerate(temporal_data):
-                padded_temporal_data[i, : arr.shape[0], :] = arr  # Copy the actual data
-                mask[
-                    i, : arr.shape[0], :
-                ] = False  # Set mask to False where actual data is present
+            longest_observation_seq = arrays.window_len
+            padded_temporal_data, observed = arrays.tensor(fill=0.0)
+            # masked where no data is present
+            mask = np.repeat(~observed[..., None], len(arrays.features), axis=2)
 
             masked_temporal_data = ma.masked_array(padded_temporal_data, mask)
             return (
@@ -971,6 +1361,7 @@ class TimeSeriesDataLoader(DataLoader):
 
     def __setitem__(self, feature: str, val: Any) -> None:
         self.data["seq_data"][feature] = val
+        self._invalidate_hash()
 
     def ids(self) -> list:
         id_col = self.seq_info["seq_id_feature"]
@@ -1020,6 +1411,7 @@ class TimeSeriesDataLoader(DataLoader):
             self.data["temporal_data"][idx] = self.data["temporal_data"][idx].fillna(
                 value
             )
+        self._invalidate_hash()
 
         return self
 
@@ -1039,23 +1431,9 @@ class TimeSeriesDataLoader(DataLoader):
         observation_times: List,
         outcome: Optional[pd.DataFrame],
     ) -> Any:
-        fill = np.nan
-
-        temporal_features = TimeSeriesDataLoader.unique_temporal_features(temporal_data)
-
-        for idx, item in enumerate(temporal_data):
-            # handling missing features
-            for col in temporal_features:
-                if col not in item.columns:
-                    item[col] = fill
-            item = item[temporal_features]
-
-            if list(item.columns) != list(temporal_features):
-                raise RuntimeError("Invalid features for packing")
-
-            temporal_data[idx] = item.fillna(fill)
+        arrays = TemporalArrays.from_frames(temporal_data, observation_times)
 
-        return static_data, temporal_data, observation_times, outcome
+        return static_data, arrays.frames(), observation_times, outcome
 
     @staticmethod
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -1065,53 +1443,9 @@ class TimeSeriesDataLoader(DataLoader):
         observation_times: List,
         outcome: Optional[pd.DataFrame],
     ) -> Any:
-        fill = np.nan
-
-        (
-            static_data,
-            temporal_data,
-            observation_times,
-            outcome,
-        ) = TimeSeriesDataLoader.pad_raw_features(
-            static_data, temporal_data, observation_times, outcome
-        )
-        max_window_len = max([len(t) for t in temporal_data])
-        temporal_features = TimeSeriesDataLoader.unique_temporal_features(temporal_data)
-
-        for idx, item in enumerate(temporal_data):
-            if len(item) != max_window_len:
-                pads = fill * np.ones(
-                    (max_window_len - len(item), len(temporal_features))
-                )
-                start = 0
-                if len(item.index) > 0:
-                    start = max(item.index) + 1
-                pads_df = pd.DataFrame(
-                    pads,
-                    index=[start + i for i in range(len(pads))],
-                    columns=item.columns,
-                )
-                item = pd.concat([item, pads_df])
+        arrays = TemporalArrays.from_frames(temporal_data, observation_times).pad()
 
-            # handle missing time points
-            if list(item.columns) != list(temporal_features):
-                raise RuntimeError(
-                    f"Invalid features {item.columns}. Expected {temporal_features}"
-                )
-            if len(item) != max_window_len:
-                raise RuntimeError("Invalid window len")
-
-            temporal_data[idx] = item
-
-        observation_times_padded = []
-        for idx, item in enumerate(observation_times):
-            item = list(item)
-            if len(item) != max_window_len:
-                pads = fill * np.ones(max_window_len - len(item))
-                item.extend(pads.tolist())
-            observation_times_padded.append(item)
-
-        return static_data, temporal_data, observation_times_padded, outcome
+        return static_data, arrays.frames(), arrays.observation_times(), outcome
 
     # Masking helpers
     @staticmethod
@@ -1140,27 +1474,12 @@ class TimeSeriesDataLoader(DataLoader):
         observation_times: List,
         fill: Any = 0,
     ) -> Any:
-        nan_cnt = 0
-        for item in temporal_data:
-            nan_cnt += np.asarray(np.isnan(item)).sum()
-
-        if nan_cnt == 0:
+        arrays = TemporalArrays.from_frames(temporal_data, observation_times)
+        masked = arrays.mask(fill=fill)
+        if masked is arrays:
             return temporal_data, observation_times
 
-        temporal_features = TimeSeriesDataLoader.unique_temporal_features(temporal_data)
-        masked_features = [f"masked_{feat}" for feat in temporal_features]
-
-        for idx, item in enumerate(temporal_data):
-            item[masked_features] = (~np.isnan(item)).astype(int)
-            item = item.fillna(fill)
-            temporal_data[idx] = item
-
-        for idx, item in enumerate(observation_times):
-            item = np.nan_to_num(item, nan=fill).tolist()
-
-            observation_times[idx] = item
-
-        return temporal_data, observation_times
+        return masked.frames(), masked.observation_times()
 
     @staticmethod
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -1174,29 +1493,67 @@ class TimeSeriesDataLoader(DataLoader):
             temporal_features
         )
 
-        missing_horizons = []
-        for idx, item in enumerate(temporal_data):
-            # handle existing mask
+        columns = list(temporal_data[0].columns) if len(temporal_data) else []
+        if all(list(item.columns) == columns for item in temporal_data):
+            # same features for all the subjects: work on the stacked values
+            arrays = TemporalArrays.from_frames(
+                temporal_data, observation_times, features=columns
+            )
+            values = arrays.values
             if len(mask_features) > 0:
-                mask = temporal_data[idx][mask_features].astype(bool)
-                item[~mask] = np.nan
+                if values.dtype.kind in "iub":
+                    values = values.astype(float)
+                mask_idx = [columns.index(feat) for feat in mask_features]
+                mask = values[:, mask_idx]
+                values[:, mask_idx] = np.where(mask.astype(bool), mask, np.nan)
 
-            item_missing_rows = item.isna().sum(axis=1).values
-            missing_horizons.append(item_missing_rows == len(temporal_features))
+            n_missing = pd.isna(values).sum(axis=1)
+            missing_horizons = n_missing == len(temporal_features)
 
             # TODO: review impact on horizons
-            temporal_data[idx] = item.dropna()
-
-        observation_times_unmasked = []
-        for idx, item in enumerate(observation_times):
-            item = list(item)
-
-            for midx, mval in enumerate(missing_horizons[idx]):
-                if mval:
-                    item[midx] = np.nan
-
-            local_horizons = list(filter(lambda v: v == v, item))
-            observation_times_unmasked.append(local_horizons)
+            observed = np.concatenate([[0], np.cumsum(n_missing == 0)])
+            temporal_data = TemporalArrays(
+                values[n_missing == 0],
+                observed[arrays.offsets],
+                columns,
+                arrays.index[n_missing == 0],
+                arrays.times,
+                arrays.time_offsets,
+                dtypes=arrays.dtypes,
+            ).frames()
+            horizon_offsets = arrays.offsets
+        else:
+            horizons = []
+            for idx, item in enumerate(temporal_data):
+                # handle existing mask
+                if len(mask_features) > 0:
+                    mask = temporal_data[idx][mask_features].astype(bool)
+                    item[~mask] = np.nan
+
+                item_missing_rows = item.isna().sum(axis=1).values
+                horizons.append(item_missing_rows == len(temporal_features))
+
+                # TODO: review impact on horizons
+                temporal_data[idx] = item.dropna()
+            missing_horizons, horizon_offsets = _flatten(horizons)
+
+        # the observation times of the missing horizons and the missing times are dropped
+        times, time_offsets = _flatten(observation_times)
+        lengths = horizon_offsets[1:] - horizon_offsets[:-1]
+        missing = np.flatnonzero(missing_horizons)
+        subjects = np.repeat(np.arange(len(lengths)), lengths)[missing]
+        steps = missing - horizon_offsets[subjects]
+        if (steps >= time_offsets[subjects + 1] - time_offsets[subjects]).any():
+            raise ValueError("Missing observation times for the temporal data")
+
+        observed = ~pd.isna(times)
+        observed[time_offsets[subjects] + steps] = False
+        time_offsets = np.concatenate([[0], np.cumsum(observed)])[time_offsets]
+        times = times[observed]
+        observation_times_unmasked = [
+            times[start:end].tolist()
+            for start, end in zip(time_offsets[:-1], time_offsets[1:])
+        ]
 
         return temporal_data, observation_times_unmasked
 
@@ -1210,36 +1567,13 @@ class TimeSeriesDataLoader(DataLoader):
         only_features: Any = False,
         fill: Any = 0,
     ) -> Any:
-        if only_features:
-            (
-                static_data,
-                temporal_data,
-                observation_times,
-                outcome,
-            ) = TimeSeriesDataLoader.pad_raw_features(
-                static_data,
-                temporal_data,
-                observation_times,
-                outcome,
-            )
-        else:
-            (
-                static_data,
-                temporal_data,
-                observation_times,
-                outcome,
-            ) = TimeSeriesDataLoader.pad_raw_data(
-                static_data,
-                temporal_data,
-                observation_times,
-                outcome,
-            )
+        # pad_raw_features/pad_raw_data, then mask_temporal_data
+        arrays = TemporalArrays.from_frames(temporal_data, observation_times)
+        if not only_features:
+            arrays = arrays.pad()
+        arrays = arrays.mask(fill=fill)
 
-        temporal_data, observation_times = TimeSeriesDataLoader.mask_temporal_data(
-            temporal_data, observation_times, fill=fill
-        )
-
-        return static_data, temporal_data, observation_times, outcome
+        return static_data, arrays.frames(), arrays.observation_times(), outcome
 
     @staticmethod
     def sequential_view(
@@ -1251,48 +1585,55 @@ class TimeSeriesDataLoader(DataLoader):
         time_id_col: str = "seq_time_id",
         seq_offset: int = 0,
     ) -> Tuple[pd.DataFrame, dict]:  # sequential dataframe, loader info
-        (
-            static_data,
-            temporal_data,
-            observation_times,
-            outcome,
-        ) = TimeSeriesDataLoader.pad_and_mask(
-            static_data, temporal_data, observation_times, outcome, only_features=True
-        )
+        if static_data is None or outcome is None:
+            raise ValueError(
+                "The sequential view requires the static data and the outcome"
+            )
+
+        # the padded features and the masks of pad_and_mask
+        arrays = TemporalArrays.from_frames(temporal_data, observation_times).mask()
+
         raw_static_features = list(static_data.columns)
         static_features = [f"seq_static_{col}" for col in raw_static_features]
 
         raw_outcome_features = list(outcome.columns)
         outcome_features = [f"seq_out_{col}" for col in raw_outcome_features]
 
-        raw_temporal_features = TimeSeriesDataLoader.unique_temporal_features(
-            temporal_data
-        )
+        raw_temporal_features = sorted(np.unique(arrays.features).tolist())
         temporal_features = [f"seq_temporal_{col}" for col in raw_temporal_features]
-        cols = (
-            [id_col, time_id_col]
-            + static_features
-            + temporal_features
-            + outcome_features
-        )
 
-        seq = []
-        for sidx, static_item in static_data.iterrows():
-            real_tidx = 0
-            for tidx, temporal_item in temporal_data[sidx].iterrows():
-                local_seq_data = (
-                    [
-                        sidx + seq_offset,
-                        observation_times[sidx][real_tidx],
-                    ]
-                    + static_item[raw_static_features].values.tolist()
-                    + temporal_item[raw_temporal_features].values.tolist()
-                    + outcome.loc[sidx, raw_outcome_features].values.tolist()
-                )
-                seq.append(local_seq_data)
-                real_tidx += 1
+        # the rows of static_data index the temporal data
+        subjects = static_data.index.to_numpy()
+        if not np.array_equal(subjects, np.arange(len(arrays))):
+            arrays = arrays.take(subjects)
+        lengths = arrays.lengths
+
+        time_lengths = arrays.time_offsets[1:] - arrays.time_offsets[:-1]
+        if (time_lengths < lengths).any():
+            raise ValueError("Missing observation times for the temporal data")
+        steps = np.arange(arrays.offsets[-1]) - np.repeat(arrays.offsets[:-1], lengths)
+        times = arrays.times[np.repeat(arrays.time_offsets[:-1], lengths) + steps]
 
-        seq_df = pd.DataFrame(seq, columns=cols)
+        temporal_idx = [arrays.features.index(feat) for feat in raw_temporal_features]
+        seq_df = pd.concat(
+            [
+                pd.DataFrame({id_col: np.repeat(subjects + seq_offset, lengths)}),
+                _inferred_frame(times.reshape(-1, 1), [time_id_col]),
+                _inferred_frame(
+                    np.repeat(static_data.to_numpy(), lengths, axis=0), static_features
+                ),
+                _inferred_frame(arrays.values[:, temporal_idx], temporal_features),
+                _inferred_frame(
+                    np.repeat(
+                        outcome.loc[subjects, raw_outcome_features].to_numpy(),
+                        lengths,
+                        axis=0,
+                    ),
+                    outcome_features,
+                ),
+            ],
+            axis=1,
+        )
         info = {
             "seq_static_features": static_features,
             "seq_temporal_features": temporal_features,
@@ -1322,6 +1663,12 @@ class TimeSeriesDataLoader(DataLoader):
         temporal_data, observation_times = TimeSeriesDataLoader.unmask_temporal_data(
             temporal_data, observation_times
         )
+        # the features missing from a subject are filled with NaNs, as in the sequential view
+        temporal_features = TimeSeriesDataLoader.unique_temporal_features(temporal_data)
+        for idx, item in enumerate(temporal_data):
+            if len(item.columns) != len(temporal_features):
+                missing = [col for col in temporal_features if col not in item.columns]
+                temporal_data[idx] = item.reindex(columns=list(item.columns) + missing)
         seq_df, info = TimeSeriesDataLoader.sequential_view(
             static_data=static_data,
             temporal_data=temporal_data,
@@ -1352,33 +1699,37 @@ class TimeSeriesDataLoader(DataLoader):
         outcome_cols = info["seq_outcome_features"]
         new_outcome_cols = [feat.split("seq_out_")[1] for feat in outcome_cols]
 
-        ids = sorted(list(set(data[id_col])))
-
-        static_data = []
-        temporal_data = []
-        observation_times = []
-        outcome_data = []
+        # the rows of each id, in order of appearance, sorted by id
+        order = np.argsort(data[id_col].to_numpy(), kind="stable")
+        _, starts = np.unique(data[id_col].to_numpy()[order], return_index=True)
+        offsets = np.append(starts, len(data)).astype(np.int64)
 
-        for item_id in ids:
-            item_data = data[data[id_col] == item_id]
-
-            static_data.append(item_data[static_cols].head(1).values.squeeze().tolist())
-            outcome_data.append(
-                item_data[outcome_cols].head(1).values.squeeze().tolist()
-            )
-            local_temporal_data = item_data[temporal_cols].copy()
-            local_observation_times = item_data[time_col].values.tolist()
-            local_temporal_data.columns = new_temporal_cols
-            # TODO: review impact on horizons
-            local_temporal_data = local_temporal_data.dropna()
-
-            temporal_data.append(local_temporal_data)
-            observation_times.append(local_observation_times)
+        static_df = _inferred_frame(
+            data[static_cols].to_numpy()[order[starts]], new_static_cols
+        )
+        outcome_df = _inferred_frame(
+            data[outcome_cols].to_numpy()[order[starts]], new_outcome_cols
+        )
 
-        static_df = pd.DataFrame(static_data, columns=new_static_cols)
-        outcome_df = pd.DataFrame(outcome_data, columns=new_outcome_cols)
+        values = data[temporal_cols].to_numpy()[order]
+        # TODO: review impact on horizons
+        observed = ~pd.isna(values).any(axis=1)
+        temporal = TemporalArrays(
+            values[observed],
+            np.concatenate([[0], np.cumsum(observed)])[offsets],
+            new_temporal_cols,
+            data.index.to_numpy()[order][observed],
+            data[time_col].to_numpy()[order],
+            offsets,
+            dtypes=list(data[temporal_cols].dtypes),
+        )
 
-        return static_df, temporal_data, observation_times, outcome_df
+        return (
+            static_df,
+            temporal.frames(),
+            temporal.observation_times(),
+            outcome_df,
+        )
 
     def is_tabular(self) -> bool:
         return True
@@ -1758,6 +2109,9 @@ class ImageDataLoader(DataLoader):
 
     def compress(
         self,
+        n_jobs: int = 1,
+        screen_threshold: Optional[float] = None,
+        cache: Optional[CompressionCache] = None,
     ) -> Tuple["DataLoader", Dict]:
         return self, {}
 
@@ -1987,6 +2341,7 @@ class Syn_SeqDataLoader(DataLoader):
 
     def __setitem__(self, feature: str, val: Any) -> None:
         self.data[feature] = val
+        self._invalidate_hash()
 
     def train(self) -> "Syn_SeqDataLoader":
         ntrain = int(len(self.data) * self.train_size)
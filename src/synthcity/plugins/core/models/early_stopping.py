@@ -0,0 +1,155 @@
+# stdlib
+import copy
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+# third party
+import numpy as np
+import pandas as pd
+import torch
+from torch import nn
+
+# synthcity absolute
+from synthcity.metrics.core.context import EvaluationContext
+from synthcity.metrics.weighted_metrics import WeightedMetrics
+from synthcity.plugins.core.dataloader import GenericDataLoader, create_from_info
+
+
+class PatienceEvaluator:
+    """Early stopping on a patience metric, for the training loops of the generative models.
+
+    The validation set is optionally subsampled once to at most `max_samples` rows, and wrapped once in a DataLoader. The metric evaluates it in an EvaluationContext, so the real-side work (dense matrices, nearest neighbours, OneClass embeddings) is reused by all the evaluations. The weights of the best model are snapshotted by deep copy.
+
+    In asynchronous mode, each evaluation runs in a background thread on a copy of the model, while the training goes on. The score is accounted for at the next `step` or at `finish`, so the training can stop one evaluation later than in synchronous mode. The evaluations then share the global random state with the training, and the results are not reproducible.
+
+    Args:
+        metric: WeightedMetrics
+            The patience metric.
+        X: torch.Tensor
+            The validation set.
+        cond: Optional[torch.Tensor]
+            Optional conditional of the validation set, passed to the generating function.
+        patience: int
+            Max number of evaluations without improvement before stopping.
+        max_samples: Optional[int]
+            Max number of validation rows used by the metric. If None, the whole validation set is used. Default: None.
+        asynchronous: bool
+            Evaluate in a background thread. Default: False.
+        random_state: int
+            Random seed of the subsampling. Default: 0.
+    """
+
+    def __init__(
+        self,
+        metric: WeightedMetrics,
+        X: torch.Tensor,
+        cond: Optional[torch.Tensor] = None,
+        patience: int = 20,
+        max_samples: Optional[int] = None,
+        asynchronous: bool = False,
+        random_state: int = 0,
+    ) -> None:
+        if max_samples is not None and max_samples <= 0:
+            raise ValueError(f"Invalid max_samples {max_samples}")
+        if cond is not None and len(cond) != len(X):
+            raise ValueError("Expecting conditional with the same length as X")
+
+        if max_samples is not None and len(X) > max_samples:
+            rng = np.random.default_rng(random_state)
+            idx = torch.from_numpy(
+                np.sort(rng.choice(len(X), max_samples, replace=False))
+            )
+            X = X[idx.to(X.device)]
+            if cond is not None:
+                cond = cond[idx.to(cond.device)]
+
+        self.X_gt = GenericDataLoader(pd.DataFrame(X.detach().cpu().numpy()))
+        self.cond = cond
+        self.metric = metric.with_context(EvaluationContext(self.X_gt))
+        self.patience = patience
+        self.asynchronous = asynchronous
+
+        self.score = np.inf if metric.direction() == "minimize" else -np.inf
+        self.wait = 0
+        self.best_state: Optional[dict] = None
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Optional[Tuple[Future, nn.Module]] = None
+
+    def evaluate(
+        self,
+        model: nn.Module,
+        generate: Callable[[nn.Module, int, Optional[torch.Tensor]], Any],
+    ) -> float:
+        """Score the data generated by `generate(model, count, cond)` against the validation set."""
+        X_syn = generate(model, len(self.X_gt), self.cond)
+        if isinstance(X_syn, torch.Tensor):
+            X_syn = X_syn.detach().cpu().numpy()
+
+        X_syn = create_from_info(pd.DataFrame(np.asarray(X_syn)), self.X_gt.info())
+        return self.metric.evaluate(self.X_gt, X_syn)
+
+    def _improves(self, score: float) -> bool:
+        if self.metric.direction() == "minimize":
+            improves = score < self.score
+        else:
+            improves = score > self.score
+
+        if improves:
+            self.score = score
+            self.wait = 0
+        else:
+            self.wait += 1
+
+        return improves
+
+    def _collect(self) -> None:
+        if self._pending is None:
+            return
+
+        future, model = self._pending
+        self._pending = None
+        # the model is a private copy, its weights are not modified anymore
+        if self._improves(future.result()):
+            self.best_state = model.state_dict()
+
+    def step(
+        self,
+        model: nn.Module,
+        generate: Callable[[nn.Module, int, Optional[torch.Tensor]], Any],
+    ) -> bool:
+        """Evaluate the current weights of `model`.
+
+        Args:
+            model: nn.Module
+                The module whose weights are evaluated and snapshotted.
+            generate: Callable
+                Generate `count` rows with the model, as `generate(model, count, cond)`.
+
+        Returns:
+            True if the patience is exhausted.
+        """
+        if not self.asynchronous:
+            if self._improves(self.evaluate(model, generate)):
+                self.best_state = copy.deepcopy(model.state_dict())
+            return self.wait >= self.patience
+
+        self._collect()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+
+        model = copy.deepcopy(model)
+        self._pending = (self._executor.submit(self.evaluate, model, generate), model)
+
+        return self.wait >= self.patience
+
+    def finish(self) -> Optional[dict]:
+        """Wait for the pending evaluation, and return the weights of the best model, if any."""
+        try:
+            self._collect()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+        return self.best_state
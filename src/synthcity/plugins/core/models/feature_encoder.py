@@ -89,6 +89,11 @@ class FeatureEncoder(TransformerMixin, BaseEstimator):  # type: ignore
         else:
             return pd.DataFrame(out, columns=self.feature_names_out)
 
+    def transform_array(self, x: np.ndarray) -> np.ndarray:
+        """Same as `transform`, on the values of the feature, without building a DataFrame."""
+        out = self._transform(validate_shape(x, self.n_dim_in))
+        return validate_shape(out, self.n_dim_out)
+
     def _transform(self, x: np.ndarray) -> np.ndarray:
         return x
 
@@ -120,6 +125,11 @@ class FeatureEncoder(TransformerMixin, BaseEstimator):  # type: ignore
         x = validate_shape(x, 1)
         return pd.Series(x, name=self.feature_name_in)
 
+    def inverse_transform_array(self, data: np.ndarray) -> np.ndarray:
+        """Same as `inverse_transform`, on the encoded values, without building a Series."""
+        x = self._inverse_transform(data.reshape(self._out_shape))
+        return validate_shape(x, 1)
+
     def _inverse_transform(self, data: np.ndarray) -> np.ndarray:
         return data
 
@@ -179,7 +189,28 @@ class DatetimeEncoder(FeatureEncoder):
 
 
 class BayesianGMMEncoder(FeatureEncoder):
-    """Bayesian Gaussian Mixture encoder"""
+    """Bayesian Gaussian Mixture encoder
+
+    For large columns, the mixture can be fitted on a stratified subsample (`max_samples`), or with warm-started EM over successive stratified batches (`incremental`). The modes of the full column are then assigned in batches of `batch_size` rows.
+
+    Args:
+        n_components: int
+            Maximum number of mixture components.
+        random_state: int
+            Random seed, for the mixture and the subsampling.
+        weight_threshold: float
+            Minimum weight of a component.
+        clip_output: bool
+            Clip the normalized values to (-0.99, 0.99).
+        std_multiplier: int
+            Scale of the normalized values, in standard deviations.
+        max_samples: Optional[int]
+            If the column has more rows, fit the mixture on a stratified subsample of `max_samples` rows. Default: None, fit on the full column.
+        incremental: bool
+            With `max_samples`, fit the mixture on all the rows, one stratified batch of `max_samples` rows at a time, each EM run starting from the previous solution.
+        batch_size: Optional[int]
+            Number of rows encoded at once. Default: None, the full column.
+    """
 
     n_dim_in = 2
 
@@ -190,29 +221,67 @@ class BayesianGMMEncoder(FeatureEncoder):
         weight_threshold: float = 0.005,
         clip_output: bool = True,
         std_multiplier: int = 4,
+        max_samples: Optional[int] = None,
+        incremental: bool = False,
+        batch_size: Optional[int] = None,
     ) -> None:
+        if max_samples is not None and max_samples < n_components:
+            raise ValueError(
+                f"max_samples must be at least n_components, got {max_samples}"
+            )
+        if batch_size is not None and batch_size <= 0:
+            raise ValueError(f"Invalid batch_size {batch_size}")
+
         self.n_components = n_components
+        self.random_state = random_state
         self.weight_threshold = weight_threshold
         self.clip_output = clip_output
         self.std_multiplier = std_multiplier
+        self.max_samples = max_samples
+        self.incremental = incremental
+        self.batch_size = batch_size
         self.model = BayesianGaussianMixture(
             n_components=n_components,
             random_state=random_state,
             weight_concentration_prior=1e-3,
+            warm_start=incremental,
         )
 
+    def _fit_batches(self, x: np.ndarray) -> List[np.ndarray]:
+        """Split the rows in stratified batches of at most `max_samples` rows.
+
+        The sorted column is cut in strata of `n_batches` consecutive values, and each batch draws one random row per stratum, so every batch follows the full distribution, tails included.
+        """
+        n = len(x)
+        if self.max_samples is None or n <= self.max_samples:
+            return [np.arange(n)]
+
+        rng = np.random.default_rng(self.random_state)
+        n_batches = int(np.ceil(n / self.max_samples))
+
+        order = np.argsort(x[:, 0], kind="stable")
+        strata = np.arange(n) // n_batches
+        shuffled = order[np.lexsort((rng.random(n), strata))]
+        batch_ids = np.arange(n) % n_batches
+
+        if not self.incremental:
+            return [shuffled[batch_ids == 0]]
+
+        return [shuffled[batch_ids == b] for b in rng.permutation(n_batches)]
+
     def _fit(self, x: np.ndarray, **kwargs: Any) -> "BayesianGaussianMixture":
         self.min_value = x.min()
         self.max_value = x.max()
 
-        self.model.fit(x)
+        for batch in self._fit_batches(x):
+            self.model.fit(x[batch])
         self.weights = self.model.weights_
         self.means = self.model.means_.reshape(-1)
         self.stds = np.sqrt(self.model.covariances_).reshape(-1)
 
         return self
 
-    def _transform(self, x: np.ndarray) -> np.ndarray:
+    def _transform_batch(self, x: np.ndarray, out: np.ndarray) -> None:
         means = self.means.reshape(1, -1)
         stds = self.stds.reshape(1, -1)
 
@@ -227,10 +296,19 @@ class BayesianGMMEncoder(FeatureEncoder):
         normalized = normalized_values[np.arange(len(x)), components]
         if self.clip_output:  # why use 0.99 instead of 1?
             normalized = np.clip(normalized, -0.99, 0.99)
-        normalized = normalized.reshape(-1, 1)
 
-        components = np.eye(self.n_components, dtype=int)[components]
-        return np.hstack([normalized, components])
+        out[:, 0] = normalized
+        out[:, 1:] = 0
+        out[np.arange(len(x)), components + 1] = 1
+
+    def _transform(self, x: np.ndarray) -> np.ndarray:
+        out = np.empty((len(x), self.n_components + 1))
+        batch_size = self.batch_size or max(len(x), 1)
+        for start in range(0, len(x), batch_size):
+            self._transform_batch(
+                x[start : start + batch_size], out[start : start + batch_size]
+            )
+        return out
 
     def get_feature_names_out(self) -> List[str]:
         name = self.feature_name_in
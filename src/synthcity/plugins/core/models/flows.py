@@ -1,4 +1,5 @@
 # stdlib
+import copy
 from typing import Any, Optional, Tuple
 
 # third party
@@ -255,7 +256,7 @@ class NormalizingFlows(nn.Module):
                         X_val, patience_score, patience
                     )
                     if save:
-                        best_state_dict = self.state_dict()
+                        best_state_dict = copy.deepcopy(self.state_dict())
 
                 if patience >= self.patience and it >= self.n_iter_min:
                     break
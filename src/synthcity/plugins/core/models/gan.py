@@ -1,9 +1,8 @@
 # stdlib
-from typing import Any, Callable, List, Optional, Tuple
+from typing import Any, Callable, List, Optional, Tuple, Union
 
 # third party
 import numpy as np
-import pandas as pd
 import torch
 from opacus import PrivacyEngine
 from pydantic import validate_arguments
@@ -16,8 +15,10 @@ import synthcity.logger as log
 from synthcity.metrics.weighted_metrics import WeightedMetrics
 from synthcity.utils.constants import DEVICE
 from synthcity.utils.reproducibility import clear_cache, enable_reproducible_results
+from synthcity.utils.samplers import BatchIterator
 
 # synthcity relative
+from .early_stopping import PatienceEvaluator
 from .mlp import MLP
 
 
@@ -102,6 +103,10 @@ class GAN(nn.Module):
             Max number of iterations without any improvement before early stopping is trigged.
         patience_metric: Optional[WeightedMetrics]
             If not None, the metric is used for evaluation the criterion for early stopping.
+        patience_max_samples: Optional[int]
+            Max number of validation rows used by the patience metric. If None, the whole validation set is used. Default: None.
+        patience_async: bool
+            Evaluate the patience metric in a background thread, on a copy of the generator, while the training goes on. The early stopping decisions are then delayed by one evaluation, and not reproducible. Default: False.
         # privacy settings
         dp_enabled: bool
             Train the discriminator with Differential Privacy guarantees
@@ -157,6 +162,8 @@ class GAN(nn.Module):
         n_iter_print: int = 10,
         patience: int = 20,
         patience_metric: Optional[WeightedMetrics] = None,
+        patience_max_samples: Optional[int] = None,
+        patience_async: bool = False,
         # privacy settings
         dp_enabled: bool = False,
         dp_delta: Optional[float] = None,
@@ -221,6 +228,8 @@ class GAN(nn.Module):
         self.n_iter_min = n_iter_min
         self.patience = patience
         self.patience_metric = patience_metric
+        self.patience_max_samples = patience_max_samples
+        self.patience_async = patience_async
         self.batch_size = batch_size
         self.clipping_value = clipping_value
 
@@ -299,6 +308,14 @@ class GAN(nn.Module):
         self,
         count: int,
         cond: Optional[torch.Tensor] = None,
+    ) -> torch.Tensor:
+        return self._forward_with(self.generator, count, cond)
+
+    def _forward_with(
+        self,
+        generator: nn.Module,
+        count: int,
+        cond: Optional[torch.Tensor] = None,
     ) -> torch.Tensor:
         if cond is None and self.n_units_conditional > 0:
             # sample from the original conditional
@@ -316,20 +333,27 @@ class GAN(nn.Module):
         fixed_noise = torch.randn(count, self.n_units_latent, device=self.device)
         fixed_noise = self._append_optional_cond(fixed_noise, cond)
 
-        return self.generator(fixed_noise)
+        return generator(fixed_noise)
 
     def dataloader(
         self, X: torch.Tensor, cond: Optional[torch.Tensor] = None
-    ) -> DataLoader:
-        if cond is None:
-            dataset = TensorDataset(X)
-        else:
-            dataset = TensorDataset(X, cond)
-        return DataLoader(
-            dataset,
+    ) -> Union[DataLoader, BatchIterator]:
+        tensors = [X] if cond is None else [X, cond]
+
+        if self.dp_enabled:
+            # the privacy engine wraps a torch DataLoader
+            return DataLoader(
+                TensorDataset(*tensors),
+                batch_size=self.batch_size,
+                sampler=self.dataloader_sampler,
+                pin_memory=False,
+            )
+
+        return BatchIterator(
+            *tensors,
             batch_size=self.batch_size,
             sampler=self.dataloader_sampler,
-            pin_memory=False,
+            device=self.device,
         )
 
     def _train_epoch_generator(
@@ -470,7 +494,7 @@ class GAN(nn.Module):
 
     def _train_epoch(
         self,
-        loader: DataLoader,
+        loader: Union[DataLoader, BatchIterator],
         fake_labels_generator: Optional[Callable] = None,
         true_labels_generator: Optional[Callable] = None,
     ) -> Tuple[float, float]:
@@ -508,48 +532,14 @@ class GAN(nn.Module):
 
         return np.mean(G_losses), np.mean(D_losses)
 
-    def _init_patience_score(self) -> float:
-        if self.patience_metric is None:
-            return 0
-
-        if self.patience_metric.direction() == "minimize":
-            return np.inf
-        else:
-            return -np.inf
-
-    def _evaluate_patience_metric(
-        self,
-        X: torch.Tensor,
-        cond: Optional[torch.Tensor],
-        prev_score: float,
-        patience: int,
-    ) -> Tuple[float, int, bool]:
-        save = False
-        if self.patience_metric is None:
-            return prev_score, patience, save
-
-        X_syn = self.generate(len(X), cond)
-        new_score = self.patience_metric.evaluate(
-            pd.DataFrame(X.detach().cpu().numpy()),
-            pd.DataFrame(X_syn),
-        )
-        score = prev_score
-        if self.patience_metric.direction() == "minimize":
-            if new_score >= prev_score:
-                patience += 1
-            else:
-                patience = 0
-                score = new_score
-                save = True
-        else:
-            if new_score <= prev_score:
-                patience += 1
-            else:
-                patience = 0
-                score = new_score
-                save = True
+    def _patience_generate(
+        self, generator: nn.Module, count: int, cond: Optional[torch.Tensor]
+    ) -> np.ndarray:
+        clear_cache()
+        generator.eval()
 
-        return score, patience, save
+        with torch.no_grad():
+            return self._forward_with(generator, count, cond).detach().cpu().numpy()
 
     def _train_test_split(self, X: torch.Tensor, cond: Optional[torch.Tensor]) -> Tuple:
         if self.patience_metric is None:
@@ -608,9 +598,19 @@ class GAN(nn.Module):
             )
 
         # Train loop
-        patience_score = self._init_patience_score()
+        patience_score: float = 0
         patience = 0
-        best_state_dict = None
+        evaluator: Optional[PatienceEvaluator] = None
+        if self.patience_metric is not None:
+            evaluator = PatienceEvaluator(
+                self.patience_metric,
+                X_val,
+                cond_val,
+                patience=self.patience,
+                max_samples=self.patience_max_samples,
+                asynchronous=self.patience_async,
+                random_state=self.random_state,
+            )
 
         for i in tqdm(range(self.generator_n_iter)):
             g_loss, d_loss = self._train_epoch(
@@ -628,19 +628,17 @@ class GAN(nn.Module):
                         f"[{i}/{self.generator_n_iter}] Privacy budget: epsilon = {privacy_engine.get_epsilon(self.dp_delta)} delta = {self.dp_delta}"
                     )
 
-                if self.patience_metric is not None:
-                    patience_score, patience, save = self._evaluate_patience_metric(
-                        X_val, cond_val, patience_score, patience
-                    )
-                    if save:
-                        best_state_dict = self.state_dict()
-
-                    if patience >= self.patience and i >= self.n_iter_min:
+                if evaluator is not None:
+                    exhausted = evaluator.step(self.generator, self._patience_generate)
+                    patience_score, patience = evaluator.score, evaluator.wait
+                    if exhausted and i >= self.n_iter_min:
                         log.debug(f"[{i}/{self.generator_n_iter}] Early stopping")
                         break
 
-        if best_state_dict is not None:
-            self.load_state_dict(best_state_dict)
+        if evaluator is not None:
+            best_state_dict = evaluator.finish()
+            if best_state_dict is not None:
+                self.generator.load_state_dict(best_state_dict)
 
         return self
 
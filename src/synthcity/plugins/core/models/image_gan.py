@@ -1,4 +1,5 @@
 # stdlib
+import copy
 from typing import Any, Callable, List, Optional, Tuple
 
 # third party
@@ -605,7 +606,7 @@ class ImageGAN(nn.Module):
                         patience,
                     )
                     if save:
-                        best_state_dict = self.state_dict()
+                        best_state_dict = copy.deepcopy(self.state_dict())
 
                     if patience >= self.patience and i >= self.n_iter_min:
                         log.debug(f"[{i}/{self.generator_n_iter}] Early stopping")
@@ -1,5 +1,5 @@
 # stdlib
-from typing import Optional
+from typing import Callable, Optional
 
 # third party
 import numpy as np
@@ -83,34 +83,47 @@ def _check_estimate_2d(
     return estimate, time_points
 
 
-def _get_comparable(
-    event_indicator: np.ndarray, event_time: np.ndarray, order: np.ndarray
+def _bisect(
+    sorted_values: np.ndarray, predicate: Callable, n_queries: int
 ) -> np.ndarray:
-    n_samples = len(event_time)
-    tied_time = 0
-    comparable = {}
-    i = 0
-    while i < n_samples - 1:
-        time_i = event_time[order[i]]
-        start = i + 1
-        end = start
-        while end < n_samples and event_time[order[end]] == time_i:
-            end += 1
-
-        # check for tied event times
-        event_at_same_time = event_indicator[order[i:end]]
-        censored_at_same_time = ~event_at_same_time
-        for j in range(i, end):
-            if event_indicator[order[j]]:
-                mask = np.zeros(n_samples, dtype=bool)
-                mask[end:] = True
-                # an event is comparable to censored samples at same time point
-                mask[i:end] = censored_at_same_time
-                comparable[j] = mask
-                tied_time += censored_at_same_time.sum()
-        i = end
-
-    return comparable, tied_time
+    """Vectorized binary search: for each query, the number of leading values of `sorted_values` satisfying `predicate(values, query_indices)`, which must be monotone along the sorted values."""
+    lo = np.zeros(n_queries, dtype=np.int64)
+    hi = np.full(n_queries, len(sorted_values), dtype=np.int64)
+    queries = np.arange(n_queries)
+    while (lo < hi).any():
+        active = lo < hi
+        mid = (lo + hi) // 2
+        ok = np.zeros(n_queries, dtype=bool)
+        ok[active] = predicate(sorted_values[mid[active]], queries[active])
+        lo = np.where(active & ok, mid + 1, lo)
+        hi = np.where(active & ~ok, mid, hi)
+    return lo
+
+
+def _prefix_rank_counts(
+    ranks: np.ndarray, lengths: np.ndarray, thresholds: np.ndarray
+) -> np.ndarray:
+    """For each query q, the number of items among `ranks[:lengths[q]]` with a rank below `thresholds[q]`.
+
+    The prefixes are split in dyadic blocks, as in a Fenwick tree. All the blocks of a level are sorted at once, and each query counts its block of the level with a single search.
+    """
+    n_items = len(ranks)
+    counts = np.zeros(len(lengths), dtype=np.int64)
+    blocks = np.arange(n_items, dtype=np.int64)
+
+    level = 0
+    while (1 << level) <= n_items:
+        size = 1 << level
+        has_block = ((lengths >> level) & 1) == 1
+        if has_block.any():
+            # the block of the prefix at this level, always a full block
+            block = (lengths[has_block] >> level) - 1
+            keys = np.sort((blocks >> level) * n_items + ranks)
+            pos = np.searchsorted(keys, block * n_items + thresholds[has_block])
+            counts[has_block] += pos - block * size
+        level += 1
+
+    return counts
 
 
 def _estimate_concordance_index(
@@ -120,38 +133,59 @@ def _estimate_concordance_index(
     weights: np.ndarray,
     tied_tol: float = 1e-8,
 ) -> float:
-    order = np.argsort(event_time)
+    """Weighted concordance index, in O(n log^2 n) time and O(n) memory.
 
-    comparable, tied_time = _get_comparable(event_indicator, event_time, order)
+    An event is comparable to the samples with a longer time, and to the censored samples with the same time. For each event, the comparable samples are a prefix of the samples sorted by decreasing time, censored first, and the concordant and tied samples are ranges of the sorted estimates, so both are counted with `_prefix_rank_counts`.
+    """
+    n_samples = len(event_time)
+    order = np.argsort(event_time)
+    sorted_time = event_time[order]
 
-    if len(comparable) == 0:
+    # the events in the order of the time groups, skipping a last singleton group
+    first = np.searchsorted(sorted_time, sorted_time, side="left")
+    comparable = event_indicator[order] & (first < n_samples - 1)
+    if not comparable.any():
         raise RuntimeError(
             "Data has no comparable pairs, cannot estimate concordance index."
         )
+    events = order[comparable]
+    time_i = event_time[events]
+    est_i = estimate[events]
+    w_i = weights[events]
+
+    # comparable samples: the prefix of the samples by decreasing time, censored first
+    censored_time = np.sort(event_time[~event_indicator])
+    n_comparable = (
+        n_samples
+        - np.searchsorted(sorted_time, time_i, side="right")
+        + np.searchsorted(censored_time, time_i, side="right")
+        - np.searchsorted(censored_time, time_i, side="left")
+    )
+    sequence = np.lexsort((~event_indicator, event_time))[::-1]
+
+    # ranks of the estimates, and the ranges of the concordant and tied estimates
+    est_order = np.argsort(estimate, kind="stable")
+    sorted_est = estimate[est_order]
+    ranks = np.empty(n_samples, dtype=np.int64)
+    ranks[est_order] = np.arange(n_samples)
+
+    # the same floating point tests as |est - est_i| <= tied_tol and est < est_i
+    below = _bisect(sorted_est, lambda est, q: est - est_i[q] < -tied_tol, len(events))
+    tied_or_below = _bisect(
+        sorted_est, lambda est, q: est - est_i[q] <= tied_tol, len(events)
+    )
 
-    concordant = 0
-    discordant = 0
-    tied_risk = 0
-    numerator = 0.0
-    denominator = 0.0
-    for ind, mask in comparable.items():
-        est_i = estimate[order[ind]]
-        w_i = weights[order[ind]]
-
-        est = estimate[order[mask]]
-
-        ties = np.absolute(est - est_i) <= tied_tol
-        n_ties = ties.sum()
-        # an event should have a higher score
-        con = est < est_i
-        n_con = con[~ties].sum()
-
-        numerator += w_i * n_con + 0.5 * w_i * n_ties
-        denominator += w_i * mask.sum()
+    counts = _prefix_rank_counts(
+        ranks[sequence],
+        np.concatenate([n_comparable, n_comparable]),
+        np.concatenate([below, tied_or_below]),
+    )
+    n_con = counts[: len(events)]
+    n_ties = counts[len(events) :] - n_con
 
-        tied_risk += n_ties
-        concordant += n_con
-        discordant += est.size - n_con - n_ties
+    # accumulated in the order of the events, as a running sum
+    numerator = np.cumsum(w_i * n_con + 0.5 * w_i * n_ties)[-1]
+    denominator = np.cumsum(w_i * n_comparable)[-1]
 
     cindex = numerator / denominator
     return cindex
@@ -412,16 +446,25 @@ def brier_score(
     prob_cens_y = cens.predict_proba(test_time)
     prob_cens_y[prob_cens_y == 0] = np.inf
 
-    # Calculating the brier scores at each time point
+    # Calculating the brier scores at all the time points at once, one row per time point.
+    # The time points are processed in chunks, to bound the memory to about `max_cells` values.
+    max_cells = 1 << 16
+    chunk = max(1, max_cells // max(len(test_time), 1))
+
     brier_scores = np.empty(times.shape[0], dtype=float)
-    for i, t in enumerate(times):
-        est = estimate[:, i]
+    for start in range(0, times.shape[0], chunk):
+        t = times[start : start + chunk, None]
+        # contiguous rows, so each mean sums in the same order as on a single column
+        est = np.ascontiguousarray(estimate[:, start : start + chunk].T)
         is_case = (test_time <= t) & test_event
         is_control = test_time > t
 
-        brier_scores[i] = np.mean(
+        brier_scores[start : start + chunk] = np.mean(
             np.square(est) * is_case.astype(int) / prob_cens_y
-            + np.square(1.0 - est) * is_control.astype(int) / prob_cens_t[i]
+            + np.square(1.0 - est)
+            * is_control.astype(int)
+            / prob_cens_t[start : start + chunk, None],
+            axis=1,
         )
 
     return brier_scores
@@ -1,6 +1,6 @@
 # cart.py
 # stdlib
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 # third party
 import numpy as np
@@ -60,7 +60,11 @@ def syn_cart(y: Any, X: Any, random_state: int = 0, **kwargs: Any) -> Dict[str,
 
 
 def generate_cart(
-    fitted_cart: Dict[str, Any], X_new: Any, random_state: int = 0, **kwargs: Any
+    fitted_cart: Dict[str, Any],
+    X_new: Any,
+    random_state: int = 0,
+    rng: Optional[np.random.Generator] = None,
+    **kwargs: Any,
 ) -> np.ndarray:
     """
     Use the fitted cart model to generate predicted y's or do custom sequential sampling.
@@ -71,6 +75,8 @@ def generate_cart(
       - randomly sample from that leaf's empirical distribution (leaf_indexed_y).
 
     If the leaf is unknown (e.g. corner case), we fallback to sampling from the entire training distribution.
+
+    The values are drawn from `rng` if provided, else from a generator seeded with `random_state`.
     """
     estimator = fitted_cart["estimator"]
     leaf_indexed_y = fitted_cart["leaf_indexed_y"]
@@ -82,7 +88,8 @@ def generate_cart(
     leaf_ids = estimator.apply(X_new)
 
     # For reproducibility
-    rng = np.random.default_rng(random_state)
+    if rng is None:
+        rng = np.random.default_rng(random_state)
 
     y_syn = []
     # Precompute a global fallback if needed
@@ -1,6 +1,6 @@
 # ctree.py
 # stdlib
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 
 # third party
 import numpy as np
@@ -89,7 +89,11 @@ def syn_ctree(
 
 
 def generate_ctree(
-    fitted_ctree: Dict[str, Any], X_new: Any, random_state: int = 0, **kwargs: Any
+    fitted_ctree: Dict[str, Any],
+    X_new: Any,
+    random_state: int = 0,
+    rng: Optional[np.random.Generator] = None,
+    **kwargs: Any
 ) -> np.ndarray:
     """
     Generate y values from the fitted ctree model by sampling from leaf-level distributions.
@@ -98,13 +102,15 @@ def generate_ctree(
         fitted_ctree: a dict returned by syn_ctree(...).
         X_new: 2D array-like (n_samples, n_features) to generate new y's for.
         random_state: integer seed for reproducibility.
+        rng: random generator of the draws. If None, a generator seeded with random_state is used.
         **kwargs: unused here, but kept for interface consistency.
 
     Returns:
         A 1D numpy array of generated y values. Classification => random draws
         from the leaf's classes, Regression => random draws from the leaf's numeric distribution.
     """
-    rng = np.random.default_rng(random_state)
+    if rng is None:
+        rng = np.random.default_rng(random_state)
 
     tree = fitted_ctree["model"]
     leaf_index_map = fitted_ctree["leaf_index_map"]
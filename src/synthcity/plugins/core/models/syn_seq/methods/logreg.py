@@ -50,12 +50,13 @@ def generate_logreg(
     fitted_model: Dict[str, Any],
     X_new: Union[np.ndarray, list],
     random_state: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
     **kwargs: Any,
 ) -> np.ndarray:
     """
     Generate predictions using the fitted logistic regression model.
 
-    For classification, simply use the predict method.
+    For classification, simply use the predict method. The predictions are deterministic, `random_state` and `rng` are unused.
     """
     model = fitted_model["model"]
     y_pred = model.predict(X_new)
@@ -48,6 +48,7 @@ def generate_lognorm(
     fitted_model: Dict[str, Any],
     X: np.ndarray,
     random_state: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
     **kwargs: Any,
 ) -> np.ndarray:
     """
@@ -57,15 +58,16 @@ def generate_lognorm(
         fitted_model: The dictionary returned by syn_lognorm(...).
         X: 2D array of predictors (not used here, but included for consistency).
         random_state: to override the model's stored random seed.
+        rng: random generator of the draws, overrides the seeds.
         **kwargs: extra arguments for generation.
 
     Returns:
         y_gen: 1D numpy array of synthesized target values.
     """
-    if random_state is not None:
-        rng = np.random.default_rng(random_state)
-    else:
-        rng = np.random.default_rng(fitted_model["random_state"])
+    if rng is None:
+        rng = np.random.default_rng(
+            random_state if random_state is not None else fitted_model["random_state"]
+        )
 
     shift = fitted_model["shift"]
     mu = fitted_model["mu"]
@@ -117,6 +119,7 @@ def generate_random(
     fitted_model: Dict[str, Any],
     X: np.ndarray,
     random_state: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
     **kwargs: Any,
 ) -> np.ndarray:
     """
@@ -126,15 +129,16 @@ def generate_random(
         fitted_model: The dictionary returned by syn_random(...).
         X: 2D array of predictors (not used here).
         random_state: optional seed.
+        rng: random generator of the draws, overrides the seeds.
         **kwargs: unused extras.
 
     Returns:
         y_syn: 1D numpy array of uniformly sampled values.
     """
-    if random_state is not None:
-        rng = np.random.default_rng(random_state)
-    else:
-        rng = np.random.default_rng(fitted_model["random_state"])
+    if rng is None:
+        rng = np.random.default_rng(
+            random_state if random_state is not None else fitted_model["random_state"]
+        )
 
     min_val = fitted_model["min_val"]
     max_val = fitted_model["max_val"]
@@ -183,6 +187,7 @@ def generate_swr(
     fitted_model: Dict[str, Any],
     X: np.ndarray,
     random_state: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
     **kwargs: Any,
 ) -> np.ndarray:
     """
@@ -194,6 +199,7 @@ def generate_swr(
         X: 2D array of predictors (not used in this simple approach).
         random_state: If you want to override the seed, but typically
                       we rely on the existing permutation.
+        rng: unused, the draws follow the existing permutation.
         **kwargs: any additional arguments.
 
     Returns:
@@ -202,7 +208,7 @@ def generate_swr(
     Raises:
         ValueError: if we request more samples than remain in the pool.
     """
-    # The random_state argument does not affect the existing permutation.
+    # The random_state and rng arguments do not affect the existing permutation.
     # The permutation was decided at fit-time.
 
     pool = fitted_model["pool"]
@@ -1,5 +1,5 @@
 # stdlib
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 # third party
 import numpy as np
@@ -72,7 +72,11 @@ def syn_norm(
 
 
 def generate_norm(
-    fitted_norm: Dict[str, Any], X_new: pd.DataFrame, **kwargs: Any
+    fitted_norm: Dict[str, Any],
+    X_new: pd.DataFrame,
+    random_state: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
+    **kwargs: Any,
 ) -> np.ndarray:
     """
     Generate synthetic predictions using the fitted 'norm' model.
@@ -83,6 +87,10 @@ def generate_norm(
         The fitted model dictionary returned by syn_norm().
     X_new : pd.DataFrame
         Predictor matrix for which to generate synthetic y values.
+    random_state : int, optional
+        Seed of the noise, overrides the seed stored at fit time.
+    rng : np.random.Generator, optional
+        Random generator of the noise, overrides the seeds.
     **kwargs : dict
         Additional parameters. If provided, can override:
           - add_noise : bool
@@ -97,7 +105,6 @@ def generate_norm(
     coef_ = fitted_norm["coef_"]
     intercept_ = fitted_norm["intercept_"]
     resid_std_ = fitted_norm["resid_std_"]
-    random_state = fitted_norm["random_state"]
 
     # Default to stored settings; allow overrides
     add_noise = kwargs.get("add_noise", fitted_norm["add_noise"])
@@ -108,8 +115,15 @@ def generate_norm(
 
     # Optionally add noise
     if add_noise and resid_std_ > 0:
-        rng = np.random.RandomState(random_state)
-        noise = rng.normal(loc=0.0, scale=resid_std_ * noise_scale, size=len(y_mean))
+        if rng is not None:
+            sampler: Any = rng
+        elif random_state is not None:
+            sampler = np.random.default_rng(random_state)
+        else:
+            sampler = np.random.RandomState(fitted_norm["random_state"])
+        noise = sampler.normal(
+            loc=0.0, scale=resid_std_ * noise_scale, size=len(y_mean)
+        )
         y_syn = y_mean + noise
     else:
         y_syn = y_mean
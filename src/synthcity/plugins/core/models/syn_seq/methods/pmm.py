@@ -57,6 +57,7 @@ def generate_pmm(
     fitted_pmm: Dict[str, Any],
     X_new: np.ndarray,
     random_state: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
     **kwargs: Any
 ) -> np.ndarray:
     """
@@ -72,14 +73,16 @@ def generate_pmm(
         fitted_pmm: dictionary from syn_pmm(...)
         X_new: shape (m, n_features) for which to generate new y
         random_state: random seed override (optional)
+        rng: random generator of the draws, overrides the seeds (optional)
         kwargs: additional arguments (not used here, but available for extension)
 
     Returns:
         y_syn: shape (m,) - synthetic target values
     """
-    if random_state is None:
-        random_state = fitted_pmm.get("random_state", 0)
-    rng = np.random.default_rng(random_state)
+    if rng is None:
+        if random_state is None:
+            random_state = fitted_pmm.get("random_state", 0)
+        rng = np.random.default_rng(random_state)
 
     regressor = fitted_pmm["model"]
     y_train = fitted_pmm["y"]
@@ -60,6 +60,7 @@ def generate_polyreg(
     fitted_model: Dict[str, Any],
     X_new: np.ndarray,
     random_state: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
     **kwargs: Any
 ) -> np.ndarray:
     """
@@ -69,12 +70,14 @@ def generate_polyreg(
     For each sample, a bin is chosen by sampling from the predicted probabilities.
     If binning was used during training, the bin index is mapped back
     to a numeric value by computing the bin centers.
+    The bins are drawn from `rng` if provided, else from a generator seeded with `random_state`.
     """
     model = fitted_model["model"]
     bin_edges = fitted_model.get("bin_edges")
-    if random_state is None:
-        random_state = fitted_model.get("random_state", 0)
-    rng = np.random.default_rng(random_state)
+    if rng is None:
+        if random_state is None:
+            random_state = fitted_model.get("random_state", 0)
+        rng = np.random.default_rng(random_state)
 
     # Predict class probabilities
     probs = model.predict_proba(X_new)
@@ -1,6 +1,6 @@
 # stdlib
 import warnings
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 # third party
 import numpy as np
@@ -78,7 +78,10 @@ def syn_rf(
 
 
 def generate_rf(
-    fitted_rf: Dict[str, Any], X_new: np.ndarray, **kwargs: Any
+    fitted_rf: Dict[str, Any],
+    X_new: np.ndarray,
+    rng: Optional[np.random.Generator] = None,
+    **kwargs: Any,
 ) -> np.ndarray:
     """
     Generate synthetic target values using a previously fitted RF model.
@@ -86,6 +89,7 @@ def generate_rf(
     Args:
         fitted_rf: dict returned by syn_rf(...).
         X_new: 2D array of shape (n_samples, n_features) for which we want predictions
+        rng: random generator of the sampled classes. If None, the global NumPy generator is used.
         kwargs: any additional settings (e.g., sampling strategies)
 
     Returns:
@@ -98,8 +102,9 @@ def generate_rf(
         # For classification, sample from predicted probability distribution
         probas = rf_model.predict_proba(X_new)
         classes = fitted_rf["classes_"]
+        sampler: Any = rng if rng is not None else np.random
         sampled_indices = [
-            np.random.choice(len(classes), p=probas[i]) for i in range(len(X_new))
+            sampler.choice(len(classes), p=probas[i]) for i in range(len(X_new))
         ]
         y_syn = np.array([classes[idx] for idx in sampled_indices])
     else:
@@ -1,5 +1,9 @@
 # stdlib
+import inspect
+import time
 import warnings
+from itertools import repeat
+from multiprocessing import shared_memory
 from typing import Any, Dict, List, Optional, Tuple
 
 # third party
@@ -8,6 +12,7 @@ import pandas as pd
 from pydantic import validate_arguments
 
 # synthcity absolute
+import synthcity.logger as log
 from synthcity.plugins.core.models.syn_seq.methods import (
     generate_cart,
     generate_ctree,
@@ -30,6 +35,7 @@ from synthcity.plugins.core.models.syn_seq.methods import (
     syn_rf,
     syn_swr,
 )
+from synthcity.utils.parallel import process_pool, resolve_n_jobs, worker_state
 
 METHOD_MAP: Dict[str, Tuple[Any, Any]] = {
     "cart": (syn_cart, generate_cart),
@@ -48,6 +54,118 @@ NUMERIC_MARKER = -777777777
 MISSING_MARKER = -999999999
 
 
+def _column_stack(
+    gen: Dict[str, np.ndarray], cols: List[str], mask: Optional[np.ndarray] = None
+) -> np.ndarray:
+    # the predictors matrix, optionally restricted to the masked rows
+    count = len(next(iter(gen.values())))
+    if len(cols) == 0:
+        return np.empty((count if mask is None else int(mask.sum()), 0))
+    if mask is None:
+        return np.column_stack([gen[col] for col in cols])
+    return np.column_stack([gen[col][mask] for col in cols])
+
+
+def _masked_write(out: np.ndarray, mask: np.ndarray, values: Any) -> np.ndarray:
+    values = np.asarray(values)
+    if values.dtype.kind not in "biuf" and out.dtype.kind in "biuf":
+        out = out.astype(object)
+    elif values.dtype.kind == "f" and out.dtype.kind in "biu":
+        out = out.astype(float)
+    out[mask] = values
+    return out
+
+
+class _FrameColumns:
+    """Read access to the columns of the training data, keeping their dtypes."""
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.columns = {col: df[col].values for col in df.columns}
+
+    def column(self, col: str) -> np.ndarray:
+        return self.columns[col]
+
+    def matrix(self, cols: List[str], mask: Optional[np.ndarray] = None) -> np.ndarray:
+        # the same matrix as df[cols].values, optionally restricted to the masked rows
+        values = [self.column(col) for col in cols]
+        if mask is not None:
+            values = [val[mask] for val in values]
+        if len(values) == 0:
+            count = len(next(iter(self.columns.values())))
+            return np.empty((count if mask is None else int(mask.sum()), 0))
+        return np.column_stack(values)
+
+
+class _SharedColumns(_FrameColumns):
+    """The columns of the training data in a shared memory block, mapped without copies by the worker processes.
+
+    The numeric columns are laid out one after the other in the block. The other columns are sent to the workers with the object.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.layout: Dict[str, Tuple[int, str, int]] = {}
+        self.objects: Dict[str, np.ndarray] = {}
+        offset = 0
+        for col in df.columns:
+            values = df[col].values
+            if values.dtype.kind in "biuf":
+                self.layout[col] = (offset, values.dtype.str, len(values))
+                offset += values.nbytes
+            else:
+                self.objects[col] = values
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self.name = self.shm.name
+        self._map()
+        for col in self.layout:
+            self.columns[col][:] = df[col].values
+
+    def _map(self) -> None:
+        self.columns = dict(self.objects)
+        for col, (offset, dtype, count) in self.layout.items():
+            self.columns[col] = np.ndarray(
+                count, dtype=dtype, buffer=self.shm.buf, offset=offset
+            )
+
+    def __getstate__(self) -> dict:
+        return {"name": self.name, "layout": self.layout, "objects": self.objects}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.attach()
+
+    def attach(self) -> None:
+        """Map the block in a worker process.
+
+        The block is owned by the parent process, which alone unlinks it. The workers share the resource tracker of the parent, so their registration of the block is the same entry, and is released by the unlink of the parent.
+        """
+        self.shm = shared_memory.SharedMemory(name=self.name)
+        self._map()
+
+    def unlink(self) -> None:
+        self.columns = {}
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _fit_col_job(
+    model: "Syn_Seq",
+    col: str,
+    method_name: str,
+    preds_list: List[str],
+    mask: Optional[np.ndarray],
+) -> Tuple[Optional[Dict[str, Any]], float]:
+    return model._fit_col(
+        worker_state("training_data"), col, method_name, preds_list, mask
+    )
+
+
+def _generate_chunk_job(
+    model: "Syn_Seq", count: int, label_encoder: Any, seed: np.random.SeedSequence
+) -> Dict[str, np.ndarray]:
+    return model._generate_chunk(count, label_encoder, seed)
+
+
 class Syn_Seq:
 
     """Synthetic Sequence Generator model.
@@ -60,20 +178,34 @@ class Syn_Seq:
     """
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
-    def __init__(self, random_state: int = 0, sampling_patience: int = 100) -> None:
+    def __init__(
+        self,
+        random_state: int = 0,
+        sampling_patience: int = 100,
+        n_jobs: int = 1,
+        chunk_size: int = 100000,
+    ) -> None:
         """
         Args:
             random_state: Random seed.
             sampling_patience: Maximum number of attempts in generation.
+            n_jobs: Number of processes fitting the columns and generating the chunks of rows. -1 uses all the CPUs.
+            chunk_size: Maximum number of rows generated at once.
         """
+        if chunk_size <= 0:
+            raise ValueError(f"Invalid chunk_size {chunk_size}")
+
         self.random_state = random_state
         self.sampling_patience = sampling_patience
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
         self.cat_distributions: Dict[str, Dict[Any, float]] = {}
         self._model_trained = False
         self._syn_order: List[str] = []
         self._method_map: Dict[str, str] = {}
         self._varsel: Dict[str, List[str]] = {}
         self._col_models: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.fit_durations: Dict[str, float] = {}
         self._first_col_values: Dict[str, np.ndarray] = {}
 
     def fit_col(
@@ -90,13 +222,17 @@ class Syn_Seq:
         (casting values to int) and record the list of special values. Then, for base
         columns with special values, filter out rows whose value is special so that the
         model sees only numeric values.
+
+        The model of each column only depends on the real data, so with `n_jobs` > 1 the columns are
+        fitted in a pool of processes, reading the training data from a shared memory block. The fit
+        duration of each column is recorded in `fit_durations`.
         """
         info_dict = loader_info
         training_data = loader.dataframe().copy()
         if training_data.empty:
             raise ValueError("No data => cannot fit Syn_Seq aggregator")
 
-        print(info_dict)
+        log.debug(f"[syn_seq] {info_dict}")
         self._syn_order = info_dict.get("syn_order", list(training_data.columns))
         self._method_map = info_dict.get("method", {})
         self._varsel = info_dict.get("variable_selection", {})
@@ -118,25 +254,25 @@ class Syn_Seq:
                     idx = self._syn_order.index(col)
                     self._varsel[col] = self._syn_order[:idx]
 
-        print("[INFO] Syn_Seq aggregator: fitting columns...")
+        log.info("Syn_Seq aggregator: fitting columns...")
 
         first_col = self._syn_order[0]
         self._first_col_values[first_col] = training_data[first_col].dropna().values
-        print(f"Fitting '{first_col}' => stored values from real data. Done.")
+        log.info(f"Fitting '{first_col}' => stored values from real data.")
 
         np.random.seed(self.random_state)
+        tasks = []
         for i, col in enumerate(self._syn_order[1:], start=1):
             method_name = self._method_map.get(col, "cart")
             preds_list = self._varsel.get(col, self._syn_order[:i])
-            y = training_data[col].values
-            X = training_data[preds_list].values
+            mask = None
             cat_col = col + "_cat"
             if cat_col in preds_list:
                 numeric_indices = np.where(
                     label_encoder[cat_col].classes_ == NUMERIC_MARKER
                 )[0]
 
-                missing_indices = []
+                missing_indices: Any = []
                 if MISSING_MARKER in label_encoder[cat_col].classes_:
                     missing_indices = np.where(
                         label_encoder[cat_col].classes_ == MISSING_MARKER
@@ -147,23 +283,59 @@ class Syn_Seq:
                     )
                 numeric_label = numeric_indices[0]
                 missing_label = missing_indices[0] if len(missing_indices) > 0 else None
-                mask = training_data[cat_col] == numeric_label
+                mask = (training_data[cat_col] == numeric_label).values
                 if missing_label is not None:
-                    mask &= training_data[cat_col] != missing_label
-                y = training_data.loc[mask, col].values
-                X = training_data.loc[mask, preds_list].values
+                    mask &= (training_data[cat_col] != missing_label).values
+            tasks.append((col, method_name, preds_list, mask))
 
-            print(f"Fitting '{col}' with '{method_name}' ... ", end="", flush=True)
+        n_jobs = min(resolve_n_jobs(self.n_jobs), len(tasks))
+        if n_jobs > 1:
+            # the models only depend on the real data, one task per column
+            shared = _SharedColumns(training_data)
             try:
-                self._col_models[col] = self._fit_single_col(method_name, X, y)
-            except Exception as e:
-                print(f"Error fitting column {col} with {method_name}: {e}.", end=" ")
-                self._col_models[col] = None
+                with process_pool(n_jobs, state={"training_data": shared}) as executor:
+                    results = list(
+                        executor.map(_fit_col_job, repeat(self), *zip(*tasks))
+                    )
+            finally:
+                shared.unlink()
+        else:
+            columns = _FrameColumns(training_data)
+            results = [
+                self._fit_col(columns, col, method_name, preds_list, mask)
+                for col, method_name, preds_list, mask in tasks
+            ]
+
+        self.fit_durations = {}
+        for (col, method_name, _, _), (fit_info, duration) in zip(tasks, results):
+            self._col_models[col] = fit_info
+            self.fit_durations[col] = duration
+            log.info(f"Fitting '{col}' with '{method_name}' => done in {duration:.3f}s")
 
-            print("Done!")
         self._model_trained = True
         return self
 
+    def _fit_col(
+        self,
+        columns: "_FrameColumns",
+        col: str,
+        method_name: str,
+        preds_list: List[str],
+        mask: Optional[np.ndarray],
+    ) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Fit a column on its predictors, restricted to the rows of `mask`.
+
+        Returns:
+            The fitted model and the duration of the fit, in seconds.
+        """
+        start = time.perf_counter()
+        y = columns.matrix([col], mask)[:, 0]
+        X = columns.matrix(preds_list, mask)
+        fit_info = self._fit_single_col(method_name, X, y)
+
+        return fit_info, time.perf_counter() - start
+
     def _fit_single_col(
         self, method_name: str, X: np.ndarray, y: np.ndarray
     ) -> Optional[Dict[str, Any]]:
@@ -192,26 +364,84 @@ class Syn_Seq:
         base column using its fitted model. Then we sample a synthetic _cat indicator (using the
         saved full distribution). For rows where the synthetic indicator is not equal to the numeric
         marker, we override the generated base column value with the special value.
+
+        The rows are generated in independent chunks of at most `chunk_size` rows, each with its own
+        seed, on `n_jobs` processes. The seeds are drawn from the global NumPy generator, seeded by fit_col.
         """
         if not self._model_trained:
             raise RuntimeError("Syn_Seq aggregator not yet fitted")
         if count <= 0:
             return pd.DataFrame({col: [] for col in self._syn_order})
 
-        gen_df = pd.DataFrame({col: [np.nan] * count for col in self._syn_order})
+        n_chunks = (count + self.chunk_size - 1) // self.chunk_size
+        sizes = [self.chunk_size] * (n_chunks - 1) + [
+            count - self.chunk_size * (n_chunks - 1)
+        ]
+        seeds = np.random.SeedSequence(np.random.randint(np.iinfo(np.int32).max)).spawn(
+            n_chunks
+        )
+
+        n_jobs = min(resolve_n_jobs(self.n_jobs), n_chunks)
+        if n_jobs > 1 and "swr" in self._methods():
+            # sampling without replacement consumes a pool shared by all the chunks
+            log.info("[syn_seq] 'swr' columns are generated sequentially")
+            n_jobs = 1
+
+        if n_jobs > 1:
+            with process_pool(n_jobs) as executor:
+                chunks = list(
+                    executor.map(
+                        _generate_chunk_job,
+                        repeat(self),
+                        sizes,
+                        repeat(label_encoder),
+                        seeds,
+                    )
+                )
+        else:
+            chunks = [
+                self._generate_chunk(size, label_encoder, seed)
+                for size, seed in zip(sizes, seeds)
+            ]
+
+        gen_df = pd.DataFrame(
+            {
+                col: np.concatenate([chunk[col] for chunk in chunks])
+                for col in self._syn_order
+            }
+        )
+        return gen_df
+
+    def _methods(self) -> List[str]:
+        return [
+            fit_info["name"]
+            for fit_info in self._col_models.values()
+            if fit_info is not None
+        ]
+
+    def _generate_chunk(
+        self, count: int, label_encoder: Any, seed: np.random.SeedSequence
+    ) -> Dict[str, np.ndarray]:
+        """
+        Generate `count` rows into preallocated column arrays.
+        All the random draws of the chunk, including those of the column methods, come from the generator seeded with `seed`.
+        """
+        rng = np.random.default_rng(seed)
+        gen: Dict[str, np.ndarray] = {
+            col: np.full(count, np.nan) for col in self._syn_order
+        }
 
         first_col = self._syn_order[0]
         if (
             first_col in self._first_col_values
             and len(self._first_col_values[first_col]) > 0
         ):
-            gen_df[first_col] = np.random.choice(
+            gen[first_col] = rng.choice(
                 self._first_col_values[first_col], size=count, replace=True
             )
         else:
-            print("Error generating first column, storing zeroes.", end=" ")
-            gen_df[first_col] = 0
-        print(f"Generating '{first_col}' => done.")
+            log.error(f"Error generating '{first_col}', storing zeroes.")
+            gen[first_col] = np.zeros(count)
 
         for col in self._syn_order[1:]:
             method_name = self._method_map.get(col, "cart")
@@ -220,63 +450,67 @@ class Syn_Seq:
             )
             cat_col = col + "_cat"
             if cat_col in preds_list:
-                print(
-                    "Encoded labels for {}:".format(cat_col),
-                    label_encoder[cat_col].classes_,
-                )
-                numeric_indices = np.where(
-                    label_encoder[cat_col].classes_ == NUMERIC_MARKER
-                )[0]
+                classes = np.asarray(label_encoder[cat_col].classes_)
+                numeric_indices = np.where(classes == NUMERIC_MARKER)[0]
                 if len(numeric_indices) == 0:
                     raise ValueError(
                         f"Numeric marker {NUMERIC_MARKER} not found in {cat_col} classes"
                     )
                 numeric_label = numeric_indices[0]
-                mask = gen_df[cat_col] == numeric_label
-                if mask.sum() > 0:
-                    Xsyn_numeric = gen_df.loc[mask, preds_list].values
+                mask = gen[cat_col] == numeric_label
+                if mask.any():
                     ysyn_numeric = self._generate_single_col(
-                        method_name, Xsyn_numeric, col
-                    )
-                    gen_df.loc[mask, col] = ysyn_numeric
-                if (~mask).sum() > 0:
-                    special_values = gen_df.loc[~mask, cat_col].map(
-                        lambda x: label_encoder[cat_col].classes_[x]
+                        method_name,
+                        _column_stack(gen, preds_list, mask),
+                        col,
+                        rng=rng,
                     )
-                    gen_df.loc[~mask, col] = special_values
+                    gen[col] = _masked_write(gen[col], mask, ysyn_numeric)
+                if not mask.all():
+                    special_values = classes[gen[cat_col][~mask].astype(int)]
+                    gen[col] = _masked_write(gen[col], ~mask, special_values)
             else:
-                Xsyn = gen_df[preds_list].values
-                ysyn = self._generate_single_col(method_name, Xsyn, col)
-                gen_df[col] = ysyn
-            print(f"Generating '{col}' => done.")
+                gen[col] = np.asarray(
+                    self._generate_single_col(
+                        method_name,
+                        _column_stack(gen, preds_list),
+                        col,
+                        rng=rng,
+                    )
+                )
+            log.debug(f"Generating '{col}' => done.")
 
             if col in self.cat_distributions:
                 numeric_indices = np.where(
                     label_encoder[col].classes_ == NUMERIC_MARKER
                 )[0]
-                if len(numeric_indices) > 0:
-                    numeric_label = numeric_indices[0].astype(int)
-                    if numeric_label not in gen_df[col].unique():
-                        print(
-                            f"{col} does not contain indicator for numeric values. \n - Model might have failed to fit the data due to highly skewed distribution. \n - Using empirical distribution for generation..."
-                        )
-                        cat_dist = {
-                            int(k): v for k, v in self.cat_distributions[col].items()
-                        }
-                        gen_df[col] = np.random.choice(
-                            list(cat_dist.keys()), size=count, p=list(cat_dist.values())
-                        )
-        return gen_df
+                if len(numeric_indices) > 0 and not np.any(
+                    gen[col] == numeric_indices[0]
+                ):
+                    log.info(
+                        f"{col} does not contain indicator for numeric values. Model might have failed to fit the data due to highly skewed distribution. Using empirical distribution for generation..."
+                    )
+                    cat_dist = {
+                        int(k): v for k, v in self.cat_distributions[col].items()
+                    }
+                    gen[col] = rng.choice(
+                        list(cat_dist.keys()), size=count, p=list(cat_dist.values())
+                    )
+        return gen
 
     def _generate_single_col(
-        self, method_name: str, Xsyn: np.ndarray, col: str
+        self, method_name: str, Xsyn: np.ndarray, col: str, **kwargs: Any
     ) -> np.ndarray:
         """
         Generate synthetic values for a single column using the fitted model.
         If no model is available for the column, a RuntimeError is raised.
+        The keyword arguments, e.g. the rng, are only forwarded to the methods accepting them.
         """
         fit_info = self._col_models.get(col)
         if fit_info is None:
             raise RuntimeError(f"No model available for column {col}.")
         _, generate_func = METHOD_MAP[fit_info["name"]]
-        return generate_func(fit_info["fitted_model"], Xsyn)
+        params = inspect.signature(generate_func).parameters
+        if not any(param.kind == param.VAR_KEYWORD for param in params.values()):
+            kwargs = {key: val for key, val in kwargs.items() if key in params}
+        return generate_func(fit_info["fitted_model"], Xsyn, **kwargs)
@@ -9,7 +9,6 @@ import pandas as pd
 import torch
 from pydantic import validate_arguments
 from torch import nn
-from torch.utils.data import DataLoader, TensorDataset
 from tqdm import trange
 
 # synthcity absolute
@@ -18,6 +17,7 @@ from synthcity.metrics.weighted_metrics import WeightedMetrics
 from synthcity.utils.callbacks import Callback, ValidationMixin
 from synthcity.utils.constants import DEVICE
 from synthcity.utils.dataframe import discrete_columns
+from synthcity.utils.samplers import BatchIterator
 
 # synthcity relative
 from .gaussian_multinomial_diffsuion import GaussianMultinomialDiffusion
@@ -109,7 +109,7 @@ class TabDDPM(nn.Module, ValidationMixin):
             cat_counts = [0]
             self.feature_names_out = self.feature_names
 
-        dataset = TensorDataset(
+        self.dataloader = BatchIterator(
             torch.tensor(X.values, dtype=torch.float32, device=self.device),
             torch.tensor([torch.nan] * len(X), dtype=torch.float32, device=self.device)
             if cond is None
@@ -118,10 +118,10 @@ class TabDDPM(nn.Module, ValidationMixin):
                 dtype=torch.long if self.is_classification else torch.float32,
                 device=self.device,
             ),
+            batch_size=self.batch_size,
+            device=self.device,
         )
 
-        self.dataloader = DataLoader(dataset, batch_size=self.batch_size)
-
         self.diffusion = GaussianMultinomialDiffusion(
             model_type=self.model_type,
             model_params=self.model_params,
@@ -207,10 +207,42 @@ class TabDDPM(nn.Module, ValidationMixin):
 
         return self
 
-    def generate(self, count: int, cond: Any = None) -> pd.DataFrame:
+    def generate(
+        self,
+        count: int,
+        cond: Any = None,
+        num_sampling_steps: Optional[int] = None,
+        eta: float = 0.0,
+        max_batch_size: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Generate `count` rows.
+
+        Args:
+            count: int
+                Number of rows.
+            cond: Any
+                Optional condition of the rows.
+            num_sampling_steps: Optional[int]
+                Number of evenly spaced timesteps of the strided DDIM sampler, e.g. 50 of `num_timesteps`. Default: None, the ancestral sampler over all the timesteps.
+            eta: float
+                Stochasticity of the DDIM steps. Default: 0.
+            max_batch_size: Optional[int]
+                Rows per sampling batch. Default: None, picked from the free memory of the device.
+        """
         self.diffusion.eval()
         if cond is not None:
             cond = torch.tensor(cond, dtype=torch.long, device=self.device)
-        sample = self.diffusion.sample_all(count, cond).detach().cpu().numpy()
+        sample = (
+            self.diffusion.sample_all(
+                count,
+                cond,
+                max_batch_size=max_batch_size,
+                num_sampling_steps=num_sampling_steps,
+                eta=eta,
+            )
+            .detach()
+            .cpu()
+            .numpy()
+        )
         df = pd.DataFrame(sample, columns=self.feature_names_out)
         return df[self.feature_names]
@@ -7,7 +7,8 @@ Based on
 
 # stdlib
 import math
-from typing import Any, Optional, Tuple
+import os
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
 
 # third party
 import numpy as np
@@ -65,6 +66,37 @@ def get_beta_schedule(schedule_name: str, num_diffusion_timesteps: int) -> np.nd
         raise NotImplementedError(f"unknown beta schedule: {schedule_name}")
 
 
+def get_sampling_timesteps(
+    num_timesteps: int, num_sampling_steps: Optional[int] = None
+) -> np.ndarray:
+    """Evenly spaced sub-sequence of the diffusion timesteps for strided sampling, in decreasing order from num_timesteps - 1 to 0.
+
+    Args:
+        num_timesteps: int
+            Number of timesteps of the diffusion process.
+        num_sampling_steps: Optional[int]
+            Number of sampling steps. Default: None, all the timesteps.
+    """
+    if num_sampling_steps is None or num_sampling_steps >= num_timesteps:
+        return np.arange(num_timesteps)[::-1].copy()
+    if num_sampling_steps <= 0:
+        raise ValueError(f"Invalid num_sampling_steps {num_sampling_steps}")
+
+    steps = np.linspace(0, num_timesteps - 1, num_sampling_steps).round().astype(int)
+    return np.unique(steps)[::-1].copy()
+
+
+def _available_memory(device: torch.device) -> Optional[int]:
+    """Free memory of a device, in bytes, or None if unknown."""
+    if device.type == "cuda":
+        free, _ = torch.cuda.mem_get_info(device)
+        return int(free)
+    try:
+        return int(os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE"))
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
 class GaussianMultinomialDiffusion(torch.nn.Module):
     def __init__(
         self,
@@ -777,6 +809,27 @@ class GaussianMultinomialDiffusion(torch.nn.Module):
             "true_mean": true_mean,
         }
 
+    def _ddim_alpha_bars(
+        self, t: Tensor, t_prev: Optional[Tensor], shape: torch.Size
+    ) -> Tuple[Tensor, Tensor]:
+        """The cumulative alphas at t, and at the previous sampling timestep t_prev (t - 1 by default, 1 when t_prev < 0)."""
+        alpha_bar = perm_and_expand(self.alphas_cumprod, t, shape)
+        if t_prev is None:
+            return alpha_bar, perm_and_expand(self.alphas_cumprod_prev, t, shape)
+
+        alphas_cumprod_prev = torch.cat(
+            [self.alphas_cumprod.new_ones(1), self.alphas_cumprod]
+        )
+        return alpha_bar, perm_and_expand(alphas_cumprod_prev, t_prev + 1, shape)
+
+    @staticmethod
+    def _ddim_sigma(alpha_bar: Tensor, alpha_bar_prev: Tensor, eta: float) -> Tensor:
+        return (
+            eta
+            * torch.sqrt((1 - alpha_bar_prev) / (1 - alpha_bar))
+            * torch.sqrt(1 - alpha_bar / alpha_bar_prev)
+        )
+
     @torch.no_grad()
     def gaussian_ddim_step(
         self,
@@ -784,6 +837,7 @@ class GaussianMultinomialDiffusion(torch.nn.Module):
         x: Tensor,
         t: Tensor,
         eta: float = 0.0,
+        t_prev: Optional[Tensor] = None,
     ) -> Tensor:
         out = self.gaussian_p_mean_variance(
             model_out_num,
@@ -794,13 +848,8 @@ class GaussianMultinomialDiffusion(torch.nn.Module):
 
         eps = self._predict_eps_from_xstart(x, t, out["pred_xstart"])
 
-        alpha_bar = perm_and_expand(self.alphas_cumprod, t, x.shape)
-        alpha_bar_prev = perm_and_expand(self.alphas_cumprod_prev, t, x.shape)
-        sigma = eta or (
-            eta
-            * torch.sqrt((1 - alpha_bar_prev) / (1 - alpha_bar))
-            * torch.sqrt(1 - alpha_bar / alpha_bar_prev)
-        )
+        alpha_bar, alpha_bar_prev = self._ddim_alpha_bars(t, t_prev, x.shape)
+        sigma = self._ddim_sigma(alpha_bar, alpha_bar_prev, eta)
 
         noise = torch.randn_like(x)
         mean_pred = (
@@ -838,17 +887,17 @@ class GaussianMultinomialDiffusion(torch.nn.Module):
 
     @torch.no_grad()
     def multinomial_ddim_step(
-        self, model_out_cat: Tensor, log_x_t: Tensor, t: Tensor, eta: float = 0.0
+        self,
+        model_out_cat: Tensor,
+        log_x_t: Tensor,
+        t: Tensor,
+        eta: float = 0.0,
+        t_prev: Optional[Tensor] = None,
     ) -> Tensor:
         log_x0 = self.predict_start(model_out_cat, log_x_t=log_x_t)
 
-        alpha_bar = perm_and_expand(self.alphas_cumprod, t, log_x_t.shape)
-        alpha_bar_prev = perm_and_expand(self.alphas_cumprod_prev, t, log_x_t.shape)
-        sigma = eta or (
-            eta
-            * torch.sqrt((1 - alpha_bar_prev) / (1 - alpha_bar))
-            * torch.sqrt(1 - alpha_bar / alpha_bar_prev)
-        )
+        alpha_bar, alpha_bar_prev = self._ddim_alpha_bars(t, t_prev, log_x_t.shape)
+        sigma = self._ddim_sigma(alpha_bar, alpha_bar_prev, eta)
 
         coef1 = sigma
         coef2 = alpha_bar_prev - sigma * alpha_bar
@@ -869,8 +918,26 @@ class GaussianMultinomialDiffusion(torch.nn.Module):
 
         return out
 
-    @torch.no_grad()
-    def sample_ddim(self, num_samples: int, cond: Any = None) -> Tensor:
+    @torch.inference_mode()
+    def sample_ddim(
+        self,
+        num_samples: int,
+        cond: Any = None,
+        timesteps: Optional[Union[Sequence[int], np.ndarray]] = None,
+        eta: float = 0.0,
+    ) -> Tensor:
+        """Sample with DDIM, for both the Gaussian and the multinomial parts.
+
+        Args:
+            num_samples: int
+                Number of samples.
+            cond: Any
+                Optional condition of the samples.
+            timesteps: Optional[Sequence[int]]
+                Decreasing sub-sequence of the timesteps to walk, e.g. from `get_sampling_timesteps`. Each step jumps from one timestep to the next of the sequence. Default: None, all the timesteps.
+            eta: float
+                Stochasticity of the steps: 0 is the deterministic DDIM for the Gaussian part. Default: 0.
+        """
         b = num_samples
         device = self.log_alpha.device
         z_norm = torch.randn((b, self.num_numerics), device=device)
@@ -883,17 +950,27 @@ class GaussianMultinomialDiffusion(torch.nn.Module):
             )
             log_z = self.log_sample_categorical(uniform_logits)
 
-        for i in reversed(range(0, self.num_timesteps)):
+        if timesteps is None:
+            timesteps = get_sampling_timesteps(self.num_timesteps)
+        steps = [int(i) for i in timesteps]
+
+        for step, i in enumerate(steps):
             debug(f"Sample timestep {i:4d}", end="\r")
             t = torch.full((b,), i, device=device, dtype=torch.long)
+            i_prev = steps[step + 1] if step + 1 < len(steps) else -1
+            t_prev = torch.full((b,), i_prev, device=device, dtype=torch.long)
             model_out = self.denoise_fn(
                 torch.cat([z_norm, log_z], dim=1).float(), t, y=cond
             )
             model_out_num = model_out[:, : self.num_numerics]
             model_out_cat = model_out[:, self.num_numerics :]
-            z_norm = self.gaussian_ddim_step(model_out_num, z_norm, t)
+            z_norm = self.gaussian_ddim_step(
+                model_out_num, z_norm, t, eta=eta, t_prev=t_prev
+            )
             if has_cat:
-                log_z = self.multinomial_ddim_step(model_out_cat, log_z, t)
+                log_z = self.multinomial_ddim_step(
+                    model_out_cat, log_z, t, eta=eta, t_prev=t_prev
+                )
 
         z_ohe = torch.exp(log_z).round()
         z_cat = log_z
@@ -902,7 +979,7 @@ class GaussianMultinomialDiffusion(torch.nn.Module):
         sample = torch.cat([z_norm, z_cat], dim=1).cpu()
         return sample
 
-    @torch.no_grad()
+    @torch.inference_mode()
     def sample(self, num_samples: int, cond: Any = None) -> Tensor:
         b = num_samples
         device = self.log_alpha.device
@@ -935,18 +1012,63 @@ class GaussianMultinomialDiffusion(torch.nn.Module):
         sample = torch.cat([z_norm, z_cat], dim=1).cpu()
         return sample
 
+    def _auto_batch_size(self, num_samples: int, memory_fraction: float = 0.25) -> int:
+        """The number of rows per sampling batch which fits in `memory_fraction` of the free memory of the device."""
+        available = _available_memory(self.log_alpha.device)
+        if available is None:
+            return min(num_samples, 2000)
+
+        # float32 activations of the denoiser, and the temporaries of the diffusion steps
+        width = sum(
+            module.out_features
+            for module in self.denoise_fn.modules()
+            if isinstance(module, torch.nn.Linear)
+        )
+        width += 8 * self.dim_input
+        bytes_per_row = 4 * 2 * width
+
+        batch_size = int(available * memory_fraction) // bytes_per_row
+        return int(np.clip(batch_size, 1, min(num_samples, 2**16)))
+
     def sample_all(
         self,
         num_samples: int,
         cond: Any = None,
-        max_batch_size: int = 2000,
+        max_batch_size: Optional[int] = 2000,
         ddim: bool = False,
+        num_sampling_steps: Optional[int] = None,
+        eta: float = 0.0,
     ) -> Tensor:
-        if ddim:
-            info("Sample using DDIM.")
-            sample_fn = self.sample_ddim
-        else:
-            sample_fn = self.sample
+        """Sample by batches.
+
+        Args:
+            num_samples: int
+                Number of samples.
+            cond: Any
+                Optional condition of the samples.
+            max_batch_size: Optional[int]
+                Number of samples per batch. If None, the batch size is picked from the free memory of the device. Default: 2000.
+            ddim: bool
+                Use DDIM sampling instead of the ancestral sampling. Default: False.
+            num_sampling_steps: Optional[int]
+                Number of evenly spaced timesteps to walk with DDIM, e.g. 50 of 1000, which implies ddim=True. Default: None, all the timesteps.
+            eta: float
+                Stochasticity of the DDIM steps. Default: 0.
+        """
+        if max_batch_size is None:
+            max_batch_size = self._auto_batch_size(num_samples)
+        if max_batch_size <= 0:
+            raise ValueError(f"Invalid max_batch_size {max_batch_size}")
+
+        sample_fn: Callable[[int, Any], Tensor] = self.sample
+        if ddim or num_sampling_steps is not None:
+            timesteps = get_sampling_timesteps(self.num_timesteps, num_sampling_steps)
+            info(f"Sample using DDIM, {len(timesteps)} steps.")
+
+            def _sample_ddim(b: int, c: Any) -> Tensor:
+                return self.sample_ddim(b, c, timesteps=timesteps, eta=eta)
+
+            sample_fn = _sample_ddim
 
         indices = [*range(0, num_samples, max_batch_size), num_samples]
         all_samples = []
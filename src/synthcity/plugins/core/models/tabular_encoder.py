@@ -2,6 +2,7 @@
 """
 
 # stdlib
+from itertools import repeat
 from typing import Any, List, Optional, Sequence, Tuple, Union
 
 # third party
@@ -14,10 +15,12 @@ from sklearn.preprocessing import MinMaxScaler
 # synthcity absolute
 import synthcity.logger as log
 from synthcity.utils.dataframe import discrete_columns as find_cat_cols
+from synthcity.utils.parallel import process_pool, resolve_n_jobs
 from synthcity.utils.serialization import dataframe_hash
 
 # synthcity relative
 from .factory import get_feature_encoder
+from .feature_encoder import FeatureEncoder
 
 
 class FeatureInfo(BaseModel):
@@ -54,6 +57,56 @@ class FeatureInfo(BaseModel):
         return v
 
 
+def _fit_feature_job(
+    encoder: "TabularEncoder", feature: pd.Series, feature_type: str
+) -> FeatureInfo:
+    return encoder._fit_feature(feature, feature_type)
+
+
+def _stack_frames(
+    frames: List[pd.DataFrame],
+) -> Optional[Tuple[pd.DataFrame, np.ndarray]]:
+    """Stack DataFrames with the same columns and dtypes, as a single DataFrame with a RangeIndex.
+
+    Returns:
+        The stacked DataFrame and the row offsets of the frames, or None if the frames cannot be stacked without changing their dtypes.
+    """
+    if len(frames) == 0:
+        return None
+
+    columns = frames[0].columns
+    dtypes = frames[0].dtypes
+    for item in frames:
+        if not item.columns.equals(columns) or not item.dtypes.equals(dtypes):
+            return None
+
+    offsets = np.zeros(len(frames) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in frames], out=offsets[1:])
+    stacked = pd.concat(frames, ignore_index=True)
+
+    return stacked, offsets
+
+
+def _split_frame(
+    data: pd.DataFrame, offsets: np.ndarray, frames: List[pd.DataFrame]
+) -> List[pd.DataFrame]:
+    """Split the rows of `data` at `offsets`, with the index of the matching item of `frames`."""
+    if data.dtypes.nunique() <= 1:
+        # a single block, sliced without going through pandas indexing
+        values = data.to_numpy()
+        return [
+            pd.DataFrame(values[start:end], columns=data.columns, index=item.index)
+            for start, end, item in zip(offsets[:-1], offsets[1:], frames)
+        ]
+
+    out = []
+    for start, end, item in zip(offsets[:-1], offsets[1:], frames):
+        chunk = data.iloc[start:end].copy()
+        chunk.index = item.index
+        out.append(chunk)
+    return out
+
+
 class TabularEncoder(TransformerMixin, BaseEstimator):
     """Tabular encoder.
 
@@ -77,14 +130,18 @@ class TabularEncoder(TransformerMixin, BaseEstimator):
         continuous_encoder: Optional[Union[str, type]] = None,
         cat_encoder_params: Optional[dict] = None,
         cont_encoder_params: Optional[dict] = None,
+        n_jobs: int = 1,
     ) -> None:
         """Create a data transformer.
 
         Args:
             whitelist (tuple):
                 Columns that will not be transformed.
+            n_jobs (int):
+                Number of processes used to fit the column encoders. -1 uses all the CPUs.
         """
         self.whitelist = whitelist
+        self.n_jobs = n_jobs
         self.categorical_limit = categorical_limit
         self.max_clusters = max_clusters
         if categorical_encoder is not None:
@@ -152,14 +209,32 @@ class TabularEncoder(TransformerMixin, BaseEstimator):
         self._column_raw_dtypes = raw_data.infer_objects().dtypes
         self._column_transform_info_list: Sequence[FeatureInfo] = []
 
+        names = []
+        ftypes = []
         for name in raw_data.columns:
             if name in self.whitelist:
                 continue
             column_hash = dataframe_hash(raw_data[[name]])
             log.info(f"Encoding {name} {column_hash}")
-            ftype = "discrete" if name in discrete_columns else "continuous"
-            column_transform_info = self._fit_feature(raw_data[name], ftype)
+            names.append(name)
+            ftypes.append("discrete" if name in discrete_columns else "continuous")
+
+        n_jobs = min(resolve_n_jobs(self.n_jobs), len(names))
+        features = (raw_data[name] for name in names)
 
+        if n_jobs > 1:
+            # the column encoders are independent, one task per column
+            with process_pool(n_jobs) as executor:
+                infos = list(
+                    executor.map(_fit_feature_job, repeat(self), features, ftypes)
+                )
+        else:
+            infos = [
+                self._fit_feature(feature, ftype)
+                for feature, ftype in zip(features, ftypes)
+            ]
+
+        for column_transform_info in infos:
             self.output_dimensions += column_transform_info.output_dimensions
             self._column_transform_info_list.append(column_transform_info)
 
@@ -198,6 +273,59 @@ class TabularEncoder(TransformerMixin, BaseEstimator):
 
         return result
 
+    def _has_array_path(self) -> bool:
+        # subclasses with custom per-feature transforms go through the DataFrame path
+        return all(
+            isinstance(info.transform, FeatureEncoder)  # type: ignore
+            for info in self._column_transform_info_list
+        ) and (
+            type(self)._transform_feature is TabularEncoder._transform_feature
+            and type(self)._inverse_transform_feature
+            is TabularEncoder._inverse_transform_feature
+        )
+
+    @validate_arguments(config=dict(arbitrary_types_allowed=True))
+    def transform_numpy(
+        self, raw_data: pd.DataFrame, dtype: Any = np.float32
+    ) -> np.ndarray:
+        """Take raw data and output a matrix data, as a single array.
+
+        Same layout as `transform`, but the encoded columns are written in place into one preallocated matrix, without building a DataFrame per column.
+
+        Args:
+            raw_data: pd.DataFrame
+                The raw data.
+            dtype: Any
+                The dtype of the output matrix. Default: np.float32.
+
+        Returns:
+            np.ndarray of shape (len(raw_data), n_features)
+        """
+        if len(self._column_transform_info_list) == 0:
+            return np.zeros((len(raw_data), 0), dtype=dtype)
+        if not self._has_array_path():
+            return np.asarray(self.transform(raw_data), dtype=dtype)
+
+        whitelist = [name for name in self.whitelist if name in raw_data.columns]
+        out = np.empty(
+            (len(raw_data), len(whitelist) + self.output_dimensions), dtype=dtype
+        )
+
+        st = 0
+        for name in whitelist:
+            out[:, st] = raw_data[name].values
+            st += 1
+
+        for column_transform_info in self._column_transform_info_list:
+            encoder = column_transform_info.transform
+            dim = column_transform_info.output_dimensions
+            out[:, st : st + dim] = encoder.transform_array(
+                raw_data[column_transform_info.name].values
+            ).reshape(len(raw_data), dim)
+            st += dim
+
+        return out
+
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def _inverse_transform_feature(
         self,
@@ -216,7 +344,6 @@ class TabularEncoder(TransformerMixin, BaseEstimator):
         if len(self._column_transform_info_list) == 0:
             return pd.DataFrame(np.zeros((len(data), 0)))
 
-        st = 0
         names = []
         feature_types = []
         recovered_feature_list = []
@@ -228,15 +355,29 @@ class TabularEncoder(TransformerMixin, BaseEstimator):
             feature_types.append(self._column_raw_dtypes)
             recovered_feature_list.append(data[name])
 
-        for column_transform_info in self._column_transform_info_list:
-            dim = column_transform_info.output_dimensions
-            column_data = data.iloc[:, list(range(st, st + dim))]
-            recovered_feature = self._inverse_transform_feature(
-                column_transform_info, column_data
-            )
-            recovered_feature_list.append(recovered_feature)
-            names.append(column_transform_info.name)
-            st += dim
+        st = len(names)
+        if self._has_array_path():
+            # contiguous views on a single array, instead of a DataFrame per feature
+            values = np.ascontiguousarray(data.iloc[:, st:].values)
+            st = 0
+            for column_transform_info in self._column_transform_info_list:
+                encoder = column_transform_info.transform
+                dim = column_transform_info.output_dimensions
+                recovered_feature_list.append(
+                    encoder.inverse_transform_array(values[:, st : st + dim])
+                )
+                names.append(column_transform_info.name)
+                st += dim
+        else:
+            for column_transform_info in self._column_transform_info_list:
+                dim = column_transform_info.output_dimensions
+                column_data = data.iloc[:, st : st + dim]
+                recovered_feature = self._inverse_transform_feature(
+                    column_transform_info, column_data
+                )
+                recovered_feature_list.append(recovered_feature)
+                names.append(column_transform_info.name)
+                st += dim
 
         recovered_data = np.column_stack(recovered_feature_list)
         recovered_data = pd.DataFrame(
@@ -416,9 +557,23 @@ class TimeSeriesTabularEncoder(TransformerMixin, BaseEstimator):
         temporal_data: List[pd.DataFrame],
         observation_times: List,
     ) -> Tuple[pd.DataFrame, List]:
-        temporal_encoded = []
-        for item in temporal_data:
-            temporal_encoded.append(self.temporal_encoder.transform(item))
+        # the whitelisted columns are aligned on the index of each item, so they are transformed one item at a time
+        stacked = None
+        if len(temporal_data) and not any(
+            name in temporal_data[0].columns for name in self.whitelist
+        ):
+            stacked = _stack_frames(temporal_data)
+
+        if stacked is not None:
+            # all the timesteps at once, split back per item
+            data, offsets = stacked
+            temporal_encoded = _split_frame(
+                self.temporal_encoder.transform(data), offsets, temporal_data
+            )
+        else:
+            temporal_encoded = []
+            for item in temporal_data:
+                temporal_encoded.append(self.temporal_encoder.transform(item))
 
         horizons_encoded = self.transform_observation_times(observation_times)
 
@@ -489,9 +644,17 @@ class TimeSeriesTabularEncoder(TransformerMixin, BaseEstimator):
         temporal_encoded: List[pd.DataFrame],
         observation_times: List,
     ) -> pd.DataFrame:
-        temporal_decoded = []
-        for item in temporal_encoded:
-            temporal_decoded.append(self.temporal_encoder.inverse_transform(item))
+        stacked = _stack_frames(temporal_encoded)
+        if stacked is not None:
+            # all the timesteps at once, split back per item
+            data, offsets = stacked
+            temporal_decoded = _split_frame(
+                self.temporal_encoder.inverse_transform(data), offsets, temporal_encoded
+            )
+        else:
+            temporal_decoded = []
+            for item in temporal_encoded:
+                temporal_decoded.append(self.temporal_encoder.inverse_transform(item))
 
         horizons_decoded = self.inverse_transform_observation_times(observation_times)
 
@@ -99,6 +99,10 @@ class TabularGAN(torch.nn.Module):
             Optional sampler for the dataloader, useful for conditional sampling
         device: Any = DEVICE
             CUDA/CPU
+        patience_max_samples: Optional[int]
+            Max number of validation rows used by the patience metric. If None, the whole validation set is used.
+        patience_async: bool
+            Evaluate the patience metric in a background thread. See GAN.
         adjust_inference_sampling: bool
             Adjust the marginal probabilities in the synthetic data to closer match the training set. Active only with the ConditionalSampler
         # privacy settings
@@ -119,6 +123,8 @@ class TabularGAN(torch.nn.Module):
             Pre-trained tabular encoder. If None, a new encoder is trained.
         encoder_whitelist:
             Ignore columns from encoding
+        encoder_n_jobs: int
+            Number of processes used to fit the tabular encoder. -1 uses all the CPUs. Default: 1.
     """
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -157,10 +163,13 @@ class TabularGAN(torch.nn.Module):
         encoder_max_clusters: int = 20,
         encoder: Any = None,
         encoder_whitelist: list = [],
+        encoder_n_jobs: int = 1,
         dataloader_sampler: Optional[BaseSampler] = None,
         device: Any = DEVICE,
         patience: int = 10,
         patience_metric: Optional[WeightedMetrics] = None,
+        patience_max_samples: Optional[int] = None,
+        patience_async: bool = False,
         n_iter_print: int = 50,
         n_iter_min: int = 100,
         adjust_inference_sampling: bool = False,
@@ -182,7 +191,9 @@ class TabularGAN(torch.nn.Module):
             self.encoder = encoder
         else:
             self.encoder = TabularEncoder(
-                max_clusters=encoder_max_clusters, whitelist=encoder_whitelist
+                max_clusters=encoder_max_clusters,
+                whitelist=encoder_whitelist,
+                n_jobs=encoder_n_jobs,
             ).fit(X)
 
         self.cond_encoder: Optional[OneHotEncoder] = None
@@ -204,6 +215,7 @@ class TabularGAN(torch.nn.Module):
             dataloader_sampler = ConditionalDatasetSampler(
                 self.encoder.transform(X),
                 self.encoder.layout(),
+                random_state=random_state,
             )
             n_units_conditional = dataloader_sampler.conditional_dimension()
 
@@ -304,6 +316,8 @@ class TabularGAN(torch.nn.Module):
             device=device,
             patience=patience,
             patience_metric=patience_metric,
+            patience_max_samples=patience_max_samples,
+            patience_async=patience_async,
             # privacy
             dp_enabled=dp_enabled,
             dp_epsilon=dp_epsilon,
@@ -336,7 +350,7 @@ class TabularGAN(torch.nn.Module):
         if encoded:
             X_enc = X
         else:
-            X_enc = self.encode(X)
+            X_enc = self.encoder.transform_numpy(X)
 
         if cond is not None and self.cond_encoder is not None:
             cond = np.asarray(cond)
@@ -401,7 +415,9 @@ class TabularGAN(torch.nn.Module):
             cond = self.cond_encoder.transform(cond).toarray()
 
         if not self.predefined_conditional and self.dataloader_sampler is not None:
-            cond = self.dataloader_sampler.sample_conditional(count, p=self.sample_prob)
+            cond = self.dataloader_sampler.sample_conditional(
+                count, p=self.sample_prob, reuse_buffer=True
+            )
 
         return self.model.generate(count, cond=cond)
 
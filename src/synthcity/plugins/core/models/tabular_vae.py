@@ -69,6 +69,8 @@ class TabularVAE(nn.Module):
             random_state used
         encoder_max_clusters: int
             The max number of clusters to create for continuous columns when encoding
+        encoder_n_jobs: int
+            Number of processes used to fit the tabular encoder. -1 uses all the CPUs. Default: 1.
         # early stopping
         n_iter_print: int
             Number of iterations after which to print updates and check the validation loss.
@@ -105,6 +107,7 @@ class TabularVAE(nn.Module):
         encoder_batch_norm: bool = False,
         encoder_dropout: float = 0.1,
         encoder_whitelist: list = [],
+        encoder_n_jobs: int = 1,
         device: Any = DEVICE,
         robust_divergence_beta: int = 2,  # used for loss_strategy = robust_divergence
         loss_factor: int = 1,  # used for standar losss
@@ -118,7 +121,9 @@ class TabularVAE(nn.Module):
         super(TabularVAE, self).__init__()
         self.columns = X.columns
         self.encoder = TabularEncoder(
-            max_clusters=encoder_max_clusters, whitelist=encoder_whitelist
+            max_clusters=encoder_max_clusters,
+            whitelist=encoder_whitelist,
+            n_jobs=encoder_n_jobs,
         ).fit(X)
 
         n_units_conditional = 0
@@ -141,6 +146,7 @@ class TabularVAE(nn.Module):
             dataloader_sampler = ConditionalDatasetSampler(
                 self.encoder.transform(X),
                 self.encoder.layout(),
+                random_state=random_state,
             )
             n_units_conditional = dataloader_sampler.conditional_dimension()
 
@@ -251,7 +257,7 @@ class TabularVAE(nn.Module):
         cond: Optional[Union[pd.DataFrame, pd.Series, np.ndarray]] = None,
         **kwargs: Any,
     ) -> Any:
-        X_enc = self.encode(X)
+        X_enc = self.encoder.transform_numpy(X)
 
         if cond is not None and self.cond_encoder is not None:
             cond = np.asarray(cond)
@@ -296,6 +302,6 @@ class TabularVAE(nn.Module):
             cond = self.cond_encoder.transform(cond).toarray()
 
         if not self.predefined_conditional and self.dataloader_sampler is not None:
-            cond = self.dataloader_sampler.sample_conditional(count)
+            cond = self.dataloader_sampler.sample_conditional(count, reuse_buffer=True)
 
         return self.model.generate(count, cond=cond)
@@ -6,13 +6,14 @@ import numpy as np
 import torch
 from pydantic import validate_arguments
 from torch import nn
-from torch.utils.data import DataLoader, TensorDataset, sampler
+from torch.utils.data import sampler
 from tqdm import tqdm
 
 # synthcity absolute
 import synthcity.logger as log
 from synthcity.utils.constants import DEVICE
 from synthcity.utils.reproducibility import enable_reproducible_results
+from synthcity.utils.samplers import BatchIterator
 
 # synthcity relative
 from .mlp import MLP
@@ -457,16 +458,16 @@ class TimeSeriesGAN(nn.Module):
         temporal_data: torch.Tensor,
         observation_times: torch.Tensor,
         cond: Optional[torch.Tensor] = None,
-    ) -> DataLoader:
-        if cond is None:
-            dataset = TensorDataset(static_data, temporal_data, observation_times)
-        else:
-            dataset = TensorDataset(static_data, temporal_data, observation_times, cond)
-        return DataLoader(
-            dataset,
+    ) -> BatchIterator:
+        tensors = [static_data, temporal_data, observation_times]
+        if cond is not None:
+            tensors.append(cond)
+
+        return BatchIterator(
+            *tensors,
             batch_size=self.batch_size,
             sampler=self.dataloader_sampler,
-            pin_memory=False,
+            device=self.device,
         )
 
     def _train_epoch_all_models(
@@ -762,7 +763,7 @@ class TimeSeriesGAN(nn.Module):
 
     def _train_epoch(
         self,
-        loader: DataLoader,
+        loader: BatchIterator,
     ) -> Tuple[float, float, float]:
         E_losses = []
         G_losses = []
@@ -1,4 +1,5 @@
 # stdlib
+import copy
 from typing import Any, Callable, List, Optional, Tuple
 
 # third party
@@ -7,12 +8,13 @@ import torch
 from pydantic import validate_arguments
 from torch import Tensor, nn
 from torch.optim import Adam
-from torch.utils.data import DataLoader, TensorDataset, sampler
+from torch.utils.data import sampler
 from tqdm import tqdm
 
 # synthcity absolute
 import synthcity.logger as log
 from synthcity.utils.constants import DEVICE
+from synthcity.utils.samplers import BatchIterator
 
 # synthcity relative
 from .mlp import MLP
@@ -445,7 +447,7 @@ class VAE(nn.Module):
                     patience += 1
                 else:
                     best_loss = val_loss
-                    best_state_dict = self.state_dict()
+                    best_state_dict = copy.deepcopy(self.state_dict())
                     patience = 0
 
                 if patience >= self.patience and epoch >= self.n_iter_min:
@@ -463,17 +465,16 @@ class VAE(nn.Module):
         else:
             return torch.from_numpy(np.asarray(X)).to(self.device)
 
-    def _dataloader(self, X: Tensor, cond: Optional[torch.Tensor] = None) -> DataLoader:
-        if cond is None:
-            dataset = TensorDataset(X)
-        else:
-            dataset = TensorDataset(X, cond)
+    def _dataloader(
+        self, X: Tensor, cond: Optional[torch.Tensor] = None
+    ) -> BatchIterator:
+        tensors = [X] if cond is None else [X, cond]
 
-        return DataLoader(
-            dataset,
+        return BatchIterator(
+            *tensors,
             sampler=self.dataloader_sampler,
             batch_size=self.batch_size,
-            pin_memory=False,
+            device=self.device,
         )
 
     def _loss_function(
@@ -11,6 +11,13 @@ from typing import Any, Callable, Dict, Generator, List, Optional, Type, Union
 import pandas as pd
 from pydantic import ConfigDict, validate_arguments
 
+try:
+    # third party
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
 # synthcity absolute
 import synthcity.logger as log
 from synthcity.metrics.plots import plot_marginal_comparison, plot_tsne
@@ -30,6 +37,8 @@ from synthcity.plugins.core.distribution import (
 )
 from synthcity.plugins.core.schema import Schema
 from synthcity.plugins.core.serializable import Serializable
+from synthcity.utils.artifacts import MISSING, ArtifactStore
+from synthcity.utils.compression import CompressionCache
 from synthcity.utils.constants import DEVICE
 from synthcity.utils.reproducibility import enable_reproducible_results
 from synthcity.utils.serialization import load_from_file, save_to_file
@@ -61,6 +70,10 @@ class Plugin(Serializable, metaclass=ABCMeta):
             Path for caching intermediary results
         compress_dataset: bool. Default = False
             Drop redundant features before training the generator.
+        compress_n_jobs: int. Default = 1
+            Number of processes of the redundancy scan of `compress_dataset`. -1 uses all the CPUs.
+        compress_screen_threshold: Optional[float]. Default = None
+            Correlation screen of the redundancy scan of `compress_dataset`. The columns weakly correlated with all the kept columns are kept without training a model.
         device:
             PyTorch device: cpu or cuda.
         random_state: int
@@ -82,6 +95,8 @@ class Plugin(Serializable, metaclass=ABCMeta):
         workspace: Path = Path("workspace"),
         compress_dataset: bool = False,
         sampling_strategy: str = "marginal",  # uniform, marginal
+        compress_n_jobs: int = 1,
+        compress_screen_threshold: Optional[float] = None,
     ) -> None:
         if self.name() == PLUGIN_NAME_NOT_SET:
             raise ValueError(
@@ -106,6 +121,8 @@ class Plugin(Serializable, metaclass=ABCMeta):
         self.device = device
         self.random_state = random_state
         self.compress_dataset = compress_dataset
+        self.compress_n_jobs = compress_n_jobs
+        self.compress_screen_threshold = compress_screen_threshold
 
         workspace.mkdir(parents=True, exist_ok=True)
         self.workspace = workspace
@@ -235,12 +252,27 @@ class Plugin(Serializable, metaclass=ABCMeta):
             X, self._data_encoders = X.encode()
             if self.compress_dataset:
                 X_hash = X.hash()
+                # the screen can keep columns the models would drop
+                screen = (
+                    ""
+                    if self.compress_screen_threshold is None
+                    else f"_screen{self.compress_screen_threshold}"
+                )
                 bkp_file = (
                     self.workspace
-                    / f"compressed_df_{X_hash}_{platform.python_version()}.bkp"
+                    / f"compressed_df_{X_hash}{screen}_{platform.python_version()}.bkp"
                 )
                 if not bkp_file.exists():
-                    X_compressed_context = X.compress()
+                    # the column scores are shared by the datasets of the workspace, the store writes them atomically
+                    store = ArtifactStore(self.workspace)
+                    cache_key = store.key("compression_cache", kind="compression")
+                    cache = self._load_compression_cache(store, cache_key)
+                    X_compressed_context = X.compress(
+                        n_jobs=self.compress_n_jobs,
+                        screen_threshold=self.compress_screen_threshold,
+                        cache=cache,
+                    )
+                    store.put(cache_key, cache, kind="compression")
                     save_to_file(bkp_file, X_compressed_context)
 
                 X, self.compress_context = load_from_file(bkp_file)
@@ -256,6 +288,19 @@ class Plugin(Serializable, metaclass=ABCMeta):
 
         return output
 
+    @staticmethod
+    def _load_compression_cache(store: ArtifactStore, key: str) -> CompressionCache:
+        """The compression cache of the workspace, or an empty one if it is missing or unreadable."""
+        try:
+            cache = store.get(key, MISSING)
+        except Exception as e:
+            log.error(f"[compression] failed to load the compression cache: {e}")
+            return CompressionCache()
+
+        if not isinstance(cache, CompressionCache):
+            return CompressionCache()
+        return cache
+
     @abstractmethod
     def _fit(self, X: DataLoader, *args: Any, **kwargs: Any) -> "Plugin":
         """Internal training method the synthetic data plugin.
@@ -369,6 +414,141 @@ class Plugin(Serializable, metaclass=ABCMeta):
 
         return X_syn
 
+    @validate_arguments(config=dict(arbitrary_types_allowed=True))
+    def generate_iter(
+        self,
+        count: Optional[int] = None,
+        chunk_size: int = 10000,
+        constraints: Optional[Constraints] = None,
+        random_state: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Generator[DataLoader, None, None]:
+        """Streaming synthetic data generation, with bounded memory.
+
+        Each chunk goes through the same path as `generate`: sampling, decompression, decoding and constraints matching.
+
+        Args:
+            count: optional int.
+                The total number of samples to generate. If None, it generated len(reference_dataset) samples.
+            chunk_size: int.
+                The maximum number of samples generated at once.
+            constraints: optional Constraints.
+                Optional constraints to apply on the generated data. See `generate`.
+            random_state: optional int.
+                Optional random seed, applied once before the first chunk.
+            cond: Optional, Union[pd.DataFrame, pd.Series, np.ndarray].
+                Optional Generation Conditional, of length `count`. Each chunk receives its slice of the conditional.
+
+        Returns:
+            A generator of DataLoaders, with at most `chunk_size` samples each.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Invalid chunk_size {chunk_size}")
+        if count is None:
+            count = self.data_info["len"]
+        if random_state is not None:
+            enable_reproducible_results(random_state)
+
+        cond = kwargs.pop("cond", None)
+
+        offset = 0
+        while offset < count:
+            chunk_count = min(chunk_size, count - offset)
+            if cond is not None:
+                if isinstance(cond, (pd.DataFrame, pd.Series)):
+                    kwargs["cond"] = cond.iloc[offset : offset + chunk_count]
+                else:
+                    kwargs["cond"] = cond[offset : offset + chunk_count]
+
+            X_syn = self.generate(count=chunk_count, constraints=constraints, **kwargs)
+            offset += chunk_count
+
+            if len(X_syn) == 0:
+                log.critical(
+                    f"Plugin {self.name()} generated an empty chunk, stopping the generation"
+                )
+                return
+
+            yield X_syn
+
+    @validate_arguments(config=dict(arbitrary_types_allowed=True))
+    def generate_to(
+        self,
+        path: Union[str, Path],
+        count: Optional[int] = None,
+        chunk_size: int = 10000,
+        format: str = "parquet",
+        constraints: Optional[Constraints] = None,
+        random_state: Optional[int] = None,
+        **kwargs: Any,
+    ) -> int:
+        """Generate synthetic data directly to a file, one chunk at a time.
+
+        Args:
+            path: str or Path.
+                The output file.
+            count: optional int.
+                The total number of samples to generate. If None, it generated len(reference_dataset) samples.
+            chunk_size: int.
+                The maximum number of samples held in memory at once.
+            format: str.
+                "parquet" or "csv". Writing parquet requires pyarrow.
+            constraints: optional Constraints.
+                Optional constraints to apply on the generated data. See `generate`.
+            random_state: optional int.
+                Optional random seed.
+
+        Returns:
+            The number of rows written.
+        """
+        if format not in ["parquet", "csv"]:
+            raise ValueError(f"Invalid format {format}. Supported: parquet, csv")
+        if format == "parquet" and pa is None:
+            raise RuntimeError("pyarrow is required for writing parquet files")
+        if self.data_info["data_type"] not in ["generic", "survival_analysis"]:
+            raise ValueError(
+                f"generate_to is not supported for {self.data_info['data_type']} data"
+            )
+
+        path = Path(path)
+        path.absolute().parent.mkdir(parents=True, exist_ok=True)
+
+        writer: Any = None
+        pa_schema: Any = None
+        rows = 0
+        try:
+            for X_syn in self.generate_iter(
+                count=count,
+                chunk_size=chunk_size,
+                constraints=constraints,
+                random_state=random_state,
+                **kwargs,
+            ):
+                df = X_syn.dataframe()
+                if format == "csv":
+                    df.to_csv(
+                        path,
+                        mode="w" if rows == 0 else "a",
+                        header=rows == 0,
+                        index=False,
+                    )
+                else:
+                    if writer is None:
+                        table = pa.Table.from_pandas(df, preserve_index=False)
+                        pa_schema = table.schema
+                        writer = pq.ParquetWriter(path, pa_schema)
+                    else:
+                        table = pa.Table.from_pandas(
+                            df, schema=pa_schema, preserve_index=False
+                        )
+                    writer.write_table(table)
+                rows += len(df)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        return rows
+
     @abstractmethod
     def _generate(
         self,
@@ -397,7 +577,8 @@ class Plugin(Serializable, metaclass=ABCMeta):
     ) -> DataLoader:
         constraints = syn_schema.as_constraints()
 
-        data_synth = pd.DataFrame([], columns=self.training_schema().features())
+        batches = [pd.DataFrame([], columns=self.training_schema().features())]
+        data_synth_len = 0
         for it in range(self.sampling_patience):
             # sample
             iter_samples = gen_cbk(count, **kwargs)
@@ -418,11 +599,14 @@ class Plugin(Serializable, metaclass=ABCMeta):
                 iter_samples_df = constraints.match(iter_samples_df)
                 iter_samples_df = iter_samples_df.drop_duplicates()
 
-            data_synth = pd.concat([data_synth, iter_samples_df], ignore_index=True)
+            # the batches are concatenated once, to avoid quadratic copies
+            batches.append(iter_samples_df)
+            data_synth_len += len(iter_samples_df)
 
-            if len(data_synth) >= count:
+            if data_synth_len >= count:
                 break
 
+        data_synth = pd.concat(batches, ignore_index=True)
         data_synth = self.training_schema().adapt_dtypes(data_synth).head(count)
 
         return create_from_info(data_synth, self.data_info)
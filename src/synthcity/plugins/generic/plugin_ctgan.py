@@ -70,6 +70,8 @@ class CTGANPlugin(Plugin):
             Gradients clipping value. Zero disables the feature
         encoder_max_clusters: int
             The max number of clusters to create for continuous columns when encoding
+        encoder_n_jobs: int
+            Number of processes used to fit the tabular encoder. -1 uses all the CPUs. Default: 1.
         adjust_inference_sampling: bool
             Adjust the marginal probabilities in the synthetic data to closer match the training set. Active only with the ConditionalSampler
         # early stopping
@@ -124,6 +126,7 @@ class CTGANPlugin(Plugin):
         clipping_value: int = 1,
         lambda_gradient_penalty: float = 10,
         encoder_max_clusters: int = 10,
+        encoder_n_jobs: int = 1,
         encoder: Any = None,
         dataloader_sampler: Optional[sampler.Sampler] = None,
         device: Any = DEVICE,
@@ -173,6 +176,7 @@ class CTGANPlugin(Plugin):
         self.lambda_gradient_penalty = lambda_gradient_penalty
 
         self.encoder_max_clusters = encoder_max_clusters
+        self.encoder_n_jobs = encoder_n_jobs
         self.encoder = encoder
         self.dataloader_sampler = dataloader_sampler
 
@@ -267,6 +271,7 @@ class CTGANPlugin(Plugin):
             clipping_value=self.clipping_value,
             lambda_gradient_penalty=self.lambda_gradient_penalty,
             encoder_max_clusters=self.encoder_max_clusters,
+            encoder_n_jobs=self.encoder_n_jobs,
             dataloader_sampler=self.dataloader_sampler,
             device=self.device,
             patience=self.patience,
@@ -86,6 +86,7 @@ class TabDDPMPlugin(Plugin):
         >>> plugin = Plugins().get("ddpm", n_iter=100, is_classification=True)
         >>> plugin.fit(X)
         >>> plugin.generate(50)
+        >>> plugin.generate(50, num_sampling_steps=50)  # strided DDIM sampling
 
     """
 
@@ -234,7 +235,24 @@ class TabDDPMPlugin(Plugin):
         return self
 
     def _generate(self, count: int, syn_schema: Schema, **kwargs: Any) -> DataLoader:
+        """Generate the synthetic data.
+
+        Optionally, a condition can be given as the keyword argument `cond`.
+
+        The sampling can be accelerated with the keyword arguments:
+            num_sampling_steps: Optional[int]
+                Number of evenly spaced timesteps walked by a strided DDIM sampler, e.g. 50 of the 1000 `num_timesteps`. Default: None, the ancestral sampler over all the timesteps.
+            eta: float
+                Stochasticity of the DDIM steps. Default: 0.
+            max_batch_size: Optional[int]
+                Rows per sampling batch. Default: None, picked from the free memory of the device.
+        """
         cond = kwargs.pop("cond", None)
+        sampling_kwargs = {
+            key: kwargs.pop(key)
+            for key in ["num_sampling_steps", "eta", "max_batch_size"]
+            if key in kwargs
+        }
 
         if self.is_classification and cond is None:
             # randomly generate labels following the distribution of the training data
@@ -244,7 +262,7 @@ class TabDDPMPlugin(Plugin):
             raise ValueError("The length of cond is less than the required count")
 
         def callback(count):  # type: ignore
-            df = self.model.generate(count, cond=cond)
+            df = self.model.generate(count, cond=cond, **sampling_kwargs)
             df = self.encoder.inverse_transform(df)
             if self.is_classification:
                 df = df.join(pd.Series(cond, name=self.target_name))
@@ -31,6 +31,10 @@ class Syn_SeqPlugin(Plugin):
         sampling_strategy: str.
             Sampling strategy to use for generating synthetic data. Options are 'marginal' or 'joint'.
             Default is 'marginal'.
+        n_jobs: int.
+            Number of processes fitting the columns and generating the rows. -1 uses all the CPUs. Default = 1.
+        generation_chunk_size: int.
+            Maximum number of rows generated at once. Each chunk is generated independently, with its own seed. Default = 100000.
 
 
     Example:
@@ -66,6 +70,8 @@ class Syn_SeqPlugin(Plugin):
         random_state: int = 0,
         compress_dataset: bool = False,
         sampling_strategy: str = "marginal",
+        n_jobs: int = 1,
+        generation_chunk_size: int = 100000,
         **kwargs: Any
     ) -> None:
         super().__init__(
@@ -74,6 +80,8 @@ class Syn_SeqPlugin(Plugin):
             compress_dataset=compress_dataset,
             sampling_strategy=sampling_strategy,
         )
+        self.n_jobs = n_jobs
+        self.generation_chunk_size = generation_chunk_size
         self.model: Optional[Syn_Seq] = None
 
     def _fit(self, X: DataLoader, *args: Any, **kwargs: Any) -> "Syn_SeqPlugin":
@@ -82,6 +90,8 @@ class Syn_SeqPlugin(Plugin):
         self.model = Syn_Seq(
             random_state=self.random_state,
             sampling_patience=self.sampling_patience,
+            n_jobs=self.n_jobs,
+            chunk_size=self.generation_chunk_size,
         )
 
         # cast explicitly to Syn_Seq to make sure mypy doesn't think it can be None
@@ -93,7 +103,7 @@ class Syn_SeqPlugin(Plugin):
     def _generate(self, count: int, syn_schema: Schema, **kwargs: Any) -> DataLoader:
         if self.model is None:
             raise RuntimeError("The model must be fitted before generating data.")
-        df_syn = self.model.generate_col(count, self._data_encoders, **kwargs)
+        df_syn = self.model.generate_col(count, self._data_encoders)
         df_syn = syn_schema.adapt_dtypes(df_syn)
         return Syn_SeqDataLoader(
             df_syn, user_custom=self.data_info.get("user_custom", {}), verbose=False
@@ -60,6 +60,8 @@ class TVAEPlugin(Plugin):
             random_state used
         encoder_max_clusters: int
             The max number of clusters to create for continuous columns when encoding
+        data_encoder_n_jobs: int
+            Number of processes used to fit the tabular encoder. -1 uses all the CPUs. Default: 1.
         # early stopping
         n_iter_print: int
             Number of iterations after which to print updates and check the validation loss.
@@ -109,6 +111,7 @@ class TVAEPlugin(Plugin):
         encoder_dropout: float = 0.1,
         loss_factor: int = 1,
         data_encoder_max_clusters: int = 10,
+        data_encoder_n_jobs: int = 1,
         dataloader_sampler: Optional[sampler.Sampler] = None,
         clipping_value: int = 1,
         n_iter_print: int = 50,
@@ -144,6 +147,7 @@ class TVAEPlugin(Plugin):
         self.batch_size = batch_size
         self.random_state = random_state
         self.data_encoder_max_clusters = data_encoder_max_clusters
+        self.data_encoder_n_jobs = data_encoder_n_jobs
         self.dataloader_sampler = dataloader_sampler
         self.loss_factor = loss_factor
         self.clipping_value = clipping_value
@@ -215,6 +219,7 @@ class TVAEPlugin(Plugin):
             encoder_batch_norm=False,
             encoder_dropout=self.encoder_dropout,
             encoder_max_clusters=self.data_encoder_max_clusters,
+            encoder_n_jobs=self.data_encoder_n_jobs,
             dataloader_sampler=self.dataloader_sampler,
             loss_factor=self.loss_factor,
             clipping_value=self.clipping_value,
@@ -2,11 +2,12 @@
 Reference: PrivBayes: Private Data Release via Bayesian Networks. (2017), Zhang J, Cormode G, Procopiuc CM, Srivastava D, Xiao X.
 """
 # stdlib
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from itertools import combinations, product
 from math import ceil
 from pathlib import Path
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 # third party
 import numpy as np
@@ -33,10 +34,142 @@ from synthcity.plugins.core.distribution import Distribution
 from synthcity.plugins.core.plugin import Plugin
 from synthcity.plugins.core.schema import Schema
 from synthcity.plugins.core.serializable import Serializable
+from synthcity.utils.parallel import process_pool, resolve_n_jobs, worker_state
 from synthcity.utils.reproducibility import enable_reproducible_results
 
 network_edge = namedtuple("network_edge", ["feature", "parents"])
 
+SUPPORTED_MI_ESTIMATORS = ["kmeans", "contingency"]
+
+
+def _entropy(counts: np.ndarray) -> float:
+    counts = counts[counts > 0]
+    total = counts.sum()
+    if total == 0:
+        return 0.0
+    p = counts / total
+    return float(-(p * np.log(p)).sum())
+
+
+class IntegerCodes:
+    """Integer-coded columns of a label-encoded dataset, with the joint codes and counts of the attribute sets memoized.
+
+    The joint value of a set of attributes in each row is a single flat index, so the contingency tables are computed with np.bincount instead of pandas group-bys.
+
+    Args:
+        data: pd.DataFrame
+            The label-encoded dataset. The codes of each column are in [0, cardinality).
+        max_entries: int
+            Maximum number of memoized attribute sets, evicted in least recently used order. Default: 256.
+    """
+
+    def __init__(self, data: pd.DataFrame, max_entries: int = 256) -> None:
+        self.n_rows = len(data)
+        self.max_entries = max_entries
+        self.codes: Dict[str, np.ndarray] = {}
+        self.card: Dict[str, int] = {}
+        for col in data.columns:
+            codes = np.ascontiguousarray(data[col].to_numpy(), dtype=np.int64)
+            self.codes[col] = codes
+            self.card[col] = int(codes.max()) + 1 if len(codes) > 0 else 0
+
+        self._joint: OrderedDict = OrderedDict()
+        self._entropy: Dict[Tuple[str, ...], float] = {}
+
+    def _compact(self, codes: np.ndarray) -> Tuple[np.ndarray, int]:
+        # renumber the observed codes, to keep the index space within the number of rows
+        uniques, codes = np.unique(codes, return_inverse=True)
+        return codes.reshape(-1), len(uniques)
+
+    def joint(self, attributes: Sequence[str]) -> Tuple[np.ndarray, int]:
+        """The flat code of the joint value of `attributes` in each row, and the size of the code space.
+
+        The codes are dense (the row-major index in the tensor of the cardinalities) while this tensor is not larger than the dataset, and renumbered to the observed joint values otherwise, so the code space never exceeds the number of rows.
+        """
+        key = tuple(attributes)
+        if key in self._joint:
+            self._joint.move_to_end(key)
+            return self._joint[key]
+
+        codes = np.zeros(self.n_rows, dtype=np.int64)
+        size = 1
+        for attr in key:
+            if size * self.card[attr] > max(self.n_rows, 1):
+                codes, size = self._compact(codes)
+            codes = codes * self.card[attr] + self.codes[attr]
+            size *= self.card[attr]
+        if size > max(self.n_rows, 1):
+            codes, size = self._compact(codes)
+
+        self._joint[key] = (codes, size)
+        while len(self._joint) > self.max_entries:
+            self._joint.popitem(last=False)
+        return codes, size
+
+    def counts(self, attributes: Sequence[str]) -> np.ndarray:
+        """The contingency counts of the joint values of `attributes`, indexed by their joint codes."""
+        codes, size = self.joint(attributes)
+        return np.bincount(codes, minlength=size)
+
+    def sparse_counts(self, attributes: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """The observed cells of the contingency tensor of `attributes`, of shape (cardinality of each attribute).
+
+        Returns:
+            The sorted flat indices of the observed cells in the tensor, and their counts.
+        """
+        shape = tuple(self.card[attr] for attr in attributes)
+        flat = np.ravel_multi_index([self.codes[attr] for attr in attributes], shape)
+        size = int(np.prod(shape))
+        if size <= 8 * max(self.n_rows, 1):
+            counts = np.bincount(flat, minlength=size)
+            cells = np.flatnonzero(counts)
+            return cells, counts[cells]
+        return np.unique(flat, return_counts=True)
+
+    def entropy(self, attributes: Sequence[str]) -> float:
+        key = tuple(sorted(attributes))
+        if key not in self._entropy:
+            self._entropy[key] = _entropy(self.counts(key))
+        return self._entropy[key]
+
+    def normalized_mutual_info(self, parents: Sequence[str], candidate: str) -> float:
+        """Normalized mutual information between the joint value of `parents` and `candidate`.
+
+        Same normalization as sklearn's normalized_mutual_info_score: the mutual information divided by the arithmetic mean of the entropies.
+        """
+        if len(parents) == 0:
+            return 0
+
+        parents = sorted(parents)
+        parent_codes, parent_size = self.joint(parents)
+        parent_entropy = self.entropy(parents)
+        candidate_entropy = self.entropy([candidate])
+        if parent_entropy == 0 and candidate_entropy == 0:
+            # a single cluster and a single class, like sklearn
+            return 1.0
+
+        card = self.card[candidate]
+        codes = parent_codes * card + self.codes[candidate]
+        if parent_size * card <= 8 * max(self.n_rows, 1):
+            joint_counts = np.bincount(codes, minlength=parent_size * card)
+        else:
+            # sparse joint values, counted by sorting rather than in a huge table
+            joint_counts = np.unique(codes, return_counts=True)[1]
+        joint_entropy = _entropy(joint_counts)
+
+        mi = max(parent_entropy + candidate_entropy - joint_entropy, 0)
+        if mi == 0:
+            return 0.0
+        normalizer = max((parent_entropy + candidate_entropy) / 2, 1e-12)
+        return float(mi / normalizer)
+
+
+def _mutual_info_job(parents: List[str], candidates: List[str]) -> List[float]:
+    codes = worker_state("codes")
+    return [
+        codes.normalized_mutual_info(parents, candidate) for candidate in candidates
+    ]
+
 
 def usefulness_minus_target(
     k: int,
@@ -77,6 +210,12 @@ class PrivBayes(Serializable):
 
     After that, PrivBayes injects noise into each marginal in P to ensure differential privacy, and then uses the noisy marginals and the Bayesian network to construct an approximation of the data distribution in D.
     Finally, PrivBayes samples tuples from the approximate distribution to construct a synthetic dataset, and then releases the synthetic data.
+
+    The parents are scored by the normalized mutual information between their joint value and the candidate attribute.
+    The default "kmeans" estimator clusters the parents into 10 clusters first.
+    The opt-in "contingency" estimator computes it exactly from the integer codes of the attributes, and scores all the
+    (candidate, parents) pairs of a step per parent set, on `n_jobs` processes. As it does not coarsen the joint value of
+    the parents, it selects different networks than "kmeans", and favours the parent sets with many distinct values.
     """
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -87,8 +226,15 @@ class PrivBayes(Serializable):
         n_bins: int = 100,
         mi_thresh: float = 0.01,
         target_usefulness: int = 5,
+        mi_estimator: str = "kmeans",
+        n_jobs: int = 1,
     ) -> None:
         super().__init__()
+        if mi_estimator not in SUPPORTED_MI_ESTIMATORS:
+            raise ValueError(
+                f"Invalid mi_estimator {mi_estimator}. Supported: {SUPPORTED_MI_ESTIMATORS}"
+            )
+
         # PrivBayes satisfies 2eps-differential privacy, eps1 + eps2 in the paper
         # eps1 = eps/2 is for the greedy bayes
         # eps2 = eps/2 is for the noisy conditionals
@@ -97,6 +243,8 @@ class PrivBayes(Serializable):
         self.n_bins = n_bins
         self.target_usefulness = target_usefulness
         self.mi_thresh = mi_thresh
+        self.mi_estimator = mi_estimator
+        self.n_jobs = n_jobs
         self.default_k = 3
         self.mi_cache: dict = {}
 
@@ -142,8 +290,35 @@ class PrivBayes(Serializable):
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def sample(self, count: int) -> pd.DataFrame:
+        """Ancestral sampling of the network, vectorized over the rows.
+
+        The nodes are sampled in the order of the DAG. The value of each row is drawn by inverse transform sampling, from the column of the CPD selected by the values of its parents.
+        """
         log.debug(f"[PrivBayes] sample {count} examples")
-        samples = self.model.forward_sample(size=count, show_progress=True)
+        codes: Dict[str, np.ndarray] = {}
+        for node in self.ordered_nodes:
+            cpd = self.network.get_cpds(node)
+            values = cpd.get_values()
+            parents = cpd.variables[1:]
+
+            if len(parents) > 0:
+                parent_idx: np.ndarray = np.ravel_multi_index(
+                    [codes[parent] for parent in parents], tuple(cpd.cardinality[1:])
+                )
+            else:
+                parent_idx = np.zeros(count, dtype=np.int64)
+
+            # the CDFs of all the columns, shifted by the column index, in one sorted array
+            cdf = np.cumsum(values, axis=0) / values.sum(axis=0)
+            cdf[-1] = 1
+            flat_cdf = (cdf + np.arange(cdf.shape[1])).T.reshape(-1)
+            draws = np.random.uniform(size=count) + parent_idx
+            flat_idx = np.searchsorted(flat_cdf, draws, side="right")
+            codes[node] = np.clip(
+                flat_idx - parent_idx * len(cdf), 0, len(cdf) - 1
+            ).astype(np.int64)
+
+        samples = pd.DataFrame(codes)
 
         log.debug(f"[PrivBayes] decode {count} examples")
         return self._decode(samples)
@@ -180,11 +355,11 @@ class PrivBayes(Serializable):
             if self.encoders[col]["type"] == "categorical":
                 data[col] = inversed
             elif self.encoders[col]["type"] == "continuous":
-                output = []
-                for interval in inversed:
-                    output.append(np.random.uniform(interval.left, interval.right))
-
-                data[col] = output
+                left = np.asarray([interval.left for interval in inversed], dtype=float)
+                right = np.asarray(
+                    [interval.right for interval in inversed], dtype=float
+                )
+                data[col] = np.random.uniform(left, right)
             else:
                 raise RuntimeError(f"Invalid encoder {self.encoders[col]}")
 
@@ -213,6 +388,31 @@ class PrivBayes(Serializable):
 
         nodes_remaining = nodes - nodes_selected
 
+        codes = IntegerCodes(data) if self.mi_estimator == "contingency" else None
+        n_jobs = resolve_n_jobs(self.n_jobs)
+        executor = (
+            process_pool(n_jobs, state={"codes": codes})
+            if codes is not None and n_jobs > 1
+            else None
+        )
+        try:
+            return self._greedy_bayes_search(
+                data, network, nodes, nodes_selected, nodes_remaining, codes, executor
+            )
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    def _greedy_bayes_search(
+        self,
+        data: pd.DataFrame,
+        network: List,
+        nodes: set,
+        nodes_selected: set,
+        nodes_remaining: set,
+        codes: Optional[IntegerCodes],
+        executor: Optional[ProcessPoolExecutor],
+    ) -> List:
         for i in tqdm(range(len(nodes_remaining))):
             if len(nodes_remaining) == 0:
                 break
@@ -222,6 +422,10 @@ class PrivBayes(Serializable):
             mutual_info_list = []
 
             num_parents = min(len(nodes_selected), self.K)
+            if codes is not None:
+                self._score_parents(
+                    codes, nodes_remaining, nodes_selected, num_parents, executor
+                )
 
             for candidate, split in product(
                 nodes_remaining, range(len(nodes_selected) - num_parents + 1)
@@ -262,6 +466,57 @@ class PrivBayes(Serializable):
             nodes_remaining = nodes - nodes_selected
         return network
 
+    def _score_parents(
+        self,
+        codes: IntegerCodes,
+        candidates: set,
+        parent_candidates: set,
+        parent_limit: int,
+        executor: Optional[ProcessPoolExecutor] = None,
+    ) -> None:
+        """Fill the MI cache with the scores of all the (candidate, parents) pairs of a greedy step.
+
+        The pairs are grouped by parent set, so the joint codes of the parents are computed once for all the candidates.
+        """
+        jobs: Dict[str, Tuple[List[str], List[str]]] = {}
+        for other_parents in combinations(sorted(parent_candidates), parent_limit):
+            parents = list(other_parents)
+            parents_key = "_".join(parents)
+            missing = [
+                candidate
+                for candidate in sorted(candidates)
+                if parents_key not in self.mi_cache.get(candidate, {})
+            ]
+            if len(missing) > 0:
+                jobs[parents_key] = (parents, missing)
+
+        if len(jobs) == 0:
+            return
+
+        tasks = list(jobs.values())
+        if executor is not None and len(tasks) > 1:
+            chunksize = max(1, len(tasks) // (4 * resolve_n_jobs(self.n_jobs)))
+            scores = list(
+                executor.map(
+                    _mutual_info_job,
+                    [parents for parents, _ in tasks],
+                    [missing for _, missing in tasks],
+                    chunksize=chunksize,
+                )
+            )
+        else:
+            scores = [
+                [
+                    codes.normalized_mutual_info(parents, candidate)
+                    for candidate in missing
+                ]
+                for parents, missing in tasks
+            ]
+
+        for parents_key, (_, missing), task_scores in zip(jobs, tasks, scores):
+            for candidate, score in zip(missing, task_scores):
+                self.mi_cache.setdefault(candidate, {})[parents_key] = score
+
     def _laplace_noise_parameter(self, n_items: int, n_features: int) -> float:
         """The noises injected into conditional distributions.
 
@@ -269,106 +524,100 @@ class PrivBayes(Serializable):
         """
         return 2 * (n_features - self.K) / (n_items * self.epsilon)
 
-    def _get_noisy_counts_for_attributes(
-        self, raw_data: pd.DataFrame, attributes: list
-    ) -> pd.DataFrame:
-        # count attribute pairs
-        data = raw_data.copy().loc[:, attributes]
-        data = data.sort_values(attributes)
-        stats = (
-            data.groupby(attributes).size().reset_index().rename(columns={0: "count"})
-        )
+    def _noisy_marginals(
+        self, codes: IntegerCodes, attribute_sets: List[List[str]]
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """The noisy counts of the observed cells of the attribute sets.
 
-        # add noise
-        noise_para = self._laplace_noise_parameter(*raw_data.shape)
-        laplace_noises = np.random.laplace(0, scale=noise_para, size=stats.index.size)
+        The counts of each set are computed over the flat cell indices, and the Laplace noise of all the cells is drawn at once, in the order of the sets and of the cells. The negative noisy counts are clipped to 0.
 
-        stats["count"] += laplace_noises
-        stats.loc[stats["count"] < 0, "count"] = 0
+        Returns:
+            For each set, the sorted flat indices of its observed cells and their noisy counts.
+        """
+        marginals = [codes.sparse_counts(attributes) for attributes in attribute_sets]
 
-        return stats
+        noise_para = self._laplace_noise_parameter(codes.n_rows, len(codes.codes))
+        laplace_noises = np.random.laplace(
+            0, scale=noise_para, size=sum(len(cells) for cells, _ in marginals)
+        )
 
-    def _get_noisy_distribution_from_counts(
-        self, stats: pd.DataFrame, attribute: str, parents: list
-    ) -> pd.DataFrame:
-        if len(parents) > 0:
-            plist = []
-            for pkey in parents:
-                plist.append(stats[pkey].T)
-
-            output = pd.crosstab(
-                stats[attribute],
-                plist,
-                values=stats["count"],
-                aggfunc="sum",
-                dropna=False,
-            )
-            output = output.fillna(0)
-            output += 1
+        noisy = []
+        offset = 0
+        for cells, counts in marginals:
+            noisy_counts = counts + laplace_noises[offset : offset + len(cells)]
+            offset += len(cells)
+            noisy.append((cells, noisy_counts.clip(0)))
 
-            output = output.values
-            return output / (output.sum(axis=0) + 1e-8)
-        else:
-            output = stats[["count"]].values
-            return output / (output.sum() + 1e-8)
+        return noisy
 
-    def _get_noisy_distribution_for_attribute(
+    def _get_noisy_distribution_from_marginal(
         self,
-        data: pd.DataFrame,
+        codes: IntegerCodes,
+        marginal: Tuple[np.ndarray, np.ndarray],
+        marginal_attributes: List[str],
         attribute: str,
         parents: list,
-        counts: Optional[pd.DataFrame] = None,
-    ) -> pd.DataFrame:
-        # count attribute pairs
+    ) -> np.ndarray:
+        """The conditional distribution of `attribute` given `parents`, from the noisy marginal of a superset of the attributes.
+
+        Returns:
+            The (attribute card, product of the parents cards) table of the TabularCPD, the first parent varying the slowest.
+        """
+        cells, counts = marginal
         attributes = parents + [attribute]
-        if counts is None:
-            counts = self._get_noisy_counts_for_attributes(data, attributes)
-        else:
-            counts = counts[attributes + ["count"]]
-            counts = counts.sort_values(attributes)
-            counts = (
-                counts.groupby(attributes)
-                .sum()
-                .reset_index()
-                .rename(columns={0: "count"})
-            )
+        shape = tuple(codes.card[attr] for attr in attributes)
 
-        output = self._get_noisy_distribution_from_counts(counts, attribute, parents)
+        index = np.unravel_index(
+            cells, tuple(codes.card[attr] for attr in marginal_attributes)
+        )
+        projected = np.ravel_multi_index(
+            [index[marginal_attributes.index(attr)] for attr in attributes], shape
+        )
+        output = np.bincount(projected, weights=counts, minlength=int(np.prod(shape)))
+        output = output.reshape(-1, shape[-1]).T
 
-        if len(output) != data[attribute].nunique():
-            raise RuntimeError(f"Invalid output len {len(output)}")
-        if output.shape[1] != data[parents].nunique().prod():
-            raise RuntimeError(f"Invalid output shape {output.shape}")
-        return output
+        if len(parents) > 0:
+            output = output + 1
+            return output / (output.sum(axis=0) + 1e-8)
+        else:
+            return output / (output.sum() + 1e-8)
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def _compute_noisy_conditional_distributions(
         self, data: pd.DataFrame
     ) -> np.ndarray:
-        """See more in Algorithm 1 in PrivBayes."""
+        """See more in Algorithm 1 in PrivBayes.
+
+        The first K attributes share a single noisy marginal, the other attributes use the noisy marginal of their parents and themselves.
+        """
         conditional_distributions = []
 
+        codes = IntegerCodes(data)
         card = data.nunique()
 
-        first_K_attr_counts = self._get_noisy_counts_for_attributes(
-            data, self.ordered_nodes[0 : self.K]
-        )
+        first_K_attributes = self.ordered_nodes[0 : self.K]
+        attribute_sets = [first_K_attributes] + [
+            parents + [attribute] for attribute, parents in self.dag[self.K :]
+        ]
+        marginals = self._noisy_marginals(codes, attribute_sets)
+
         # generate noisy conditionals for Pr[Xi | Πi] (i ∈ [0, d) ).
         for idx in range(0, len(self.dag)):
             attribute, parents = self.dag[idx]
 
             if idx < self.K:
-                node_values = self._get_noisy_distribution_for_attribute(
-                    data,
-                    attribute,
-                    parents,
-                    counts=first_K_attr_counts,
-                )  # P*(Xi | Πi)
+                marginal, marginal_attributes = marginals[0], first_K_attributes
             else:
-                node_values = self._get_noisy_distribution_for_attribute(
-                    data, attribute, parents
-                )  # P*(Xi | Πi)
-
+                marginal = marginals[idx - self.K + 1]
+                marginal_attributes = attribute_sets[idx - self.K + 1]
+            node_values = self._get_noisy_distribution_from_marginal(
+                codes, marginal, marginal_attributes, attribute, parents
+            )  # P*(Xi | Πi)
+
+            if len(node_values) != card[attribute]:
+                raise RuntimeError(f"Invalid output len {len(node_values)}")
+            if node_values.shape[1] != card[parents].prod():
+                raise RuntimeError(f"Invalid output shape {node_values.shape}")
             if len(parents) == 0:
                 if not np.allclose(node_values.sum().sum(), 1):
                     raise RuntimeError(f"Invalid node_values = {node_values}")
@@ -402,11 +651,16 @@ class PrivBayes(Serializable):
             return distribution / summation
 
     def _calculate_sensitivity(
-        self, data: pd.DataFrame, child: str, parents: List[str]
+        self,
+        data: pd.DataFrame,
+        child: str,
+        parents: List[str],
+        attr_to_is_binary: Optional[Dict[str, bool]] = None,
     ) -> float:
         """Sensitivity function for Bayesian network construction. PrivBayes Lemma 4.1"""
         num_tuples = len(data)
-        attr_to_is_binary = {attr: data[attr].unique().size <= 2 for attr in data}
+        if attr_to_is_binary is None:
+            attr_to_is_binary = self._binary_attributes(data)
 
         if attr_to_is_binary[child] or (
             len(parents) == 1 and attr_to_is_binary[parents[0]]
@@ -420,6 +674,10 @@ class PrivBayes(Serializable):
             b = (1 - 1 / num_tuples) * np.log(1 + 2 / (num_tuples - 1))
             return a + b
 
+    @staticmethod
+    def _binary_attributes(data: pd.DataFrame) -> Dict[str, bool]:
+        return {attr: data[attr].unique().size <= 2 for attr in data}
+
     def _calculate_delta(self, data: pd.DataFrame, sensitivity: float) -> float:
         """Computing delta, which is a factor when applying differential privacy.
 
@@ -468,10 +726,18 @@ class PrivBayes(Serializable):
     def mutual_info_score(
         self, data: pd.DataFrame, parents: List[str], candidate: str
     ) -> float:
-        """Cluster the source columns, and compute the mutual information between the target and the clusters."""
+        """Normalized mutual information between the target and the source columns.
+
+        With the "kmeans" estimator, the source columns are clustered, and the score is computed between the binned target and the clusters.
+        """
         if len(parents) == 0:
             return 0
 
+        if self.mi_estimator == "contingency":
+            return IntegerCodes(data[parents + [candidate]]).normalized_mutual_info(
+                parents, candidate
+            )
+
         src = data[parents]
         src_cluster = KMeans(n_clusters=10).fit(src)
 
@@ -490,13 +756,22 @@ class PrivBayes(Serializable):
         mutual_info_list: List[float],
     ) -> List:
         """Applied in Exponential Mechanism to sample outcomes."""
-        delta_array = []
-        for (candidate, parents) in parents_pair_list:
-            sensitivity = self._calculate_sensitivity(data, candidate, parents)
-            delta = self._calculate_delta(data, sensitivity)
-            delta_array.append(delta)
+        attr_to_is_binary = self._binary_attributes(data)
+        # the sensitivity only depends on the pair through the binary attributes
+        deltas: Dict[bool, float] = {}
+        delta_array = np.empty(len(parents_pair_list))
+        for idx, (candidate, parents) in enumerate(parents_pair_list):
+            binary = attr_to_is_binary[candidate] or (
+                len(parents) == 1 and attr_to_is_binary[parents[0]]
+            )
+            if binary not in deltas:
+                sensitivity = self._calculate_sensitivity(
+                    data, candidate, parents, attr_to_is_binary
+                )
+                deltas[binary] = self._calculate_delta(data, sensitivity)
+            delta_array[idx] = deltas[binary]
 
-        mi_array = np.array(mutual_info_list) / (2 * np.array(delta_array))
+        mi_array = np.array(mutual_info_list) / (2 * delta_array)
         mi_array = np.exp(mi_array)
         mi_array = self._normalize_given_distribution(mi_array)
         return mi_array
@@ -561,6 +836,10 @@ class PrivBayesPlugin(Plugin):
             target_usefulness: int
                 Def 4.7 in the paper: A noisy distribution is θ-useful if the ratio of average scale of
     information to average scale of noise is no less than θ. 5-useful is the recommended value.
+            mi_estimator: str
+                The mutual information estimator scoring the parents: "kmeans", over 10 clusters of the parents, or "contingency", exact over the integer codes. Default: "kmeans".
+            n_jobs: int
+                Number of processes scoring the parents with the "contingency" estimator. -1 uses all the CPUs.
             random_state: int
                 Random seed
             # Core Plugin arguments
@@ -593,6 +872,8 @@ class PrivBayesPlugin(Plugin):
         n_bins: int = 100,
         mi_thresh: float = 0.01,
         target_usefulness: int = 5,
+        mi_estimator: str = "kmeans",
+        n_jobs: int = 1,
         random_state: int = 0,
         # core plugin arguments
         workspace: Path = Path("workspace"),
@@ -615,6 +896,8 @@ class PrivBayesPlugin(Plugin):
         self.n_bins = n_bins
         self.mi_thresh = mi_thresh
         self.target_usefulness = target_usefulness
+        self.mi_estimator = mi_estimator
+        self.n_jobs = n_jobs
 
     @staticmethod
     def name() -> str:
@@ -635,6 +918,8 @@ class PrivBayesPlugin(Plugin):
             n_bins=self.n_bins,
             mi_thresh=self.mi_thresh,
             target_usefulness=self.target_usefulness,
+            mi_estimator=self.mi_estimator,
+            n_jobs=self.n_jobs,
         )
         self.model.fit(X.dataframe())
         return self
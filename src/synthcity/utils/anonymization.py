@@ -1,7 +1,9 @@
 # stdlib
+from collections import deque
 from typing import Dict, List, Optional, Tuple
 
 # third party
+import numpy as np
 import pandas as pd
 from pydantic import validate_arguments
 from sklearn.preprocessing import LabelEncoder
@@ -9,6 +11,176 @@ from sklearn.preprocessing import LabelEncoder
 # synthcity absolute
 from synthcity.metrics.eval_privacy import kAnonymization
 from synthcity.plugins.core.dataloader import GenericDataLoader
+from synthcity.utils.parallel import process_pool, resolve_n_jobs, worker_state
+
+
+def _integer_codes(series: pd.Series) -> Tuple[np.ndarray, int, int]:
+    """Integer codes of a column, in order of appearance. The missing values get the last code.
+
+    Returns:
+        The codes, the number of non-missing values and the total number of codes.
+    """
+    codes, uniques = pd.factorize(series)
+    n_valid = n_codes = len(uniques)
+    if (codes < 0).any():
+        codes[codes < 0] = n_codes
+        n_codes += 1
+    return codes.astype(np.int64), n_valid, n_codes
+
+
+def _median(values: np.ndarray) -> float:
+    """The median of the non-missing values, found with np.partition."""
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return np.nan
+
+    mid = len(values) // 2
+    if len(values) % 2:
+        return np.partition(values, mid)[mid]
+    lower, upper = np.partition(values, [mid - 1, mid])[mid - 1 : mid + 1]
+    return (lower + upper) / 2
+
+
+class _MondrianPartitioner:
+    """Array-based Mondrian partitioning of the rows of a dataset.
+
+    The categorical columns are stored as integer codes and the other columns as floats. A partition is an ascending array of row positions, split on its widest column, at the median or on the first half of its categories, if both halves satisfy the k-anonymity, l-diversity and t-closeness criteria, checked from the bincount of the integer-coded sensitive column.
+
+    The partitions are explored breadth first, and each one is identified by its depth and by the binary code of its path from the root, so the leaves of independent subtrees can be processed separately and merged back in the breadth first order.
+    """
+
+    def __init__(
+        self,
+        X: pd.DataFrame,
+        feature_columns: List,
+        sensitive_column: str,
+        categoricals: List,
+        k_threshold: int,
+        l_diversity: int,
+        t_threshold: float,
+    ) -> None:
+        self.k_threshold = k_threshold
+        self.l_diversity = l_diversity
+        self.t_threshold = t_threshold
+
+        # (is categorical, values, number of non-missing codes, number of codes, scale)
+        self.features: List[Tuple[bool, np.ndarray, int, int, float]] = []
+        for column in feature_columns:
+            if column in categoricals:
+                codes, n_valid, n_codes = _integer_codes(X[column])
+                self.features.append((True, codes, n_valid, n_codes, float(n_codes)))
+            else:
+                values = X[column].to_numpy(dtype=float)
+                scale = X[column].max() - X[column].min()
+                self.features.append((False, values, 0, 0, scale))
+
+        self.sensitive, n_valid, self.n_sensitive = _integer_codes(X[sensitive_column])
+        self.t_closeness = sensitive_column in categoricals
+        self.freqs = np.bincount(self.sensitive, minlength=self.n_sensitive)[
+            :n_valid
+        ] / len(X)
+
+    def _span(self, part: np.ndarray, feature: Tuple) -> float:
+        is_categorical, values, _, n_codes, scale = feature
+        values = values[part]
+        span: float
+        if is_categorical:
+            span = np.count_nonzero(np.bincount(values, minlength=n_codes))
+        else:
+            values = values[~np.isnan(values)]
+            span = values.max() - values.min() if len(values) else np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return span / scale
+
+    def _split(self, part: np.ndarray, feature: Tuple) -> Tuple[np.ndarray, np.ndarray]:
+        is_categorical, values, n_valid, n_codes, _ = feature
+        values = values[part]
+        if is_categorical:
+            # the first half of the categories, in order of appearance. The missing values go in neither half, as for the numerical columns.
+            uniques, first = np.unique(values, return_index=True)
+            ordered = uniques[np.argsort(first)]
+            left = np.zeros(n_codes, dtype=bool)
+            left[ordered[: len(ordered) // 2]] = True
+            right = ~left
+            left[n_valid:] = right[n_valid:] = False
+            return part[left[values]], part[right[values]]
+
+        median = _median(values)
+        return part[values < median], part[values >= median]
+
+    def _is_anonymous(self, part: np.ndarray) -> bool:
+        if len(part) < self.k_threshold:
+            return False
+
+        sensitive = self.sensitive[part]
+        if not self.t_closeness and self.n_sensitive > 4 * len(part):
+            # cheaper than a bincount over all the sensitive values
+            return len(np.unique(sensitive)) >= self.l_diversity
+
+        counts = np.bincount(sensitive, minlength=self.n_sensitive)
+        if np.count_nonzero(counts) < self.l_diversity:
+            return False
+        if not self.t_closeness:
+            return True
+
+        counts = counts[: len(self.freqs)]
+        present = counts > 0
+        if not present.any():
+            return -1.0 <= self.t_threshold
+        p = counts[present] / (len(part) + 1e-8)
+        return np.abs(p - self.freqs[present]).max() <= self.t_threshold
+
+    def _split_partition(
+        self, part: np.ndarray
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        spans = [self._span(part, feature) for feature in self.features]
+        for idx in sorted(range(len(spans)), key=lambda idx: -spans[idx]):
+            # a column with a single value can't be split
+            if not spans[idx] > 0:
+                continue
+            lp, rp = self._split(part, self.features[idx])
+            if self._is_anonymous(lp) and self._is_anonymous(rp):
+                return lp, rp
+        return None
+
+    def partition(
+        self,
+        part: np.ndarray,
+        depth: int = 0,
+        code: int = 0,
+        max_pending: Optional[int] = None,
+    ) -> Tuple[List, List]:
+        """Partition the subtree rooted at `part`, breadth first.
+
+        Args:
+            part: np.ndarray
+                The ascending row positions of the root of the subtree.
+            depth: int
+                The depth of the root.
+            code: int
+                The path code of the root.
+            max_pending: Optional[int]
+                Stop when that many partitions are waiting to be split. Default: None, partition the whole subtree.
+
+        Returns:
+            The finished and the pending partitions, as (depth, code, row positions) tuples.
+        """
+        finished = []
+        pending = deque([(part, depth, code)])
+        while pending and (max_pending is None or len(pending) < max_pending):
+            part, depth, code = pending.popleft()
+            halves = self._split_partition(part)
+            if halves is None:
+                finished.append((depth, code, part))
+                continue
+            pending.append((halves[0], depth + 1, 2 * code))
+            pending.append((halves[1], depth + 1, 2 * code + 1))
+
+        return finished, [(depth, code, part) for part, depth, code in pending]
+
+
+def _partition_job(depth: int, code: int, part: np.ndarray) -> List:
+    return worker_state("partitioner").partition(part, depth, code)[0]
 
 
 class DatasetAnonymization:
@@ -17,7 +189,9 @@ class DatasetAnonymization:
     k-Anonymity states that every individual in one dataset partition is indistinguishable from at least k - 1 other individuals.
     l-Diversity uses a stronger privacy definition and claims that every generalized block has to contain at least l different sensitive values.
     An equivalence class is said to have t-closeness if the distance between the distribution of a sensitive attribute in this class and the distribution of the attribute in the whole table is no more than a threshold t. A table is said to have t-closeness if all equivalence classes have t-closeness.
-    For that, we measure the Kolmogorov-Smirnov distance between the empirical probability distribution of the sensitive attribute over the entire dataset vs. the distribution over the partition."""
+    For that, we measure the Kolmogorov-Smirnov distance between the empirical probability distribution of the sensitive attribute over the entire dataset vs. the distribution over the partition.
+
+    The partitions are learned with the Mondrian algorithm, on numpy arrays. With `n_jobs` > 1, the independent subtrees of the partitioning are processed on `n_jobs` processes, -1 using all the CPUs. The partitions are the same whatever `n_jobs`."""
 
     @validate_arguments
     def __init__(
@@ -27,6 +201,7 @@ class DatasetAnonymization:
         t_threshold: float = 0.2,
         categorical_limit: int = 5,
         max_partitions: Optional[int] = None,
+        n_jobs: int = 1,
     ) -> None:
         if k_threshold < 1:
             raise ValueError(
@@ -46,6 +221,7 @@ class DatasetAnonymization:
 
         self.categorical_limit = categorical_limit
         self.max_partitions = max_partitions
+        self.n_jobs = n_jobs
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def is_anonymous(self, X: pd.DataFrame, sensitive_features: List[str] = []) -> bool:
@@ -107,65 +283,38 @@ class DatasetAnonymization:
         X, encoders = self._setup(X)
         features = self._get_features(X, [sensitive_column])
 
-        partitions = self._partition_dataset(X, features, sensitive_column)
-
-        def agg_categorical_column(series: pd.Series) -> list:
-            # TODO
-            return [series.mean()]
-
-        def agg_numerical_column(series: pd.Series) -> list:
-            return [series.mean()]
+        partitions = self._partition_positions(X, features, sensitive_column)
+        if self.max_partitions is not None:
+            partitions = partitions[: self.max_partitions + 1]
 
-        categoricals = self._get_categoricals(X)
+        labels = np.full(len(X), -1)
+        for idx, partition in enumerate(partitions):
+            labels[partition] = idx
+        in_partition = labels >= 0
 
-        rows = []
-        for i, partition in enumerate(partitions):
-            if self.max_partitions is not None and i > self.max_partitions:
-                break
-
-            X_part = X.loc[partition]
-
-            X_part_cat = X_part[[c for c in X_part.columns if c in categoricals]]
-            X_part_num = X_part[[c for c in X_part.columns if c not in categoricals]]
-
-            num_agg = X_part_num.agg(agg_numerical_column)
-            cat_agg = X_part_cat.agg(agg_categorical_column)
-
-            aggregations = []
-
-            if len(num_agg) > 0:
-                aggregations.append(num_agg)
-            if len(cat_agg) > 0:
-                aggregations.append(cat_agg)
-
-            grouped_columns = pd.concat(
-                aggregations,
-                axis=1,
-            )
+        # one row per record of the partitions with a sensitive value, ordered by partition and sensitive value
+        sensitive_codes, sensitive_values = pd.factorize(X[sensitive_column], sort=True)
+        rows = np.flatnonzero(in_partition & (sensitive_codes >= 0))
+        rows = rows[np.lexsort((sensitive_codes[rows], labels[rows]))]
+        row_labels = labels[rows]
 
-            if set(grouped_columns.columns) != set(X_part.columns):
-                raise RuntimeError(
-                    f"Invalid columns {set(grouped_columns.columns)} != {set(X_part.columns)}"
-                )
-            grouped_columns = grouped_columns[X_part.columns]
+        columns = {}
+        for column in X.columns:
+            if column == sensitive_column:
+                columns[column] = np.asarray(sensitive_values)[sensitive_codes[rows]]
+                continue
 
-            sensitive_counts = X_part.groupby(sensitive_column).agg(
-                {sensitive_column: "count"}
+            # the mean of the column over each partition
+            values = X[column].to_numpy(dtype=float)
+            valid = in_partition & ~np.isnan(values)
+            sums = np.bincount(
+                labels[valid], weights=values[valid], minlength=len(partitions)
             )
-            values = grouped_columns.iloc[0].to_dict()
+            counts = np.bincount(labels[valid], minlength=len(partitions))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                columns[column] = (sums / counts)[row_labels]
 
-            for sensitive_value, count in sensitive_counts[sensitive_column].items():
-                if count == 0:
-                    continue
-                values.update(
-                    {
-                        sensitive_column: sensitive_value,
-                    }
-                )
-                for cnt in range(count):
-                    rows.append(values.copy())
-
-        result = pd.DataFrame(rows)
+        result = pd.DataFrame(columns, columns=X.columns)
 
         return self._tear_down(result, encoders)
 
@@ -225,6 +374,40 @@ class DatasetAnonymization:
 
         return categoricals
 
+    def _partition_positions(
+        self,
+        X: pd.DataFrame,
+        feature_columns: List,
+        sensitive_column: str,
+    ) -> List[np.ndarray]:
+        """The row positions of the partitions, in breadth first order."""
+        partitioner = _MondrianPartitioner(
+            X,
+            feature_columns,
+            sensitive_column,
+            self._get_categoricals(X),
+            self.k_threshold,
+            self.l_diversity,
+            self.t_threshold,
+        )
+        n_jobs = resolve_n_jobs(self.n_jobs)
+
+        root = np.arange(len(X))
+        if n_jobs > 1:
+            # split the top of the tree locally, then the subtrees in parallel
+            finished, pending = partitioner.partition(root, max_pending=4 * n_jobs)
+            if pending:
+                with process_pool(
+                    n_jobs, state={"partitioner": partitioner}
+                ) as executor:
+                    for leaves in executor.map(_partition_job, *zip(*pending)):
+                        finished.extend(leaves)
+        else:
+            finished, _ = partitioner.partition(root)
+
+        finished.sort(key=lambda leaf: leaf[:2])
+        return [part for _, _, part in finished]
+
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def _partition_dataset(
         self,
@@ -233,29 +416,12 @@ class DatasetAnonymization:
         sensitive_column: str,
     ) -> List:
         """Learn a list of valid partitions that covers the entire dataframe."""
-        finished_partitions = []
-        partitions = [X.index]
-
-        scale = self._get_spans(X, X.index)
-        categoricals = self._get_categoricals(X)
-        freqs = self._get_frequencies(X, sensitive_column)
-
-        while partitions:
-            partition = partitions.pop(0)
-            spans = self._get_spans(X[feature_columns], partition, scale)
-            for column, span in sorted(spans.items(), key=lambda x: -x[1]):
-                lp, rp = self._split(X, partition, column, categoricals)
-                if not self._is_partition_anonymous(
-                    X, lp, sensitive_column, freqs, categoricals
-                ) or not self._is_partition_anonymous(
-                    X, rp, sensitive_column, freqs, categoricals
-                ):
-                    continue
-                partitions.extend((lp, rp))
-                break
-            else:
-                finished_partitions.append(partition)
-        return finished_partitions
+        return [
+            X.index[partition]
+            for partition in self._partition_positions(
+                X, feature_columns, sensitive_column
+            )
+        ]
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def _get_frequencies(self, X: pd.DataFrame, sensitive_column: str) -> Dict:
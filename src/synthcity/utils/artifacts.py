@@ -0,0 +1,398 @@
+# stdlib
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sqlite3
+import tempfile
+import time
+from abc import ABCMeta, abstractmethod
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Iterator, List, Optional
+
+# third party
+import cloudpickle
+import pandas as pd
+
+# synthcity absolute
+import synthcity.logger as log
+from synthcity.version import __version__
+
+# Artifacts written by a different synthcity or python version are never reused.
+SCHEMA_VERSION = f"synthcity-{__version__}-py{platform.python_version()}"
+
+# Temporary files older than this (in seconds) are leftovers of crashed writers.
+STALE_TMP_AGE = 3600
+
+# Default of `ArtifactStore.get` to tell a missing artifact from a stored None, in a single lookup.
+MISSING: Any = object()
+
+
+def artifact_key(*parts: Any, kind: str = "", schema: str = SCHEMA_VERSION) -> str:
+    """Content hash of the inputs of an artifact, tied to the version/schema key."""
+    raw = json.dumps([schema, kind, *parts], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ArtifactBackend(metaclass=ABCMeta):
+    """
+    .. inheritance-diagram:: synthcity.utils.artifacts.ArtifactBackend
+        :parts: 1
+
+    Base class for the blob storage of the ArtifactStore.
+
+    Each derived class must implement the following methods:
+        exists() - test if a blob is stored for a key.
+        read() - return the bytes stored for a key.
+        write() - store the bytes for a key. The write must be atomic: a concurrent reader sees either the full blob or nothing.
+        delete() - remove the blob of a key, if any.
+        modified() - the last modification time of a blob.
+        keys() - iterate over the stored keys.
+        cleanup() - remove the leftovers of interrupted writes.
+    """
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def read(self, key: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def write(self, key: str, data: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def modified(self, key: str) -> float:
+        ...
+
+    @abstractmethod
+    def keys(self) -> Iterator[str]:
+        ...
+
+    def cleanup(self) -> None:
+        pass
+
+
+class LocalArtifactBackend(ArtifactBackend):
+    """Stores each artifact as a file in a local (or shared) directory.
+
+    Args:
+        root: Path
+            The directory of the blobs. The blobs are sharded by the first two characters of their key.
+    """
+
+    suffix = ".bkp"
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{self.suffix}"
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def read(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def write(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=self.suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def modified(self, key: str) -> float:
+        return self._path(key).stat().st_mtime
+
+    def keys(self) -> Iterator[str]:
+        for path in self.root.glob(f"*/*{self.suffix}"):
+            if not path.name.startswith(".tmp-"):
+                yield path.name[: -len(self.suffix)]
+
+    def cleanup(self) -> None:
+        now = time.time()
+        for path in self.root.glob(f"*/.tmp-*{self.suffix}"):
+            try:
+                if now - path.stat().st_mtime > STALE_TMP_AGE:
+                    path.unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue
+
+
+class ArtifactIndex:
+    """SQLite index with the metadata of the stored artifacts.
+
+    A connection is opened per operation, so the index can be shared by several processes and pickled with its owner.
+
+    Args:
+        path: Path
+            The SQLite database file.
+    """
+
+    columns = ["key", "kind", "schema", "digest", "size", "created", "accessed"]
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS artifacts (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT,
+                    schema TEXT,
+                    digest TEXT,
+                    size INTEGER,
+                    created REAL,
+                    accessed REAL
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=60)
+
+    def add(self, key: str, kind: str, schema: str, digest: str, size: int) -> None:
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, kind, schema, digest, size, now, now),
+            )
+
+    def get(self, key: str) -> Optional[dict]:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT * FROM artifacts WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return dict(zip(self.columns, row))
+
+    def touch(self, key: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE artifacts SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+
+    def remove(self, key: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+
+    def size(self) -> int:
+        with closing(self._connect()) as conn:
+            (total,) = conn.execute("SELECT SUM(size) FROM artifacts").fetchone()
+
+        return int(total or 0)
+
+    def list(self) -> List[dict]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT * FROM artifacts ORDER BY accessed ASC"
+            ).fetchall()
+
+        return [dict(zip(self.columns, row)) for row in rows]
+
+
+class ArtifactStore:
+    """Content-addressed cache for the intermediary results of the benchmarks and metrics.
+
+    The artifacts are addressed by a hash of their inputs (e.g. the dataset hashes and the arguments of the experiment) and of a schema key, which ties them to the synthcity and python versions.
+    The blobs are written atomically by the backend, and verified against the digest recorded in the index when loaded, so a concurrent worker never reads a partial artifact.
+    With a `max_size`, each `put` evicts the least recently used artifacts from the index sizes alone; the scan of the orphan blobs only runs in `gc`.
+
+    Args:
+        workspace: Path
+            The folder for the blobs and the index. Default: Path("workspace").
+        max_size: Optional[int]
+            Size limit of the store, in bytes. When exceeded, the least recently used artifacts are evicted. Default: None, unbounded.
+        schema: str
+            The version/schema key of the artifacts. Default: SCHEMA_VERSION.
+        backend: Optional[ArtifactBackend]
+            The blob storage. Default: a LocalArtifactBackend in `workspace`.
+
+    Example:
+        >>> store = ArtifactStore(Path("workspace"))
+        >>> key = store.key("experiment", X.hash(), kind="synthetic")
+        >>> X_syn = store.get(key, MISSING)
+        >>> if X_syn is MISSING:
+        >>>     X_syn = generator.generate(count)
+        >>>     store.put(key, X_syn, kind="synthetic")
+    """
+
+    def __init__(
+        self,
+        workspace: Path = Path("workspace"),
+        max_size: Optional[int] = None,
+        schema: str = SCHEMA_VERSION,
+        backend: Optional[ArtifactBackend] = None,
+    ) -> None:
+        self.workspace = Path(workspace)
+        self.max_size = max_size
+        self.schema = schema
+        self.backend = (
+            backend
+            if backend is not None
+            else LocalArtifactBackend(self.workspace / "artifacts")
+        )
+        self.index = ArtifactIndex(self.workspace / "artifacts.db")
+
+    def key(self, *parts: Any, kind: str = "") -> str:
+        """Content hash of the inputs of an artifact."""
+        return artifact_key(*parts, kind=kind, schema=self.schema)
+
+    def exists(self, key: str) -> bool:
+        return self.index.get(key) is not None and self.backend.exists(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Load an artifact, or return `default` if it is missing or corrupted.
+
+        Prefer `get(key, MISSING)` over `exists` followed by `get`: the artifact can be evicted between the two calls.
+        """
+        meta = self.index.get(key)
+        if meta is None:
+            return default
+
+        try:
+            data = self.backend.read(key)
+        except FileNotFoundError:
+            self.index.remove(key)
+            return default
+
+        if hashlib.sha256(data).hexdigest() != meta["digest"]:
+            log.error(f"[artifacts] corrupted artifact {key}, discarding it")
+            self.remove(key)
+            return default
+
+        self.index.touch(key)
+        return cloudpickle.loads(data)
+
+    def put(self, key: str, obj: Any, kind: str = "") -> None:
+        data = cloudpickle.dumps(obj)
+
+        self.backend.write(key, data)
+        self.index.add(
+            key,
+            kind=kind,
+            schema=self.schema,
+            digest=hashlib.sha256(data).hexdigest(),
+            size=len(data),
+        )
+
+        if self.max_size is not None:
+            self._evict(self.max_size)
+
+    def remove(self, key: str) -> None:
+        self.index.remove(key)
+        self.backend.delete(key)
+
+    def ls(self) -> pd.DataFrame:
+        """List the stored artifacts, from the least to the most recently used."""
+        return pd.DataFrame(self.index.list(), columns=ArtifactIndex.columns)
+
+    def size(self) -> int:
+        return self.index.size()
+
+    def _evict(self, max_size: int) -> List[str]:
+        """Remove the least recently used artifacts until the indexed sizes fit in `max_size` bytes."""
+        total = self.index.size()
+        if total <= max_size:
+            return []
+
+        removed = []
+        for meta in self.index.list():
+            if total <= max_size:
+                break
+            self.remove(meta["key"])
+            removed.append(meta["key"])
+            total -= meta["size"]
+
+        return removed
+
+    def gc(self, max_size: Optional[int] = None) -> List[str]:
+        """Remove the orphan blobs and index entries, then evict the least recently used artifacts until the store fits in `max_size` bytes.
+
+        Returns:
+            The list of removed keys.
+        """
+        if max_size is None:
+            max_size = self.max_size
+
+        removed = []
+        self.backend.cleanup()
+
+        entries = []
+        for meta in self.index.list():
+            if self.backend.exists(meta["key"]):
+                entries.append(meta)
+                continue
+            self.index.remove(meta["key"])
+            removed.append(meta["key"])
+
+        # blobs without an index entry are leftovers of writers which crashed before indexing them
+        indexed = set(meta["key"] for meta in entries)
+        now = time.time()
+        for key in list(self.backend.keys()):
+            if key in indexed:
+                continue
+            try:
+                if now - self.backend.modified(key) <= STALE_TMP_AGE:
+                    continue
+            except FileNotFoundError:
+                continue
+            self.backend.delete(key)
+            removed.append(key)
+
+        if max_size is None:
+            return removed
+
+        return removed + self._evict(max_size)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """`python -m synthcity.utils.artifacts {ls,gc}`: inspect or trim an artifact store."""
+    parser = argparse.ArgumentParser(description="Manage the synthcity artifact cache")
+    parser.add_argument("--workspace", type=Path, default=Path("workspace"))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("ls", help="list the cached artifacts")
+    gc_parser = subparsers.add_parser("gc", help="evict artifacts")
+    gc_parser.add_argument(
+        "--max-size", type=int, default=None, help="size limit, in bytes"
+    )
+
+    parsed = parser.parse_args(args)
+    store = ArtifactStore(parsed.workspace)
+
+    if parsed.command == "ls":
+        print(store.ls().to_string(index=False))
+    elif parsed.command == "gc":
+        removed = store.gc(max_size=parsed.max_size)
+        print(f"Removed {len(removed)} artifacts, {store.size()} bytes in use")
+
+
+if __name__ == "__main__":
+    main()
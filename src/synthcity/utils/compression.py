@@ -1,14 +1,91 @@
 # stdlib
-from typing import Dict, List
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 # third party
+import numpy as np
 import pandas as pd
 from pydantic import validate_arguments
 from sklearn.preprocessing import LabelEncoder
 from xgboost import XGBClassifier, XGBRegressor
 
+# synthcity absolute
+import synthcity.logger as log
+
 # synthcity relative
 from .evaluation import evaluate_classifier, evaluate_regression
+from .parallel import process_pool, resolve_n_jobs
+from .serialization import dataframe_hash
+
+
+def _redundancy_model(y: pd.Series, cat_limit: int, n_jobs: Optional[int]) -> Any:
+    if len(y.unique()) < cat_limit:
+        return XGBClassifier(
+            tree_method="approx",
+            n_jobs=2 if n_jobs is None else n_jobs,
+            verbosity=0,
+            depth=3,
+        )
+
+    if n_jobs is None:
+        return XGBRegressor()
+    return XGBRegressor(n_jobs=n_jobs)
+
+
+def _redundancy_score(
+    X: pd.DataFrame, y: pd.Series, cat_limit: int, n_jobs: Optional[int] = None
+) -> Optional[float]:
+    """Cross-validated score of the prediction of `y` from `X`: the AUCROC for the categorical columns, the R2 otherwise. None if the model cannot be evaluated."""
+    model = _redundancy_model(y, cat_limit, n_jobs)
+    try:
+        if isinstance(model, XGBClassifier):
+            return evaluate_classifier(model, X, y)["clf"]["aucroc"][0]
+        return evaluate_regression(model, X, y)["clf"]["r2"][0]
+    except BaseException:
+        return None
+
+
+def _rank_correlations(df: pd.DataFrame) -> np.ndarray:
+    """Absolute Spearman correlations between the columns, 0 for the constant columns."""
+    ranks = df.rank().to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = np.abs(np.corrcoef(ranks, rowvar=False))
+    return np.nan_to_num(np.atleast_2d(corr), nan=0.0)
+
+
+class CompressionCache:
+    """Cache of the redundancy scores of `compress_dataset`.
+
+    A score is keyed by the content of the scanned column and of the columns it is predicted from, so it is reused by the next calls as long as these columns are unchanged, for example when only some other columns of a dataset change. The cache can be pickled, to be persisted between runs.
+
+    Args:
+        max_entries: int
+            Maximum number of scores, evicted in least recently used order. Default: 10000.
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        if max_entries <= 0:
+            raise ValueError(f"Invalid max_entries {max_entries}")
+
+        self.max_entries = max_entries
+        self._scores: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def get(self, key: str) -> Tuple[bool, Optional[float]]:
+        """Return if the score of `key` is cached, and the score."""
+        if key not in self._scores:
+            return False, None
+        self._scores.move_to_end(key)
+        return True, self._scores[key]
+
+    def set(self, key: str, score: Optional[float]) -> None:
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.max_entries:
+            self._scores.popitem(last=False)
 
 
 @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -17,7 +94,33 @@ def compress_dataset(
     cat_limit: int = 10,
     impute: bool = True,
     score_threshold: float = 0.98,
+    n_jobs: int = 1,
+    screen_threshold: Optional[float] = None,
+    cache: Optional[CompressionCache] = None,
 ) -> pd.DataFrame:
+    """Drop the redundant columns, and merge the low cardinality categorical columns.
+
+    A column is redundant if an XGBoost model predicts it from the columns which are still kept with a cross-validated score of at least `score_threshold`. The columns are scanned in order, and each scan depends on the redundant columns found before it.
+
+    Args:
+        df: pd.DataFrame
+            The dataset.
+        cat_limit: int
+            Columns with fewer unique values are categorical. Default: 10.
+        impute: bool
+            Fill the missing values with 0. Default: True.
+        score_threshold: float
+            Minimum score (AUCROC or R2) of a redundant column. Default: 0.98.
+        n_jobs: int
+            Number of processes scanning the columns, one column per task, with single-threaded models. The scan is speculative: a wave of `n_jobs` columns is scored at once, and the columns after the first redundant column of a wave are scored again without it, so the result is the same as the sequential scan. -1 uses all the CPUs. Default: 1.
+        screen_threshold: Optional[float]
+            If set, a column whose absolute Spearman correlation with every kept column is below the threshold is kept without training a model. The screen only detects monotonic dependencies, so it can keep columns the models would drop. Default: None, no screen.
+        cache: Optional[CompressionCache]
+            Cache of the column scores, read and updated in place. Default: None, no cache.
+
+    Returns:
+        The compressed dataset, and the context of `decompress_dataset`.
+    """
     df = df.copy()
     original_dtypes = df.infer_objects().dtypes
 
@@ -38,43 +141,89 @@ def compress_dataset(
         encoders[col] = LabelEncoder().fit(df[col])
         df[col] = encoders[col].transform(df[col])
 
+    n_jobs = resolve_n_jobs(n_jobs)
+
+    correlations = None
+    if screen_threshold is not None:
+        correlations = _rank_correlations(df[covariates])
+
+    digests: Dict[str, str] = {}
+    if cache is not None:
+        digests = {col: dataframe_hash(df[[col]]) for col in covariates}
+
+    def _key(column: str, sources: List[str]) -> str:
+        key = hashlib.sha256(f"{cat_limit} {digests[column]}".encode())
+        for col in sources:
+            key.update(digests[col].encode())
+        return key.hexdigest()
+
+    def _scan(columns: List[str], executor: Optional[Any]) -> List[Optional[float]]:
+        scores: List[Optional[float]] = [None] * len(columns)
+        todo = []
+        for idx, column in enumerate(columns):
+            sources = [
+                col for col in covariates if col not in redundant and col != column
+            ]
+            if correlations is not None:
+                pos = [covariates.get_loc(col) for col in sources]
+                column_corr = correlations[covariates.get_loc(column), pos]
+                if len(pos) == 0 or column_corr.max() < screen_threshold:
+                    log.debug(f"compression: {column} kept by the correlation screen")
+                    continue
+            if cache is not None:
+                found, scores[idx] = cache.get(_key(column, sources))
+                if found:
+                    continue
+            todo.append((idx, column, sources))
+
+        jobs = [(df[sources], df[column]) for _, column, sources in todo]
+        if executor is not None:
+            futures = [
+                executor.submit(_redundancy_score, X, y, cat_limit, 1) for X, y in jobs
+            ]
+            results = [future.result() for future in futures]
+        else:
+            results = [_redundancy_score(X, y, cat_limit) for X, y in jobs]
+
+        for (idx, column, sources), score in zip(todo, results):
+            scores[idx] = score
+            if cache is not None:
+                cache.set(_key(column, sources), score)
+        return scores
+
+    executor = process_pool(n_jobs) if n_jobs > 1 else None
+    try:
+        # waves of `n_jobs` columns, cut after the first redundant column
+        pending = list(covariates)
+        while pending:
+            wave = pending[:n_jobs]
+            scores = _scan(wave, executor)
+            pending = pending[len(wave) :]
+            for pos, score in enumerate(scores):
+                if score is not None and score >= score_threshold:
+                    redundant.append(wave[pos])
+                    pending = wave[pos + 1 :] + pending
+                    break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
     # compress
     compressers = {}
-    for column in covariates:
-        X = df[covariates].drop(columns=redundant + [column])
+    for idx, column in enumerate(redundant):
+        # the columns kept when the column was scanned
+        X = df[covariates].drop(columns=redundant[: idx + 1])
         y = df[column]
 
-        if len(df[column].unique()) < cat_limit:
-            model = model = XGBClassifier(
-                tree_method="approx",
-                n_jobs=2,
-                verbosity=0,
-                depth=3,
-            )
-            try:
-                score = evaluate_classifier(model, X, y)["clf"]["aucroc"][0]
-            except BaseException:
-                continue
-
-        else:
-            model = XGBRegressor()
+        model = _redundancy_model(y, cat_limit, None)
+        model.fit(X, y)
 
-            try:
-                score = evaluate_regression(model, X, y)["clf"]["r2"][0]
-            except BaseException:
-                continue
-
-        if score >= score_threshold:
-            redundant.append(column)
-            model.fit(X, y)
-
-            src_cols = X.columns
-            compressers[column] = {
-                "cols": list(src_cols),
-                "model": model,
-                "min": y.min(),
-                "max": y.max(),
-            }
+        compressers[column] = {
+            "cols": list(X.columns),
+            "model": model,
+            "min": y.min(),
+            "max": y.max(),
+        }
     df = df.drop(columns=redundant)
     covariates = df.columns
 
@@ -0,0 +1,67 @@
+# stdlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Hashable, Optional
+
+# third party
+import torch
+from threadpoolctl import threadpool_limits
+
+# Read-only state of the pool workers. It is handed to each worker once, through the pool
+# initializer, instead of being pickled with each task. The task functions are defined at
+# module level, so they can be pickled by reference, and read the state with `worker_state`.
+_worker_state: Dict[Any, Any] = {}
+
+
+def resolve_n_jobs(n_jobs: int) -> int:
+    """The number of processes requested by `n_jobs`: the value itself if positive, else all the CPUs."""
+    return n_jobs if n_jobs > 0 else multiprocessing.cpu_count()
+
+
+def init_worker(
+    state: Optional[Dict[Any, Any]] = None, n_threads: Optional[int] = None
+) -> None:
+    """Initializer of the pool workers.
+
+    Args:
+        state: Optional[Dict[Any, Any]]
+            The state of the worker, read by the tasks with `worker_state`. Default: None, no state.
+        n_threads: Optional[int]
+            Bound on the threads of torch and of the native thread pools (BLAS, OpenMP) of the worker, so the workers share the CPUs. Default: None, no bound.
+    """
+    _worker_state.clear()
+    if state is not None:
+        _worker_state.update(state)
+
+    if n_threads is not None:
+        torch.set_num_threads(n_threads)
+        threadpool_limits(limits=n_threads)
+
+
+def worker_state(key: Hashable) -> Any:
+    """An entry of the state of the current worker."""
+    if key not in _worker_state:
+        raise RuntimeError(f"The worker state {key} is not initialized")
+    return _worker_state[key]
+
+
+def process_pool(
+    n_jobs: int,
+    state: Optional[Dict[Any, Any]] = None,
+    n_threads: Optional[int] = None,
+) -> ProcessPoolExecutor:
+    """A pool of `n_jobs` processes, initialized by `init_worker`.
+
+    Args:
+        n_jobs: int
+            Number of processes. -1 uses all the CPUs.
+        state: Optional[Dict[Any, Any]]
+            The state of the workers. Default: None.
+        n_threads: Optional[int]
+            Bound on the threads of each worker. Default: None.
+    """
+    return ProcessPoolExecutor(
+        max_workers=resolve_n_jobs(n_jobs),
+        initializer=init_worker,
+        initargs=(state, n_threads),
+    )
@@ -39,6 +39,10 @@ class BaseSampler(torch.utils.data.sampler.Sampler):
     def train_test(self) -> Tuple:
         raise NotImplementedError()
 
+    def indices(self) -> np.ndarray:
+        """The indices of one epoch, in iteration order."""
+        return np.fromiter(iter(self), dtype=np.int64)
+
 
 class ImbalancedDatasetSampler(BaseSampler):
     """Samples elements randomly from a given list of indices for imbalanced dataset"""
@@ -69,14 +73,19 @@ class ImbalancedDatasetSampler(BaseSampler):
         weights = 1.0 / label_to_count[df["label"]]
 
         self.weights = torch.DoubleTensor(weights.to_list())
+        self.train_positions = np.asarray(
+            [self.train_mapping[idx] for idx in self.train_idx], dtype=np.int64
+        )
 
-    def __iter__(self) -> Generator:
-        return (
-            self.train_mapping[self.train_idx[i]]
-            for i in torch.multinomial(
+    def indices(self) -> np.ndarray:
+        return self.train_positions[
+            torch.multinomial(
                 self.weights, self.num_train_samples, replacement=True
-            )
-        )
+            ).numpy()
+        ]
+
+    def __iter__(self) -> Generator:
+        yield from self.indices().tolist()
 
     def __len__(self) -> int:
         return len(self.train_idx)
@@ -86,7 +95,22 @@ class ImbalancedDatasetSampler(BaseSampler):
 
 
 class ConditionalDatasetSampler(BaseSampler):
-    """DataSampler samples the conditional vector and corresponding data."""
+    """DataSampler samples the conditional vector and corresponding data.
+
+    The rows of each category are indexed once, in a CSR layout, so the rows matching a batch of conditionals are drawn without a Python loop. The sampler draws from its own seeded generator.
+
+    Args:
+        data: pd.DataFrame
+            The encoded data.
+        output_info: List[FeatureInfo]
+            The layout of the encoded data.
+        device: Any
+            PyTorch device. Default: DEVICE.
+        train_size: float
+            Proportion of the rows in the training split. Default: 0.8.
+        random_state: int
+            Seed of the sampler. Default: 0.
+    """
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def __init__(
@@ -95,45 +119,86 @@ class ConditionalDatasetSampler(BaseSampler):
         output_info: List[FeatureInfo],
         device: Any = DEVICE,
         train_size: float = 0.8,
+        random_state: int = 0,
     ) -> None:
         self._device = device
+        self._rng = np.random.default_rng(random_state)
+        self._cond_buffer: Optional[np.ndarray] = None
+        self._cond_buffer_hot = np.zeros(0, dtype=int)
 
         indices = np.arange(0, len(data))
         self._train_idx, self._test_idx = train_test_split(
-            indices, train_size=train_size
+            indices, train_size=train_size, random_state=random_state
         )
-        self._train_mapping = {
-            old_idx: new_idx for new_idx, old_idx in enumerate(self._train_idx)
-        }
+        self._train_positions = np.arange(len(self._train_idx))
         self._num_items = len(indices)
 
         self._internal_setup(data, output_info)
 
         self._prepare_dataset_conditionals()
 
-    def _random_choice_prob_index(self, discrete_column_id: int) -> np.ndarray:
-        probs = self._discrete_feat_value_prob[discrete_column_id]
-        r = np.expand_dims(np.random.rand(probs.shape[0]), axis=1)
-        return (probs.cumsum(axis=1) > r).argmax(axis=1)
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_cond_buffer"] = None
+        state["_cond_buffer_hot"] = np.zeros(0, dtype=int)
+        return state
+
+    def _random_choice_prob_index(self, discrete_column_id: np.ndarray) -> np.ndarray:
+        cum_probs = self._discrete_feat_value_cum_prob[discrete_column_id]
+        r = np.expand_dims(self._rng.random(cum_probs.shape[0]), axis=1)
+        return (cum_probs > r).argmax(axis=1)
+
+    def _one_hot(
+        self, category_id: np.ndarray, reuse_buffer: bool = False
+    ) -> np.ndarray:
+        batch = len(category_id)
+        if not reuse_buffer:
+            cond = np.zeros((batch, self._n_conditional_dimension), dtype="float32")
+        else:
+            if self._cond_buffer is None or len(self._cond_buffer) < batch:
+                self._cond_buffer = np.zeros(
+                    (batch, self._n_conditional_dimension), dtype="float32"
+                )
+            else:
+                # only the entries set by the previous call are not zero
+                hot = self._cond_buffer_hot
+                self._cond_buffer[np.arange(len(hot)), hot] = 0
+            self._cond_buffer_hot = category_id
+            cond = self._cond_buffer[:batch]
+
+        cond[np.arange(batch), category_id] = 1
+        return cond
 
     def get_dataset_conditionals(self) -> np.ndarray:
         return self._dataset_conditional
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def sample_conditional(
-        self, batch: int, with_ids: bool = False, p: Optional[np.ndarray] = None
+        self,
+        batch: int,
+        with_ids: bool = False,
+        p: Optional[np.ndarray] = None,
+        reuse_buffer: bool = False,
     ) -> Any:
         """Generate the conditional vector for training.
 
+        Args:
+            batch: int
+                Number of conditional vectors.
+            with_ids: bool
+                Also return the sampled columns and categories.
+            p: Optional np.ndarray
+                Optional probability for each category
+            reuse_buffer: bool
+                Write the conditional vectors to a buffer owned by the sampler, instead of a new matrix. The buffer is overwritten by the next call with `reuse_buffer`, so the result must be consumed before. Default: False.
+
         Returns:
             cond (batch x #categories):
-                The conditional vector.
+                The float32 conditional vector.
             discrete column id (batch):
                 Integer representation of mask.
             category_id_in_col (batch):
                 Selected category in the selected discrete column.
-            p: Optional np.ndarray
-                Optional probability for each discrete column
         """
         if self._n_discrete_columns == 0:
             return None
@@ -142,24 +207,17 @@ class ConditionalDatasetSampler(BaseSampler):
             if p.shape[-1] != self._n_conditional_dimension:
                 raise ValueError(f"Invalid probability shape {p.shape}")
 
-            cond_res = np.zeros((batch, self._n_conditional_dimension), dtype="float32")
+            ind = self._rng.choice(self._n_conditional_dimension, batch, p=p)
 
-            ind = np.random.choice(self._n_conditional_dimension, batch, p=p)
+            return self._one_hot(ind, reuse_buffer=reuse_buffer)
 
-            cond_res[np.arange(batch), ind] = 1
-
-            return cond_res
-
-        discrete_column_id = np.random.choice(
-            np.arange(self._n_discrete_columns), batch
-        )
+        discrete_column_id = self._rng.integers(self._n_discrete_columns, size=batch)
 
-        cond = np.zeros((batch, self._n_conditional_dimension)).astype(float)
         category_id_in_col = self._random_choice_prob_index(discrete_column_id)
         category_id = (
             self._categorical_feat_offset[discrete_column_id] + category_id_in_col
         )
-        cond[np.arange(batch), category_id] = 1
+        cond = self._one_hot(category_id, reuse_buffer=reuse_buffer)
 
         if with_ids:
             return cond, discrete_column_id, category_id_in_col
@@ -168,7 +226,7 @@ class ConditionalDatasetSampler(BaseSampler):
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def sample_conditional_for_class(self, batch: int, c: int) -> Optional[np.ndarray]:
-        cond = np.zeros((batch, self._n_conditional_dimension)).astype(float)
+        cond = np.zeros((batch, self._n_conditional_dimension), dtype="float32")
         cond[..., c] = 1
 
         return cond
@@ -178,7 +236,7 @@ class ConditionalDatasetSampler(BaseSampler):
         self,
         cat_feats: np.ndarray,
         cat_values: np.ndarray,
-    ) -> List[int]:
+    ) -> np.ndarray:
         """Sample data from original training data satisfying the sampled conditional vector.
 
         Returns:
@@ -187,11 +245,13 @@ class ConditionalDatasetSampler(BaseSampler):
         if len(cat_values) != len(cat_feats):
             raise ValueError(f"Invalid categorical features {cat_values}")
 
-        idx = []
-        for c, o in zip(cat_feats, cat_values):
-            idx.append(np.random.choice(self._categorical_value_to_row_[c][o]))
+        category_id = self._categorical_feat_offset[cat_feats] + cat_values
+        start = self._category_row_offsets[category_id]
+        count = self._category_row_offsets[category_id + 1] - start
+        if np.any(count == 0):
+            raise ValueError("Cannot sample the rows of an empty category")
 
-        return idx
+        return self._category_rows[start + self._rng.integers(count)]
 
     def conditional_dimension(self) -> int:
         """Return the total number of categories."""
@@ -200,11 +260,11 @@ class ConditionalDatasetSampler(BaseSampler):
     def conditional_probs(self) -> Optional[np.ndarray]:
         return self._conditional_probs
 
-    def __iter__(self) -> Generator:
-        np.random.shuffle(self._train_idx)
+    def indices(self) -> np.ndarray:
+        return self._rng.permutation(self._train_positions)
 
-        for idx in self._train_idx:
-            yield self._train_mapping[idx]
+    def __iter__(self) -> Generator:
+        yield from self.indices().tolist()
 
     def __len__(self) -> int:
         return len(self._train_idx)
@@ -225,25 +285,29 @@ class ConditionalDatasetSampler(BaseSampler):
         )
 
         data = np.asarray(data)
-        # Store the row id for each category in each categorical column.
-        # For example _rid_by_cat_cols[a][b] is a list of all rows with the
-        # a-th discrete column equal value b.
-        self._categorical_value_to_row_ = []
-
-        # Compute _rid_by_cat_cols
+        # Store the row ids of each category of the discrete columns, in a CSR
+        # layout: the rows with the k-th category of the conditional vector are
+        # _category_rows[_category_row_offsets[k] : _category_row_offsets[k + 1]].
+        discrete_dims: List[int] = []
         st = 0
         for column_info in output_info:
             if is_discrete_column(column_info):
-                rid_by_cat = []
-                for j in range(column_info.output_dimensions):
-                    rid_by_cat.append(np.nonzero(data[:, st + j])[0])
-                self._categorical_value_to_row_.append(rid_by_cat)
-
+                discrete_dims.extend(range(st, st + column_info.output_dimensions))
             st += column_info.output_dimensions
 
         if st != data.shape[1]:
             raise RuntimeError(f"Invalid offset {st} {data.shape}")
 
+        rows, category_id = np.nonzero(data[:, discrete_dims])
+        order = np.argsort(category_id, kind="stable")
+        self._category_rows = rows[order]
+        self._category_row_offsets = np.concatenate(
+            [
+                [0],
+                np.cumsum(np.bincount(category_id, minlength=len(discrete_dims))),
+            ]
+        )
+
         # Prepare an interval matrix for efficiently sample conditional vector
         max_category = max(
             [
@@ -296,6 +360,9 @@ class ConditionalDatasetSampler(BaseSampler):
         self._conditional_probs = self._conditional_probs / (
             np.sum(self._conditional_probs) + 1e-8
         )
+        self._discrete_feat_value_cum_prob = self._discrete_feat_value_prob.cumsum(
+            axis=1
+        )
 
     def _prepare_dataset_conditionals(self) -> None:
         self._dataset_conditional = None
@@ -312,10 +379,108 @@ class ConditionalDatasetSampler(BaseSampler):
             categoricals, categoricals_vals
         )
 
-        self._train_idx = [idx for idx in sampling_indices if idx in self._train_idx]
-        self._train_mapping = {
-            old_idx: new_idx for new_idx, old_idx in enumerate(self._train_idx)
-        }
+        self._train_idx = sampling_indices[np.isin(sampling_indices, self._train_idx)]
+        # the duplicated rows are mapped to their last position
+        values, last = np.unique(self._train_idx[::-1], return_index=True)
+        self._train_positions = (len(self._train_idx) - 1 - last)[
+            np.searchsorted(values, self._train_idx)
+        ]
 
     def train_test(self) -> Tuple:
         return self._train_idx, self._test_idx
+
+
+class BatchIterator:
+    """Iterates over the mini-batches of in-memory tensors, for the training loops.
+
+    A faster equivalent of `DataLoader(TensorDataset(*tensors), batch_size=batch_size, sampler=sampler)`: the tensors are moved to the device once, the rows of each epoch are gathered with a single indexing per tensor into buffers allocated once, and the batches are contiguous slices of these buffers, without any per-row or per-batch collation.
+
+    The batches are overwritten by the next epoch. Without sampler and shuffling, the batches are slices of the tensors themselves, and must not be modified in place.
+
+    Args:
+        tensors: torch.Tensor
+            The tensors, with the same number of rows.
+        batch_size: int
+            Number of rows per batch. The last batch of an epoch can be smaller.
+        sampler: Optional[torch.utils.data.sampler.Sampler]
+            The rows of each epoch. The indices of the BaseSampler and WeightedRandomSampler epochs are drawn at once. Default: None, all the rows.
+        shuffle: bool
+            Shuffle the rows of each epoch, if there is no sampler. Default: False, the rows are in order.
+        device: Any
+            PyTorch device of the batches. Default: DEVICE.
+    """
+
+    def __init__(
+        self,
+        *tensors: torch.Tensor,
+        batch_size: int,
+        sampler: Optional[torch.utils.data.sampler.Sampler] = None,
+        shuffle: bool = False,
+        device: Any = DEVICE,
+    ) -> None:
+        if len(tensors) == 0:
+            raise ValueError("Expecting at least one tensor")
+        if any(len(tensor) != len(tensors[0]) for tensor in tensors):
+            raise ValueError("The tensors must have the same number of rows")
+        if batch_size <= 0:
+            raise ValueError(f"Invalid batch_size {batch_size}")
+
+        self.tensors = [tensor.to(device) for tensor in tensors]
+        self.batch_size = batch_size
+        self.sampler = sampler
+        self.shuffle = shuffle
+        self.device = device
+        self._buffers: List[torch.Tensor] = []
+
+    def _epoch_indices(self) -> Optional[torch.Tensor]:
+        if self.sampler is None:
+            if not self.shuffle:
+                return None
+            return torch.randperm(len(self.tensors[0]), device=self.device)
+
+        indices: Any
+        if isinstance(self.sampler, BaseSampler):
+            indices = self.sampler.indices()
+        elif isinstance(self.sampler, torch.utils.data.WeightedRandomSampler):
+            indices = torch.multinomial(
+                self.sampler.weights,
+                self.sampler.num_samples,
+                self.sampler.replacement,
+                generator=self.sampler.generator,
+            )
+        else:
+            indices = np.fromiter(iter(self.sampler), dtype=np.int64)
+
+        return torch.as_tensor(indices, dtype=torch.long, device=self.device)
+
+    def _gather(self) -> List[torch.Tensor]:
+        indices = self._epoch_indices()
+        if indices is None:
+            return self.tensors
+
+        n_rows = len(indices)
+        if len(self._buffers) == 0 or len(self._buffers[0]) != n_rows:
+            self._buffers = [
+                torch.empty(
+                    (n_rows, *tensor.shape[1:]), dtype=tensor.dtype, device=self.device
+                )
+                for tensor in self.tensors
+            ]
+
+        for tensor, buffer in zip(self.tensors, self._buffers):
+            torch.index_select(tensor, 0, indices, out=buffer)
+
+        return self._buffers
+
+    def __iter__(self) -> Generator:
+        buffers = self._gather()
+        for start in range(0, len(buffers[0]), self.batch_size):
+            yield [buffer[start : start + self.batch_size] for buffer in buffers]
+
+    def __len__(self) -> int:
+        n_rows = (
+            len(self.tensors[0])
+            if self.sampler is None
+            else len(self.sampler)  # type: ignore
+        )
+        return (n_rows + self.batch_size - 1) // self.batch_size
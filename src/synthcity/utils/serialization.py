@@ -159,10 +159,21 @@ def load_from_file(path: Union[str, Path]) -> Any:
         return cloudpickle.load(f)
 
 
-def dataframe_hash(df: pd.DataFrame) -> str:
-    """Dataframe hashing, used for caching/backups"""
+def dataframe_hash(df: pd.DataFrame, chunk_size: int = 100000) -> str:
+    """Dataframe hashing, used for caching/backups
+
+    The rows are hashed in chunks of `chunk_size`, so only one chunk is copied at a time. The result does not depend on the chunk size.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"Invalid chunk_size {chunk_size}")
+
     cols = sorted(list(df.columns))
-    return str(abs(pd.util.hash_pandas_object(df[cols].fillna(0)).sum()))
+    total = 0
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start : start + chunk_size][cols].fillna(0)
+        # uint64 sums wrap around, as for the hash of the full frame
+        total = (total + int(pd.util.hash_pandas_object(chunk).sum())) % 2**64
+    return str(total)
 
 
 def dataframe_cols_hash(df: pd.DataFrame) -> str:
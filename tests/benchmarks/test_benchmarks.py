@@ -1,7 +1,7 @@
 # stdlib
 import hashlib
 import json
-import platform
+from concurrent.futures import Executor, ThreadPoolExecutor
 from copy import copy
 from pathlib import Path
 from typing import Any, List
@@ -13,8 +13,16 @@ from sklearn.datasets import load_diabetes, load_iris
 
 # synthcity absolute
 from synthcity.benchmark import Benchmarks
+from synthcity.benchmark.executor import (
+    ExecutorBackend,
+    ProcessPoolBackend,
+    SequentialBackend,
+    get_backend,
+)
 from synthcity.benchmark.utils import get_json_serializable_kwargs
+from synthcity.metrics import Metrics
 from synthcity.plugins import Plugins
+from synthcity.plugins.core.constraints import Constraints
 from synthcity.plugins.core.dataloader import (
     DataLoader,
     GenericDataLoader,
@@ -23,6 +31,7 @@ from synthcity.plugins.core.dataloader import (
 from synthcity.plugins.core.distribution import Distribution
 from synthcity.plugins.core.plugin import Plugin
 from synthcity.plugins.core.schema import Schema
+from synthcity.utils.artifacts import ArtifactStore
 
 
 def test_benchmark_sanity() -> None:
@@ -267,30 +276,19 @@ def test_benchmark_workspace_cache() -> None:
 
     assert workspace.exists()
 
+    store = ArtifactStore(workspace)
     for repeat in range(repeats):
-        X_syn_cache_file = (
-            workspace
-            / f"{experiment_name}_{testcase}_{plugin}_{kwargs_hash}_{platform.python_version()}_{repeat}.bkp"
-        )
-        generator_file = (
-            workspace
-            / f"{experiment_name}_{testcase}_{plugin}_{kwargs_hash}_{platform.python_version()}_generator_{repeat}.bkp"
-        )
-        X_augment_cache_file = (
-            workspace
-            / f"{experiment_name}_{testcase}_{plugin}_augmentation_{augmentation_hash}_{kwargs_hash}_{platform.python_version()}_{repeat}.bkp"
-        )
+        experiment_key = [experiment_name, testcase, plugin, kwargs_hash, repeat]
 
-        augment_generator_file = (
-            workspace
-            / f"{experiment_name}_{testcase}_{plugin}_augmentation_{augmentation_hash}_{kwargs_hash}_{platform.python_version()}_generator_{repeat}.bkp"
-        )
-
-        assert X_syn_cache_file.exists()
-        assert generator_file.exists()
+        assert store.exists(store.key(*experiment_key, kind="synthetic"))
+        assert store.exists(store.key(*experiment_key, kind="generator"))
 
-        assert X_augment_cache_file.exists()
-        assert augment_generator_file.exists()
+        assert store.exists(
+            store.key(*experiment_key, augmentation_hash, kind="augmentation")
+        )
+        assert store.exists(
+            store.key(*experiment_key, augmentation_hash, kind="augmentation_generator")
+        )
 
 
 def test_benchmark_added_plugin() -> None:
@@ -343,3 +341,102 @@ def test_benchmark_added_plugin() -> None:
         },
     )
     assert "copy_data" in score
+
+
+def _sanity_benchmark(workspace: Path, **kwargs: Any) -> dict:
+    X, y = load_diabetes(return_X_y=True, as_frame=True)
+    X["target"] = y
+
+    return Benchmarks.evaluate(
+        [
+            ("test1", "marginal_distributions", {}),
+            ("test2", "dummy_sampler", {}),
+        ],
+        GenericDataLoader(X, sensitive_columns=["sex"]),
+        metrics={"sanity": ["common_rows_proportion", "data_mismatch_score"]},
+        repeats=2,
+        workspace=workspace,
+        **kwargs,
+    )
+
+
+def test_benchmark_process_backend(tmp_path: Path) -> None:
+    reference = _sanity_benchmark(tmp_path / "sequential")
+    scores = _sanity_benchmark(tmp_path / "process", backend="process", n_jobs=2)
+
+    assert list(scores.keys()) == list(reference.keys())
+    for testcase in reference:
+        assert (
+            scores[testcase]
+            .drop(columns="durations")
+            .equals(reference[testcase].drop(columns="durations"))
+        )
+
+    scores = _sanity_benchmark(
+        tmp_path / "budget", backend=ProcessPoolBackend(cpu_budget=2)
+    )
+    assert list(scores.keys()) == list(reference.keys())
+
+    with pytest.raises(ValueError):
+        _sanity_benchmark(tmp_path / "invalid", backend="invalid")
+
+
+def test_benchmark_resume(tmp_path: Path, monkeypatch: Any) -> None:
+    reference = _sanity_benchmark(tmp_path)
+
+    # the completed jobs are loaded from the workspace, without evaluating them again
+    def _fail(*args: Any, **kwargs: Any) -> None:
+        raise RuntimeError("evaluated twice")
+
+    monkeypatch.setattr(Metrics, "evaluate", _fail)
+    scores = _sanity_benchmark(tmp_path)
+
+    for testcase in reference:
+        assert scores[testcase].equals(reference[testcase])
+
+    with pytest.raises(RuntimeError):
+        _sanity_benchmark(tmp_path, use_metric_cache=False)
+
+    # the evaluations depend on the generation arguments
+    with pytest.raises(RuntimeError):
+        _sanity_benchmark(
+            tmp_path, synthetic_constraints=Constraints(rules=[("age", "ge", 0)])
+        )
+    with pytest.raises(RuntimeError):
+        _sanity_benchmark(tmp_path, random_state=1)
+
+
+class _ThreadBackend(ExecutorBackend):
+    def executor(self) -> Executor:
+        return ThreadPoolExecutor(max_workers=1)
+
+
+def test_benchmark_executor_backend(tmp_path: Path) -> None:
+    reference = _sanity_benchmark(tmp_path / "sequential")
+    scores = _sanity_benchmark(tmp_path / "threads", backend=_ThreadBackend())
+
+    for testcase in reference:
+        assert (
+            scores[testcase]
+            .drop(columns="durations")
+            .equals(reference[testcase].drop(columns="durations"))
+        )
+
+
+def test_benchmark_backend_budgets() -> None:
+    assert ProcessPoolBackend(n_jobs=3, cpu_budget=16).n_workers() == 3
+    assert ProcessPoolBackend(cpus_per_job=4, cpu_budget=16).n_workers() == 4
+    assert (
+        ProcessPoolBackend(
+            cpu_budget=16, memory_per_job=2 << 30, memory_budget=5 << 30
+        ).n_workers()
+        == 2
+    )
+    assert isinstance(get_backend("sequential"), SequentialBackend)
+
+    with pytest.raises(ValueError):
+        ProcessPoolBackend(cpus_per_job=0)
+    with pytest.raises(ValueError):
+        ProcessPoolBackend(cpus_per_job=4, cpu_budget=2)
+    with pytest.raises(ValueError):
+        ProcessPoolBackend(memory_budget=1 << 30)
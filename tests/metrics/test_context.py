@@ -0,0 +1,129 @@
+# stdlib
+import pickle
+
+# third party
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import load_iris
+
+# synthcity absolute
+from synthcity.metrics import Metrics
+from synthcity.metrics.core import EvaluationContext
+from synthcity.plugins.core.dataloader import GenericDataLoader, create_from_info
+
+
+def _data(n: int = 150, categories: list = ["a", "b", "c"]) -> pd.DataFrame:
+    X, y = load_iris(return_X_y=True, as_frame=True)
+    X = X.sample(n, replace=True, random_state=n).reset_index(drop=True)
+    X["cat"] = np.random.RandomState(n).choice(categories, size=n)
+    X["target"] = y.values[:n] if n <= len(y) else np.resize(y.values, n)
+    return X
+
+
+def test_context_encode() -> None:
+    X_gt = GenericDataLoader(_data(150), target_column="target")
+    X_syn = GenericDataLoader(_data(100), target_column="target")
+
+    # reference: encoders fitted on the concatenation of the datasets
+    all_df = pd.concat([X_gt.dataframe(), X_syn.dataframe()])
+    _, encoders = create_from_info(all_df, X_gt.info()).encode()
+    ref_gt, _ = X_gt.encode(encoders)
+    ref_syn, _ = X_syn.encode(encoders)
+
+    context = EvaluationContext(X_gt)
+    enc_gt, enc_syn, enc_train, enc_ref_syn, enc_aug = context.encode(X_syn)
+
+    assert enc_train is None and enc_ref_syn is None and enc_aug is None
+    assert enc_gt.dataframe().equals(ref_gt.dataframe())
+    assert enc_syn.dataframe().equals(ref_syn.dataframe())
+
+    # the real side is reused while the encoders don't change
+    other = GenericDataLoader(_data(80), target_column="target")
+    assert context.encode(other)[0] is enc_gt
+
+    # new categories change the encoders
+    new = GenericDataLoader(_data(80, ["a", "d"]), target_column="target")
+    enc_gt_new, enc_new, *_ = context.encode(new)
+    assert enc_gt_new is not enc_gt
+    assert enc_new["cat"].nunique() == 2
+
+
+def test_context_memo() -> None:
+    context = EvaluationContext(GenericDataLoader(_data()), max_entries=2)
+
+    calls = []
+
+    def _compute() -> np.ndarray:
+        calls.append(1)
+        return np.zeros(3)
+
+    first = context.memo("a", _compute)
+    assert context.memo("a", _compute) is first
+    assert len(calls) == 1
+    assert not first.flags.writeable
+
+    context.memo("b", _compute)
+    context.memo("c", _compute)
+    context.memo("a", _compute)
+    assert len(calls) == 4
+
+    X = np.random.randn(20, 3)
+    assert context.neighbors(X) is context.neighbors(X.copy())
+
+    with pytest.raises(ValueError):
+        EvaluationContext(GenericDataLoader(_data()), max_entries=0)
+
+
+def test_context_pickle() -> None:
+    X_gt = GenericDataLoader(_data())
+    context = EvaluationContext(X_gt)
+    context.memo("a", lambda: 1)
+
+    restored = pickle.loads(pickle.dumps(context))
+
+    assert restored.X_gt is None
+    assert restored.memo("a", lambda: 2) == 2
+    assert restored.max_entries == context.max_entries
+
+
+def test_context_matches() -> None:
+    X_gt = GenericDataLoader(_data(150))
+    context = EvaluationContext(X_gt)
+
+    assert context.matches(X_gt)
+    assert context.matches(GenericDataLoader(_data(150)))
+    assert not context.matches(GenericDataLoader(_data(100)))
+    assert not context.matches(X_gt, X_train=X_gt)
+
+    with pytest.raises(ValueError):
+        Metrics.evaluate(
+            GenericDataLoader(_data(100)),
+            GenericDataLoader(_data(100)),
+            metrics={"sanity": ["common_rows_proportion"]},
+            context=context,
+        )
+
+
+def test_context_evaluate() -> None:
+    X_gt = GenericDataLoader(_data(150), target_column="target")
+    metrics = {
+        "sanity": [
+            "common_rows_proportion",
+            "nearest_syn_neighbor_distance",
+            "close_values_probability",
+        ],
+        "stats": ["jensenshannon_dist", "ks_test"],
+    }
+
+    context = EvaluationContext(X_gt)
+    for n in [100, 120]:
+        X_syn = GenericDataLoader(_data(n), target_column="target")
+
+        reference = Metrics.evaluate(X_gt, X_syn, metrics=metrics, use_cache=False)
+        out = Metrics.evaluate(
+            X_gt, X_syn, metrics=metrics, use_cache=False, context=context
+        )
+
+        assert list(out.index) == list(reference.index)
+        assert np.allclose(out["mean"], reference["mean"])
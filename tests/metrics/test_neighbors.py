@@ -0,0 +1,107 @@
+# stdlib
+import pickle
+
+# third party
+import numpy as np
+import pytest
+from scipy.spatial.distance import cdist
+from sklearn.datasets import load_iris
+from sklearn.metrics import pairwise_distances
+
+# synthcity absolute
+from synthcity.metrics.core import EvaluationContext, NeighborIndex
+from synthcity.metrics.eval_statistical import AlphaPrecision, PRDCScore
+from synthcity.plugins.core.dataloader import GenericDataLoader
+
+
+@pytest.mark.parametrize("algorithm", ["auto", "ball_tree", "brute"])
+@pytest.mark.parametrize("batch_size", [7, 4096])
+def test_neighbor_index_exact(algorithm: str, batch_size: int) -> None:
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 4))
+    Q = rng.normal(size=(50, 4))
+
+    dist, idx = NeighborIndex(X, algorithm=algorithm, batch_size=batch_size).kneighbors(
+        Q, 3
+    )
+
+    reference = cdist(Q, X)
+    assert dist.shape == idx.shape == (len(Q), 3)
+    assert np.allclose(dist, np.sort(reference, axis=1)[:, :3])
+    assert np.allclose(np.take_along_axis(reference, idx, axis=1), dist)
+
+    # the indexed rows are their own closest neighbours
+    dist, idx = NeighborIndex(X, batch_size=batch_size).kneighbors(X, 1)
+    assert (idx[:, 0] == np.arange(len(X))).all()
+    assert np.allclose(dist, 0)
+
+
+def test_neighbor_index_invalid() -> None:
+    X = np.random.randn(10, 2)
+
+    with pytest.raises(ValueError):
+        NeighborIndex(X, backend="invalid")
+    with pytest.raises(ValueError):
+        NeighborIndex(X, batch_size=0)
+    with pytest.raises(ValueError):
+        NeighborIndex(X[:0])
+    with pytest.raises(ValueError):
+        NeighborIndex(X).kneighbors(X, 11)
+
+
+def test_neighbor_index_approximate() -> None:
+    pytest.importorskip("pynndescent")
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 4))
+
+    dist, idx = NeighborIndex(X, backend="approximate").kneighbors(X[:50], 2)
+
+    reference = np.sort(cdist(X[:50], X), axis=1)[:, :2]
+    assert dist.shape == (50, 2)
+    assert np.isclose(dist, reference).mean() > 0.9
+
+
+def test_context_kneighbors() -> None:
+    X_gt = GenericDataLoader(load_iris(as_frame=True).frame)
+    context = EvaluationContext(X_gt, knn_batch_size=16)
+
+    X = np.random.randn(100, 3)
+    Q = np.random.randn(30, 3)
+
+    index = context.neighbors(X)
+    dist, idx = context.kneighbors(X, Q, 2)
+
+    # a single index serves the queries of every number of neighbours
+    assert context.kneighbors(X, Q, 3)[0].shape == (30, 3)
+    assert context.neighbors(X) is index
+    assert context.kneighbors(X, Q.copy(), 2)[0] is dist
+    assert not dist.flags.writeable and not idx.flags.writeable
+    assert np.allclose(dist, np.sort(cdist(Q, X), axis=1)[:, :2])
+
+    restored = pickle.loads(pickle.dumps(context))
+    assert restored.knn_batch_size == 16
+
+    with pytest.raises(ValueError):
+        EvaluationContext(X_gt, knn_batch_size=0)
+
+
+def test_metrics_shared_neighbors() -> None:
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(150, 4))
+    X_syn = rng.normal(size=(150, 4))
+
+    context = EvaluationContext(GenericDataLoader(X))
+    reference = AlphaPrecision().metrics(X, X_syn)
+    shared = AlphaPrecision(context=context).metrics(X, X_syn)
+
+    for lhs, rhs in zip(reference, shared):
+        assert np.allclose(lhs, rhs)
+
+    # PRDC queries the index of X built by AlphaPrecision
+    prdc = PRDCScore(context=context)
+    radii = prdc._compute_nearest_neighbour_distances(X, prdc.nearest_k)
+
+    distances = pairwise_distances(X)
+    expected = np.sort(distances, axis=1)[:, prdc.nearest_k]
+    assert np.allclose(radii, expected)
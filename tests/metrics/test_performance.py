@@ -1,6 +1,6 @@
 # stdlib
 import sys
-from typing import Optional, Type
+from typing import Any, Optional, Type
 
 # third party
 import numpy as np
@@ -11,6 +11,7 @@ from sklearn.datasets import load_diabetes, load_iris
 from torchvision import datasets
 
 # synthcity absolute
+from synthcity.metrics import eval_performance
 from synthcity.metrics.eval_performance import (
     FeatureImportanceRankDistance,
     PerformanceEvaluatorLinear,
@@ -366,6 +367,45 @@ def test_evaluate_performance_custom_labels(
     assert "syn_ood" in good_score
 
 
+@pytest.mark.parametrize(
+    "evaluator_t",
+    [
+        PerformanceEvaluatorLinear,
+        PerformanceEvaluatorMLP,
+    ],
+)
+def test_evaluate_performance_train_once(
+    evaluator_t: Type, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    X, y = load_iris(return_X_y=True, as_frame=True)
+    X["target"] = y
+    Xloader = GenericDataLoader(X, target_column="target")
+    X_syn = GenericDataLoader(
+        X.sample(frac=1, random_state=0).head(100), target_column="target"
+    )
+
+    fit_sizes = []
+    fit_classifier = eval_performance._fit_classifier
+
+    def _counting_fit(
+        model: Type, model_args: dict, X: np.ndarray, y: np.ndarray
+    ) -> Any:
+        fit_sizes.append(len(X))
+        return fit_classifier(model, model_args, X, y)
+
+    monkeypatch.setattr(eval_performance, "_fit_classifier", _counting_fit)
+
+    evaluator = evaluator_t(use_cache=False)
+    score = evaluator.evaluate(Xloader, X_syn)
+
+    # one model per real data fold, and a single synthetic data model
+    assert len(fit_sizes) == evaluator._n_folds + 1
+    assert fit_sizes.count(len(X_syn)) == 1
+
+    monkeypatch.undo()
+    assert evaluator_t(use_cache=False, n_jobs=2).evaluate(Xloader, X_syn) == score
+
+
 @pytest.mark.slow_1
 @pytest.mark.slow
 @pytest.mark.parametrize("test_plugin", [Plugins().get("timegan")])
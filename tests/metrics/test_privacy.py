@@ -1,14 +1,18 @@
 # stdlib
 import sys
-from typing import Type
+from pathlib import Path
+from typing import Any, List, Type
 
 # third party
 import numpy as np
+import pandas as pd
 import pytest
+from sklearn.cluster import MiniBatchKMeans
 from sklearn.datasets import load_iris
 from torchvision import datasets
 
 # synthcity absolute
+from synthcity.metrics.core import EvaluationContext
 from synthcity.metrics.eval_privacy import (
     DeltaPresence,
     DomiasMIABNAF,
@@ -96,3 +100,101 @@ def test_image_support() -> None:
         for k in score:
             assert score[k] >= 0
             assert not np.isnan(score[k])
+
+
+@pytest.mark.parametrize("grouping", ["minibatch", "exact"])
+@pytest.mark.parametrize(
+    "evaluator_t", [DeltaPresence, kAnonymization, kMap, lDiversityDistinct]
+)
+def test_evaluator_grouping(evaluator_t: Type, grouping: str) -> None:
+    X, _ = load_iris(return_X_y=True, as_frame=True)
+    X_gt = GenericDataLoader(X, sensitive_features=["sepal length (cm)"])
+    X_syn = GenericDataLoader(
+        X.sample(300, replace=True, random_state=0).reset_index(drop=True),
+        sensitive_features=["sepal length (cm)"],
+    )
+
+    score = evaluator_t(use_cache=False, grouping=grouping).evaluate(X_gt, X_syn)
+    for submetric in score:
+        assert score[submetric] > 0
+
+    with pytest.raises(ValueError):
+        evaluator_t(grouping="invalid")
+
+
+def test_exact_grouping() -> None:
+    qi = pd.DataFrame({"age": [30, 30, 30, 40, 40, 50], "zip": [1, 1, 1, 2, 2, 3]})
+    X_gt = GenericDataLoader(
+        qi.assign(disease=["a", "b", "b", "a", "a", "c"]),
+        sensitive_features=["disease"],
+    )
+    X_syn = GenericDataLoader(
+        pd.DataFrame(
+            {
+                "age": [30.0, 30.0, 40.0, 40.0, 40.0, 60.0],
+                "zip": [1, 1, 2, 2, 2, 3],
+                "disease": ["a"] * 6,
+            }
+        ),
+        sensitive_features=["disease"],
+    )
+
+    k_anon = kAnonymization(use_cache=False, grouping="exact")
+    assert k_anon.evaluate_data(X_gt) == 1
+    assert k_anon.evaluate_data(X_syn) == 1
+
+    l_div = lDiversityDistinct(use_cache=False, grouping="exact")
+    assert l_div.evaluate_data(X_gt) == 1
+    assert l_div.evaluate_data(X_syn.sample(5, random_state=0)) == 1
+
+    # the synthetic (60, 3) record matches no real class
+    assert kMap(use_cache=False, grouping="exact").evaluate(X_gt, X_syn) == {"score": 2}
+    assert DeltaPresence(use_cache=False, grouping="exact").evaluate(X_gt, X_syn) == {
+        "score": 1.5 / (1 + 5e-9)
+    }
+
+
+def test_evaluator_cache(tmp_path: Path) -> None:
+    X, _ = load_iris(return_X_y=True, as_frame=True)
+    X_gt = GenericDataLoader(X, sensitive_features=["sepal length (cm)"])
+    X_syn = GenericDataLoader(X.sample(100, random_state=0))
+
+    # without cache, the workspace is neither read nor written
+    workspace = tmp_path / "nocache"
+    score = kAnonymization(use_cache=False, workspace=workspace).evaluate(X_gt, X_syn)
+    assert not (workspace / "artifacts.db").exists()
+
+    workspace = tmp_path / "cache"
+    evaluator = kAnonymization(workspace=workspace)
+    assert evaluator.evaluate(X_gt, X_syn) == score
+    assert (workspace / "artifacts.db").exists()
+
+    # the cached result is reused
+    evaluator._evaluate = None  # type: ignore
+    assert evaluator.evaluate(X_gt, X_syn) == score
+
+
+def test_grouping_context_reuse(monkeypatch: pytest.MonkeyPatch) -> None:
+    X, _ = load_iris(return_X_y=True, as_frame=True)
+    X_gt = GenericDataLoader(X, sensitive_features=["sepal length (cm)"])
+    X_syn = GenericDataLoader(
+        X.sample(300, replace=True, random_state=0).reset_index(drop=True),
+        sensitive_features=["sepal length (cm)"],
+    )
+    context = EvaluationContext(X_gt, qi_grouping="minibatch")
+
+    fits = []
+    original_fit = MiniBatchKMeans.fit
+
+    def _fit(self: MiniBatchKMeans, *args: Any, **kwargs: Any) -> MiniBatchKMeans:
+        fits.append(self.n_clusters)
+        return original_fit(self, *args, **kwargs)
+
+    monkeypatch.setattr(MiniBatchKMeans, "fit", _fit)
+
+    evaluators: List[Type] = [DeltaPresence, kAnonymization, kMap, lDiversityDistinct]
+    for evaluator_t in evaluators:
+        evaluator_t(use_cache=False, context=context).evaluate(X_gt, X_syn)
+
+    # one clustering per cluster count for each dataset, shared by the metrics
+    assert sorted(fits) == sorted([2, 5, 10, 15] * 2)
@@ -0,0 +1,97 @@
+# stdlib
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+# third party
+import pandas as pd
+import pytest
+from sklearn.datasets import load_iris
+
+# synthcity absolute
+from synthcity.metrics.eval_sanity import (
+    CommonRowsProportion,
+    DataMismatchScore,
+    NearestSyntheticNeighborDistance,
+)
+from synthcity.metrics.scores import ScoreEvaluator
+from synthcity.plugins.core.dataloader import DataLoader, GenericDataLoader
+
+
+class SlowMetric(DataMismatchScore):
+    @staticmethod
+    def name() -> str:
+        return "slow_metric"
+
+    @staticmethod
+    def cost() -> float:
+        return 1000.0
+
+    def evaluate(self, X_gt: DataLoader, X_syn: DataLoader) -> Dict:
+        time.sleep(3)
+        return {"score": 0}
+
+
+def _loaders() -> Any:
+    X, y = load_iris(return_X_y=True, as_frame=True)
+    X["target"] = y
+    X_gt = GenericDataLoader(X)
+    X_syn = GenericDataLoader(X.sample(frac=1, random_state=1))
+
+    return X_gt, X_syn
+
+
+def _evaluate(scores: ScoreEvaluator, metrics: list) -> pd.DataFrame:
+    X_gt, X_syn = _loaders()
+    for metric in metrics:
+        scores.queue(metric(use_cache=False, workspace=Path("workspace")), X_gt, X_syn)
+    scores.compute()
+
+    return scores.to_dataframe()
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_score_evaluator_backends(backend: str) -> None:
+    metrics = [
+        DataMismatchScore,
+        CommonRowsProportion,
+        NearestSyntheticNeighborDistance,
+    ]
+
+    reference = _evaluate(ScoreEvaluator(), metrics)
+    out = _evaluate(ScoreEvaluator(n_jobs=2, backend=backend), metrics)
+
+    assert list(out.index) == list(reference.index)
+    assert (out["mean"] == reference["mean"]).all()
+    assert (out["errors"] == 0).all()
+
+
+def test_score_evaluator_cost() -> None:
+    scores = ScoreEvaluator(costs={CommonRowsProportion.fqdn(): 3})
+
+    assert scores.cost(CommonRowsProportion()) == 3
+    assert scores.cost(DataMismatchScore()) == DataMismatchScore.cost()
+    assert SlowMetric.cost() > DataMismatchScore.cost()
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_score_evaluator_timeout(backend: str, n_jobs: int) -> None:
+    scores = ScoreEvaluator(
+        n_jobs=n_jobs, backend=backend, timeout=1, poll_interval=0.1
+    )
+
+    # with a single worker, the next metric starts as soon as the slow one times out
+    start = time.time()
+    out = _evaluate(scores, [SlowMetric, CommonRowsProportion])
+
+    assert time.time() - start < 3
+    assert SlowMetric.fqdn() not in scores.scores
+    assert f"{CommonRowsProportion.fqdn()}.score" in out.index
+
+
+def test_score_evaluator_invalid() -> None:
+    with pytest.raises(ValueError):
+        ScoreEvaluator(backend="invalid")
+    with pytest.raises(ValueError):
+        ScoreEvaluator(timeout=0)
@@ -144,6 +144,43 @@ def test_evaluate_maximum_mean_discrepancy(kernel: str, test_plugin: Plugin) ->
     assert MaximumMeanDiscrepancy.direction() == "minimize"
 
 
+@pytest.mark.parametrize("kernel", ["rbf", "polynomial"])
+def test_maximum_mean_discrepancy_estimators(kernel: str) -> None:
+    rng = np.random.default_rng(0)
+    X = GenericDataLoader(pd.DataFrame(rng.normal(size=(700, 4)) + 5))
+    X_close = GenericDataLoader(pd.DataFrame(rng.normal(size=(600, 4)) + 5))
+    X_far = GenericDataLoader(pd.DataFrame(rng.normal(size=(600, 4)) + 6))
+
+    def _score(X_syn: DataLoader, **kwargs: Any) -> dict:
+        return MaximumMeanDiscrepancy(
+            kernel=kernel, use_cache=False, **kwargs
+        ).evaluate(X, X_syn)
+
+    exact = _score(X_close, estimator="exact")
+    blocked = _score(X_close, estimator="blocked", block_size=128)
+    assert np.isclose(blocked["joint"], exact["joint"], rtol=1e-3, atol=1e-5)
+
+    estimators = ["linear_time"] + (["rff"] if kernel == "rbf" else [])
+    for estimator in estimators:
+        close = _score(X_close, estimator=estimator)
+        far = _score(X_far, estimator=estimator)
+        assert close["joint"] < far["joint"]
+
+    if kernel == "rbf":
+        rff = _score(X_close, estimator="rff", n_features=8192)
+        assert np.isclose(rff["joint"], exact["joint"], atol=0.01)
+
+    auto = MaximumMeanDiscrepancy(kernel=kernel)
+    assert auto.estimator_for(700, 600) == "exact"
+    assert auto.estimator_for(10000, 600) == "blocked"
+    assert MaximumMeanDiscrepancy(kernel="linear").estimator_for(10000, 600) == "exact"
+
+    with pytest.raises(ValueError):
+        MaximumMeanDiscrepancy(kernel=kernel, estimator="invalid")
+    with pytest.raises(ValueError):
+        MaximumMeanDiscrepancy(kernel=kernel, block_size=0)
+
+
 @pytest.mark.parametrize("test_plugin", [Plugins().get("dummy_sampler")])
 def test_evaluate_avg_jensenshannon_distance(test_plugin: Plugin) -> None:
     X, y = load_iris(return_X_y=True, as_frame=True)
@@ -214,6 +251,27 @@ def test_evaluate_prdc(test_plugin: Plugin) -> None:
     assert PRDCScore.direction() == "maximize"
 
 
+def test_prdc_blocked() -> None:
+    rng = np.random.default_rng(0)
+    X = GenericDataLoader(pd.DataFrame(rng.normal(size=(500, 4))))
+    X_syn = GenericDataLoader(pd.DataFrame(rng.normal(size=(400, 4)) + 0.5))
+
+    exact = PRDCScore(estimator="exact", use_cache=False).evaluate(X, X_syn)
+    blocked = PRDCScore(estimator="blocked", block_size=64, use_cache=False).evaluate(
+        X, X_syn
+    )
+
+    assert list(blocked) == list(exact)
+    for key in exact:
+        assert np.isclose(blocked[key], exact[key], atol=0.01)
+
+    assert PRDCScore().estimator_for(500, 400) == "exact"
+    assert PRDCScore().estimator_for(500, 10000) == "blocked"
+
+    with pytest.raises(ValueError):
+        PRDCScore(estimator="invalid")
+
+
 @pytest.mark.parametrize("test_plugin", [Plugins().get("dummy_sampler")])
 def test_evaluate_alpha_precision(test_plugin: Plugin) -> None:
     X, y = load_iris(return_X_y=True, as_frame=True)
@@ -1,5 +1,6 @@
 # third party
 import numpy as np
+import pytest
 from lifelines.datasets import load_rossi
 
 # synthcity absolute
@@ -7,6 +8,40 @@ from synthcity.plugins.core.models.survival_analysis.metrics import (
     km_survival_function,
     nonparametric_distance,
 )
+from synthcity.plugins.core.models.survival_analysis.third_party.metrics import (
+    brier_score,
+    concordance_index_censored,
+    concordance_index_ipcw,
+)
+from synthcity.plugins.core.models.survival_analysis.third_party.nonparametric import (
+    CensoringDistributionEstimator,
+)
+
+
+def _naive_c_index(
+    event: np.ndarray,
+    time: np.ndarray,
+    estimate: np.ndarray,
+    weights: np.ndarray,
+    tied_tol: float,
+) -> float:
+    numerator = 0.0
+    denominator = 0.0
+    for i in np.flatnonzero(event):
+        comparable = (time > time[i]) | ((time == time[i]) & ~event)
+        est = estimate[comparable]
+        ties = np.absolute(est - estimate[i]) <= tied_tol
+        concordant = (est < estimate[i]) & ~ties
+        numerator += weights[i] * (concordant.sum() + 0.5 * ties.sum())
+        denominator += weights[i] * comparable.sum()
+    return numerator / denominator
+
+
+def _survival(event: np.ndarray, time: np.ndarray) -> np.ndarray:
+    out = np.empty(len(time), dtype=[("event", bool), ("time", float)])
+    out["event"] = event
+    out["time"] = time
+    return out
 
 
 def test_km_surv_function() -> None:
@@ -38,3 +73,66 @@ def test_nonparametric_distance() -> None:
     assert 0 < auc_abs_opt < 1
 
     assert sightedness < 1
+
+
+@pytest.mark.parametrize("tied_tol", [1e-8, 0.1])
+def test_concordance_index_censored(tied_tol: float) -> None:
+    rng = np.random.RandomState(0)
+    for _ in range(20):
+        n = rng.randint(2, 100)
+        time = rng.randint(0, 10, size=n).astype(float)
+        event = rng.rand(n) < 0.5
+        event[0] = True
+        time[0] = time.min() - 1
+        estimate = rng.randint(0, 5, size=n) * 0.1
+
+        cindex = concordance_index_censored(event, time, estimate, tied_tol=tied_tol)
+        assert np.isclose(
+            cindex, _naive_c_index(event, time, estimate, np.ones(n), tied_tol)
+        )
+
+
+def test_concordance_index_ipcw() -> None:
+    df = load_rossi()
+    event = df["arrest"].values.astype(bool)
+    time = df["week"].values.astype(float)
+    estimate = df["prio"].values.astype(float)
+    survival = _survival(event, time)
+
+    # the censoring survival function is zero at the last time, so the test times are truncated
+    cens = CensoringDistributionEstimator().fit(survival)
+    for tau in [np.quantile(time, 0.5), np.quantile(time, 0.9)]:
+        weights = np.zeros(len(time))
+        mask = time < tau
+        weights[mask] = np.square(cens.predict_ipcw(survival[mask]))
+
+        cindex = concordance_index_ipcw(survival, survival, estimate, tau=float(tau))
+        assert np.isclose(cindex, _naive_c_index(event, time, estimate, weights, 1e-8))
+
+    with pytest.raises(RuntimeError):
+        concordance_index_censored(
+            np.array([False, True]), np.array([1.0, 2.0]), np.array([0.1, 0.2])
+        )
+
+
+def test_brier_score() -> None:
+    df = load_rossi()
+    survival = _survival(df["arrest"].values.astype(bool), df["week"].values)
+    times = np.arange(5, 50, 5)
+    estimate = np.random.RandomState(0).rand(len(df), len(times))
+
+    scores = brier_score(survival, survival, estimate, times)
+
+    cens = CensoringDistributionEstimator().fit(survival)
+    prob_cens_y = cens.predict_proba(survival["time"])
+    prob_cens_y[prob_cens_y == 0] = np.inf
+    for idx, t in enumerate(times):
+        is_case = (survival["time"] <= t) & survival["event"]
+        is_control = survival["time"] > t
+        expected = np.mean(
+            np.square(estimate[:, idx]) * is_case / prob_cens_y
+            + np.square(1.0 - estimate[:, idx])
+            * is_control
+            / cens.predict_proba(np.array([t]))[0]
+        )
+        assert np.isclose(scores[idx], expected)
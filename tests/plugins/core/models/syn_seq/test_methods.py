@@ -85,3 +85,35 @@ def test_methods_numeric_output(method_name: str) -> None:
     assert np.issubdtype(
         y_syn.dtype, np.number
     ), f"Method '{method_name}': output dtype {y_syn.dtype} is not numeric"
+
+
+@pytest.mark.parametrize("method_name", list(METHOD_PAIRS.keys()))
+def test_methods_rng(method_name: str) -> None:
+    """
+    Test that each synthesis method draws from the generator it is given, and not from the global NumPy state.
+    """
+    syn_func, gen_func = METHOD_PAIRS[method_name]
+    y = np.repeat(np.arange(1, 6), 20)
+    X = np.random.rand(100, 3)
+
+    np.random.seed(0)
+    # swr consumes its pool, each draw gets a fresh fit
+    first = gen_func(syn_func(y, X, random_state=0), X, rng=np.random.default_rng(1))
+    second = gen_func(syn_func(y, X, random_state=0), X, rng=np.random.default_rng(1))
+
+    np.testing.assert_array_equal(first, second)
+    # the global generator was not consumed
+    assert np.random.rand() == np.random.RandomState(0).rand()
+
+
+@pytest.mark.parametrize("method_name", ["norm", "rf"])
+def test_methods_rng_draws(method_name: str) -> None:
+    syn_func, gen_func = METHOD_PAIRS[method_name]
+    y = np.repeat(np.arange(1, 6), 20)
+    X = np.random.rand(100, 3)
+
+    fitted_model = syn_func(y, X, random_state=0)
+
+    first = gen_func(fitted_model, X, rng=np.random.default_rng(1))
+    second = gen_func(fitted_model, X, rng=np.random.default_rng(2))
+    assert not np.array_equal(first, second)
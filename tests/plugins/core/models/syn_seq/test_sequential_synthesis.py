@@ -1,4 +1,5 @@
 # stdlib
+from multiprocessing import shared_memory
 from typing import Any, Dict, List
 
 # third party
@@ -7,6 +8,7 @@ import pandas as pd
 import pytest
 
 # synthcity absolute
+from synthcity.plugins.core.models.syn_seq import syn_seq
 from synthcity.plugins.core.models.syn_seq.syn_seq import METHOD_MAP, Syn_Seq
 
 
@@ -125,3 +127,114 @@ def test_sequential_synthesis_not_fitted() -> None:
     syn_seq = Syn_Seq()
     with pytest.raises(RuntimeError, match="Syn_Seq aggregator not yet fitted"):
         syn_seq.generate_col(3, label_encoder={})
+
+
+def test_sequential_synthesis_special_values(sample_df: pd.DataFrame) -> None:
+    """
+    Test that the rows whose synthetic _cat indicator is not the numeric marker
+    get the special value of their label, and the others the generated value.
+    """
+    syn_seq = Syn_Seq()
+    syn_seq._syn_order = ["A", "B_cat", "B"]
+    syn_seq._varsel = {"B_cat": ["A"], "B": ["B_cat"]}
+    syn_seq._first_col_values = {"A": np.array(sample_df["A"])}
+    syn_seq._col_models = {
+        "B_cat": {"name": "cart", "fitted_model": "dummy_model"},
+        "B": {"name": "cart", "fitted_model": "dummy_model"},
+    }
+    syn_seq._model_trained = True
+
+    # dummy_generate yields A + 100 for B_cat, so label 101 is the numeric marker
+    classes = [-1] * 110
+    classes[101] = -777777777
+    for special in [102, 103, 104, 105]:
+        classes[special] = special * 10
+    label_encoder = {"B_cat": DummyLabelEncoder(classes)}
+
+    gen_df = syn_seq.generate_col(200, label_encoder=label_encoder)
+
+    numeric = gen_df["B_cat"] == 101
+    assert numeric.any() and (~numeric).any()
+    np.testing.assert_array_equal(
+        gen_df.loc[~numeric, "B"], gen_df.loc[~numeric, "B_cat"] * 10
+    )
+    assert (gen_df.loc[numeric, "B"] == 201).all()
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_sequential_synthesis_chunks(
+    dummy_loader: DummyLoader, loader_info: Dict[str, Any], n_jobs: int
+) -> None:
+    """
+    Test that the chunked and parallel generation yields the requested rows,
+    reproducibly for a given seed.
+    """
+    syn_seq = Syn_Seq(random_state=42, n_jobs=n_jobs, chunk_size=64)
+    syn_seq.fit_col(dummy_loader, label_encoder={}, loader_info=loader_info)
+
+    gen_df = syn_seq.generate_col(1000, label_encoder={})
+
+    assert len(gen_df) == 1000
+    assert list(gen_df.columns) == ["A", "B"]
+    np.testing.assert_array_equal(gen_df["B"], gen_df["A"] + 100)
+    assert gen_df["A"].nunique() == 5
+
+    np.random.seed(0)
+    first = syn_seq.generate_col(1000, label_encoder={})
+    np.random.seed(0)
+    second = syn_seq.generate_col(1000, label_encoder={})
+    assert first.equals(second)
+
+    with pytest.raises(ValueError):
+        Syn_Seq(chunk_size=0)
+
+
+def test_sequential_synthesis_parallel_fit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that the columns fitted in a pool of processes, on the shared training data,
+    get the same models as the sequential fit.
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "A": rng.integers(0, 5, size=200),
+            "B": rng.normal(size=200),
+            "C": rng.integers(0, 3, size=200),
+            "D": rng.normal(size=200),
+        }
+    )
+    info = {
+        "syn_order": ["A", "B", "C", "D"],
+        "method": {"B": "norm", "C": "logreg", "D": "norm"},
+    }
+
+    blocks: List[str] = []
+
+    class _RecordedColumns(syn_seq._SharedColumns):
+        def __init__(self, df: pd.DataFrame) -> None:
+            super().__init__(df)
+            blocks.append(self.name)
+
+    monkeypatch.setattr(syn_seq, "_SharedColumns", _RecordedColumns)
+
+    sequential = Syn_Seq().fit_col(DummyLoader(df), {}, dict(info))
+    parallel = Syn_Seq(n_jobs=2).fit_col(DummyLoader(df), {}, dict(info))
+
+    # the parent process releases the shared block
+    assert len(blocks) == 1
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=blocks[0])
+
+    assert set(parallel.fit_durations) == {"B", "C", "D"}
+    assert all(duration >= 0 for duration in parallel.fit_durations.values())
+    for col in ["B", "D"]:
+        ref = sequential._col_models[col]["fitted_model"]  # type: ignore
+        out = parallel._col_models[col]["fitted_model"]  # type: ignore
+        np.testing.assert_allclose(ref["coef_"], out["coef_"])
+    assert parallel._col_models["C"] is not None
+
+    X = df[["A", "B"]].values
+    np.testing.assert_array_equal(
+        sequential._generate_single_col("logreg", X, "C", random_state=0),
+        parallel._generate_single_col("logreg", X, "C", random_state=0),
+    )
@@ -0,0 +1,132 @@
+# stdlib
+from typing import Any, List, Optional
+
+# third party
+import numpy as np
+import pytest
+import torch
+from torch import nn
+
+# synthcity absolute
+from synthcity.metrics.weighted_metrics import WeightedMetrics
+from synthcity.plugins.core.models.early_stopping import PatienceEvaluator
+
+
+def _metric() -> WeightedMetrics:
+    return WeightedMetrics(
+        metrics=[("detection", "detection_linear")], weights=[1], task_type="regression"
+    )
+
+
+def _generate(model: nn.Module, count: int, cond: Optional[torch.Tensor]) -> Any:
+    with torch.no_grad():
+        return model(torch.randn(count, 4))
+
+
+def _scripted(evaluator: PatienceEvaluator, scores: List[float]) -> List[float]:
+    """Replace the metric of the evaluator by a sequence of scores, and record the weights it is evaluated with."""
+    evaluated = []
+    remaining = list(scores)
+
+    def _evaluate(model: nn.Module, generate: Any) -> float:
+        evaluated.append(model.weight.sum().item())
+        return remaining.pop(0)
+
+    evaluator.evaluate = _evaluate  # type: ignore
+    return evaluated
+
+
+def test_patience_evaluator_subsample() -> None:
+    X = torch.randn(1000, 4)
+    cond = torch.arange(1000).reshape(-1, 1)
+
+    evaluator = PatienceEvaluator(_metric(), X, cond, max_samples=100)
+    assert evaluator.cond is not None
+    assert len(evaluator.X_gt) == 100
+    assert len(evaluator.cond) == 100
+
+    # the conditional rows match the validation rows
+    rows = evaluator.cond.flatten()
+    assert np.allclose(evaluator.X_gt.numpy(), X[rows].numpy())
+
+    # the real-side work is memoized across the evaluations
+    model = nn.Linear(4, 4)
+    first = evaluator.evaluate(model, _generate)
+    assert evaluator.metric.context is not None
+    assert len(evaluator.metric.context._cache) > 0
+    assert evaluator.evaluate(model, _generate) == pytest.approx(first, abs=0.2)
+
+    assert len(PatienceEvaluator(_metric(), X, max_samples=5000).X_gt) == 1000
+    assert len(PatienceEvaluator(_metric(), X).X_gt) == 1000
+
+    with pytest.raises(ValueError):
+        PatienceEvaluator(_metric(), X, max_samples=0)
+    with pytest.raises(ValueError):
+        PatienceEvaluator(_metric(), X, cond[:-1])
+
+
+def test_patience_evaluator_sync() -> None:
+    model = nn.Linear(4, 4)
+    evaluator = PatienceEvaluator(_metric(), torch.randn(50, 4), patience=2)
+    _scripted(evaluator, [0.9, 0.5, 0.7, 0.5])
+
+    best: dict = {}
+    exhausted = []
+    for step in range(4):
+        with torch.no_grad():
+            model.weight.fill_(step)
+        exhausted.append(evaluator.step(model, _generate))
+        if step == 1:
+            best = {k: v.clone() for k, v in model.state_dict().items()}
+
+    assert exhausted == [False, False, False, True]
+    assert evaluator.score == 0.5
+
+    # the best weights are a snapshot, not the current weights
+    best_state = evaluator.finish()
+    assert best_state is not None
+    for key, value in best_state.items():
+        assert torch.equal(value, best[key])
+
+
+def test_patience_evaluator_async() -> None:
+    model = nn.Linear(4, 4)
+    evaluator = PatienceEvaluator(
+        _metric(), torch.randn(50, 4), patience=2, asynchronous=True
+    )
+    evaluated = _scripted(evaluator, [0.9, 0.5, 0.7, 0.5])
+
+    exhausted = []
+    for step in range(4):
+        with torch.no_grad():
+            model.weight.fill_(step)
+        exhausted.append(evaluator.step(model, _generate))
+        # the training goes on while the copy is evaluated
+        with torch.no_grad():
+            model.weight.fill_(-1)
+
+    # the scores are accounted for one step later
+    assert exhausted == [False, False, False, False]
+
+    best_state = evaluator.finish()
+    assert evaluator.wait == 2
+    assert evaluated == [step * model.weight.numel() for step in range(4)]
+    assert best_state is not None
+    assert torch.all(best_state["weight"] == 1)
+    assert evaluator._executor is None
+
+
+def test_patience_evaluator_direction() -> None:
+    metric = WeightedMetrics(
+        metrics=[("performance", "linear_model")], weights=[1], task_type="regression"
+    )
+    evaluator = PatienceEvaluator(metric, torch.randn(50, 4), patience=1)
+    _scripted(evaluator, [0.1, 0.5, 0.2])
+
+    model = nn.Linear(4, 4)
+    assert [evaluator.step(model, _generate) for _ in range(3)] == [
+        False,
+        False,
+        True,
+    ]
+    assert evaluator.score == 0.5
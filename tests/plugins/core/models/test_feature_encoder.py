@@ -0,0 +1,110 @@
+# stdlib
+import time
+
+# third party
+import numpy as np
+import pandas as pd
+import pytest
+
+# synthcity absolute
+from synthcity.plugins.core.models.feature_encoder import BayesianGMMEncoder
+
+
+def _multimodal_column(n: int, random_state: int = 0) -> pd.Series:
+    rng = np.random.default_rng(random_state)
+    modes = rng.choice([-10.0, 0.0, 25.0], size=n, p=[0.2, 0.5, 0.3])
+    return pd.Series(modes + rng.normal(size=n), name="feature")
+
+
+def _reconstruction_error(encoder: BayesianGMMEncoder, x: pd.Series) -> float:
+    recovered = encoder.inverse_transform(encoder.transform(x))
+    return float(np.abs(recovered.values - x.values).mean())
+
+
+def test_bayesian_gmm_sanity() -> None:
+    x = _multimodal_column(1000)
+    encoder = BayesianGMMEncoder(n_components=5).fit(x)
+
+    encoded = encoder.transform(x)
+
+    assert encoded.shape == (len(x), 6)
+    assert (encoded.values[:, 1:].sum(axis=1) == 1).all()
+    assert encoder.feature_types_out == ["continuous"] + ["discrete"] * 5
+    assert _reconstruction_error(encoder, x) < 0.1
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_bayesian_gmm_subsample(incremental: bool) -> None:
+    x = _multimodal_column(5000)
+    reference = BayesianGMMEncoder(n_components=5).fit(x)
+    encoder = BayesianGMMEncoder(
+        n_components=5, max_samples=500, incremental=incremental
+    ).fit(x)
+
+    # the min/max clipping bounds always come from the full column
+    assert encoder.min_value == x.min()
+    assert encoder.max_value == x.max()
+    assert (
+        _reconstruction_error(encoder, x)
+        < 2 * _reconstruction_error(reference, x) + 0.1
+    )
+
+
+def test_bayesian_gmm_fit_batches() -> None:
+    x = _multimodal_column(1050).values.reshape(-1, 1)
+
+    batches = BayesianGMMEncoder(max_samples=100)._fit_batches(x)
+    assert len(batches) == 1
+    assert len(batches[0]) <= 100
+    # stratified: the subsample spans the whole range of the column
+    assert x[batches[0]].min() < np.quantile(x, 0.02)
+    assert x[batches[0]].max() > np.quantile(x, 0.98)
+
+    batches = BayesianGMMEncoder(max_samples=100, incremental=True)._fit_batches(x)
+    assert len(batches) == 11
+    assert sorted(np.concatenate(batches)) == list(range(len(x)))
+
+
+def test_bayesian_gmm_batch_size() -> None:
+    x = _multimodal_column(1000)
+    encoder = BayesianGMMEncoder(n_components=5).fit(x)
+    batched = BayesianGMMEncoder(n_components=5, batch_size=128).fit(x)
+
+    assert (encoder.transform(x).values == batched.transform(x).values).all()
+
+
+def test_bayesian_gmm_invalid() -> None:
+    with pytest.raises(ValueError):
+        BayesianGMMEncoder(n_components=10, max_samples=5)
+    with pytest.raises(ValueError):
+        BayesianGMMEncoder(batch_size=0)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"max_samples": 20000},
+        {"max_samples": 20000, "incremental": True},
+    ],
+    ids=["full", "subsample", "incremental"],
+)
+def test_bayesian_gmm_benchmark(benchmark: object, params: dict) -> None:
+    """Encoding fidelity and wall time of the subsampled fits, against the full fit.
+
+    Run with `pytest -m slow tests/plugins/core/models/test_feature_encoder.py --benchmark-only`.
+    """
+    x = _multimodal_column(500000)
+
+    def _fit() -> BayesianGMMEncoder:
+        return BayesianGMMEncoder(n_components=10, batch_size=100000, **params).fit(x)
+
+    start = time.perf_counter()
+    encoder = benchmark.pedantic(_fit, rounds=1, iterations=1)  # type: ignore
+    benchmark.extra_info["fit_time"] = time.perf_counter() - start  # type: ignore
+
+    error = _reconstruction_error(encoder, x)
+    benchmark.extra_info["reconstruction_error"] = error  # type: ignore
+
+    assert error < 0.5
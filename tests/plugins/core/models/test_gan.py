@@ -181,3 +181,30 @@ def test_gan_generation_with_early_stopping(patience_metric: Tuple[str, str]) ->
     assert generated.shape == (10, X.shape[1])
 
     assert actual_iter < 1000
+
+
+def test_gan_generation_with_async_early_stopping() -> None:
+    X, _ = load_iris(return_X_y=True)
+    X = MinMaxScaler().fit_transform(X)
+
+    model = GAN(
+        n_features=X.shape[1],
+        n_units_latent=50,
+        generator_n_iter=1000,
+        n_iter_print=20,
+        n_iter_min=20,
+        patience=2,
+        batch_size=len(X),
+        patience_metric=WeightedMetrics(
+            metrics=[("detection", "detection_linear")],
+            weights=[1],
+            task_type="regression",
+        ),
+        patience_max_samples=20,
+        patience_async=True,
+    )
+    model.fit(X)
+
+    generated = model.generate(10)
+
+    assert generated.shape == (10, X.shape[1])
@@ -3,6 +3,7 @@ from typing import Any
 
 # third party
 import numpy as np
+import pandas as pd
 import pytest
 from sklearn.datasets import load_diabetes, load_iris
 
@@ -100,6 +101,51 @@ def test_encoder_inverse_transform(max_clusters: int) -> None:
     assert np.abs(X - recovered).sum().sum() < 5
 
 
+def test_encoder_parallel_fit() -> None:
+    X, y = load_iris(return_X_y=True, as_frame=True)
+    X["target"] = y
+
+    serial = TabularEncoder(max_clusters=5).fit(X)
+    parallel = TabularEncoder(max_clusters=5, n_jobs=2).fit(X)
+
+    assert [info.name for info in serial.layout()] == [
+        info.name for info in parallel.layout()
+    ]
+    assert serial.output_dimensions == parallel.output_dimensions
+    assert (serial.transform(X).values == parallel.transform(X).values).all()
+
+
+def test_encoder_transform_numpy() -> None:
+    X, y = load_iris(return_X_y=True, as_frame=True)
+    X["target"] = y
+    net = TabularEncoder(max_clusters=5).fit(X)
+
+    encoded = net.transform(X)
+    encoded_np = net.transform_numpy(X)
+
+    assert encoded_np.dtype == np.float32
+    assert encoded_np.shape == encoded.shape
+    assert np.allclose(encoded_np, encoded.values.astype(np.float32))
+
+    # the array methods of the column encoders match their DataFrame counterparts
+    for info in net.layout():
+        values = X[info.name].values
+        encoder = info.transform
+        encoded_col = encoder.transform_array(values)
+        assert np.allclose(encoded_col, encoder.transform(X[info.name]).values)
+        assert np.allclose(
+            encoder.inverse_transform_array(encoded_col),
+            encoder.inverse_transform(pd.DataFrame(encoded_col)).values,
+        )
+
+    recovered = net.inverse_transform(pd.DataFrame(encoded_np))
+    reference = net.inverse_transform(encoded)
+
+    assert (recovered.columns == X.columns).all()
+    assert (recovered.dtypes == reference.dtypes).all()
+    assert np.abs(recovered - reference).sum().sum() < 1e-3
+
+
 def check_equal_layouts(
     layout: list, act_layout: list, disc_act: str, cont_act: str
 ) -> None:
@@ -260,6 +306,41 @@ def test_ts_encoder_inverse_transform(source: Any) -> None:
         assert np.abs(temporal_decoded - temporal[idx]).sum().sum() < 5
 
 
+def test_ts_encoder_batch_transform() -> None:
+    _, temporal, observation_times, _ = SineDataloader(no=20).load()
+    for idx, item in enumerate(temporal):
+        item["cat"] = np.arange(len(item)) % 3
+        item.index = item.index + 100 * idx
+
+    net = TimeSeriesTabularEncoder(max_clusters=5).fit_temporal(
+        temporal, observation_times
+    )
+
+    # the batch path matches the encoding of each item
+    temporal_encoded, _ = net.transform_temporal(temporal, observation_times)
+    assert len(temporal_encoded) == len(temporal)
+    for item, encoded in zip(temporal, temporal_encoded):
+        pd.testing.assert_frame_equal(
+            encoded, net.temporal_encoder.transform(item), check_exact=True
+        )
+
+    temporal_decoded, _ = net.inverse_transform_temporal(
+        temporal_encoded, observation_times
+    )
+    for encoded, decoded in zip(temporal_encoded, temporal_decoded):
+        pd.testing.assert_frame_equal(
+            decoded, net.temporal_encoder.inverse_transform(encoded), check_exact=True
+        )
+
+    # items with different dtypes are encoded one at a time
+    temporal[0] = temporal[0].astype(float)
+    temporal_encoded, _ = net.transform_temporal(temporal, observation_times)
+    for item, encoded in zip(temporal, temporal_encoded):
+        pd.testing.assert_frame_equal(
+            encoded, net.temporal_encoder.transform(item), check_exact=True
+        )
+
+
 @pytest.mark.parametrize("source", [SineDataloader, GoogleStocksDataloader])
 def test_ts_encoder_activation_layout(source: Any) -> None:
     max_clusters = 5
@@ -1,4 +1,5 @@
 # stdlib
+import pickle
 import sys
 from datetime import datetime
 from typing import Any
@@ -18,6 +19,7 @@ from synthcity.plugins.core.dataloader import (
     ImageDataLoader,
     SurvivalAnalysisDataLoader,
     Syn_SeqDataLoader,
+    TemporalArrays,
     TimeSeriesDataLoader,
     TimeSeriesSurvivalDataLoader,
     create_from_info,
@@ -148,6 +150,32 @@ def test_generic_dataloader_compression() -> None:
     assert decompressed.shape[1] == loader.shape[1]
 
 
+def test_generic_dataloader_hash() -> None:
+    X, y = load_breast_cancer(return_X_y=True, as_frame=True)
+    X["target"] = y
+
+    loader = GenericDataLoader(X.copy(), target_column="target")
+    reference = loader.hash()
+
+    assert loader.hash() is reference
+    assert GenericDataLoader(X.copy(), target_column="target").hash() == reference
+    assert pickle.loads(pickle.dumps(loader)).hash() == reference
+
+    loader["target"] = 1 - y
+    updated = loader.hash()
+    assert updated != reference
+
+    loader.data = X
+    assert loader.hash() == reference
+
+    X_nan = X.copy()
+    X_nan.iloc[0, 0] = np.nan
+    loader = GenericDataLoader(X_nan, target_column="target")
+    nan_hash = loader.hash()
+    loader.fillna(1)
+    assert loader.hash() != nan_hash
+
+
 def test_survival_dataloader_sanity() -> None:
     df = load_rossi()
 
@@ -426,6 +454,148 @@ def test_time_series_pack_unpack(source: Any, repack: bool) -> None:
         assert (unp_temporal[idx].values == item[cols].values).all()
 
 
+def _random_time_series(
+    n_subjects: int = 20, missing: bool = False, seed: int = 0
+) -> tuple:
+    rng = np.random.RandomState(seed)
+    static_data = pd.DataFrame(rng.randn(n_subjects, 2), columns=["s0", "s1"])
+    outcome = pd.DataFrame(rng.randint(2, size=(n_subjects, 1)), columns=["y"])
+
+    temporal_data = []
+    observation_times = []
+    for _ in range(n_subjects):
+        seq_len = rng.randint(1, 8)
+        item = pd.DataFrame(rng.randn(seq_len, 3), columns=["a", "b", "c"])
+        if missing:
+            # the first observation of each subject is complete
+            item[
+                (rng.rand(seq_len, 3) < 0.2) & (np.arange(seq_len) > 0)[:, None]
+            ] = np.nan
+        temporal_data.append(item)
+        observation_times.append(np.sort(rng.rand(seq_len)).tolist())
+
+    return static_data, temporal_data, observation_times, outcome
+
+
+def test_temporal_arrays() -> None:
+    _, temporal_data, observation_times, _ = _random_time_series(missing=True)
+
+    arrays = TemporalArrays.from_frames(temporal_data, observation_times)
+    assert len(arrays) == len(temporal_data)
+    assert arrays.features == ["a", "b", "c"]
+    assert arrays.window_len == max(len(item) for item in temporal_data)
+
+    for item, frame in zip(temporal_data, arrays.frames()):
+        pd.testing.assert_frame_equal(item, frame)
+    assert arrays.observation_times() == observation_times
+
+    subjects = np.array([3, 0, 3])
+    taken = arrays.take(subjects)
+    for idx, frame in zip(subjects, taken.frames()):
+        pd.testing.assert_frame_equal(temporal_data[idx], frame)
+
+    padded = arrays.pad()
+    tensor, observed = padded.tensor()
+    assert observed.all()
+    assert tensor.shape == (len(temporal_data), arrays.window_len, 3)
+    assert np.shares_memory(tensor, padded.values)
+    for item, frame, times in zip(
+        temporal_data, padded.frames(), padded.observation_times()
+    ):
+        assert len(frame) == len(times) == arrays.window_len
+        assert list(frame.index) == list(range(arrays.window_len))
+        assert np.array_equal(frame.values[: len(item)], item.values, equal_nan=True)
+        assert np.isnan(frame.values[len(item) :]).all()
+
+    masked = arrays.mask()
+    assert masked.features == ["a", "b", "c", "masked_a", "masked_b", "masked_c"]
+    assert not np.isnan(masked.values).any()
+    assert np.array_equal(masked.values[:, 3:], ~np.isnan(arrays.values))
+    assert masked.mask() is masked
+
+    with pytest.raises(ValueError):
+        TemporalArrays.from_frames(temporal_data, observation_times[:-1])
+
+
+def test_time_series_mixed_types() -> None:
+    rng = np.random.RandomState(0)
+    temporal_data = [
+        pd.DataFrame(
+            {
+                "f": rng.randn(seq_len),
+                "i": rng.randint(0, 5, seq_len),
+                "s": rng.choice(["x", "y"], seq_len),
+            }
+        )
+        for seq_len in [3, 4, 5, 3]
+    ]
+    observation_times = [list(range(len(item))) for item in temporal_data]
+    dtypes = temporal_data[0].dtypes
+
+    arrays = TemporalArrays.from_frames(temporal_data, observation_times)
+    for item, frame in zip(temporal_data, arrays.frames()):
+        pd.testing.assert_frame_equal(item, frame)
+    for frame in arrays.take(np.array([2, 0])).frames():
+        pd.testing.assert_series_equal(frame.dtypes, dtypes)
+
+    loader = TimeSeriesDataLoader(
+        temporal_data=temporal_data,
+        observation_times=observation_times,
+        static_data=pd.DataFrame({"a": rng.randn(4)}),
+        outcome=pd.DataFrame({"y": [0, 1, 0, 1]}),
+    )
+    _, unp_temporal, _, _ = loader.unpack()
+    for frame in unp_temporal:
+        pd.testing.assert_series_equal(frame.dtypes, dtypes)
+
+    # the padded integers are floats, as pandas fills them with NaNs
+    _, padded, _, _ = TimeSeriesDataLoader.pad_and_mask(
+        None, temporal_data, observation_times, None
+    )
+    for frame in padded:
+        assert frame.dtypes.to_dict() == {
+            "f": np.float64,
+            "i": np.float64,
+            "s": object,
+            "masked_f": int,
+            "masked_i": int,
+            "masked_s": int,
+        }
+
+
+@pytest.mark.parametrize("missing", [True, False])
+def test_time_series_sequential_view(missing: bool) -> None:
+    static_data, temporal_data, observation_times, outcome = _random_time_series(
+        missing=missing
+    )
+
+    loader = TimeSeriesDataLoader(
+        temporal_data=temporal_data,
+        observation_times=observation_times,
+        static_data=static_data,
+        outcome=outcome,
+    )
+    # the observations with missing values are dropped by the loader
+    _, temporal_data, observation_times, _ = loader.unpack()
+    df = loader.dataframe()
+    assert list(df.groupby("seq_id").size()) == [len(item) for item in temporal_data]
+
+    (
+        unp_static_data,
+        unp_temporal,
+        unp_observation_times,
+        unp_out,
+    ) = TimeSeriesDataLoader.unpack_raw_data(df, loader.info())
+
+    assert np.allclose(unp_static_data.values, static_data.values)
+    assert (unp_out.values == outcome.values).all()
+    for idx, item in enumerate(temporal_data):
+        assert np.array_equal(
+            unp_temporal[idx][item.columns].values, item.values, equal_nan=True
+        )
+        assert len(unp_observation_times[idx]) == len(item)
+
+
 def test_time_series_survival_dataloader_sanity() -> None:
     static_data, temporal_data, observation_times, outcome = PBCDataloader().load()
     T, E = outcome
@@ -1,13 +1,23 @@
 # stdlib
+import hashlib
+from pathlib import Path
 from typing import Any, List
 
 # third party
+import pandas as pd
 import pytest
+from sklearn.datasets import load_iris
 
 # synthcity absolute
+import synthcity.plugins.core.dataloader as dataloader_module
+import synthcity.plugins.core.plugin as plugin_module
+from synthcity.plugins import Plugins
+from synthcity.plugins.core.constraints import Constraints
 from synthcity.plugins.core.dataloader import DataLoader, GenericDataLoader
 from synthcity.plugins.core.distribution import Distribution
 from synthcity.plugins.core.plugin import Plugin
+from synthcity.utils.artifacts import ArtifactStore
+from synthcity.utils.compression import CompressionCache
 
 
 class AbstractMockPlugin(Plugin):
@@ -51,3 +61,118 @@ def test_mock_plugin_ok() -> None:
     reloaded = Plugin.load(buff)
 
     assert reloaded.name() == plugin.name()
+
+
+@pytest.mark.parametrize("chunk_size", [7, 50, 1000])
+def test_generate_iter(chunk_size: int) -> None:
+    X, y = load_iris(return_X_y=True, as_frame=True)
+    X["target"] = y
+
+    plugin = Plugins().get("marginal_distributions")
+    plugin.fit(GenericDataLoader(X))
+
+    constraints = Constraints(rules=[("target", "==", 1)])
+    chunks = list(
+        plugin.generate_iter(count=100, chunk_size=chunk_size, constraints=constraints)
+    )
+
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) <= 100
+    for chunk in chunks:
+        assert list(chunk.columns) == list(X.columns)
+        assert (chunk["target"] == 1).all()
+
+    with pytest.raises(ValueError):
+        next(plugin.generate_iter(count=10, chunk_size=0))
+
+
+@pytest.mark.parametrize("format", ["parquet", "csv"])
+def test_generate_to(tmp_path: Path, format: str) -> None:
+    if format == "parquet" and plugin_module.pa is None:
+        pytest.skip("pyarrow is not available")
+
+    X, y = load_iris(return_X_y=True, as_frame=True)
+    X["target"] = y
+
+    plugin = Plugins().get("uniform_sampler")
+    plugin.fit(GenericDataLoader(X))
+
+    path = tmp_path / f"synthetic.{format}"
+    rows = plugin.generate_to(path, count=95, chunk_size=20, format=format)
+
+    out = pd.read_parquet(path) if format == "parquet" else pd.read_csv(path)
+    assert rows == len(out) == 95
+    assert list(out.columns) == list(X.columns)
+
+    with pytest.raises(ValueError):
+        plugin.generate_to(path, count=10, format="json")
+
+
+def test_compression_cache_workspace(tmp_path: Path) -> None:
+    X, y = load_iris(return_X_y=True, as_frame=True)
+    X["target"] = y
+
+    def _fit(df: pd.DataFrame) -> Plugin:
+        plugin = Plugins().get(
+            "uniform_sampler", compress_dataset=True, workspace=tmp_path
+        )
+        return plugin.fit(GenericDataLoader(df))
+
+    _fit(X)
+    store = ArtifactStore(tmp_path)
+    key = store.key("compression_cache", kind="compression")
+    cache = store.get(key)
+    assert isinstance(cache, CompressionCache)
+    assert len(cache) > 0
+
+    # an unreadable cache is replaced by an empty one
+    data = b"corrupted"
+    store.backend.write(key, data)
+    store.index.add(
+        key,
+        kind="compression",
+        schema=store.schema,
+        digest=hashlib.sha256(data).hexdigest(),
+        size=len(data),
+    )
+    assert len(Plugin._load_compression_cache(store, key)) == 0
+
+    _fit(X.assign(noise=range(len(X))))
+    assert isinstance(store.get(key), CompressionCache)
+
+
+def test_compression_options(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    X, y = load_iris(return_X_y=True, as_frame=True)
+    X["target"] = y
+
+    calls: List[dict] = []
+    compress = dataloader_module.compress_dataset
+
+    def _compress(df: pd.DataFrame, **kwargs: Any) -> Any:
+        calls.append(kwargs)
+        return compress(df, **kwargs)
+
+    monkeypatch.setattr(dataloader_module, "compress_dataset", _compress)
+
+    plugin = Plugins().get(
+        "uniform_sampler",
+        compress_dataset=True,
+        compress_n_jobs=2,
+        compress_screen_threshold=0.3,
+        workspace=tmp_path,
+    )
+    assert plugin.compress_n_jobs == 2
+    assert plugin.compress_screen_threshold == 0.3
+
+    plugin.fit(GenericDataLoader(X))
+    assert len(calls) == 1
+    assert calls[0]["n_jobs"] == 2
+    assert calls[0]["screen_threshold"] == 0.3
+
+    # the screened compression is not reused without the screen
+    Plugins().get("uniform_sampler", compress_dataset=True, workspace=tmp_path).fit(
+        GenericDataLoader(X)
+    )
+    assert len(calls) == 2
+    assert calls[1]["n_jobs"] == 1
+    assert calls[1]["screen_threshold"] is None
@@ -188,3 +188,12 @@ def test_plugin_encoding() -> None:
 
     assert syn_df["date"].infer_objects().dtype.kind == "M"
     assert syn_df["bool"].infer_objects().dtype.kind == "b"
+
+
+def test_plugin_encoder_n_jobs() -> None:
+    X, _ = load_iris(as_frame=True, return_X_y=True)
+    test_plugin = plugin(encoder_n_jobs=2, **plugin_args)
+    test_plugin.fit(GenericDataLoader(X))
+
+    assert test_plugin.model.encoder.n_jobs == 2
+    assert len(test_plugin.generate(10)) == 10
@@ -6,6 +6,7 @@ from typing import Any, Generator
 import numpy as np
 import pandas as pd
 import pytest
+import torch
 from generic_helpers import generate_fixtures
 from sklearn.datasets import load_iris
 
@@ -15,6 +16,10 @@ from synthcity.metrics.weighted_metrics import WeightedMetrics
 from synthcity.plugins import Plugin
 from synthcity.plugins.core.constraints import Constraints
 from synthcity.plugins.core.dataloader import GenericDataLoader
+from synthcity.plugins.core.models.tabular_ddpm.gaussian_multinomial_diffsuion import (
+    GaussianMultinomialDiffusion,
+    get_sampling_timesteps,
+)
 from synthcity.plugins.generic.plugin_ddpm import plugin
 from synthcity.utils.callbacks import EarlyStopping
 
@@ -175,3 +180,57 @@ def test_eval_performance_ddpm(compress_dataset: bool) -> None:
 
     print(plugin.name(), results)
     assert np.mean(results) > 0.8
+
+
+def test_sampling_timesteps() -> None:
+    timesteps = get_sampling_timesteps(1000, 50)
+    assert len(timesteps) == 50
+    assert timesteps[0] == 999 and timesteps[-1] == 0
+    assert (np.diff(timesteps) < 0).all()
+
+    assert (get_sampling_timesteps(100) == np.arange(100)[::-1]).all()
+    assert len(get_sampling_timesteps(100, 500)) == 100
+
+    with pytest.raises(ValueError):
+        get_sampling_timesteps(100, 0)
+
+
+def test_sample_ddim_strided() -> None:
+    diffusion = GaussianMultinomialDiffusion(
+        num_numerical_features=3,
+        num_categorical_features=(2, 4),
+        model_type="mlp",
+        model_params={},
+        num_timesteps=100,
+    )
+    diffusion.eval()
+
+    # walking every timestep is the original DDIM sampler
+    torch.manual_seed(0)
+    reference = diffusion.sample_ddim(20)
+    torch.manual_seed(0)
+    full = diffusion.sample_ddim(20, timesteps=get_sampling_timesteps(100))
+    assert torch.equal(reference, full)
+
+    sample = diffusion.sample_all(50, num_sampling_steps=10, max_batch_size=None)
+    assert sample.shape == (50, 5)
+    assert not sample.isnan().any()
+    assert set(sample[:, 4].tolist()) <= {0.0, 1.0, 2.0, 3.0}
+
+    with pytest.raises(ValueError):
+        diffusion.sample_all(10, max_batch_size=0)
+
+
+@pytest.mark.parametrize(
+    "test_plugin", extend_fixtures(is_classification=[True, False])
+)
+def test_plugin_generate_strided(test_plugin: Plugin) -> None:
+    X = pd.DataFrame(load_iris()["data"])
+    test_plugin.fit(GenericDataLoader(X))
+
+    X_gen = test_plugin.generate(50, num_sampling_steps=10)
+    assert len(X_gen) == 50
+    assert test_plugin.schema_includes(X_gen)
+
+    X_gen = test_plugin.generate(50, num_sampling_steps=10, eta=1.0, max_batch_size=7)
+    assert len(X_gen) == 50
@@ -144,3 +144,12 @@ def test_plugin_conditional() -> None:
     assert test_plugin.schema_includes(X_gen)
 
     assert (X_gen["target"] == 1).sum() >= 0.8 * count
+
+
+def test_plugin_encoder_n_jobs() -> None:
+    X, _ = load_iris(as_frame=True, return_X_y=True)
+    test_plugin = plugin(data_encoder_n_jobs=2, **plugin_args)
+    test_plugin.fit(GenericDataLoader(X))
+
+    assert test_plugin.model.encoder.n_jobs == 2
+    assert len(test_plugin.generate(10)) == 10
@@ -1,12 +1,19 @@
 # third party
+import numpy as np
+import pandas as pd
 import pytest
 from fhelpers import generate_fixtures
 from sklearn.datasets import load_iris
+from sklearn.metrics import normalized_mutual_info_score
 
 # synthcity absolute
 from synthcity.plugins import Plugin
 from synthcity.plugins.core.dataloader import GenericDataLoader
-from synthcity.plugins.privacy.plugin_privbayes import plugin
+from synthcity.plugins.privacy.plugin_privbayes import (
+    IntegerCodes,
+    PrivBayes,
+    plugin,
+)
 
 plugin_name = "privbayes"
 
@@ -48,3 +55,83 @@ def test_plugin_generate_privbayes() -> None:
     assert len(X_gen) == 50
     assert test_plugin.schema_includes(X_gen)
     assert sorted(list(X_gen.columns)) == sorted(list(X.columns))
+
+
+def _coded_data(n: int = 2000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {col: rng.integers(0, k, size=n) for col, k in zip("abcde", [3, 40, 7, 2, 60])}
+    )
+    df["f"] = (df["a"] * 3 + df["c"]) % 5
+    return df
+
+
+@pytest.mark.parametrize(
+    "parents,candidate",
+    [(["a"], "f"), (["a", "c"], "f"), (["b", "e"], "d"), (["b", "c", "e"], "a")],
+)
+def test_integer_codes_mutual_info(parents: list, candidate: str) -> None:
+    df = _coded_data()
+    codes = IntegerCodes(df)
+
+    joint = df[parents].astype(str).agg("-".join, axis=1)
+    expected = normalized_mutual_info_score(joint, df[candidate])
+
+    assert np.isclose(codes.normalized_mutual_info(parents, candidate), expected)
+    assert codes.joint(parents)[1] <= len(df)
+    assert codes.counts(parents).sum() == len(df)
+
+
+def test_privbayes_parallel_greedy_bayes() -> None:
+    df = _coded_data()
+
+    networks = []
+    for n_jobs in [1, 2]:
+        np.random.seed(0)
+        model = PrivBayes(K=2, mi_estimator="contingency", n_jobs=n_jobs)
+        networks.append(model._greedy_bayes(df.copy()))
+
+    assert networks[0] == networks[1]
+    assert sorted(edge.feature for edge in networks[0]) == sorted(df.columns)
+
+    with pytest.raises(ValueError):
+        PrivBayes(mi_estimator="invalid")
+
+
+def test_plugin_generate_privbayes_contingency() -> None:
+    assert plugin().mi_estimator == "kmeans"
+
+    X, _ = load_iris(as_frame=True, return_X_y=True)
+    test_plugin = plugin(K=2, mi_estimator="contingency")
+    test_plugin.fit(GenericDataLoader(X))
+
+    assert len(test_plugin.generate(50)) == 50
+
+
+def test_privbayes_sample_matches_cpds() -> None:
+    df = _coded_data(5000)[["a", "c", "d", "f"]]
+    np.random.seed(0)
+    model = PrivBayes(K=2, epsilon=10).fit(df)
+
+    np.random.seed(1)
+    samples = model.sample(20000)
+    assert len(samples) == 20000
+    assert sorted(samples.columns) == sorted(df.columns)
+
+    # the empirical conditionals of the samples follow the CPDs of the network
+    for node in model.ordered_nodes:
+        cpd = model.network.get_cpds(node)
+        parents = cpd.variables[1:]
+        values = cpd.get_values()
+        if len(parents) == 0:
+            freq = samples[node].value_counts(normalize=True).sort_index()
+            assert np.allclose(freq.values, values[freq.index, 0], atol=0.02)
+            continue
+
+        parent_idx = np.ravel_multi_index(
+            [samples[parent].values for parent in parents], cpd.cardinality[1:]
+        )
+        top = np.bincount(parent_idx).argmax()
+        rows = samples[node].values[parent_idx == top]
+        freq = np.bincount(rows, minlength=len(values)) / len(rows)
+        assert np.allclose(freq, values[:, top], atol=0.05)
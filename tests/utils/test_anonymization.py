@@ -1,4 +1,6 @@
 # third party
+import numpy as np
+import pandas as pd
 import pytest
 from sklearn.datasets import load_breast_cancer, load_diabetes
 
@@ -60,6 +62,49 @@ def test_k_anonymity_partition() -> None:
     assert less_parts < more_parts
 
 
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_k_anonymity_partition_cover(n_jobs: int) -> None:
+    X, y = load_diabetes(return_X_y=True, as_frame=True)
+    X["target"] = y
+    X.index = X.index * 2 + 1
+    features = [col for col in X.columns if col != "target"]
+
+    evaluator = DatasetAnonymization(k_threshold=5, n_jobs=n_jobs)
+    partitions = evaluator._partition_dataset(X, features, "target")
+
+    reference = DatasetAnonymization(k_threshold=5)._partition_dataset(
+        X, features, "target"
+    )
+    assert len(partitions) == len(reference)
+    for partition, ref in zip(partitions, reference):
+        assert partition.equals(ref)
+
+    # the partitions are disjoint, cover the dataset and are all anonymous
+    covered = np.concatenate([np.asarray(partition) for partition in partitions])
+    assert sorted(covered) == sorted(X.index)
+    for partition in partitions:
+        assert evaluator._is_partition_anonymous(X, partition, "target") is True
+
+
+def test_k_anonymity_anonymize_column_rows() -> None:
+    X = pd.DataFrame(
+        {
+            "age": [20, 21, 22, 23, 60, 61, 62, 63],
+            "zip": [1, 1, 2, 2, 3, 3, 4, 4],
+            "disease": ["b", "a", "b", "a", "c", "a", "c", "a"],
+        }
+    )
+
+    evaluator = DatasetAnonymization(k_threshold=4, categorical_limit=2)
+    anon_df = evaluator.anonymize_column(X.copy(), sensitive_column="disease")
+
+    # one row per record, with the means of its partition, sorted by sensitive value
+    assert list(anon_df.columns) == list(X.columns)
+    assert anon_df["age"].tolist() == [21.5] * 4 + [61.5] * 4
+    assert anon_df["zip"].tolist() == [1.5] * 4 + [3.5] * 4
+    assert anon_df["disease"].tolist() == ["a", "a", "b", "b", "a", "a", "c", "c"]
+
+
 def test_k_anonymity_validation() -> None:
     X, y = load_breast_cancer(return_X_y=True, as_frame=True)
 
@@ -0,0 +1,134 @@
+# stdlib
+import os
+import time
+from pathlib import Path
+
+# third party
+import pandas as pd
+import pytest
+
+# synthcity absolute
+from synthcity.utils.artifacts import (
+    MISSING,
+    STALE_TMP_AGE,
+    ArtifactStore,
+    LocalArtifactBackend,
+    artifact_key,
+    main,
+)
+
+
+@pytest.fixture
+def backend(tmp_path: Path) -> LocalArtifactBackend:
+    return LocalArtifactBackend(tmp_path / "workspace" / "artifacts")
+
+
+@pytest.fixture
+def store(tmp_path: Path, backend: LocalArtifactBackend) -> ArtifactStore:
+    return ArtifactStore(tmp_path / "workspace", backend=backend)
+
+
+def test_artifacts_put_get(store: ArtifactStore) -> None:
+    key = store.key("experiment", 1, kind="synthetic")
+
+    assert key == store.key("experiment", 1, kind="synthetic")
+    assert key != store.key("experiment", 2, kind="synthetic")
+    assert key != store.key("experiment", 1, kind="generator")
+    assert key != ArtifactStore(store.workspace, schema="other").key(
+        "experiment", 1, kind="synthetic"
+    )
+
+    assert not store.exists(key)
+    assert store.get(key) is None
+    assert store.get(key, default=3) == 3
+    assert store.get(key, MISSING) is MISSING
+    assert key == artifact_key("experiment", 1, kind="synthetic")
+
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    store.put(key, df, kind="synthetic")
+
+    assert store.exists(key)
+    assert store.get(key).equals(df)
+
+    listing = store.ls()
+    assert list(listing["key"]) == [key]
+    assert list(listing["kind"]) == ["synthetic"]
+    assert store.size() == listing["size"].sum()
+
+    store.remove(key)
+    assert not store.exists(key)
+
+
+def test_artifacts_corrupted(store: ArtifactStore) -> None:
+    key = store.key("corrupted")
+    store.put(key, list(range(100)))
+
+    store.backend.write(key, b"partial")
+
+    assert store.get(key) is None
+    assert not store.exists(key)
+
+
+def test_artifacts_lru_eviction(store: ArtifactStore) -> None:
+    keys = [store.key(idx) for idx in range(4)]
+    for key in keys:
+        store.put(key, os.urandom(1000))
+        time.sleep(0.01)
+
+    # the first artifact becomes the most recently used
+    store.get(keys[0])
+
+    blob_size = int(store.ls()["size"].max())
+    removed = store.gc(max_size=2 * blob_size)
+
+    assert removed == keys[1:3]
+    assert store.exists(keys[0])
+    assert store.exists(keys[3])
+
+
+def test_artifacts_max_size(tmp_path: Path, backend: LocalArtifactBackend) -> None:
+    store = ArtifactStore(tmp_path / "workspace", max_size=3000, backend=backend)
+    for idx in range(10):
+        store.put(store.key(idx), os.urandom(1000))
+
+    assert store.size() <= 3000
+    assert store.exists(store.key(9))
+
+    # the eviction on put only reads the index, the orphan blobs are left to gc
+    orphan = store.key("orphan")
+    backend.write(orphan, b"orphan")
+    old = time.time() - 2 * STALE_TMP_AGE
+    os.utime(backend._path(orphan), (old, old))
+
+    store.put(store.key(10), os.urandom(1000))
+    assert store.size() <= 3000
+    assert backend.exists(orphan)
+    assert orphan in store.gc()
+
+
+def test_artifacts_gc_orphans(
+    store: ArtifactStore, backend: LocalArtifactBackend
+) -> None:
+    key = store.key("orphan")
+    backend.write(key, b"orphan")
+
+    # recent unindexed blobs might belong to a concurrent writer
+    assert store.gc() == []
+
+    old = time.time() - 2 * STALE_TMP_AGE
+    path = backend._path(key)
+    os.utime(path, (old, old))
+
+    assert store.gc() == [key]
+    assert not path.exists()
+
+
+def test_artifacts_cli(store: ArtifactStore, capsys: pytest.CaptureFixture) -> None:
+    store.put(store.key("cli"), [1, 2, 3], kind="test")
+
+    main(["--workspace", str(store.workspace), "ls"])
+    assert store.key("cli") in capsys.readouterr().out
+
+    main(["--workspace", str(store.workspace), "gc", "--max-size", "0"])
+    assert "Removed 1 artifacts" in capsys.readouterr().out
+    assert len(store.ls()) == 0
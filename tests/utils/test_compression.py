@@ -1,13 +1,22 @@
 # stdlib
+import pickle
 import urllib.error
+from typing import Any
 
 # third party
+import numpy as np
 import pandas as pd
+import pytest
 from sklearn.datasets import load_diabetes
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
 
 # synthcity absolute
-from synthcity.utils.compression import compress_dataset, decompress_dataset
+from synthcity.utils import compression
+from synthcity.utils.compression import (
+    CompressionCache,
+    compress_dataset,
+    decompress_dataset,
+)
 
 
 @retry(
@@ -82,6 +91,69 @@ def test_decompression_sanity() -> None:
     assert decompressed_df["sex"].dtype == "object"
 
 
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_compression_parallel(n_jobs: int) -> None:
+    df = load_diabetes(as_frame=True, return_X_y=True)[0]
+    df["sex"] = df["sex"].astype(str)
+    df["sex_dup"] = df["sex"]
+    df["bmi_dup"] = 2 * df["bmi"] + 1
+
+    ref_df, ref_context = compress_dataset(df)
+    compressed_df, context = compress_dataset(df, n_jobs=n_jobs)
+
+    assert list(compressed_df.columns) == list(ref_df.columns)
+    assert list(context["compressers"]) == list(ref_context["compressers"])
+    for col in context["compressers"]:
+        assert (
+            context["compressers"][col]["cols"]
+            == ref_context["compressers"][col]["cols"]
+        )
+
+
+def test_compression_screen() -> None:
+    df = load_diabetes(as_frame=True, return_X_y=True)[0]
+    df["bmi_dup"] = 2 * df["bmi"] + 1
+
+    ref_df, _ = compress_dataset(df)
+    compressed_df, context = compress_dataset(df, screen_threshold=0.9)
+
+    assert list(compressed_df.columns) == list(ref_df.columns)
+    assert "bmi" in context["compressers"]
+
+
+def test_compression_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    df = load_diabetes(as_frame=True, return_X_y=True)[0]
+    df["sex"] = df["sex"].astype(str)
+    df["sex_dup"] = df["sex"]
+
+    cache = CompressionCache()
+    ref_df, _ = compress_dataset(df, cache=cache)
+    assert len(cache) == df.shape[1]
+
+    calls = []
+    score = compression._redundancy_score
+
+    def _counted(*args: Any, **kwargs: Any) -> Any:
+        calls.append(1)
+        return score(*args, **kwargs)
+
+    monkeypatch.setattr(compression, "_redundancy_score", _counted)
+
+    # everything is cached
+    cache = pickle.loads(pickle.dumps(cache))
+    compressed_df, _ = compress_dataset(df, cache=cache)
+    assert list(compressed_df.columns) == list(ref_df.columns)
+    assert len(calls) == 0
+
+    # a new column changes the covariates of every column
+    df["noise"] = np.random.RandomState(0).randn(len(df))
+    compress_dataset(df, cache=cache)
+    assert len(calls) == df.shape[1]
+
+    with pytest.raises(ValueError):
+        CompressionCache(max_entries=0)
+
+
 def test_compression_sanity2() -> None:
     df = load_diabetes(as_frame=True, return_X_y=True)[0]
     compressed_df_orig, _ = compress_dataset(df)
@@ -0,0 +1,55 @@
+# stdlib
+import multiprocessing
+from typing import Any
+
+# third party
+import pytest
+import torch
+
+# synthcity absolute
+from synthcity.utils.parallel import (
+    init_worker,
+    process_pool,
+    resolve_n_jobs,
+    worker_state,
+)
+
+
+def _state_job(key: str) -> Any:
+    return worker_state(key)
+
+
+def _threads_job() -> int:
+    return torch.get_num_threads()
+
+
+def test_resolve_n_jobs() -> None:
+    assert resolve_n_jobs(1) == 1
+    assert resolve_n_jobs(3) == 3
+    assert resolve_n_jobs(-1) == multiprocessing.cpu_count()
+    assert resolve_n_jobs(0) == multiprocessing.cpu_count()
+
+
+def test_worker_state() -> None:
+    with process_pool(2, state={"data": [1, 2, 3]}) as executor:
+        assert list(executor.map(_state_job, ["data"] * 4)) == [[1, 2, 3]] * 4
+
+        with pytest.raises(RuntimeError):
+            executor.submit(_state_job, "missing").result()
+
+    with process_pool(1, n_threads=1) as executor:
+        assert executor.submit(_threads_job).result() == 1
+
+
+def test_init_worker() -> None:
+    init_worker({"data": 1})
+    assert worker_state("data") == 1
+
+    # the state is replaced, not merged
+    init_worker({"other": 2})
+    with pytest.raises(RuntimeError):
+        worker_state("data")
+
+    init_worker()
+    with pytest.raises(RuntimeError):
+        worker_state("other")
@@ -0,0 +1,198 @@
+# stdlib
+import pickle
+
+# third party
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+
+# synthcity absolute
+from synthcity.plugins.core.models.tabular_encoder import TabularEncoder
+from synthcity.utils.samplers import (
+    BatchIterator,
+    ConditionalDatasetSampler,
+    ImbalancedDatasetSampler,
+)
+
+
+def _encoded_data(n: int = 1000) -> tuple:
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame(
+        {
+            "a": rng.choice(["a", "b", "c", "d"], n),
+            "b": rng.randint(0, 3, n),
+            "c": rng.randn(n),
+            "d": rng.choice(["x", "y", "z"], n, p=[0.8, 0.15, 0.05]),
+        }
+    )
+    encoder = TabularEncoder().fit(df)
+    data = encoder.transform(df)
+
+    discrete_dims: list = []
+    st = 0
+    for info in encoder.layout():
+        if info.feature_type == "discrete":
+            discrete_dims.extend(range(st, st + info.output_dimensions))
+        st += info.output_dimensions
+
+    return data, encoder.layout(), np.asarray(data)[:, discrete_dims]
+
+
+def test_conditional_sampler_index() -> None:
+    data, layout, discrete = _encoded_data()
+    sampler = ConditionalDatasetSampler(data, layout)
+
+    assert sampler.conditional_dimension() == discrete.shape[1]
+    for k in range(discrete.shape[1]):
+        start, end = sampler._category_row_offsets[k : k + 2]
+        assert np.array_equal(
+            sampler._category_rows[start:end], np.nonzero(discrete[:, k])[0]
+        )
+
+
+def test_conditional_sampler_sample() -> None:
+    data, layout, discrete = _encoded_data()
+    sampler = ConditionalDatasetSampler(data, layout)
+
+    cond, columns, values = sampler.sample_conditional(500, with_ids=True)
+    category = sampler._categorical_feat_offset[columns] + values
+
+    assert cond.dtype == np.float32
+    assert np.all(cond.sum(axis=1) == 1)
+    assert np.all(cond[np.arange(500), category] == 1)
+
+    # the sampled rows have the sampled categories
+    rows = sampler.sample_conditional_indices(columns, values)
+    assert np.all(discrete[rows, category] == 1)
+
+    # the training rows are sampled from the training split
+    train_idx, test_idx = sampler.train_test()
+    assert len(set(train_idx) & set(test_idx)) == 0
+    assert sorted(sampler) == sorted(sampler._train_positions.tolist())
+
+    with pytest.raises(ValueError):
+        sampler.sample_conditional_indices(columns, values[:-1])
+
+
+def test_conditional_sampler_buffer() -> None:
+    data, layout, _ = _encoded_data()
+    sampler = ConditionalDatasetSampler(data, layout)
+    offsets = sampler._categorical_feat_offset
+
+    for batch in [100, 10, 300, 50]:
+        cond, columns, values = sampler.sample_conditional(
+            batch, with_ids=True, reuse_buffer=True
+        )
+        assert cond.shape == (batch, sampler.conditional_dimension())
+        assert np.all(cond.sum(axis=1) == 1)
+        assert np.all(cond[np.arange(batch), offsets[columns] + values] == 1)
+
+    first = sampler.sample_conditional(20, reuse_buffer=True)
+    second = sampler.sample_conditional(20, p=sampler.conditional_probs())
+    assert first is not second
+    assert np.all(first.sum(axis=1) == 1)
+
+    restored = pickle.loads(pickle.dumps(sampler))
+    assert restored._cond_buffer is None
+    assert np.all(restored.sample_conditional(30, reuse_buffer=True).sum(axis=1) == 1)
+
+
+def test_conditional_sampler_seed() -> None:
+    data, layout, _ = _encoded_data()
+
+    first = ConditionalDatasetSampler(data, layout, random_state=1)
+    second = ConditionalDatasetSampler(data, layout, random_state=1)
+    other = ConditionalDatasetSampler(data, layout, random_state=2)
+
+    assert np.array_equal(
+        first.get_dataset_conditionals(), second.get_dataset_conditionals()
+    )
+    assert np.array_equal(first.train_test()[0], second.train_test()[0])
+    assert list(first) == list(second)
+    assert not np.array_equal(first.train_test()[0], other.train_test()[0])
+
+
+@pytest.mark.parametrize("batch_size", [1, 64, 1000])
+def test_batch_iterator(batch_size: int) -> None:
+    X = torch.randn(500, 4)
+    y = torch.randint(0, 3, (500,))
+
+    iterator = BatchIterator(X, y, batch_size=batch_size, device="cpu")
+    reference = DataLoader(TensorDataset(X, y), batch_size=batch_size)
+
+    assert len(iterator) == len(reference)
+    for _ in range(2):
+        batches = list(iterator)
+        assert len(batches) == len(reference)
+        for (X_mb, y_mb), (X_ref, y_ref) in zip(batches, reference):
+            assert torch.equal(X_mb, X_ref)
+            assert torch.equal(y_mb, y_ref)
+
+    # in order, the batches are slices of the tensors, without copy
+    first = next(iter(iterator))[0]
+    assert first.data_ptr() == iterator.tensors[0].data_ptr()
+    assert len(iterator._buffers) == 0
+
+    shuffled = torch.cat(
+        [
+            X_mb
+            for X_mb, _ in BatchIterator(
+                X, y, batch_size=64, shuffle=True, device="cpu"
+            )
+        ]
+    )
+    assert not torch.equal(shuffled, X)
+    assert torch.equal(shuffled.sort(dim=0).values, X.sort(dim=0).values)
+
+    # the shuffled batches are gathered into buffers
+    shuffled_iterator = BatchIterator(X, y, batch_size=64, shuffle=True, device="cpu")
+    next(iter(shuffled_iterator))[0].zero_()
+    assert torch.equal(shuffled_iterator.tensors[0], X)
+
+    with pytest.raises(ValueError):
+        BatchIterator(X, y[:-1], batch_size=batch_size)
+
+
+def test_batch_iterator_sampler() -> None:
+    X = torch.arange(500).reshape(-1, 1)
+
+    indices = [3, 1, 4, 1, 5, 9, 2, 6]
+    batches = list(
+        BatchIterator(X, batch_size=3, sampler=indices, device="cpu")  # type: ignore
+    )
+    assert [batch[0].flatten().tolist() for batch in batches] == [
+        [3, 1, 4],
+        [1, 5, 9],
+        [2, 6],
+    ]
+
+    labels = list(np.random.RandomState(0).randint(0, 3, 500))
+    sampler = ImbalancedDatasetSampler(labels)
+    train_idx, _ = sampler.train_test()
+    X_train = X[train_idx]
+
+    iterator = BatchIterator(X_train, batch_size=32, sampler=sampler, device="cpu")
+    assert len(iterator) == len(
+        DataLoader(TensorDataset(X_train), batch_size=32, sampler=sampler)
+    )
+
+    rows = torch.cat([batch[0] for batch in iterator]).flatten()
+    assert len(rows) == len(sampler)
+    assert set(rows.tolist()) <= set(X_train.flatten().tolist())
+
+    data, layout, _ = _encoded_data()
+    sampler = ConditionalDatasetSampler(data, layout)
+    train_idx, _ = sampler.train_test()
+    X_train = torch.as_tensor(np.asarray(data))[train_idx]
+
+    rows = torch.cat(
+        [
+            batch[0]
+            for batch in BatchIterator(
+                X_train, batch_size=100, sampler=sampler, device="cpu"
+            )
+        ]
+    )
+    assert len(rows) == len(sampler)
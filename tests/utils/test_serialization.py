@@ -1,5 +1,10 @@
+# third party
+import numpy as np
+import pandas as pd
+import pytest
+
 # synthcity absolute
-from synthcity.utils.serialization import load, save
+from synthcity.utils.serialization import dataframe_hash, load, save
 
 
 def test_save_load() -> None:
@@ -12,3 +17,18 @@ def test_save_load() -> None:
     assert isinstance(reloaded, dict)
     assert reloaded["a"] == 1
     assert reloaded["b"] == "dssf"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100000])
+def test_dataframe_hash(chunk_size: int) -> None:
+    df = pd.DataFrame(np.random.randn(100, 3), columns=["c", "a", "b"])
+    df.iloc[::5, 1] = np.nan
+
+    reference = str(pd.util.hash_pandas_object(df[["a", "b", "c"]].fillna(0)).sum())
+
+    assert dataframe_hash(df, chunk_size=chunk_size) == reference
+    assert dataframe_hash(df[["b", "c", "a"]], chunk_size=chunk_size) == reference
+    assert dataframe_hash(df.iloc[:0], chunk_size=chunk_size) == "0"
+
+    with pytest.raises(ValueError):
+        dataframe_hash(df, chunk_size=0)